@@ -0,0 +1,45 @@
+"""
+Background Jobs API — status and retry for the durable job queue
+(app/services/job_queue.py).
+"""
+
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException
+
+from app.services import job_queue
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("/background-jobs")
+async def background_jobs_status():
+    """Queue depth per kind and status, plus the latest dead-lettered jobs."""
+    try:
+        return job_queue.stats()
+    except Exception as e:
+        logger.error(f"Background jobs stats error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/background-jobs/{job_id}")
+async def background_job(job_id: int):
+    """One job: status (pending/running/done/dead), attempts, last error and result."""
+    job = job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found (finished jobs are purged after "
+                                                    f"{job_queue.KEEP_DONE_DAYS} days)")
+    return job
+
+
+@router.post("/background-jobs/retry")
+async def background_jobs_retry(kind: Optional[str] = None):
+    """Re-queue dead jobs (optionally one kind) with a fresh attempt budget."""
+    try:
+        return {"requeued": job_queue.retry_dead(kind)}
+    except Exception as e:
+        logger.error(f"Background jobs retry error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
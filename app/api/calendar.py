@@ -329,8 +329,8 @@ async def create_event_from_voice(request: VoiceToCalendarRequest):
     
     Uses Claude to extract structured event data.
     """
-    import httpx
     import json
+    from app.core import http_clients
     
     anthropic_key = os.getenv("ANTHROPIC_API_KEY")
     if not anthropic_key:
@@ -356,90 +356,90 @@ If you cannot parse a valid event, respond:
 Today's date is: """ + datetime.now().strftime("%Y-%m-%d")
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.anthropic.com/v1/messages",
-                headers={
-                    "x-api-key": anthropic_key,
-                    "anthropic-version": "2023-06-01",
-                    "content-type": "application/json"
-                },
-                json={
-                    "model": "claude-sonnet-4-20250514",
-                    "max_tokens": 500,
-                    "system": system_prompt,
-                    "messages": [{"role": "user", "content": request.text}]
-                },
-                timeout=30.0
-            )
-            
-            if response.status_code != 200:
-                raise HTTPException(status_code=502, detail=f"Claude API error: {response.text}")
-            
-            result = response.json()
-            content = result["content"][0]["text"]
-            
-            # Parse Claude's response
-            # Strip markdown if present
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0]
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0]
-            
-            parsed = json.loads(content.strip())
-            
-            if "error" in parsed:
-                return {
-                    "success": False,
-                    "error": parsed["error"],
-                    "originalText": request.text
-                }
-            
-            # Build datetime from parsed data
-            event_date = datetime.strptime(parsed["date"], "%Y-%m-%d")
+        client = http_clients.get_client(http_clients.ANTHROPIC)
+        response = await client.post(
+            "https://api.anthropic.com/v1/messages",
+            headers={
+                "x-api-key": anthropic_key,
+                "anthropic-version": "2023-06-01",
+                "content-type": "application/json"
+            },
+            json={
+                "model": "claude-sonnet-4-20250514",
+                "max_tokens": 500,
+                "system": system_prompt,
+                "messages": [{"role": "user", "content": request.text}]
+            },
+            timeout=30.0
+        )
+        
+        if response.status_code != 200:
+            raise HTTPException(status_code=502, detail=f"Claude API error: {response.text}")
+        
+        result = response.json()
+        content = result["content"][0]["text"]
+        
+        # Parse Claude's response
+        # Strip markdown if present
+        if "```json" in content:
+            content = content.split("```json")[1].split("```")[0]
+        elif "```" in content:
+            content = content.split("```")[1].split("```")[0]
+        
+        parsed = json.loads(content.strip())
+        
+        if "error" in parsed:
+            return {
+                "success": False,
+                "error": parsed["error"],
+                "originalText": request.text
+            }
+        
+        # Build datetime from parsed data
+        event_date = datetime.strptime(parsed["date"], "%Y-%m-%d")
+        
+        if parsed.get("all_day"):
+            start_dt = event_date
+            end_dt = event_date
+        else:
+            start_time = datetime.strptime(parsed["start_time"], "%H:%M")
+            start_dt = event_date.replace(hour=start_time.hour, minute=start_time.minute)
             
-            if parsed.get("all_day"):
-                start_dt = event_date
-                end_dt = event_date
+            if parsed.get("end_time"):
+                end_time = datetime.strptime(parsed["end_time"], "%H:%M")
+                end_dt = event_date.replace(hour=end_time.hour, minute=end_time.minute)
             else:
-                start_time = datetime.strptime(parsed["start_time"], "%H:%M")
-                start_dt = event_date.replace(hour=start_time.hour, minute=start_time.minute)
-                
-                if parsed.get("end_time"):
-                    end_time = datetime.strptime(parsed["end_time"], "%H:%M")
-                    end_dt = event_date.replace(hour=end_time.hour, minute=end_time.minute)
-                else:
-                    end_dt = start_dt + timedelta(hours=1)
-            
-            # Create the event
-            create_request = CreateEventRequest(
-                title=parsed["title"],
-                startTime=start_dt,
-                endTime=end_dt,
-                location=parsed.get("location"),
-                allDay=parsed.get("all_day", False)
-            )
-            
-            # Check if calendar is configured
-            service = get_calendar_service()
-            if not service:
-                return {
-                    "success": False,
-                    "parsed": parsed,
-                    "error": "Google Calendar not configured - event parsed but not created",
-                    "originalText": request.text
-                }
-            
-            # Create the event
-            event_result = await create_event(create_request)
-            
+                end_dt = start_dt + timedelta(hours=1)
+        
+        # Create the event
+        create_request = CreateEventRequest(
+            title=parsed["title"],
+            startTime=start_dt,
+            endTime=end_dt,
+            location=parsed.get("location"),
+            allDay=parsed.get("all_day", False)
+        )
+        
+        # Check if calendar is configured
+        service = get_calendar_service()
+        if not service:
             return {
-                "success": True,
+                "success": False,
                 "parsed": parsed,
-                "event": event_result,
+                "error": "Google Calendar not configured - event parsed but not created",
                 "originalText": request.text
             }
-            
+        
+        # Create the event
+        event_result = await create_event(create_request)
+        
+        return {
+            "success": True,
+            "parsed": parsed,
+            "event": event_result,
+            "originalText": request.text
+        }
+        
     except json.JSONDecodeError as e:
         logger.error(f"Failed to parse Claude response: {e}")
         return {
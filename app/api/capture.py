@@ -11,12 +11,12 @@ Handles voice and text captures, integrating:
 
 import os
 import logging
-import httpx
 from datetime import datetime
 from typing import Optional
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
 from pydantic import BaseModel
 
+from app.core import http_clients
 from app.core.database import execute_query, execute_procedure
 
 logger = logging.getLogger(__name__)
@@ -42,20 +42,20 @@ async def call_whisper(audio_data: bytes) -> dict:
     if not api_key:
         raise HTTPException(status_code=503, detail="OpenAI API key not configured")
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            "https://api.openai.com/v1/audio/transcriptions",
-            headers={"Authorization": f"Bearer {api_key}"},
-            files={"file": ("audio.webm", audio_data, "audio/webm")},
-            data={"model": "whisper-1"},
-            timeout=30.0
-        )
-        
-        if response.status_code != 200:
-            logger.error(f"Whisper error: {response.text}")
-            raise HTTPException(status_code=502, detail="Transcription failed")
-        
-        return response.json()
+    client = http_clients.get_client(http_clients.OPENAI)
+    response = await client.post(
+        "https://api.openai.com/v1/audio/transcriptions",
+        headers={"Authorization": f"Bearer {api_key}"},
+        files={"file": ("audio.webm", audio_data, "audio/webm")},
+        data={"model": "whisper-1"},
+        timeout=30.0
+    )
+    
+    if response.status_code != 200:
+        logger.error(f"Whisper error: {response.text}")
+        raise HTTPException(status_code=502, detail="Transcription failed")
+    
+    return response.json()
 
 
 async def call_claude(text: str, project_code: Optional[str] = None) -> dict:
@@ -109,46 +109,46 @@ Or for other intents:
     if project_code:
         system_prompt += f"\n\nContext: The user is working on project {project_code}."
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            "https://api.anthropic.com/v1/messages",
-            headers={
-                "x-api-key": api_key,
-                "anthropic-version": "2023-06-01",
-                "content-type": "application/json"
-            },
-            json={
-                "model": "claude-sonnet-4-20250514",
-                "max_tokens": 1000,
-                "system": system_prompt,
-                "messages": [{"role": "user", "content": text}]
-            },
-            timeout=30.0
-        )
-        
-        if response.status_code != 200:
-            logger.error(f"Claude error: {response.text}")
-            raise HTTPException(status_code=502, detail="AI processing failed")
-        
-        result = response.json()
-        content = result["content"][0]["text"]
+    client = http_clients.get_client(http_clients.ANTHROPIC)
+    response = await client.post(
+        "https://api.anthropic.com/v1/messages",
+        headers={
+            "x-api-key": api_key,
+            "anthropic-version": "2023-06-01",
+            "content-type": "application/json"
+        },
+        json={
+            "model": "claude-sonnet-4-20250514",
+            "max_tokens": 1000,
+            "system": system_prompt,
+            "messages": [{"role": "user", "content": text}]
+        },
+        timeout=30.0
+    )
+    
+    if response.status_code != 200:
+        logger.error(f"Claude error: {response.text}")
+        raise HTTPException(status_code=502, detail="AI processing failed")
+    
+    result = response.json()
+    content = result["content"][0]["text"]
+    
+    # Parse JSON from response
+    import json
+    try:
+        # Strip markdown if present
+        if "```json" in content:
+            content = content.split("```json")[1].split("```")[0]
+        elif "```" in content:
+            content = content.split("```")[1].split("```")[0]
         
-        # Parse JSON from response
-        import json
-        try:
-            # Strip markdown if present
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0]
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0]
-            
-            return json.loads(content.strip())
-        except json.JSONDecodeError:
-            return {
-                "intent": "NOTE",
-                "response": content,
-                "summary": text[:100]
-            }
+        return json.loads(content.strip())
+    except json.JSONDecodeError:
+        return {
+            "intent": "NOTE",
+            "response": content,
+            "summary": text[:100]
+        }
 
 
 def create_conversation(source: str, project_code: Optional[str] = None, title: Optional[str] = None) -> dict:
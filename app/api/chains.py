@@ -2,6 +2,9 @@
 Chain Proposal Browse UI — MP54
 Read-only GET routes for viewing bug chain proposals and bug details.
 REQ-116 / sprint MP54-CHAIN-PROPOSAL-UI-001
+
+Pages read the chain_snapshot_* tables (see app/services/chain_snapshots.py)
+and fall back to the MP53B views until the snapshots have been built.
 """
 
 import json
@@ -15,6 +18,8 @@ from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 
 from app.core.database import execute_query
+from app.services import chain_snapshots
+from app.services.chain_snapshots import SEEDED, INDUCTIVE, MISCLASSIFIED, UNCLASSIFIED
 
 logger = logging.getLogger(__name__)
 
@@ -29,18 +34,9 @@ templates = Jinja2Templates(directory=str(_TEMPLATES_DIR))
 # ---------------------------------------------------------------------------
 
 def _nav_counts() -> dict:
-    """Fetch misclassified and unclassified counts for the shared nav badges."""
+    """Misclassified and unclassified counts for the shared nav badges (cached)."""
     try:
-        mis = execute_query(
-            "SELECT COUNT(*) AS cnt FROM vw_bug_chain_misclassified", fetch="one"
-        ) or {}
-        unc = execute_query(
-            "SELECT COUNT(*) AS cnt FROM vw_bug_chain_unclassified", fetch="one"
-        ) or {}
-        return {
-            "misclassified_count": int(mis.get("cnt") or 0),
-            "unclassified_count": int(unc.get("cnt") or 0),
-        }
+        return chain_snapshots.nav_counts()
     except Exception as exc:
         logger.warning(f"_nav_counts failed: {exc}")
         return {"misclassified_count": "?", "unclassified_count": "?"}
@@ -69,7 +65,7 @@ async def chains_index(request: Request):
     chains = execute_query(
         "SELECT chain_label, total_occurrences, expected_outcome, missing_signal, "
         "first_occurrence_at, member_requirement_codes "
-        "FROM vw_bug_chain_proposals_seeded ORDER BY total_occurrences DESC"
+        f"FROM {chain_snapshots.source(SEEDED)} ORDER BY total_occurrences DESC"
     ) or []
 
     for c in chains:
@@ -92,7 +88,7 @@ async def chains_misclassified(request: Request):
         "SELECT m.chain_label, m.member_requirement_code, m.bv_id, m.bv_title, "
         "m.bv_status, m.failure_type, m.misclassification_reason, "
         "r.title AS bug_title "
-        "FROM vw_bug_chain_misclassified m "
+        f"FROM {chain_snapshots.source(MISCLASSIFIED)} m "
         "LEFT JOIN roadmap_requirements r ON r.code = m.member_requirement_code "
         "ORDER BY m.chain_label, m.member_requirement_code"
     ) or []
@@ -112,7 +108,7 @@ async def chains_misclassified(request: Request):
 async def chains_unclassified(request: Request):
     rows = execute_query(
         "SELECT code, title "
-        "FROM vw_bug_chain_unclassified ORDER BY code"
+        f"FROM {chain_snapshots.source(UNCLASSIFIED)} ORDER BY code"
     ) or []
 
     nav = _nav_counts()
@@ -129,15 +125,15 @@ async def chains_unclassified(request: Request):
 @router.get("/chains/arithmetic", response_class=HTMLResponse, include_in_schema=False)
 async def chains_arithmetic(request: Request):
     seeded_row = execute_query(
-        "SELECT SUM(total_occurrences) AS cnt FROM vw_bug_chain_proposals_seeded",
+        f"SELECT SUM(total_occurrences) AS cnt FROM {chain_snapshots.source(SEEDED)}",
         fetch="one",
     ) or {}
     inductive_row = execute_query(
-        "SELECT COUNT(*) AS cnt FROM vw_bug_chain_proposals_inductive",
+        f"SELECT COUNT(*) AS cnt FROM {chain_snapshots.source(INDUCTIVE)}",
         fetch="one",
     ) or {}
     unclassified_row = execute_query(
-        "SELECT COUNT(*) AS cnt FROM vw_bug_chain_unclassified",
+        f"SELECT COUNT(*) AS cnt FROM {chain_snapshots.source(UNCLASSIFIED)}",
         fetch="one",
     ) or {}
     total_row = execute_query(
@@ -179,7 +175,7 @@ async def chain_detail(request: Request, chain_label: str):
     chain = execute_query(
         "SELECT chain_label, total_occurrences, expected_outcome, missing_signal, "
         "first_occurrence_at, member_requirement_codes "
-        "FROM vw_bug_chain_proposals_seeded WHERE chain_label = ?",
+        f"FROM {chain_snapshots.source(SEEDED)} WHERE chain_label = ?",
         (chain_label,),
         fetch="one",
     )
@@ -210,7 +206,7 @@ async def chain_detail(request: Request, chain_label: str):
         "SELECT i.proposed_member_code, i.proposed_member_title, i.match_rule, "
         "i.recurrence_count, i.diagnostic_present, "
         "LEFT(r.description, 500) AS description_preview "
-        "FROM vw_bug_chain_proposals_inductive i "
+        f"FROM {chain_snapshots.source(INDUCTIVE)} i "
         "LEFT JOIN roadmap_requirements r ON r.code = i.proposed_member_code "
         "WHERE i.chain_label = ?",
         (chain_label,),
@@ -273,3 +269,33 @@ async def bug_detail(request: Request, code: str):
         "bug_detail.html",
         {"request": request, "bug": bug, "history": history, "bvs": bvs, **nav},
     )
+
+
+# ---------------------------------------------------------------------------
+# Snapshot admin — POST /api/chains/snapshots/rebuild
+# ---------------------------------------------------------------------------
+
+@router.get("/api/chains/snapshots")
+async def chain_snapshot_status():
+    """Report whether pages are served from snapshots and current nav counts."""
+    ready = chain_snapshots.snapshots_ready()
+    built = execute_query(
+        "SELECT value_json, updated_at FROM governance_kv WHERE key_name = 'chain_snapshots_built_at'",
+        fetch="one",
+    ) if ready else None
+    return {
+        "ready": ready,
+        "built_at": built["value_json"] if built else None,
+        **_nav_counts(),
+    }
+
+
+@router.post("/api/chains/snapshots/rebuild")
+async def rebuild_chain_snapshots():
+    """Repopulate every chain snapshot table from the live proposal views."""
+    try:
+        counts = chain_snapshots.rebuild_snapshots()
+        return {"success": True, "counts": counts}
+    except Exception as exc:
+        logger.error(f"rebuild_chain_snapshots failed: {exc}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(exc))
@@ -4,14 +4,17 @@ Endpoints for the PL bug classification & chain management surface.
 REQ-117 / sprint MP56-BUG-INSPECTOR-001
 """
 
+import base64
 import json
 import logging
 from typing import List, Dict, Any, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
-from app.core.database import execute_query
+from app.core import change_hooks
+from app.core.database import execute_query, get_db
+from app.services import chain_matcher
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +56,17 @@ class BugChainMerge(BaseModel):
     target: str
 
 
+class ChainProposalAccept(BaseModel):
+    codes: List[str]
+
+
+class BugBatchUpdate(BaseModel):
+    codes: List[str]
+    classifications: Optional[List[str]] = None
+    bug_chain_ids: Optional[List[str]] = None
+    mode: str = "replace"  # replace | add | remove
+
+
 # ---------------------------------------------------------------------------
 # Helper functions
 # ---------------------------------------------------------------------------
@@ -127,92 +141,284 @@ async def load_chains() -> List[Dict[str, Any]]:
     return result
 
 
-async def load_bugs_with_context() -> List[Dict[str, Any]]:
+# Upper bound on bound parameters per IN (...) list — SQL Server caps a
+# single statement at 2100 parameters.
+_IN_CHUNK = 500
+
+SUMMARY_PAGE_DEFAULT = 100
+SUMMARY_PAGE_MAX = 500
+
+
+def _placeholders(n: int) -> str:
+    return ",".join(["?"] * n)
+
+
+def _chunks(items: List[Any], size: int = _IN_CHUNK):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _parse_json_field(value: Any, default: Any) -> Any:
+    if not value:
+        return default
+    try:
+        return json.loads(value) if isinstance(value, str) else value
+    except Exception:
+        return default
+
+
+def _age_days(created: Any) -> int:
+    if not created:
+        return 0
+    from datetime import datetime
+    try:
+        if isinstance(created, str):
+            created = datetime.fromisoformat(created)
+        return (datetime.utcnow() - created.replace(tzinfo=None)).days
+    except Exception:
+        return 0
+
+
+def _bug_base(bug: Dict[str, Any]) -> Dict[str, Any]:
+    """List-view fields shared by summary and hydrated bug objects."""
+    bug_code = bug["code"]
+    return {
+        "code": bug_code,
+        "title": bug["title"],
+        "description": bug.get("description", ""),
+        "status": bug["status"],
+        "priority": bug.get("priority", "P2"),
+        "type": bug["type"],
+        "layer": "unknown",  # TODO: Add layer field to schema or derive
+        "prefix": bug_code.split("-")[0] if "-" in bug_code else bug_code[:3],
+        "pth": bug.get("pth"),
+        "failure_class_hash": bug.get("failure_class_hash"),
+        "bug_chain_ids": [],  # M:N array
+        "classifications": [],  # M:N array
+        "created_at": str(bug["created_at"]) if bug.get("created_at") else None,
+        "updated_at": str(bug["updated_at"]) if bug.get("updated_at") else None,
+        "age": _age_days(bug.get("created_at")),
+    }
+
+
+def _fetch_grouped(sql_template: str, ids: List[Any], key: str) -> Dict[Any, List[Dict[str, Any]]]:
+    """Run an IN (...) query over ids in chunks and group rows by `key`."""
+    grouped: Dict[Any, List[Dict[str, Any]]] = {}
+    for chunk in _chunks(ids):
+        rows = execute_query(sql_template.format(ids=_placeholders(len(chunk))), tuple(chunk)) or []
+        for row in rows:
+            grouped.setdefault(row[key], []).append(row)
+    return grouped
+
+
+_LINK_TABLES = {
+    "classifications": ("bug_classifications", "classification_code"),
+    "bug_chain_ids": ("bug_chain_members", "chain_id"),
+}
+_LINK_ROWS_PER_INSERT = 500  # 2 params/row; stays under the 2100-param cap and 1000-row VALUES cap
+
+
+def _apply_bug_links(cursor, bug_ids: List[str], field: str, values: List[str], mode: str) -> None:
+    """Set-based update of one M:N link table for many bugs on an open cursor.
+
+    replace: delete all links for the bugs, then insert bug_ids × values.
+    add:     insert bug_ids × values that aren't already linked.
+    remove:  delete only the given values from the bugs.
+    Inserts are multi-row INSERT…SELECT FROM (VALUES …) guarded by NOT EXISTS,
+    so duplicates in the request or the table are skipped rather than raised.
     """
-    Load all bugs (type='bug') with full context including:
-    - Bug-level classifications from bug_classifications join table
-    - Chain membership from bug_chain_members
-    - UAT walks with BVs
-    - Sprint history
-    - Handoffs
-    - Reviews
-    - Status history
+    table, col = _LINK_TABLES[field]
+    values = list(dict.fromkeys(values))
+
+    if mode in ("replace", "remove"):
+        for chunk in _chunks(bug_ids):
+            sql = f"DELETE FROM {table} WHERE bug_requirement_id IN ({_placeholders(len(chunk))})"
+            params = list(chunk)
+            if mode == "remove":
+                if not values:
+                    return
+                sql += f" AND {col} IN ({_placeholders(len(values))})"
+                params += values
+            cursor.execute(sql, params)
+        if mode == "remove":
+            return
+
+    pairs = [(bug_id, v) for bug_id in bug_ids for v in values]
+    for i in range(0, len(pairs), _LINK_ROWS_PER_INSERT):
+        chunk = pairs[i:i + _LINK_ROWS_PER_INSERT]
+        cursor.execute(
+            f"""
+            INSERT INTO {table} (bug_requirement_id, {col}, created_by)
+            SELECT DISTINCT v.bug_requirement_id, v.link_value, 'CC'
+            FROM (VALUES {",".join(["(?, ?)"] * len(chunk))}) AS v(bug_requirement_id, link_value)
+            WHERE NOT EXISTS (
+                SELECT 1 FROM {table} t
+                WHERE t.bug_requirement_id = v.bug_requirement_id AND t.{col} = v.link_value
+            )
+            """,
+            [p for pair in chunk for p in pair],
+        )
+
+
+def _resolve_bug_ids(codes: List[str]) -> Dict[str, str]:
+    """Map bug codes to requirement ids (type = 'bug' only)."""
+    found: Dict[str, str] = {}
+    for chunk in _chunks(list(dict.fromkeys(codes))):
+        rows = execute_query(
+            f"SELECT id, code FROM roadmap_requirements WHERE type = 'bug' AND code IN ({_placeholders(len(chunk))})",
+            tuple(chunk),
+        ) or []
+        found.update({r["code"]: r["id"] for r in rows})
+    return found
+
+
+def _update_bug_links(bug_ids: List[str], update: ClassificationUpdate, mode: str = "replace") -> None:
+    """Apply classification and chain changes for bug_ids in one transaction, then notify."""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        if update.classifications is not None:
+            _apply_bug_links(cursor, bug_ids, "classifications", update.classifications, mode)
+        if update.bug_chain_ids is not None:
+            _apply_bug_links(cursor, bug_ids, "bug_chain_ids", update.bug_chain_ids, mode)
+
+    if update.classifications is not None:
+        change_hooks.notify_change(change_hooks.BUG_CLASSIFICATION, bug_ids)
+    if update.bug_chain_ids is not None:
+        change_hooks.notify_change(change_hooks.BUG_CHAIN_MEMBER, bug_ids)
+
+
+def _hydrate_bugs(bugs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
-    # Get all bugs (MP56-PATCH: sprint_id removed - not in roadmap_requirements table)
-    bugs = execute_query(
+    Attach full classifier context to a list of roadmap_requirements bug rows.
+    Each nested collection is fetched with one IN (...) query per chunk of bugs
+    rather than one query per bug, so hydrating N bugs costs a constant number
+    of round trips.
+    """
+    if not bugs:
+        return []
+    bug_ids = [b["id"] for b in bugs]
+
+    cls_by_bug = _fetch_grouped(
+        """
+        SELECT bug_requirement_id, classification_code
+        FROM bug_classifications
+        WHERE bug_requirement_id IN ({ids})
+        """,
+        bug_ids, "bug_requirement_id",
+    )
+    chains_by_bug = _fetch_grouped(
+        """
+        SELECT bug_requirement_id, chain_id
+        FROM bug_chain_members
+        WHERE bug_requirement_id IN ({ids})
+        """,
+        bug_ids, "bug_requirement_id",
+    )
+
+    # UAT walks via pth_registry (MP56-PATCH: fixed uat_page_id error)
+    walks_by_bug = _fetch_grouped(
         """
         SELECT
-            id, code, title, description, status, priority, type,
-            pth, failure_class_hash, created_at, updated_at,
-            project_id
-        FROM roadmap_requirements
-        WHERE type = 'bug'
+            pr.requirement_id, u.id, u.pth, cp.sprint_id, u.status,
+            u.pl_submitted_at, u.general_notes, u.version
+        FROM pth_registry pr
+        JOIN uat_pages u ON u.pth = pr.pth
+        LEFT JOIN cc_prompts cp ON cp.pth = u.pth
+        WHERE pr.requirement_id IN ({ids})
+        ORDER BY u.pl_submitted_at DESC
+        """,
+        bug_ids, "requirement_id",
+    )
+    walk_ids = list({w["id"] for rows in walks_by_bug.values() for w in rows})
+    # MP56-PATCH: removed bv_type - not in table
+    bvs_by_walk = _fetch_grouped(
+        """
+        SELECT
+            spec_id, bv_id, title, status, classification,
+            notes, cc_evidence, cc_result
+        FROM uat_bv_items
+        WHERE spec_id IN ({ids})
+        ORDER BY bv_id
+        """,
+        walk_ids, "spec_id",
+    ) if walk_ids else {}
+
+    # Sprint history via cc_prompts (MP56-PATCH: use requirement_id not pth)
+    sprints_by_bug = _fetch_grouped(
+        """
+        SELECT
+            requirement_id, id, sprint_id, pth, status, session_outcome,
+            approved_at, approved_by, also_closes,
+            session_started_at, session_ended_at, session_stop_reason,
+            LEFT(content, 500) AS content
+        FROM cc_prompts
+        WHERE requirement_id IN ({ids})
+        ORDER BY created_at DESC
+        """,
+        bug_ids, "requirement_id",
+    )
+
+    # Handoffs (MP56-PATCH: use pth_registry)
+    handoffs_by_bug = _fetch_grouped(
+        """
+        SELECT
+            pr.requirement_id, h.id, h.pth, h.direction, h.description, h.evidence_json
+        FROM mcp_handoffs h
+        JOIN pth_registry pr ON pr.pth = h.pth
+        WHERE pr.requirement_id IN ({ids})
+        ORDER BY h.created_at DESC
+        """,
+        bug_ids, "requirement_id",
+    )
+    handoff_ids = list({h["id"] for rows in handoffs_by_bug.values() for h in rows})
+    # Reviews (MP56-PATCH: column is prompt_pth not pth, no created_by)
+    reviews_by_handoff = _fetch_grouped(
+        """
+        SELECT
+            id, prompt_pth, handoff_id, assessment, notes,
+            lesson_candidates, created_at
+        FROM reviews
+        WHERE handoff_id IN ({ids})
         ORDER BY created_at DESC
+        """,
+        handoff_ids, "handoff_id",
+    ) if handoff_ids else {}
+
+    # Status history (MP56-PATCH: use old_value/new_value not old_status/new_status)
+    history_by_bug = _fetch_grouped(
         """
-    ) or []
+        SELECT
+            requirement_id, id, old_value AS old_status, new_value AS new_status,
+            changed_at, changed_by, notes AS note
+        FROM requirement_history
+        WHERE requirement_id IN ({ids})
+          AND field_name = 'status'
+        ORDER BY changed_at ASC
+        """,
+        bug_ids, "requirement_id",
+    )
 
     result = []
     for bug in bugs:
-        bug_code = bug["code"]
         bug_req_id = bug["id"]
+        item = _bug_base(bug)
+        item["bug_chain_ids"] = [r["chain_id"] for r in chains_by_bug.get(bug_req_id, [])]
+        item["classifications"] = [r["classification_code"] for r in cls_by_bug.get(bug_req_id, [])]
 
-        # Get classifications for this bug from bug_classifications join table
-        bug_cls = execute_query(
-            """
-            SELECT classification_code
-            FROM bug_classifications
-            WHERE bug_requirement_id = ?
-            """,
-            (bug_req_id,)
-        ) or []
-        classifications = [r["classification_code"] for r in bug_cls]
-
-        # Get chain IDs from bug_chain_members
-        bug_chains = execute_query(
-            """
-            SELECT chain_id
-            FROM bug_chain_members
-            WHERE bug_requirement_id = ?
-            """,
-            (bug_req_id,)
-        ) or []
-        bug_chain_ids = [r["chain_id"] for r in bug_chains]
-
-        # Get UAT walks via pth_registry (MP56-PATCH: fixed uat_page_id error)
         uat_walks = []
-        walks = execute_query(
-            """
-            SELECT
-                u.id, u.pth, cp.sprint_id, u.status,
-                u.pl_submitted_at, u.general_notes, u.version
-            FROM pth_registry pr
-            JOIN uat_pages u ON u.pth = pr.pth
-            LEFT JOIN cc_prompts cp ON cp.pth = u.pth
-            WHERE pr.requirement_id = ?
-            ORDER BY u.pl_submitted_at DESC
-            """,
-            (bug_req_id,)
-        ) or []
-
-        for walk in walks:
-            # Get BVs for this UAT walk (MP56-PATCH: removed bv_type - not in table)
-            bvs = execute_query(
-                """
-                SELECT
-                    bv_id, title, status, classification,
-                    notes, cc_evidence, cc_result
-                FROM uat_bv_items
-                WHERE spec_id = ?
-                ORDER BY bv_id
-                """,
-                (walk["id"],)
-            ) or []
-
-            # Per API.md: BV classification is singular in DB but we return as array for forward-compat
-            for bv in bvs:
-                bv["classifications"] = [bv["classification"]] if bv.get("classification") else []
-                del bv["classification"]  # Remove singular field
-
+        for walk in walks_by_bug.get(bug_req_id, []):
+            bvs = []
+            for bv in bvs_by_walk.get(walk["id"], []):
+                # Per API.md: BV classification is singular in DB but we return as array for forward-compat
+                bvs.append({
+                    "bv_id": bv["bv_id"],
+                    "title": bv["title"],
+                    "status": bv["status"],
+                    "notes": bv.get("notes"),
+                    "cc_evidence": bv.get("cc_evidence"),
+                    "cc_result": bv.get("cc_result"),
+                    "classifications": [bv["classification"]] if bv.get("classification") else [],
+                })
             uat_walks.append({
                 "id": walk["id"],
                 "pth": walk["pth"],
@@ -221,33 +427,11 @@ async def load_bugs_with_context() -> List[Dict[str, Any]]:
                 "submitted_at": str(walk["pl_submitted_at"]) if walk.get("pl_submitted_at") else None,
                 "general_notes": walk.get("general_notes"),
                 "version": walk.get("version", ""),
-                "bvs": [dict(bv) for bv in bvs],
+                "bvs": bvs,
             })
 
-        # Get sprint history via cc_prompts (MP56-PATCH: use requirement_id not pth)
         sprints = []
-        sprint_rows = execute_query(
-            """
-            SELECT
-                id, sprint_id, pth, status, session_outcome,
-                approved_at, approved_by, also_closes,
-                session_started_at, session_ended_at, session_stop_reason,
-                content
-            FROM cc_prompts
-            WHERE requirement_id = ?
-            ORDER BY created_at DESC
-            """,
-            (bug_req_id,)
-        ) or []
-
-        for s in sprint_rows:
-            also_closes = []
-            if s.get("also_closes"):
-                try:
-                    also_closes = json.loads(s["also_closes"]) if isinstance(s["also_closes"], str) else s["also_closes"]
-                except:
-                    also_closes = []
-
+        for s in sprints_by_bug.get(bug_req_id, []):
             sprints.append({
                 "id": s["id"],
                 "sprint_id": s["sprint_id"],
@@ -256,91 +440,36 @@ async def load_bugs_with_context() -> List[Dict[str, Any]]:
                 "session_outcome": s.get("session_outcome"),
                 "approved_at": str(s["approved_at"]) if s.get("approved_at") else None,
                 "approved_by": s.get("approved_by"),
-                "also_closes": also_closes,
-                "content": s.get("content", "")[:500],  # Truncate for response size
+                "also_closes": _parse_json_field(s.get("also_closes"), []),
+                "content": s.get("content") or "",  # Truncated to 500 chars in SQL
                 "session_started_at": str(s["session_started_at"]) if s.get("session_started_at") else None,
                 "session_ended_at": str(s["session_ended_at"]) if s.get("session_ended_at") else None,
                 "session_stop_reason": s.get("session_stop_reason"),
             })
 
-        # Get handoffs (MP56-PATCH: use pth_registry)
         handoffs = []
-        handoff_rows = execute_query(
-            """
-            SELECT
-                h.id, h.pth, h.direction, h.description, h.evidence_json
-            FROM mcp_handoffs h
-            WHERE h.pth IN (SELECT pth FROM pth_registry WHERE requirement_id = ?)
-            ORDER BY h.created_at DESC
-            """,
-            (bug_req_id,)
-        ) or []
-
-        for h in handoff_rows:
-            evidence = {}
-            if h.get("evidence_json"):
-                try:
-                    evidence = json.loads(h["evidence_json"]) if isinstance(h["evidence_json"], str) else h["evidence_json"]
-                except:
-                    evidence = {}
-
+        reviews = []
+        for h in handoffs_by_bug.get(bug_req_id, []):
             handoffs.append({
                 "id": h["id"],
                 "pth": h["pth"],
                 "direction": h["direction"],
                 "description": h.get("description", ""),
-                "evidence_json": evidence,
+                "evidence_json": _parse_json_field(h.get("evidence_json"), {}),
             })
-
-        # Get reviews (MP56-PATCH: column is prompt_pth not pth, no created_by)
-        reviews = []
-        if handoffs:
-            for handoff in handoffs:
-                review_rows = execute_query(
-                    """
-                    SELECT
-                        id, prompt_pth, handoff_id, assessment, notes,
-                        lesson_candidates, created_at
-                    FROM reviews
-                    WHERE handoff_id = ?
-                    ORDER BY created_at DESC
-                    """,
-                    (handoff["id"],)
-                ) or []
-
-                for r in review_rows:
-                    lesson_cand = {}
-                    if r.get("lesson_candidates"):
-                        try:
-                            lesson_cand = json.loads(r["lesson_candidates"]) if isinstance(r["lesson_candidates"], str) else r["lesson_candidates"]
-                        except:
-                            lesson_cand = {}
-
-                    reviews.append({
-                        "id": r["id"],
-                        "pth": r["prompt_pth"],  # Map prompt_pth → pth for frontend
-                        "handoff_id": r["handoff_id"],
-                        "assessment": r["assessment"],
-                        "notes": r.get("notes", ""),
-                        "lesson_candidates": lesson_cand,
-                        "created_at": str(r["created_at"]) if r.get("created_at") else None,
-                    })
-
-        # Get status history from requirement_history (MP56-PATCH: use old_value/new_value not old_status/new_status)
-        history = execute_query(
-            """
-            SELECT
-                id, old_value AS old_status, new_value AS new_status, changed_at, changed_by, notes AS note
-            FROM requirement_history
-            WHERE requirement_id = ?
-              AND field_name = 'status'
-            ORDER BY changed_at ASC
-            """,
-            (bug_req_id,)
-        ) or []
+            for r in reviews_by_handoff.get(h["id"], []):
+                reviews.append({
+                    "id": r["id"],
+                    "pth": r["prompt_pth"],  # Map prompt_pth → pth for frontend
+                    "handoff_id": r["handoff_id"],
+                    "assessment": r["assessment"],
+                    "notes": r.get("notes", ""),
+                    "lesson_candidates": _parse_json_field(r.get("lesson_candidates"), {}),
+                    "created_at": str(r["created_at"]) if r.get("created_at") else None,
+                })
 
         history_items = []
-        for h in history:
+        for h in history_by_bug.get(bug_req_id, []):
             history_items.append({
                 "id": h["id"],
                 "old_status": h.get("old_status"),
@@ -350,56 +479,206 @@ async def load_bugs_with_context() -> List[Dict[str, Any]]:
                 "note": h.get("note", ""),
             })
 
-        # Calculate age in days
-        age_days = 0
-        if bug.get("created_at"):
-            from datetime import datetime
-            try:
-                created = bug["created_at"]
-                if isinstance(created, str):
-                    created = datetime.fromisoformat(created)
-                age_days = (datetime.utcnow() - created.replace(tzinfo=None)).days
-            except:
-                age_days = 0
-
-        # Build final bug object (MP56-PATCH: sprint_id removed - bugs have many sprints)
-        result.append({
-            "code": bug_code,
-            "title": bug["title"],
-            "description": bug.get("description", ""),
-            "status": bug["status"],
-            "priority": bug.get("priority", "P2"),
-            "type": bug["type"],
-            "layer": "unknown",  # TODO: Add layer field to schema or derive
-            "prefix": bug_code.split("-")[0] if "-" in bug_code else bug_code[:3],
-            "pth": bug.get("pth"),
-            "failure_class_hash": bug.get("failure_class_hash"),
-            "bug_chain_ids": bug_chain_ids,  # M:N array
-            "classifications": classifications,  # M:N array
-            "created_at": str(bug["created_at"]) if bug.get("created_at") else None,
-            "updated_at": str(bug["updated_at"]) if bug.get("updated_at") else None,
-            "age": age_days,
+        item.update({
             "uat_walks": uat_walks,
             "sprints": sprints,
             "handoffs": handoffs,
             "reviews": reviews,
             "history": history_items,
         })
+        result.append(item)
 
     return result
 
 
+_BUG_COLUMNS = """
+    id, code, title, description, status, priority, type,
+    pth, failure_class_hash, created_at, updated_at,
+    project_id
+"""
+
+
+async def load_bugs_with_context() -> List[Dict[str, Any]]:
+    """
+    Load all bugs (type='bug') with full context including:
+    - Bug-level classifications from bug_classifications join table
+    - Chain membership from bug_chain_members
+    - UAT walks with BVs
+    - Sprint history
+    - Handoffs
+    - Reviews
+    - Status history
+    """
+    # MP56-PATCH: sprint_id removed - not in roadmap_requirements table
+    bugs = execute_query(
+        f"""
+        SELECT {_BUG_COLUMNS}
+        FROM roadmap_requirements
+        WHERE type = 'bug'
+        ORDER BY created_at DESC
+        """
+    ) or []
+    return _hydrate_bugs(bugs)
+
+
+async def load_bugs_by_code(codes: List[str]) -> List[Dict[str, Any]]:
+    """Hydrate full context for specific bug codes, preserving request order."""
+    codes = [c for c in dict.fromkeys(codes) if c]
+    if not codes:
+        return []
+    rows: List[Dict[str, Any]] = []
+    for chunk in _chunks(codes):
+        rows.extend(execute_query(
+            f"""
+            SELECT {_BUG_COLUMNS}
+            FROM roadmap_requirements
+            WHERE type = 'bug' AND code IN ({_placeholders(len(chunk))})
+            """,
+            tuple(chunk)
+        ) or [])
+    by_code = {b["code"]: b for b in _hydrate_bugs(rows)}
+    return [by_code[c] for c in codes if c in by_code]
+
+
+def _encode_cursor(created_at: Any, code: str) -> str:
+    raw = json.dumps([str(created_at) if created_at else None, code])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    try:
+        created_at, code = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8"))
+        return created_at, code
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def load_bug_summaries(
+    limit: int = SUMMARY_PAGE_DEFAULT,
+    cursor: Optional[str] = None,
+    classification: Optional[str] = None,
+    chain: Optional[str] = None,
+    status: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    One page of list-view bug rows plus nested-collection counts, in a single
+    query. Keyset-paginated on (created_at DESC, code DESC) so later pages cost
+    the same as the first.
+    """
+    limit = max(1, min(limit, SUMMARY_PAGE_MAX))
+    where = ["r.type = 'bug'"]
+    params: List[Any] = []
+    if status:
+        where.append("r.status = ?")
+        params.append(status)
+    if classification:
+        where.append(
+            "EXISTS (SELECT 1 FROM bug_classifications bc"
+            " WHERE bc.bug_requirement_id = r.id AND bc.classification_code = ?)"
+        )
+        params.append(classification)
+    if chain:
+        where.append(
+            "EXISTS (SELECT 1 FROM bug_chain_members m"
+            " WHERE m.bug_requirement_id = r.id AND m.chain_id = ?)"
+        )
+        params.append(chain)
+    if cursor:
+        cur_created, cur_code = _decode_cursor(cursor)
+        if cur_created is None:
+            where.append("(r.created_at IS NULL AND r.code < ?)")
+            params.append(cur_code)
+        else:
+            where.append("(r.created_at < ? OR r.created_at IS NULL OR (r.created_at = ? AND r.code < ?))")
+            params.extend([cur_created, cur_created, cur_code])
+
+    rows = execute_query(
+        f"""
+        SELECT TOP ({limit + 1})
+            r.id, r.code, r.title, r.description, r.status, r.priority, r.type,
+            r.pth, r.failure_class_hash, r.created_at, r.updated_at, r.project_id,
+            (SELECT STRING_AGG(bc.classification_code, ',') FROM bug_classifications bc
+             WHERE bc.bug_requirement_id = r.id) AS classification_csv,
+            (SELECT STRING_AGG(m.chain_id, ',') FROM bug_chain_members m
+             WHERE m.bug_requirement_id = r.id) AS chain_csv,
+            (SELECT COUNT(*) FROM pth_registry pr JOIN uat_pages u ON u.pth = pr.pth
+             WHERE pr.requirement_id = r.id) AS uat_walk_count,
+            (SELECT COUNT(*) FROM cc_prompts cp WHERE cp.requirement_id = r.id) AS sprint_count,
+            (SELECT COUNT(*) FROM mcp_handoffs h JOIN pth_registry pr ON pr.pth = h.pth
+             WHERE pr.requirement_id = r.id) AS handoff_count,
+            (SELECT COUNT(*) FROM reviews rv JOIN mcp_handoffs h ON rv.handoff_id = h.id
+             JOIN pth_registry pr ON pr.pth = h.pth
+             WHERE pr.requirement_id = r.id) AS review_count,
+            (SELECT COUNT(*) FROM requirement_history rh
+             WHERE rh.requirement_id = r.id AND rh.field_name = 'status') AS history_count
+        FROM roadmap_requirements r
+        WHERE {' AND '.join(where)}
+        ORDER BY r.created_at DESC, r.code DESC
+        """,
+        tuple(params) if params else None
+    ) or []
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    bugs = []
+    for row in rows:
+        item = _bug_base(row)
+        item["classifications"] = [c for c in (row.get("classification_csv") or "").split(",") if c]
+        item["bug_chain_ids"] = [c for c in (row.get("chain_csv") or "").split(",") if c]
+        item["counts"] = {
+            "uat_walks": row.get("uat_walk_count") or 0,
+            "sprints": row.get("sprint_count") or 0,
+            "handoffs": row.get("handoff_count") or 0,
+            "reviews": row.get("review_count") or 0,
+            "history": row.get("history_count") or 0,
+        }
+        item["hydrated"] = False
+        bugs.append(item)
+
+    next_cursor = _encode_cursor(rows[-1].get("created_at"), rows[-1]["code"]) if has_more and rows else None
+    return {"bugs": bugs, "next_cursor": next_cursor, "has_more": has_more}
+
+
 # ---------------------------------------------------------------------------
 # B.1 — GET /api/classifier/bootstrap
 # ---------------------------------------------------------------------------
 
 @router.get("/api/classifier/bootstrap")
-async def classifier_bootstrap():
+async def classifier_bootstrap(
+    mode: str = Query("full", pattern="^(full|summary)$"),
+    limit: int = Query(SUMMARY_PAGE_DEFAULT, ge=1, le=SUMMARY_PAGE_MAX),
+    cursor: Optional[str] = None,
+    classification: Optional[str] = None,
+    chain: Optional[str] = None,
+    status: Optional[str] = None,
+):
     """
     Initial hydration endpoint for the Bug Classifier UI.
     Returns all bugs with full context, all classifications, and all chains.
+
+    mode=summary returns one keyset page of list-view bug fields plus counts
+    of each nested collection (filterable by classification, chain, status).
+    Pass the returned next_cursor back to fetch the next page, and hydrate
+    individual bugs via /api/classifier/bugs/{code}.
     """
     try:
+        if mode == "summary":
+            page = await load_bug_summaries(
+                limit=limit, cursor=cursor,
+                classification=classification, chain=chain, status=status,
+            )
+            response = {
+                "mode": "summary",
+                "bugs": page["bugs"],
+                "next_cursor": page["next_cursor"],
+                "has_more": page["has_more"],
+            }
+            # Reference data only rides along on the first page
+            if not cursor:
+                response["classifications"] = await load_classifications()
+                response["chains"] = await load_chains()
+            return response
+
         bugs = await load_bugs_with_context()
         classifications = await load_classifications()
         chains = await load_chains()
@@ -409,11 +688,83 @@ async def classifier_bootstrap():
             "classifications": classifications,
             "chains": chains,
         }
+    except HTTPException:
+        raise
     except Exception as exc:
         logger.error(f"classifier_bootstrap failed: {exc}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(exc))
 
 
+# ---------------------------------------------------------------------------
+# B.2 — GET /api/classifier/bugs/{code} (on-demand detail hydration)
+# ---------------------------------------------------------------------------
+
+@router.get("/api/classifier/bugs")
+async def classifier_bugs_batch(codes: str = Query(..., description="Comma-separated bug codes")):
+    """Hydrate full context for several bugs at once (UI prefetch)."""
+    code_list = [c.strip() for c in codes.split(",") if c.strip()]
+    if not code_list:
+        raise HTTPException(status_code=400, detail="codes is required")
+    if len(code_list) > SUMMARY_PAGE_MAX:
+        raise HTTPException(status_code=400, detail=f"At most {SUMMARY_PAGE_MAX} codes per request")
+    try:
+        bugs = await load_bugs_by_code(code_list)
+        found = {b["code"] for b in bugs}
+        return {
+            "bugs": bugs,
+            "missing": [c for c in code_list if c not in found],
+        }
+    except Exception as exc:
+        logger.error(f"classifier_bugs_batch failed: {exc}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(exc))
+
+
+@router.get("/api/classifier/bugs/{bug_code}")
+async def classifier_bug_detail(bug_code: str):
+    """Full context (UAT walks, sprints, handoffs, reviews, history) for one bug."""
+    try:
+        bugs = await load_bugs_by_code([bug_code])
+    except Exception as exc:
+        logger.error(f"classifier_bug_detail failed for {bug_code}: {exc}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(exc))
+    if not bugs:
+        raise HTTPException(status_code=404, detail=f"Bug {bug_code} not found")
+    return bugs[0]
+
+
+# ---------------------------------------------------------------------------
+# C.1b — PATCH /api/bugs:batch  (bulk reclassification)
+# ---------------------------------------------------------------------------
+
+@router.patch("/api/bugs:batch")
+async def update_bugs_batch(batch: BugBatchUpdate):
+    """
+    Apply the same classification and/or chain change to many bugs in one
+    transaction. mode=replace mirrors PATCH /api/bugs/{code}; add and remove
+    change only the listed values and leave other links alone.
+    """
+    if batch.mode not in ("replace", "add", "remove"):
+        raise HTTPException(status_code=422, detail="mode must be replace, add or remove")
+    if batch.classifications is None and batch.bug_chain_ids is None:
+        raise HTTPException(status_code=422, detail="Nothing to update: pass classifications and/or bug_chain_ids")
+    try:
+        found = _resolve_bug_ids(batch.codes)
+        missing = [c for c in batch.codes if c not in found]
+        if found:
+            _update_bug_links(
+                list(found.values()),
+                ClassificationUpdate(classifications=batch.classifications, bug_chain_ids=batch.bug_chain_ids),
+                mode=batch.mode,
+            )
+        logger.info(f"Batch {batch.mode} updated {len(found)} bugs ({len(missing)} not found)")
+        return {"success": not missing, "updated": sorted(found), "not_found": missing}
+    except HTTPException:
+        raise
+    except Exception as exc:
+        logger.error(f"update_bugs_batch failed: {exc}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(exc))
+
+
 # ---------------------------------------------------------------------------
 # C.1 — PATCH /api/bugs/:code
 # ---------------------------------------------------------------------------
@@ -439,42 +790,11 @@ async def update_bug(bug_code: str, update: ClassificationUpdate):
 
         bug_req_id = bug_rows[0]["id"]
 
-        # Update classifications if provided
-        if update.classifications is not None:
-            # Delete existing
-            execute_query(
-                "DELETE FROM bug_classifications WHERE bug_requirement_id = ?",
-                (bug_req_id,)
-            )
-            # Insert new
-            for cls_code in update.classifications:
-                execute_query(
-                    """
-                    INSERT INTO bug_classifications (bug_requirement_id, classification_code, created_by)
-                    VALUES (?, ?, 'CC')
-                    """,
-                    (bug_req_id, cls_code)
-                )
-            logger.info(f"Updated classifications for {bug_code}: {update.classifications}")
-
-        # Update chain memberships if provided
-        if update.bug_chain_ids is not None:
-            # Delete existing
-            execute_query(
-                "DELETE FROM bug_chain_members WHERE bug_requirement_id = ?",
-                (bug_req_id,)
-            )
-            # Insert new
-            for chain_id in update.bug_chain_ids:
-                execute_query(
-                    """
-                    INSERT INTO bug_chain_members (bug_requirement_id, chain_id, created_by)
-                    VALUES (?, ?, 'CC')
-                    """,
-                    (bug_req_id, chain_id)
-                )
-            logger.info(f"Updated chain memberships for {bug_code}: {update.bug_chain_ids}")
-
+        _update_bug_links([bug_req_id], update)
+        logger.info(
+            f"Updated {bug_code}: classifications={update.classifications} "
+            f"chains={update.bug_chain_ids}"
+        )
         return {"success": True, "code": bug_code}
 
     except HTTPException:
@@ -670,6 +990,13 @@ async def delete_chain(chain_id: str):
         if not existing:
             raise HTTPException(status_code=404, detail=f"Chain {chain_id} not found")
 
+        member_ids = [
+            r["bug_requirement_id"] for r in execute_query(
+                "SELECT bug_requirement_id FROM bug_chain_members WHERE chain_id = ?",
+                (chain_id,)
+            ) or []
+        ]
+
         # Delete members first (FK constraint)
         execute_query(
             "DELETE FROM bug_chain_members WHERE chain_id = ?",
@@ -682,6 +1009,8 @@ async def delete_chain(chain_id: str):
             (chain_id,)
         )
 
+        if member_ids:
+            change_hooks.notify_change(change_hooks.BUG_CHAIN_MEMBER, member_ids)
         logger.info(f"Deleted bug chain: {chain_id}")
         return {"success": True, "id": chain_id}
 
@@ -731,6 +1060,7 @@ async def add_chain_member(chain_id: str, member: BugChainMemberAdd):
             # Already exists, ignore
             pass
 
+        change_hooks.notify_change(change_hooks.BUG_CHAIN_MEMBER, [bug_req_id])
         logger.info(f"Added {member.code} to chain {chain_id}")
         return {"success": True, "chain_id": chain_id, "bug_code": member.code}
 
@@ -765,6 +1095,7 @@ async def remove_chain_member(chain_id: str, bug_code: str):
             (bug_req_id, chain_id)
         )
 
+        change_hooks.notify_change(change_hooks.BUG_CHAIN_MEMBER, [bug_req_id])
         logger.info(f"Removed {bug_code} from chain {chain_id}")
         return {"success": True, "chain_id": chain_id, "bug_code": bug_code}
 
@@ -790,37 +1121,111 @@ async def merge_chains(source_id: str, merge: BugChainMerge):
         if not target_exists:
             raise HTTPException(status_code=404, detail=f"Target chain {target_id} not found")
 
-        # Move all members from source to target (idempotent)
-        members = execute_query(
-            "SELECT bug_requirement_id FROM bug_chain_members WHERE chain_id = ?",
-            (source_id,)
-        ) or []
+        # Move all members from source to target (idempotent) and drop the
+        # source in one transaction; OUTPUT captures the moved members for hooks.
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT INTO bug_chain_members (bug_requirement_id, chain_id, created_by)
+                SELECT s.bug_requirement_id, ?, 'CC'
+                FROM bug_chain_members s
+                WHERE s.chain_id = ?
+                  AND NOT EXISTS (
+                      SELECT 1 FROM bug_chain_members t
+                      WHERE t.chain_id = ? AND t.bug_requirement_id = s.bug_requirement_id
+                  )
+                """,
+                (target_id, source_id, target_id),
+            )
+            cursor.execute(
+                "DELETE FROM bug_chain_members OUTPUT DELETED.bug_requirement_id WHERE chain_id = ?",
+                (source_id,),
+            )
+            member_ids = [row[0] for row in cursor.fetchall()]
+            cursor.execute("DELETE FROM bug_chains WHERE id = ?", (source_id,))
 
-        for m in members:
-            bug_req_id = m["bug_requirement_id"]
-            try:
-                execute_query(
-                    """
-                    INSERT INTO bug_chain_members (bug_requirement_id, chain_id, created_by)
-                    VALUES (?, ?, 'CC')
-                    """,
-                    (bug_req_id, target_id)
-                )
-            except Exception:
-                # Already exists in target, skip
-                pass
+        if member_ids:
+            change_hooks.notify_change(change_hooks.BUG_CHAIN_MEMBER, member_ids)
+        logger.info(f"Merged chain {source_id} into {target_id} ({len(member_ids)} members)")
+        return {"success": True, "source_id": source_id, "target_id": target_id, "moved": len(member_ids)}
+
+    except HTTPException:
+        raise
+    except Exception as exc:
+        logger.error(f"merge_chains failed: {exc}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(exc))
 
-        # Delete source chain (members already moved)
-        execute_query("DELETE FROM bug_chain_members WHERE chain_id = ?", (source_id,))
-        execute_query("DELETE FROM bug_chains WHERE id = ?", (source_id,))
 
-        logger.info(f"Merged chain {source_id} into {target_id}")
-        return {"success": True, "source_id": source_id, "target_id": target_id}
+# ---------------------------------------------------------------------------
+# C.4 — Inductive chain proposals (in-process matcher, MP53B view replacement)
+# ---------------------------------------------------------------------------
 
+@router.get("/api/chains/{chain_id}/proposals")
+async def get_chain_proposals(
+    chain_id: str,
+    min_score: float = Query(0.35, ge=0.0, le=1.0),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """Score non-member bugs against a chain's tokens, hash and existing members."""
+    try:
+        chain = chain_matcher.load_chain(chain_id)
+        if not chain:
+            raise HTTPException(status_code=404, detail=f"Chain {chain_id} not found")
+        proposals = chain_matcher.get_matcher().propose_members(
+            chain, chain["member_codes"], min_score=min_score, limit=limit
+        )
+        return {
+            "chain_id": chain_id,
+            "member_count": len(chain["member_codes"]),
+            "proposals": proposals,
+        }
     except HTTPException:
         raise
     except Exception as exc:
-        logger.error(f"merge_chains failed: {exc}", exc_info=True)
+        logger.error(f"get_chain_proposals failed for {chain_id}: {exc}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(exc))
+
+
+@router.post("/api/chains/{chain_id}/proposals/accept")
+async def accept_chain_proposals(chain_id: str, body: ChainProposalAccept):
+    """Add accepted proposals to the chain through the regular member API."""
+    added, errors = [], []
+    for code in body.codes:
+        try:
+            await add_chain_member(chain_id, BugChainMemberAdd(code=code))
+            added.append(code)
+        except HTTPException as exc:
+            errors.append({"code": code, "error": exc.detail})
+    return {"success": not errors, "chain_id": chain_id, "added": added, "errors": errors}
+
+
+@router.get("/api/classifier/bugs/{bug_code}/similar")
+async def get_similar_bugs(
+    bug_code: str,
+    threshold: float = Query(0.5, ge=0.0, le=1.0),
+    limit: int = Query(20, ge=1, le=200),
+):
+    """Near-duplicate bugs by MinHash similarity of title + description."""
+    try:
+        matcher = chain_matcher.get_matcher()
+    except Exception as exc:
+        logger.error(f"get_similar_bugs failed: {exc}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(exc))
+    if bug_code not in matcher.by_code:
+        raise HTTPException(status_code=404, detail=f"Bug {bug_code} not found")
+    return {"code": bug_code, "similar": matcher.near_duplicates(bug_code, threshold=threshold, limit=limit)}
+
+
+@router.post("/api/classifier/matcher/rebuild")
+async def rebuild_matcher():
+    """Drop and rebuild the in-process chain matcher index."""
+    try:
+        chain_matcher.reset()
+        matcher = chain_matcher.get_matcher()
+        return {"success": True, "bugs": len(matcher), "tokens": len(matcher.postings)}
+    except Exception as exc:
+        logger.error(f"rebuild_matcher failed: {exc}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(exc))
 
 
@@ -20,10 +20,10 @@ from pydantic import BaseModel, Field
 
 from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import HTMLResponse
-import httpx
 
-from app.core.config import settings
-from app.core.database import execute_query
+from app.core import change_hooks, http_clients
+from app.core.database import execute_query, get_db
+from app.services import rag_outbox
 
 logger = logging.getLogger(__name__)
 
@@ -128,39 +128,50 @@ def _row_to_dict(row: dict) -> dict:
     }
 
 
-async def _rag_ingest_lesson(lesson_dict: dict):
-    """Best-effort ingest a lesson into Portfolio RAG lessons collection."""
-    rag_url = settings.PORTFOLIO_RAG_URL
-    if not rag_url:
-        return False
-    try:
-        payload = {
-            "collection": "lessons",
-            "documents": [lesson_dict["lesson"]],
-            "ids": [lesson_dict["id"]],
-            "metadatas": [{
-                "project": lesson_dict["project"],
-                "category": lesson_dict["category"],
-                "target": lesson_dict["target"],
-                "source_sprint": lesson_dict.get("source_sprint") or "",
-                "status": lesson_dict["status"],
-                "proposed_by": lesson_dict.get("proposed_by", "cc"),
-            }]
-        }
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.post(f"{rag_url}/ingest/custom", json=payload)
-            if resp.status_code in (200, 201):
-                execute_query("""
-                    UPDATE lessons_learned
-                    SET rag_ingested = 1, rag_ingested_at = GETDATE()
-                    WHERE id = ?
-                """, (lesson_dict["id"],), fetch="none")
-                return True
-            else:
-                logger.warning(f"RAG ingest failed for {lesson_dict['id']}: {resp.status_code}")
-    except Exception as e:
-        logger.warning(f"RAG ingest error for {lesson_dict['id']}: {e}")
-    return False
+def _lesson_chunk(row: dict) -> dict:
+    """Portfolio RAG `lessons` chunk for one lesson row."""
+    return {
+        "id": row["id"],
+        "content": row["lesson"],
+        "metadata": {
+            "project": row["project"],
+            "category": row["category"],
+            "target": row["target"],
+            "source_sprint": row.get("source_sprint") or "",
+            "status": row["status"],
+            "proposed_by": row.get("proposed_by") or "cc",
+        },
+    }
+
+
+def _load_lesson_chunks(ids: List[str]) -> dict:
+    rows = execute_query(
+        f"SELECT * FROM lessons_learned WHERE id IN ({', '.join('?' * len(ids))}) "
+        f"AND (deleted IS NULL OR deleted = 0)",
+        tuple(ids), fetch="all",
+    ) or []
+    return {r["id"]: _lesson_chunk(r) for r in rows}
+
+
+def _mark_lessons_ingested(sent: dict, deleted: List[str]) -> None:
+    if not sent:
+        return
+    ids = list(sent)
+    execute_query(
+        f"UPDATE lessons_learned SET rag_ingested = 1, rag_ingested_at = GETDATE() "
+        f"WHERE id IN ({', '.join('?' * len(ids))})",
+        tuple(ids), fetch="none",
+    )
+
+
+# Lesson writes queue a rag_outbox row in their own transaction; the
+# dispatcher sends the current row (or a delete) to the `lessons` collection.
+rag_outbox.register_source("lesson", rag_outbox.Source(
+    collection="lessons",
+    load=_load_lesson_chunks,
+    chunk_id=lambda lesson_id: lesson_id,
+    on_sent=_mark_lessons_ingested,
+))
 
 
 # ── POST /api/lessons ─────────────────────────────────────────────────
@@ -179,25 +190,28 @@ async def create_lesson(body: LessonCreate):
     approved_at = "GETDATE()" if status_val in ("approved", "applied") else "NULL"
     applied_at = "GETDATE()" if status_val == "applied" else "NULL"
 
-    execute_query(f"""
-        INSERT INTO lessons_learned
-            (id, project, category, lesson, source_sprint, target, target_file,
-             status, proposed_by, created_at, approved_at, applied_at, applied_in_sprint)
-        VALUES
-            (?, ?, ?, ?, ?, ?, ?,
-             ?, ?, GETDATE(), {approved_at}, {applied_at}, ?)
-    """, (
-        ll_id, body.project, category_val, body.lesson,
-        body.source_sprint, target_val, body.target_file,
-        status_val, proposed_by_val, body.applied_in_sprint
-    ), fetch="none")
-
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            INSERT INTO lessons_learned
+                (id, project, category, lesson, source_sprint, target, target_file,
+                 status, proposed_by, created_at, approved_at, applied_at, applied_in_sprint)
+            VALUES
+                (?, ?, ?, ?, ?, ?, ?,
+                 ?, ?, GETDATE(), {approved_at}, {applied_at}, ?)
+        """, (
+            ll_id, body.project, category_val, body.lesson,
+            body.source_sprint, target_val, body.target_file,
+            status_val, proposed_by_val, body.applied_in_sprint
+        ))
+        # RAG ingest is queued with the insert and sent by the outbox dispatcher
+        rag_outbox.enqueue(cursor, "lessons", "lesson", [ll_id])
+    rag_outbox.kick()
+
+    change_hooks.notify_change(change_hooks.LESSON, [ll_id])
     row = execute_query("SELECT * FROM lessons_learned WHERE id = ?", (ll_id,), fetch="one")
     lesson_dict = _row_to_dict(row)
 
-    # Best-effort RAG ingest
-    await _rag_ingest_lesson(lesson_dict)
-
     # Checkpoint
     ck = hashlib.sha256(f"{ll_id}:{status_val}".encode()).hexdigest()[:4].upper()
     lesson_dict["checkpoint"] = ck
@@ -350,6 +364,7 @@ async def approve_lesson_shortcut(lesson_id: str):
     execute_query("""
         UPDATE lessons_learned SET status = 'approved', approved_at = GETDATE() WHERE id = ?
     """, (lesson_id,), fetch="none")
+    change_hooks.notify_change(change_hooks.LESSON, [lesson_id])
     return HTMLResponse(_lesson_action_html(lesson_id, "approved", row["lesson"]))
 
 
@@ -363,6 +378,7 @@ async def reject_lesson_shortcut(lesson_id: str):
     execute_query("""
         UPDATE lessons_learned SET status = 'rejected' WHERE id = ?
     """, (lesson_id,), fetch="none")
+    change_hooks.notify_change(change_hooks.LESSON, [lesson_id])
     return HTMLResponse(_lesson_action_html(lesson_id, "rejected", row["lesson"]))
 
 
@@ -443,18 +459,17 @@ async def update_lesson(lesson_id: str, body: LessonUpdate):
         raise HTTPException(400, "No fields to update")
 
     params.append(lesson_id)
-    execute_query(f"""
-        UPDATE lessons_learned SET {', '.join(updates)} WHERE id = ?
-    """, tuple(params), fetch="none")
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            UPDATE lessons_learned SET {', '.join(updates)} WHERE id = ?
+        """, tuple(params))
+        rag_outbox.enqueue(cursor, "lessons", "lesson", [lesson_id])
+    rag_outbox.kick()
+    change_hooks.notify_change(change_hooks.LESSON, [lesson_id])
 
     updated = execute_query("SELECT * FROM lessons_learned WHERE id = ?", (lesson_id,), fetch="one")
-    lesson_dict = _row_to_dict(updated)
-
-    # Re-ingest to RAG if already ingested and status changed
-    if row.get("rag_ingested") and body.status:
-        await _rag_ingest_lesson(lesson_dict)
-
-    return lesson_dict
+    return _row_to_dict(updated)
 
 
 # ── DELETE /api/lessons/{id} — soft delete ────────────────────────────
@@ -469,10 +484,13 @@ async def delete_lesson(lesson_id: str):
     if not row:
         raise HTTPException(404, f"Lesson {lesson_id} not found")
 
-    execute_query(
-        "UPDATE lessons_learned SET deleted = 1 WHERE id = ?",
-        (lesson_id,), fetch="none"
-    )
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE lessons_learned SET deleted = 1 WHERE id = ?", (lesson_id,))
+        # Dispatcher finds the row gone and sends a delete for it
+        rag_outbox.enqueue(cursor, "lessons", "lesson", [lesson_id])
+    rag_outbox.kick()
+    change_hooks.notify_change(change_hooks.LESSON, [lesson_id])
     return {"deleted": lesson_id}
 
 
@@ -531,47 +549,47 @@ async def apply_lesson(body: dict):
     }
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            url = f"{GITHUB_API}/repos/{GITHUB_OWNER}/{target_repo}/contents/{target_file}"
-            resp = await client.get(url, headers=headers)
-            if resp.status_code == 404:
-                raise HTTPException(status_code=404, detail=f"File not found: {target_repo}/{target_file}")
-            resp.raise_for_status()
-
-            file_data = resp.json()
-            file_sha = file_data['sha']
-            content = base64.b64decode(file_data['content']).decode('utf-8')
-
-            if target_section not in content:
-                headers_found = [line.strip() for line in content.split('\n') if line.strip().startswith('##')]
-                raise HTTPException(400, f"Section '{target_section}' not found. Available: {headers_found}")
-
-            check_text = lesson_text.strip()[:60]
-            if check_text in content:
-                return {"already_applied": True, "target_repo": target_repo, "target_file": target_file, "note": "Lesson text already exists."}
-
-            section_idx = content.index(target_section)
-            newline_idx = content.index('\n', section_idx)
-            new_content = content[:newline_idx + 1] + lesson_text + '\n' + content[newline_idx + 1:]
-
-            short_desc = lesson_text.split('\n')[0][:60].strip('- ')
-            commit_msg = f"docs: LL from {source_sprint} - {short_desc}"
-
-            new_content_b64 = base64.b64encode(new_content.encode('utf-8')).decode('utf-8')
-            put_resp = await client.put(url, headers=headers, json={
-                "message": commit_msg,
-                "content": new_content_b64,
-                "sha": file_sha,
-            })
-            if put_resp.status_code not in (200, 201):
-                raise HTTPException(502, f"GitHub commit failed: {put_resp.status_code}")
-
-            commit_sha = put_resp.json().get('commit', {}).get('sha', 'unknown')
-
-            return {
-                "applied": True, "commit_sha": commit_sha[:7],
-                "target_repo": target_repo, "target_file": target_file,
-            }
+        client = http_clients.get_client()
+        url = f"{GITHUB_API}/repos/{GITHUB_OWNER}/{target_repo}/contents/{target_file}"
+        resp = await client.get(url, headers=headers)
+        if resp.status_code == 404:
+            raise HTTPException(status_code=404, detail=f"File not found: {target_repo}/{target_file}")
+        resp.raise_for_status()
+
+        file_data = resp.json()
+        file_sha = file_data['sha']
+        content = base64.b64decode(file_data['content']).decode('utf-8')
+
+        if target_section not in content:
+            headers_found = [line.strip() for line in content.split('\n') if line.strip().startswith('##')]
+            raise HTTPException(400, f"Section '{target_section}' not found. Available: {headers_found}")
+
+        check_text = lesson_text.strip()[:60]
+        if check_text in content:
+            return {"already_applied": True, "target_repo": target_repo, "target_file": target_file, "note": "Lesson text already exists."}
+
+        section_idx = content.index(target_section)
+        newline_idx = content.index('\n', section_idx)
+        new_content = content[:newline_idx + 1] + lesson_text + '\n' + content[newline_idx + 1:]
+
+        short_desc = lesson_text.split('\n')[0][:60].strip('- ')
+        commit_msg = f"docs: LL from {source_sprint} - {short_desc}"
+
+        new_content_b64 = base64.b64encode(new_content.encode('utf-8')).decode('utf-8')
+        put_resp = await client.put(url, headers=headers, json={
+            "message": commit_msg,
+            "content": new_content_b64,
+            "sha": file_sha,
+        })
+        if put_resp.status_code not in (200, 201):
+            raise HTTPException(502, f"GitHub commit failed: {put_resp.status_code}")
+
+        commit_sha = put_resp.json().get('commit', {}).get('sha', 'unknown')
+
+        return {
+            "applied": True, "commit_sha": commit_sha[:7],
+            "target_repo": target_repo, "target_file": target_file,
+        }
     except HTTPException:
         raise
     except Exception as e:
@@ -14,8 +14,9 @@ from typing import Optional, List
 from fastapi import APIRouter, Depends, HTTPException, Header, Query, Response, Request
 from fastapi.security import APIKeyHeader
 
+from app.core import change_hooks, compression
 from app.core.config import settings
-from app.core.database import execute_query
+from app.core.database import execute_query, get_db
 from app.schemas.mcp import (
     HandoffCreate, HandoffUpdate, HandoffResponse, HandoffListResponse,
     TaskCreate, TaskUpdate, TaskResponse, TaskListResponse,
@@ -25,6 +26,7 @@ from app.schemas.mcp import (
     UATDirectSubmit, UATDirectSubmitResponse,
     UATListItem, UATListResponse
 )
+from app.services import verification_service
 
 logger = logging.getLogger(__name__)
 
@@ -238,37 +240,11 @@ def _link_requirement_codes_to_handoff(handoff_id: str, requirement_codes: List[
 
 def _autolink_handoff_to_requirements(handoff_id: str, handoff_content: str) -> int:
     """Parse requirement codes from handoff content and insert junction links.
-    Used for non-UAT handoffs only. UAT submissions use _link_requirement_codes_to_handoff."""
+    Used for non-UAT handoffs only. UAT submissions link explicit codes in submit_uat_direct."""
     requirement_codes = _extract_requirement_ids(handoff_content)
     return _link_requirement_codes_to_handoff(handoff_id, requirement_codes, source='content_parse')
 
 
-def _auto_close_requirements_for_handoff(handoff_id: str, approved: bool) -> int:
-    """Set linked requirement statuses when UAT is approved/failed.
-    Only updates requirements linked via explicit linked_requirements array (source='uat_explicit')."""
-    if approved:
-        new_status = 'closed'
-    else:
-        new_status = 'executing'
-
-    # Only auto-close requirements linked via explicit array, not content parsing
-    rows = execute_query("""
-        SELECT rr.id, rr.code, rr.status as old_status
-        FROM roadmap_requirements rr
-        JOIN roadmap_requirement_handoffs rrh ON rr.id = rrh.requirement_id
-        WHERE rrh.handoff_id = ? AND rrh.source = 'uat_explicit'
-    """, (handoff_id,), fetch="all") or []
-
-    for row in rows:
-        execute_query("""
-            UPDATE roadmap_requirements SET status = ?, updated_at = GETDATE()
-            WHERE id = ?
-        """, (new_status, row['id']), fetch="none")
-        logger.info(f"Auto-close: {row['code']} {row['old_status']} -> {new_status} (handoff {handoff_id})")
-
-    return len(rows)
-
-
 # ============================================
 # HANDOFF ENDPOINTS
 # ============================================
@@ -430,20 +406,24 @@ async def create_handoff(
                         linked_requirements=[w.get('code','') for w in work_items if w.get('code')],
                         feature_title=feature_title
                     )
-                    execute_query("UPDATE uat_pages SET html_content = ? WHERE id = ?",
-                                  (html, uat_id), fetch="none")
+                    execute_query(
+                        "UPDATE uat_pages SET html_content = ?, html_content_z = ?, html_norm_version = NULL WHERE id = ?",
+                        (*compression.split(html), uat_id), fetch="none")
                     auto_uat_url = f"https://metapm.rentyourcio.com/uat/{uat_id}"
                     logger.info(f"Auto-generated UAT page {uat_id} (PTH={pth_value}) for handoff {handoff_id}")
         except Exception as autogen_err:
             logger.warning(f"UAT auto-gen failed (non-blocking): {autogen_err}")
 
+        change_hooks.notify_change(change_hooks.HANDOFF, [handoff_id])
+        if auto_uat_url:
+            change_hooks.notify_change(change_hooks.UAT_PAGE, [auto_uat_url.rsplit("/", 1)[-1]])
+
         public_url = f"https://metapm.rentyourcio.com/mcp/handoffs/{handoff_id}/content"
 
-        # Fire-and-forget PA notification for handoff received
+        # PA notification for handoff received (background job queue)
         try:
             from app.api.prompts import notify_pa
-            import asyncio
-            asyncio.create_task(notify_pa("Handoff received", {
+            notify_pa("Handoff received", {
                 "pth": getattr(handoff, 'prompt_pth', '') or '',
                 "project": handoff.project,
                 "sprint": handoff.task,
@@ -451,18 +431,14 @@ async def create_handoff(
                 "handoff_url": public_url,
                 "uat_url": auto_uat_url,
                 "handoff_id": handoff_id,  # MP-EMAIL-COMPLETE: include UUID for plain-text email
-            }))
+            })
         except Exception as pa_err:
             logger.warning(f"PA handoff notification failed (non-fatal): {pa_err}")
 
         # AP06: Fire Loop 2 immediately for this specific handoff (targeted mode)
         try:
             from app.api.prompts import trigger_cloud_run_job_immediate
-            import asyncio
-            asyncio.create_task(
-                trigger_cloud_run_job_immediate("metapm-loop2-reviewer",
-                                                handoff_id=str(handoff_id))
-            )
+            trigger_cloud_run_job_immediate("metapm-loop2-reviewer", handoff_id=str(handoff_id))
         except Exception as loop2_err:
             logger.warning(f"Loop 2 trigger failed (non-fatal): {loop2_err}")
 
@@ -650,7 +626,7 @@ async def dashboard_handoffs(
         # Get paginated results
         params.extend([offset, limit])
         results = execute_query(f"""
-            SELECT id, project, task, title, direction, status, content, source,
+            SELECT id, project, task, title, direction, status, LEFT(content, 201) AS content, source,
                    gcs_path, gcs_url, gcs_synced, from_entity, to_entity,
                    version, git_commit, git_verified, compliance_score,
                    uat_status, uat_passed, uat_failed, uat_date,
@@ -663,7 +639,7 @@ async def dashboard_handoffs(
 
         handoffs = []
         for row in (results or []):
-            # Get first ~200 chars as preview
+            # Get first ~200 chars as preview (201 fetched so the ellipsis still shows)
             content = row['content'] or ''
             preview = content[:200] + '...' if len(content) > 200 else content
 
@@ -904,6 +880,7 @@ async def submit_uat_results(
                 updated_at = GETUTCDATE()
             WHERE id = ?
         """, (new_status, uat.status.value, uat.passed, uat.failed, handoff_id), fetch="none")
+        change_hooks.notify_change(change_hooks.HANDOFF, [handoff_id])
 
         return UATResult(
             id=str(result['id']),
@@ -1044,13 +1021,6 @@ async def submit_uat_direct(uat: UATDirectSubmit):
 
         title_db = (uat.uat_title or f"UAT: {project_name} v{version_db}")[:200]
 
-        # Look for existing handoff for this project/version
-        handoff = execute_query("""
-            SELECT id, status FROM mcp_handoffs
-            WHERE project = ? AND task LIKE ?
-            ORDER BY created_at DESC
-        """, (project_name, f"%{version_db}%"), fetch="one")
-
         # Build content from actual UAT data
         content = f"# UAT Results for {project_name} {version_full}\n\n"
         if feature_value:
@@ -1067,132 +1037,35 @@ async def submit_uat_direct(uat: UATDirectSubmit):
         content += "---\n\n"
         content += results_text
 
+        # Look for existing handoff for this project/version, and its UAT page
+        handoff = execute_query("""
+            SELECT TOP 1 h.id, pg.id AS page_id
+            FROM mcp_handoffs h
+            OUTER APPLY (SELECT TOP 1 id FROM uat_pages WHERE handoff_id = h.id) pg
+            WHERE h.project = ? AND h.task LIKE ?
+            ORDER BY h.created_at DESC
+        """, (project_name, f"%{version_db}%"), fetch="one")
+
+        # Ids are allocated here so the page renders once with all of them
+        # embedded, and every row below is written in a single batch.
         if handoff:
             handoff_id = str(handoff['id'])
             logger.info(f"Found existing handoff {handoff_id} for {project_name} {version_db}")
-            # Update existing handoff content with new UAT results
-            execute_query("""
-                UPDATE mcp_handoffs
-                SET content = ?, updated_at = GETUTCDATE()
-                WHERE id = ?
-            """, (content, handoff_id), fetch="none")
-            # MP-MS1-FIX WF-03: Link ONLY from explicit linked_requirements, never from content text
-            _link_requirement_codes_to_handoff(handoff_id, linked_requirement_codes, source='uat_explicit')
         else:
-            # Create a new handoff for this UAT submission (using pre-built content)
-            result = execute_query("""
-                INSERT INTO mcp_handoffs (
-                    project, task, direction, status, content,
-                    source, version, title
-                )
-                OUTPUT INSERTED.id
-                VALUES (?, ?, 'ai_to_cc', 'pending_uat', ?, 'uat_checklist', ?, ?)
-            """, (
-                project_name,
-                task_id,
-                content,
-                version_db,
-                title_db
-            ), fetch="one")
-
-            if not result:
-                raise HTTPException(status_code=500, detail="Failed to create handoff")
-
-            handoff_id = str(result['id'])
-            logger.info(f"Created new handoff {handoff_id} for {project_name} {version_db}")
-            # MP-MS1-FIX WF-03: Link ONLY from explicit linked_requirements, never from content text
-            _link_requirement_codes_to_handoff(handoff_id, linked_requirement_codes, source='uat_explicit')
-
-        # PTH propagation (MP-PTH-FIELD-001): copy PTH from linked requirement to handoff
-        if linked_requirement_codes:
-            for _rc in linked_requirement_codes:
-                _pth_row = execute_query(
-                    "SELECT pth FROM roadmap_requirements WHERE code = ? AND pth IS NOT NULL",
-                    (_rc,), fetch="one"
-                )
-                if _pth_row and _pth_row.get('pth'):
-                    execute_query(
-                        "UPDATE mcp_handoffs SET pth = ? WHERE id = ?",
-                        (_pth_row['pth'], handoff_id), fetch="none"
-                    )
-                    break
-
-        # Insert UAT result
-        uat_result = execute_query("""
-            INSERT INTO uat_results (
-                handoff_id, status, total_tests, passed, failed,
-                notes_count, results_text, checklist_path
-            )
-            OUTPUT INSERTED.id, INSERTED.tested_at
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            handoff_id,
-            uat.status.value,
-            uat.total_tests,
-            uat.passed,
-            uat.failed,
-            uat.notes_count or 0,
-            results_text,
-            uat.checklist_path
-        ), fetch="one")
-
-        if not uat_result:
-            raise HTTPException(status_code=500, detail="Failed to create UAT result")
-
-        uat_id = str(uat_result['id'])
-
-        # Update handoff status and UAT fields
+            handoff_id = str(uuid.uuid4())
+        uat_id = str(uuid.uuid4())
+        existing_page_id = str(handoff['page_id']) if handoff and handoff.get('page_id') else None
         new_status = "done" if uat.status == UATStatus.PASSED else "needs_fixes"
-        execute_query("""
-            UPDATE mcp_handoffs
-            SET status = ?,
-                uat_status = ?,
-                uat_passed = ?,
-                uat_failed = ?,
-                uat_date = GETUTCDATE(),
-                updated_at = GETUTCDATE()
-            WHERE id = ?
-        """, (new_status, uat.status.value, uat.passed, uat.failed, handoff_id), fetch="none")
-
-        linked_count = _auto_close_requirements_for_handoff(
-            handoff_id=handoff_id,
-            approved=(uat.status == UATStatus.PASSED)
-        )
-        if linked_count:
-            logger.info(
-                f"Updated {linked_count} linked requirement(s) to status {new_status} from UAT for handoff {handoff_id}"
-            )
-
-        handoff_url = f"https://metapm.rentyourcio.com/mcp/handoffs/{handoff_id}/content"
-
-        # MP-VERIFY-001: Store evidence_json and trigger auto-verification
-        if uat.requirements:
-            evidence_json = json.dumps(uat.requirements)
-            execute_query("""
-                UPDATE mcp_handoffs SET evidence_json = ? WHERE id = ?
-            """, (evidence_json, handoff_id), fetch="none")
-            logger.info(f"Stored evidence for {len(uat.requirements)} requirements on handoff {handoff_id}")
-            # Auto-verify in background
-            import asyncio
-            try:
-                from app.services.verification_service import verify_handoff as _verify
-                asyncio.create_task(_verify(handoff_id))
-            except Exception as ve:
-                logger.warning(f"Auto-verification trigger failed (non-blocking): {ve}")
-
-        # MP-UAT-GEN-001: PTH propagation from submit payload
-        if uat.pth:
-            execute_query(
-                "UPDATE mcp_handoffs SET pth = ? WHERE id = ?",
-                (uat.pth, handoff_id), fetch="none"
-            )
+        evidence_json = json.dumps(uat.requirements) if uat.requirements else None
 
         # MP-UAT-GEN-001: Server-side UAT page generation from structured test_cases
         uat_page_id = None
+        html = None
         if uat.test_cases:
             try:
                 from app.services.uat_generator_v2 import render_structured_uat_html
                 tc_dicts = [tc.model_dump() for tc in uat.test_cases]
+                page_id = existing_page_id or str(uuid.uuid4())
                 html = render_structured_uat_html(
                     project=project_name,
                     version=version_full,
@@ -1201,51 +1074,145 @@ async def submit_uat_direct(uat: UATDirectSubmit):
                     cc_summary=uat.cc_summary,
                     test_cases=tc_dicts,
                     handoff_id=handoff_id,
-                    uat_result_id=uat_id
+                    uat_result_id=uat_id,
+                    uat_page_id=page_id
                 )
-                # Upsert into uat_pages
-                existing_page = execute_query(
-                    "SELECT id FROM uat_pages WHERE handoff_id = ?",
-                    (handoff_id,), fetch="one"
-                )
-                if existing_page:
-                    uat_page_id = str(existing_page["id"])
-                    execute_query("""
-                        UPDATE uat_pages
-                        SET test_cases_json = ?, html_content = ?, pth = ?,
-                            version = ?, status = 'ready'
-                        WHERE id = ?
-                    """, (json.dumps(tc_dicts), html, uat.pth, version_full[:20], uat_page_id), fetch="none")
-                else:
-                    page_result = execute_query("""
-                        INSERT INTO uat_pages (handoff_id, project, pth, version,
-                                               test_cases_json, html_content, status)
-                        OUTPUT INSERTED.id
-                        VALUES (?, ?, ?, ?, ?, ?, 'ready')
-                    """, (handoff_id, project_name, uat.pth, version_full[:20],
-                          json.dumps(tc_dicts), html), fetch="one")
-                    if page_result:
-                        uat_page_id = str(page_result["id"])
-                        # Re-render with real uat_page_id in the HTML
-                        html = render_structured_uat_html(
-                            project=project_name,
-                            version=version_full,
-                            feature=feature_value,
-                            pth=uat.pth,
-                            cc_summary=uat.cc_summary,
-                            test_cases=tc_dicts,
-                            handoff_id=handoff_id,
-                            uat_result_id=uat_id,
-                            uat_page_id=uat_page_id
-                        )
-                        execute_query(
-                            "UPDATE uat_pages SET html_content = ? WHERE id = ?",
-                            (html, uat_page_id), fetch="none"
-                        )
-                logger.info(f"Generated UAT page {uat_page_id} from {len(uat.test_cases)} structured test cases")
+                uat_page_id = page_id
             except Exception as gen_err:
                 logger.warning(f"UAT page generation failed (non-blocking): {gen_err}")
 
+        sql = ["""
+            SET NOCOUNT ON;
+            SET XACT_ABORT ON;
+            DECLARE @hid UNIQUEIDENTIFIER = ?;
+            DECLARE @closed TABLE (id NVARCHAR(36), code NVARCHAR(20), old_status NVARCHAR(50));
+        """]
+        params: list = [handoff_id]
+
+        if handoff:
+            sql.append("""
+            UPDATE mcp_handoffs
+            SET content = ?, status = ?, uat_status = ?, uat_passed = ?, uat_failed = ?,
+                uat_date = GETUTCDATE(), evidence_json = COALESCE(?, evidence_json),
+                updated_at = GETUTCDATE()
+            WHERE id = @hid;
+            """)
+            params += [content, new_status, uat.status.value, uat.passed, uat.failed, evidence_json]
+        else:
+            sql.append("""
+            INSERT INTO mcp_handoffs (
+                id, project, task, direction, status, content, source, version, title,
+                uat_status, uat_passed, uat_failed, uat_date, evidence_json
+            )
+            VALUES (@hid, ?, ?, 'ai_to_cc', ?, ?, 'uat_checklist', ?, ?, ?, ?, ?, GETUTCDATE(), ?);
+            """)
+            params += [project_name, task_id, new_status, content, version_db, title_db,
+                       uat.status.value, uat.passed, uat.failed, evidence_json]
+
+        if linked_requirement_codes:
+            placeholders = ','.join(['?'] * len(linked_requirement_codes))
+            # MP-MS1-FIX WF-03: Link ONLY from explicit linked_requirements, never from content text
+            sql.append(f"""
+            INSERT INTO roadmap_requirement_handoffs (requirement_id, handoff_id, source)
+            SELECT m.id, @hid, 'uat_explicit'
+            FROM (
+                SELECT MIN(id) AS id FROM roadmap_requirements
+                WHERE code IN ({placeholders}) GROUP BY code
+            ) m
+            WHERE NOT EXISTS (
+                SELECT 1 FROM roadmap_requirement_handoffs x
+                WHERE x.requirement_id = m.id AND x.handoff_id = @hid
+            );
+            """)
+            params += linked_requirement_codes
+
+        # PTH: the submitted one (MP-UAT-GEN-001), else the first linked
+        # requirement's (MP-PTH-FIELD-001), else whatever the handoff had.
+        if uat.pth or linked_requirement_codes:
+            req_pth = "NULL"
+            if linked_requirement_codes:
+                req_pth = f"""(
+                    SELECT TOP 1 pth FROM roadmap_requirements
+                    WHERE code IN ({placeholders}) AND pth IS NOT NULL ORDER BY code
+                )"""
+            sql.append(f"UPDATE mcp_handoffs SET pth = COALESCE(?, {req_pth}, pth) WHERE id = @hid;")
+            params += [uat.pth] + (linked_requirement_codes if linked_requirement_codes else [])
+
+        sql.append("""
+            INSERT INTO uat_results (
+                id, handoff_id, status, total_tests, passed, failed,
+                notes_count, results_text, checklist_path
+            )
+            VALUES (?, @hid, ?, ?, ?, ?, ?, ?, ?);
+        """)
+        params += [uat_id, uat.status.value, uat.total_tests, uat.passed, uat.failed,
+                   uat.notes_count or 0, results_text, uat.checklist_path]
+
+        if uat_page_id and existing_page_id:
+            sql.append("""
+            UPDATE uat_pages
+            SET test_cases_json = ?, html_content = ?, html_content_z = ?, html_norm_version = NULL,
+                pth = ?, version = ?, status = 'ready'
+            WHERE id = ?;
+            DELETE FROM uat_bv_items WHERE spec_id = ?;
+            """)
+            params += [json.dumps(tc_dicts), *compression.split(html), uat.pth, version_full[:20],
+                       uat_page_id, uat_page_id]
+        elif uat_page_id:
+            sql.append("""
+            INSERT INTO uat_pages (id, handoff_id, project, pth, version,
+                                   test_cases_json, html_content, html_content_z, status)
+            VALUES (?, @hid, ?, ?, ?, ?, ?, ?, 'ready');
+            """)
+            params += [uat_page_id, project_name, uat.pth, version_full[:20], json.dumps(tc_dicts),
+                       *compression.split(html)]
+
+        # Only requirements linked via the explicit array are auto-closed, not content parsing.
+        # OUTPUT needs INTO: roadmap_requirements has an AFTER UPDATE trigger.
+        sql.append("""
+            UPDATE rr SET status = ?, updated_at = GETDATE()
+            OUTPUT inserted.id, inserted.code, deleted.status INTO @closed
+            FROM roadmap_requirements rr
+            JOIN roadmap_requirement_handoffs rrh ON rr.id = rrh.requirement_id
+            WHERE rrh.handoff_id = @hid AND rrh.source = 'uat_explicit';
+            SELECT id, code, old_status FROM @closed;
+        """)
+        req_status = 'closed' if uat.status == UATStatus.PASSED else 'executing'
+        params.append(req_status)
+
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("\n".join(sql), tuple(params))
+            closed = cursor.fetchall()
+
+        if not handoff:
+            logger.info(f"Created new handoff {handoff_id} for {project_name} {version_db}")
+        for _, req_code, old_status in closed:
+            logger.info(f"Auto-close: {req_code} {old_status} -> {req_status} (handoff {handoff_id})")
+        if closed:
+            logger.info(
+                f"Updated {len(closed)} linked requirement(s) to status {new_status} from UAT for handoff {handoff_id}"
+            )
+        if evidence_json:
+            logger.info(f"Stored evidence for {len(uat.requirements)} requirements on handoff {handoff_id}")
+        if uat_page_id:
+            logger.info(f"Generated UAT page {uat_page_id} from {len(uat.test_cases)} structured test cases")
+
+        handoff_url = f"https://metapm.rentyourcio.com/mcp/handoffs/{handoff_id}/content"
+
+        # MP-VERIFY-001: Auto-verify stored evidence on the background verification queue
+        if evidence_json:
+            try:
+                verification_service.queue_verification(handoff_id)
+            except Exception as ve:
+                logger.warning(f"Auto-verification trigger failed (non-blocking): {ve}")
+
+        change_hooks.notify_change(change_hooks.HANDOFF, [handoff_id])
+        if uat_page_id:
+            change_hooks.notify_change(change_hooks.UAT_PAGE, [uat_page_id])
+        if closed:
+            change_hooks.notify_change(change_hooks.REQUIREMENT, [str(row[0]) for row in closed])
+
         # Checkpoint verification (MP-MS3 Phase 6)
         checkpoint_verified = None
         if uat.uat_checkpoint and uat.uat_verification_hash:
@@ -1675,6 +1642,7 @@ async def update_handoff(
                 SET status = ?, updated_at = GETUTCDATE()
                 WHERE id = ?
             """, (update.status.value, handoff_id), fetch="none")
+            change_hooks.notify_change(change_hooks.HANDOFF, [handoff_id])
 
         # Return mcp_handoffs record
         result = execute_query("""
@@ -15,12 +15,14 @@ from typing import Any
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import JSONResponse
 
+from app.core import change_hooks, compression
 from app.core.config import Settings
-from app.core.database import execute_query
+from app.core.database import execute_query, get_db
 from app.core.state_machine import (
     validate_prompt_transition, write_prompt_history, write_prompt_failure,
     write_requirement_failure, write_failure_event, InvalidTransitionError,
 )
+from app.services import bv_items, uat_spec_batch
 
 logger = logging.getLogger(__name__)
 
@@ -213,6 +215,44 @@ TOOLS = [
             "required": ["pth", "sprint_id", "project_code", "version", "test_cases"],
         },
     },
+    {
+        "name": "post_uat_specs",
+        "description": "Post many UAT specs in one call (e.g. at the end of a multi-sprint run). Same upsert-by-PTH rules as post_uat_spec; all-or-nothing — if any spec is invalid or already has a PL submission, nothing is written and every problem is listed. Returns spec_id and uat_url per spec, in input order.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "specs": {
+                    "type": "array",
+                    "description": "Array of UAT specs, each shaped like post_uat_spec's arguments",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "pth": {"type": "string", "description": "Prompt tracking hash (e.g. 'HM24')"},
+                            "sprint_id": {"type": "string", "description": "Sprint identifier"},
+                            "project_code": {"type": "string", "description": "Project short code e.g. 'HL', 'AF', 'SF', 'MP'"},
+                            "version": {"type": "string", "description": "Version string e.g. '2.28.0 to 2.29.0'"},
+                            "test_cases": {
+                                "type": "array",
+                                "description": "Array of BV objects",
+                                "items": {
+                                    "type": "object",
+                                    "properties": {
+                                        "id": {"type": "string"},
+                                        "title": {"type": "string"},
+                                        "type": {"type": "string", "default": "pl_visual"},
+                                        "expected": {"type": "string"},
+                                    },
+                                    "required": ["id", "title", "expected"],
+                                },
+                            },
+                        },
+                        "required": ["pth", "sprint_id", "project_code", "version", "test_cases"],
+                    },
+                },
+            },
+            "required": ["specs"],
+        },
+    },
     {
         "name": "post_requirement",
         "description": "Create a new requirement in MetaPM. CAI calls this to seed backlog items directly from conversation without PL having to use the UI. Auto-generates the next sequential code for the project.",
@@ -421,15 +461,15 @@ def _tool_post_prompt(args: dict) -> dict:
     result = execute_query("""
         SET NOCOUNT ON;
         INSERT INTO cc_prompts
-            (sprint_id, project_id, pth, requirement_id, content, content_md,
+            (sprint_id, project_id, pth, requirement_id, content, content_md, content_md_z,
              estimated_hours, created_by, status, also_closes)
-        VALUES (?, ?, ?, ?, ?, ?, ?, 'CAI', 'draft', ?);
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'CAI', 'draft', ?);
         SELECT id, pth, sprint_id, status, created_at
         FROM cc_prompts WHERE id = SCOPE_IDENTITY();
     """, (
         sprint_id, project_id, pth, req_row["id"],
         content_md[:500] if content_md else '',
-        content_md, estimated_hours, also_closes_json,
+        *compression.split(content_md), estimated_hours, also_closes_json,
     ), fetch="one")
 
     if not result:
@@ -454,6 +494,7 @@ def _tool_post_prompt(args: dict) -> dict:
             logger.info(f"BUG-037: linked PTH {pth} to {requirement_code}, advanced to cc_prompt_ready")
         else:
             logger.info(f"BUG-037: linked PTH {pth} to {requirement_code} (already at {req_row['status']}, no advance needed)")
+        change_hooks.notify_change(change_hooks.REQUIREMENT, [req_row["id"]])
     except Exception as e:
         logger.warning(f"BUG-037: requirement auto-advance failed (non-fatal): {e}")
 
@@ -474,7 +515,7 @@ def _tool_get_prompt(args: dict) -> dict:
     pth = args["pth"]
     row = execute_query("""
         SELECT TOP 1 id, sprint_id, project_id, pth, status,
-               LEN(content_md) as content_length,
+               LEN(content_md) + COALESCE(DATALENGTH(DECOMPRESS(content_md_z)) / 2, 0) as content_length,
                created_by, approved_by, approved_at, created_at
         FROM cc_prompts WHERE pth = ?
         ORDER BY id DESC
@@ -571,25 +612,24 @@ def _tool_get_uat_results(args: dict) -> dict:
 
 
 def _tool_trigger_rag_sync(args: dict) -> dict:
-    import httpx
     import os
+    from app.core import http_clients
     mcp_key = os.getenv("MCP_API_KEY", "")
     if not mcp_key:
         return {"status": "error", "message": "MCP_API_KEY not set on server"}
     try:
-        with httpx.Client(timeout=30.0) as client:
-            resp = client.post(
-                "https://metapm.rentyourcio.com/api/rag/sync",
-                headers={"X-API-Key": mcp_key}
-            )
-            resp.raise_for_status()
-            result = resp.json()
-            return {
-                "tool": "trigger_rag_sync",
-                "status": "success",
-                "synced_count": result.get("synced", result.get("count", "unknown")),
-                "message": "Portfolio RAG metapm collection updated",
-            }
+        resp = http_clients.get_sync_client().post(
+            "https://metapm.rentyourcio.com/api/rag/sync",
+            headers={"X-API-Key": mcp_key}
+        )
+        resp.raise_for_status()
+        result = resp.json()
+        return {
+            "tool": "trigger_rag_sync",
+            "status": "success",
+            "synced_count": result.get("synced", result.get("count", "unknown")),
+            "message": "Portfolio RAG metapm collection updated",
+        }
     except Exception as e:
         return {"tool": "trigger_rag_sync", "status": "error", "message": str(e)}
 
@@ -855,6 +895,7 @@ def _tool_patch_requirement_status(args: dict) -> dict:
         "UPDATE roadmap_requirements SET status = ?, updated_at = GETDATE() WHERE id = ?",
         (status, req_id), fetch="none"
     )
+    change_hooks.notify_change(change_hooks.REQUIREMENT, [req_id])
 
     checkpoint = hashlib.sha256(f"{req_id}:{status}".encode()).hexdigest()[:4].upper()
     return {"code": code, "previous_status": current, "status": status, "checkpoint": checkpoint, "note": note}
@@ -906,6 +947,7 @@ def _tool_update_compliance_doc(args: dict) -> dict:
             VALUES (?, ?, ?, ?, ?, ?, ?)
         """, (doc_id, doc_type, project_code, content_md, version, checkpoint, updated_by), fetch="none")
         status = "created"
+    change_hooks.notify_change(change_hooks.COMPLIANCE_DOC, [doc_id])
 
     return {
         "id": doc_id,
@@ -997,60 +1039,38 @@ def _tool_post_uat_spec(args: dict) -> dict:
                 "pl_submitted_at": str(existing["pl_submitted_at"]),
                 "existing_uat_url": f"https://metapm.rentyourcio.com/uat/{spec_id}",
             }
-        execute_query("""
-            UPDATE uat_pages SET
-                project = ?, sprint_code = ?, version = ?,
-                test_cases_json = ?, html_content = 'spec_created',
-                status = 'ready', spec_data = ?
-            WHERE id = ?
-        """, (project_code, sprint_id, version, tc_json, spec_data, spec_id), fetch="none")
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE uat_pages SET
+                    project = ?, sprint_code = ?, version = ?,
+                    test_cases_json = ?, html_content = 'spec_created', html_content_z = NULL,
+                    status = 'ready', spec_data = ?, general_notes_attachments = NULL
+                WHERE id = ?
+            """, (project_code, sprint_id, version, tc_json, spec_data, spec_id))
+            # MP24 BUG-043 / BA17: replace BV items with one pending row per test case
+            bv_items.seed(cursor, spec_id, test_cases_raw)
     else:
         spec_id = str(_uuid.uuid4()).upper()
-        execute_query("""
-            INSERT INTO uat_pages
-                (id, handoff_id, project, sprint_code, pth, version,
-                 test_cases_json, html_content, status,
-                 spec_source, spec_locked_at, spec_data)
-            VALUES (?, ?, ?, ?, ?, ?,
-                    ?, 'spec_created', 'ready',
-                    'cc_spec', ?, ?)
-        """, (
-            spec_id, spec_id, project_code, sprint_id, pth, version,
-            tc_json, datetime.utcnow(), spec_data,
-        ), fetch="none")
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO uat_pages
+                    (id, handoff_id, project, sprint_code, pth, version,
+                     test_cases_json, html_content, status,
+                     spec_source, spec_locked_at, spec_data)
+                VALUES (?, ?, ?, ?, ?, ?,
+                        ?, 'spec_created', 'ready',
+                        'cc_spec', ?, ?)
+            """, (
+                spec_id, spec_id, project_code, sprint_id, pth, version,
+                tc_json, datetime.utcnow(), spec_data,
+            ))
+            bv_items.seed(cursor, spec_id, test_cases_raw)
+    change_hooks.notify_change(change_hooks.UAT_PAGE, [spec_id])
 
     uat_url = f"https://metapm.rentyourcio.com/uat/{spec_id}"
 
-    # MP24 BUG-043: Delete all existing BV items before inserting new ones (dedup on re-spec)
-    if existing:
-        try:
-            execute_query("DELETE FROM uat_bv_items WHERE spec_id = ?", (spec_id,), fetch="none")
-            logger.info(f"post_uat_spec: deleted old BV items for spec {spec_id} (dedup)")
-        except Exception as del_err:
-            logger.warning(f"post_uat_spec: BV item cleanup failed: {del_err}")
-
-    # BA17 fix: persist individual BV items to uat_bv_items (so get_uat_results can read them)
-    for tc in test_cases_raw:
-        try:
-            bv_id = tc.get("id", "")
-            bv_title = tc.get("title", "")
-            execute_query("""
-                IF EXISTS (SELECT 1 FROM uat_bv_items WHERE spec_id=? AND bv_id=?)
-                    UPDATE uat_bv_items
-                    SET title=?, status='pending', notes='', updated_at=GETUTCDATE()
-                    WHERE spec_id=? AND bv_id=?
-                ELSE
-                    INSERT INTO uat_bv_items (spec_id, bv_id, title, status, notes)
-                    VALUES (?, ?, ?, 'pending', '')
-            """, (
-                spec_id, bv_id,            # EXISTS check
-                bv_title,                   # UPDATE SET
-                spec_id, bv_id,            # UPDATE WHERE
-                spec_id, bv_id, bv_title,  # INSERT
-            ), fetch="none")
-        except Exception as bv_err:
-            logger.warning(f"post_uat_spec BV item upsert failed for {bv_id}: {bv_err}")
-
     # Auto-advance linked requirement from cc_complete -> uat_ready
     try:
         req_row = execute_query(
@@ -1062,6 +1082,7 @@ def _tool_post_uat_spec(args: dict) -> dict:
                 "UPDATE roadmap_requirements SET status = 'uat_ready', uat_url = ?, updated_at = GETUTCDATE() WHERE id = ?",
                 (uat_url, req_row["id"]), fetch="none"
             )
+            change_hooks.notify_change(change_hooks.REQUIREMENT, [req_row["id"]])
             logger.info(f"post_uat_spec: auto-advanced {req_row['code']} to uat_ready for PTH {pth}")
         else:
             write_failure_event('orphan_pth', pth, 'post_uat_spec',
@@ -1078,6 +1099,34 @@ def _tool_post_uat_spec(args: dict) -> dict:
     }
 
 
+def _tool_post_uat_specs(args: dict) -> dict:
+    """Batch post_uat_spec: one validation pass, one transaction (app/services/uat_spec_batch.py)."""
+    specs = [
+        {
+            "project": spec.get("project_code"),
+            "sprint": spec.get("sprint_id"),
+            "pth": spec.get("pth"),
+            "version": spec.get("version"),
+            "test_cases": spec.get("test_cases") or [],
+        }
+        for spec in args.get("specs") or []
+    ]
+    try:
+        result = uat_spec_batch.ingest(specs, default_type="pl_visual")
+    except uat_spec_batch.BatchRejected as e:
+        for err in e.errors:
+            if err["error"] == uat_spec_batch.EMPTY_TEST_CASES:
+                write_failure_event('empty_test_cases', err.get("pth"), 'post_uat_specs',
+                                    'UAT spec rejected: test_cases array was empty. Zero-BV spec produces zero-evidence pass.')
+        return {"error": str(e), "errors": e.errors}
+
+    for spec in result["specs"]:
+        if spec["advanced_requirement"] is None and "auto_advance_error" not in result:
+            write_failure_event('orphan_pth', spec["pth"], 'post_uat_specs',
+                                f"No requirement found at cc_complete for PTH '{spec['pth']}' during post_uat_specs.")
+    return result
+
+
 def _tool_post_requirement(args: dict) -> dict:
     """MF003: Create a requirement via project_code. Auto-generates next sequential code."""
     import uuid as _uuid
@@ -1147,6 +1196,7 @@ def _tool_post_requirement(args: dict) -> dict:
         req_id, project_id, code, title, description,
         req_type.lower(), priority, status, sprint_id,
     ), fetch="none")
+    change_hooks.notify_change(change_hooks.REQUIREMENT, [req_id])
 
     url = f"https://metapm.rentyourcio.com/requirements/{req_id}"
     return {
@@ -1193,6 +1243,7 @@ def _tool_create_handoff_shell(args: dict) -> dict:
                 "UPDATE roadmap_requirements SET status = 'cc_complete', updated_at = GETUTCDATE() WHERE id = ?",
                 (req_row["id"],), fetch="none"
             )
+            change_hooks.notify_change(change_hooks.REQUIREMENT, [req_row["id"]])
             requirement_advanced = {"code": req_row["code"], "new_status": "cc_complete"}
             logger.info(f"create_handoff_shell: auto-advanced {req_row['code']} to cc_complete for PTH {pth}")
         else:
@@ -1224,16 +1275,10 @@ def _tool_get_uat_results_by_pth(args: dict) -> dict:
     if not page:
         return {"error": f"No UAT results found for PTH '{pth}'"}
 
-    test_cases = []
-    if page.get("test_cases_json"):
-        try:
-            raw = json.loads(page["test_cases_json"])
-            test_cases = [
-                {"id": tc.get("id", ""), "title": tc.get("title", ""), "status": tc.get("status", "pending"), "notes": tc.get("notes", "")}
-                for tc in raw if not tc.get("id", "").startswith("_")
-            ]
-        except (json.JSONDecodeError, TypeError):
-            pass
+    test_cases = [
+        {"id": tc.get("id", ""), "title": tc.get("title", ""), "status": tc.get("status", "pending"), "notes": tc.get("notes", "")}
+        for tc in bv_items.cases(str(page["id"]), page) if not tc.get("id", "").startswith("_")
+    ]
 
     submitted_at = page.get("pl_submitted_at") or page.get("created_at")
     return {
@@ -1322,6 +1367,7 @@ def _tool_post_session_signal(args: dict) -> dict:
                     "UPDATE roadmap_requirements SET status = 'cc_executing', updated_at = GETUTCDATE() WHERE id = ?",
                     (req_row["id"],), fetch="none"
                 )
+                change_hooks.notify_change(change_hooks.REQUIREMENT, [req_row["id"]])
                 response['requirement_advanced'] = {'code': req_row['code'], 'new_status': 'cc_executing'}
                 logger.info(f"post_session_signal: auto-advanced {req_row['code']} to cc_executing for PTH {pth}")
             else:
@@ -1333,6 +1379,7 @@ def _tool_post_session_signal(args: dict) -> dict:
         # MP44 REQ-081: Auto-advance also_closes requirements to cc_executing
         if also_closes and project_id:
             advanced_codes = []
+            advanced_ids = []
             for code in also_closes:
                 try:
                     ac_row = execute_query(
@@ -1347,12 +1394,14 @@ def _tool_post_session_signal(args: dict) -> dict:
                             (ac_row["id"],), fetch="none"
                         )
                         advanced_codes.append(code)
+                        advanced_ids.append(ac_row["id"])
                         logger.info(f"post_session_signal: also_closes auto-advanced {code} to cc_executing")
                     else:
                         logger.warning(f"post_session_signal: also_closes {code} not at advanceable status (status={ac_row['status'] if ac_row else 'NOT FOUND'})")
                 except Exception as e:
                     logger.warning(f"post_session_signal: also_closes auto-advance for {code} failed (non-fatal): {e}")
             if advanced_codes:
+                change_hooks.notify_change(change_hooks.REQUIREMENT, advanced_ids)
                 response['also_closes_advanced'] = advanced_codes
 
     elif status == "completed":
@@ -1370,6 +1419,7 @@ def _tool_post_session_signal(args: dict) -> dict:
         # MP44 REQ-081: Auto-advance also_closes requirements to cc_complete
         if also_closes and project_id:
             advanced_codes = []
+            advanced_ids = []
             for code in also_closes:
                 try:
                     ac_row = execute_query(
@@ -1384,12 +1434,14 @@ def _tool_post_session_signal(args: dict) -> dict:
                             (ac_row["id"],), fetch="none"
                         )
                         advanced_codes.append(code)
+                        advanced_ids.append(ac_row["id"])
                         logger.info(f"post_session_signal: also_closes auto-advanced {code} to cc_complete")
                     else:
                         logger.warning(f"post_session_signal: also_closes {code} not at cc_executing (status={ac_row['status'] if ac_row else 'NOT FOUND'})")
                 except Exception as e:
                     logger.warning(f"post_session_signal: also_closes auto-advance for {code} failed (non-fatal): {e}")
             if advanced_codes:
+                change_hooks.notify_change(change_hooks.REQUIREMENT, advanced_ids)
                 response['also_closes_advanced'] = advanced_codes
 
     elif status in ("stopped", "blocked"):
@@ -1463,45 +1515,26 @@ def _tool_submit_cc_results(args: dict) -> dict:
     if not row:
         return {"error": f"UAT spec {spec_id} not found"}
 
-    import json
-    existing_cases = json.loads(row["test_cases_json"]) if row.get("test_cases_json") else []
-    updates_by_id = {tc["id"]: tc for tc in test_cases}
-    updated_count = 0
-
-    for case in existing_cases:
-        if case.get("id", "").startswith("_"):
-            continue
-        update = updates_by_id.get(case["id"])
-        if update and case.get("type") == "cc_machine":
-            case["cc_result"] = update["cc_result"]
-            case["cc_evidence"] = strip_surrogates(update["cc_evidence"])
-            case["status"] = update["cc_result"]
-            updated_count += 1
+    machine_ids = {
+        c["id"] for c in bv_items.cases(spec_id, row)
+        if not c.get("id", "").startswith("_") and c.get("type") == "cc_machine"
+    }
+    # Only the spec's cc_machine BVs: never a PL-visual result or an undefined id
+    machine_results = [tc for tc in test_cases if tc["id"] in machine_ids]
+    updated_count = len(machine_results)
 
-    execute_query("""
-        UPDATE uat_pages SET test_cases_json = ? WHERE id = ?
-    """, (json.dumps(existing_cases), spec_id), fetch="none")
+    with get_db() as conn:
+        bv_items.apply(conn.cursor(), spec_id, [
+            {
+                "id": tc["id"],
+                "status": tc["cc_result"],
+                "cc_result": tc["cc_result"],
+                "cc_evidence": strip_surrogates(tc["cc_evidence"]),
+            }
+            for tc in machine_results
+        ])
+    change_hooks.notify_change(change_hooks.UAT_PAGE, [spec_id])
 
-    # Persist to uat_bv_items
-    for tc in test_cases:
-        try:
-            execute_query("""
-                IF EXISTS (SELECT 1 FROM uat_bv_items WHERE spec_id=? AND bv_id=?)
-                    UPDATE uat_bv_items
-                    SET status=?, cc_result=?, cc_evidence=?
-                    WHERE spec_id=? AND bv_id=?
-                ELSE
-                    INSERT INTO uat_bv_items (spec_id, bv_id, title, status, cc_result, cc_evidence)
-                    VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                spec_id, tc["id"],
-                tc["cc_result"], tc["cc_result"], strip_surrogates(tc["cc_evidence"]),
-                spec_id, tc["id"],
-                spec_id, tc["id"], tc["id"],
-                tc["cc_result"], tc["cc_result"], strip_surrogates(tc["cc_evidence"]),
-            ), fetch="none")
-        except Exception as e:
-            logger.warning(f"CC BV item upsert failed for {tc['id']}: {e}")
 
     return {"updated": updated_count, "spec_id": spec_id}
 
@@ -1671,6 +1704,7 @@ TOOL_HANDLERS = {
     "update_compliance_doc": _tool_update_compliance_doc,
     "get_checkpoint": _tool_get_checkpoint,
     "post_uat_spec": _tool_post_uat_spec,
+    "post_uat_specs": _tool_post_uat_specs,
     "post_requirement": _tool_post_requirement,
     "create_handoff_shell": _tool_create_handoff_shell,
     "get_uat_results_by_pth": _tool_get_uat_results_by_pth,
@@ -16,26 +16,26 @@ from typing import Optional, List
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.security import APIKeyHeader
 from pydantic import BaseModel, Field
-import httpx
-import requests as _requests
-
+from app.core import change_hooks, compression, http_clients
 from app.core.config import settings
 from app.core.database import execute_query
 from app.core.state_machine import (
     validate_prompt_transition, write_prompt_history, write_prompt_failure,
     write_failure_event, InvalidTransitionError, PROMPT_VALID_TRANSITIONS,
 )
+from app.services import job_queue
 
 logger = logging.getLogger(__name__)
 
 
-async def trigger_cloud_run_job_immediate(job_name: str = "metapm-loop1-worker",
-                                          pth: str = None, handoff_id: str = None,
-                                          args_override: list = None):
-    """Fire a Cloud Run Job immediately with optional targeted args (AP06).
-    Uses GCP metadata server to get identity token, then calls Cloud Run Jobs API.
-    Non-blocking — never delays the caller response.
-    MM10B: records execution to job_executions table for PTH-aware Jobs panel.
+def trigger_cloud_run_job_immediate(job_name: str = "metapm-loop1-worker",
+                                    pth: str = None, handoff_id: str = None,
+                                    args_override: list = None) -> Optional[int]:
+    """Queue a Cloud Run Job execution with optional targeted args (AP06).
+    Runs on the background job queue at high priority, so it starts within
+    moments but never delays the caller response, and is retried if the
+    Cloud Run API call fails. Returns the background job id (None if it
+    could not be queued).
     AP07: args_override allows passing arbitrary arg list (e.g. for loop3_processor).
 
     Args:
@@ -45,93 +45,123 @@ async def trigger_cloud_run_job_immediate(job_name: str = "metapm-loop1-worker",
         args_override: If set, uses this list of args directly (overrides pth/handoff_id).
     """
     try:
-        project = "super-flashcards-475210"
-        # Get identity token from metadata server (available in Cloud Run)
-        token_resp = _requests.get(
-            "http://metadata.google.internal/computeMetadata/v1/instance/service-accounts/default/token",
-            headers={"Metadata-Flavor": "Google"},
-            timeout=5
-        )
-        token = token_resp.json().get("access_token", "")
-        if not token:
-            logger.warning("[AP06] Could not obtain identity token — skipping immediate trigger")
-            return
-
-        run_url = (f"https://us-central1-run.googleapis.com/apis/run.googleapis.com/v1/"
-                   f"namespaces/{project}/jobs/{job_name}:run")
-
-        # AP06/AP07: build targeted override args if provided
-        body = {}
-        if args_override:
-            body = {"overrides": {"containerOverrides": [{"args": args_override}]}}
-            logger.info(f"[AP07] Triggering {job_name} | args: {args_override}")
-        elif pth:
-            body = {"overrides": {"containerOverrides": [{"args": [f"--pth={pth}"]}]}}
-            logger.info(f"[AP06] Triggering {job_name} targeted | PTH: {pth}")
-        elif handoff_id:
-            body = {"overrides": {"containerOverrides": [{"args": [f"--handoff-id={handoff_id}"]}]}}
-            logger.info(f"[AP06] Triggering {job_name} targeted | Handoff: {handoff_id}")
-        else:
-            logger.info(f"[AP06] Triggering {job_name} (fallback sweep)")
-
-        resp = _requests.post(run_url,
-                              headers={"Authorization": f"Bearer {token}",
-                                       "Content-Type": "application/json"},
-                              json=body if body else None,
-                              timeout=10)
-        if resp.status_code in (200, 201, 202):
-            logger.info(f"[AP06] Cloud Run trigger fired for {job_name}")
-            # MM10B: record to job_executions for PTH-aware Jobs panel
-            try:
-                exec_data = resp.json()
-                exec_name = exec_data.get("metadata", {}).get("name", f"{job_name}-{uuid.uuid4().hex[:8]}")
-                # AP08 Fix 5: detect loop3, extract pth from args_override
-                if "loop1" in job_name:
-                    job_type = "loop1"
-                elif "loop3" in job_name:
-                    job_type = "loop3"
-                else:
-                    job_type = "loop2"
-                effective_pth = pth
-                if not effective_pth and args_override:
-                    for a in args_override:
-                        if a.startswith("--pth="):
-                            effective_pth = a.split("=", 1)[1]
-                            if effective_pth == "N/A":
-                                effective_pth = None
-                            break
-                execute_query(
-                    """INSERT INTO job_executions (id, pth, job_type, handoff_id, status)
-                       VALUES (?, ?, ?, ?, 'running')""",
-                    (exec_name, effective_pth, job_type, handoff_id), fetch="none"
-                )
-            except Exception as rec_err:
-                logger.warning(f"[MM10B] job_executions record failed (non-fatal): {rec_err}")
+        return job_queue.enqueue("cloud_run_job", {
+            "job_name": job_name, "pth": pth, "handoff_id": handoff_id, "args_override": args_override,
+        }, priority=job_queue.PRIORITY_HIGH)
+    except Exception as e:
+        logger.warning(f"[AP06] Could not queue {job_name} trigger (non-fatal): {e}")
+        return None
+
+
+async def _run_cloud_run_job(payload: dict) -> dict:
+    """Background job: execute a Cloud Run Job via the Jobs API.
+    Uses GCP metadata server to get identity token, then calls Cloud Run Jobs API.
+    MM10B: records execution to job_executions table for PTH-aware Jobs panel.
+    """
+    job_name = payload["job_name"]
+    pth = payload.get("pth")
+    handoff_id = payload.get("handoff_id")
+    args_override = payload.get("args_override")
+    project = "super-flashcards-475210"
+    # Get identity token from metadata server (available in Cloud Run)
+    token_resp = await http_clients.get_client(http_clients.GOOGLE_METADATA).get(
+        "http://metadata.google.internal/computeMetadata/v1/instance/service-accounts/default/token",
+        headers={"Metadata-Flavor": "Google"},
+    )
+    token = token_resp.json().get("access_token", "")
+    if not token:
+        raise job_queue.PermanentJobError("Could not obtain identity token — skipping immediate trigger")
+
+    run_url = (f"https://us-central1-run.googleapis.com/apis/run.googleapis.com/v1/"
+               f"namespaces/{project}/jobs/{job_name}:run")
+
+    # AP06/AP07: build targeted override args if provided
+    body = {}
+    if args_override:
+        body = {"overrides": {"containerOverrides": [{"args": args_override}]}}
+        logger.info(f"[AP07] Triggering {job_name} | args: {args_override}")
+    elif pth:
+        body = {"overrides": {"containerOverrides": [{"args": [f"--pth={pth}"]}]}}
+        logger.info(f"[AP06] Triggering {job_name} targeted | PTH: {pth}")
+    elif handoff_id:
+        body = {"overrides": {"containerOverrides": [{"args": [f"--handoff-id={handoff_id}"]}]}}
+        logger.info(f"[AP06] Triggering {job_name} targeted | Handoff: {handoff_id}")
+    else:
+        logger.info(f"[AP06] Triggering {job_name} (fallback sweep)")
+
+    resp = await http_clients.get_client(http_clients.GOOGLE_RUN).post(
+        run_url,
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
+        json=body if body else None,
+    )
+    if resp.status_code not in (200, 201, 202):
+        message = f"Cloud Run trigger failed: {resp.status_code} {resp.text[:200]}"
+        if 400 <= resp.status_code < 500 and resp.status_code not in (408, 429):
+            raise job_queue.PermanentJobError(message)
+        raise RuntimeError(message)
+    logger.info(f"[AP06] Cloud Run trigger fired for {job_name}")
+    # MM10B: record to job_executions for PTH-aware Jobs panel
+    exec_name = None
+    try:
+        exec_data = resp.json()
+        exec_name = exec_data.get("metadata", {}).get("name", f"{job_name}-{uuid.uuid4().hex[:8]}")
+        # AP08 Fix 5: detect loop3, extract pth from args_override
+        if "loop1" in job_name:
+            job_type = "loop1"
+        elif "loop3" in job_name:
+            job_type = "loop3"
         else:
-            logger.warning(f"[AP06] Cloud Run trigger failed (non-fatal): {resp.status_code} {resp.text[:200]}")
+            job_type = "loop2"
+        effective_pth = pth
+        if not effective_pth and args_override:
+            for a in args_override:
+                if a.startswith("--pth="):
+                    effective_pth = a.split("=", 1)[1]
+                    if effective_pth == "N/A":
+                        effective_pth = None
+                    break
+        await asyncio.to_thread(
+            execute_query,
+            """INSERT INTO job_executions (id, pth, job_type, handoff_id, status)
+               VALUES (?, ?, ?, ?, 'running')""",
+            (exec_name, effective_pth, job_type, handoff_id), "none"
+        )
+    except Exception as rec_err:
+        logger.warning(f"[MM10B] job_executions record failed (non-fatal): {rec_err}")
+    return {"execution": exec_name}
+
+
+def notify_pa(event_type: str, data: dict) -> Optional[int]:
+    """Queue a webhook to Personal Assistant (retried on the background job queue)."""
+    try:
+        return job_queue.enqueue("pa_notify", {"event_type": event_type, "data": data})
     except Exception as e:
-        logger.warning(f"[AP06] Cloud Run trigger error (non-fatal): {e}")
+        logger.warning(f"PA notification could not be queued (non-fatal): {e}")
+        return None
 
 
-async def notify_pa(event_type: str, data: dict):
-    """Fire-and-forget webhook to Personal Assistant."""
+async def _send_pa_notification(payload: dict) -> None:
+    """Background job: POST the PA webhook. The secret is read at send time, never stored."""
+    event_type, data = payload["event_type"], payload.get("data") or {}
     pa_url = os.getenv("PA_WEBHOOK_URL",
         "https://personal-assistant-57478301787.us-central1.run.app/api/webhook/handoff")
-    try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            await client.post(pa_url, json={
-                "pth": data.get("pth", ""),
-                "project": data.get("project", "MetaPM"),
-                "title": f"{event_type}: {data.get('sprint', data.get('pth', ''))}",
-                "description": data.get("description", ""),
-                "handoff_url": data.get("handoff_url", ""),
-                "uat_url": data.get("uat_url", ""),
-                "handoff_id": data.get("handoff_id", ""),  # MP-EMAIL-COMPLETE
-                "secret": os.getenv("PA_WEBHOOK_SECRET", "")
-            }, headers={"Content-Type": "application/json"})
-            logger.info(f"PA notified: {event_type}")
-    except Exception as e:
-        logger.warning(f"PA notification failed (non-fatal): {e}")
+    client = http_clients.get_client()
+    resp = await client.post(pa_url, json={
+        "pth": data.get("pth", ""),
+        "project": data.get("project", "MetaPM"),
+        "title": f"{event_type}: {data.get('sprint', data.get('pth', ''))}",
+        "description": data.get("description", ""),
+        "handoff_url": data.get("handoff_url", ""),
+        "uat_url": data.get("uat_url", ""),
+        "handoff_id": data.get("handoff_id", ""),  # MP-EMAIL-COMPLETE
+        "secret": os.getenv("PA_WEBHOOK_SECRET", "")
+    }, headers={"Content-Type": "application/json"}, timeout=5.0)
+    resp.raise_for_status()
+    logger.info(f"PA notified: {event_type}")
+
+
+job_queue.register("cloud_run_job", _run_cloud_run_job)
+job_queue.register("pa_notify", _send_pa_notification)
 
 router = APIRouter()
 
@@ -237,7 +267,7 @@ def _row_to_response(row: dict) -> dict:
         "project_id": row.get("project_id"),
         "pth": row.get("pth"),
         "requirement_id": row.get("requirement_id"),
-        "content_md": row.get("content_md"),
+        "content_md": compression.read(row, "content_md"),
         "content": row.get("content"),
         "status": row.get("status", "draft"),
         "estimated_hours": float(row["estimated_hours"]) if row.get("estimated_hours") else None,
@@ -320,10 +350,10 @@ async def create_prompt(prompt: PromptCreate, _: bool = Depends(verify_api_key))
     result = execute_query("""
         SET NOCOUNT ON;
         INSERT INTO cc_prompts
-            (sprint_id, project_id, pth, requirement_id, content, content_md,
+            (sprint_id, project_id, pth, requirement_id, content, content_md, content_md_z,
              estimated_hours, created_by, status)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'draft');
-        SELECT id, sprint_id, project_id, pth, requirement_id, content_md,
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'draft');
+        SELECT id, sprint_id, project_id, pth, requirement_id, content_md, content_md_z,
                status, estimated_hours, created_by, created_at
         FROM cc_prompts WHERE id = SCOPE_IDENTITY();
     """, (
@@ -332,7 +362,7 @@ async def create_prompt(prompt: PromptCreate, _: bool = Depends(verify_api_key))
         prompt.pth,
         req_row["id"],
         prompt.content_md[:500] if prompt.content_md else '',
-        prompt.content_md,
+        *compression.split(prompt.content_md),
         prompt.estimated_hours,
         prompt.created_by,
     ), fetch="one")
@@ -356,17 +386,18 @@ async def create_prompt(prompt: PromptCreate, _: bool = Depends(verify_api_key))
             logger.info(f"BUG-037: linked PTH {prompt.pth} to {prompt.requirement_code}, advanced to cc_prompt_ready")
         else:
             logger.info(f"BUG-037: linked PTH {prompt.pth} to {prompt.requirement_code} (already at {req_row['status']}, no advance needed)")
+        change_hooks.notify_change(change_hooks.REQUIREMENT, [req_row["id"]])
     except Exception as e:
         logger.error(f"BUG-037: auto-advance failed for {prompt.requirement_code}: {e}")
 
     # Fire-and-forget PA notification
-    asyncio.create_task(notify_pa("Prompt created", {
+    notify_pa("Prompt created", {
         "pth": result.get("pth", ""),
         "project": "MetaPM",
         "sprint": result.get("sprint_id", ""),
         "description": f"New prompt {result.get('pth')} ready for review",
         "handoff_url": f"https://metapm.rentyourcio.com/prompts/{result.get('pth', '')}",
-    }))
+    })
 
     return {
         "id": result["id"],
@@ -750,6 +781,7 @@ async def update_prompt(prompt_id: int, patch: PromptPatch):
     """Update prompt status (approve/reject/execute/complete). No auth required for PL browser approval."""
     set_parts = []
     params = []
+    trigger_loop1 = False
 
     # Read current state for history tracking
     current_row = execute_query(
@@ -785,11 +817,9 @@ async def update_prompt(prompt_id: int, patch: PromptPatch):
             if patch.approved_by:
                 set_parts.append("approved_by = ?")
                 params.append(patch.approved_by)
-            # AP06: fire Cloud Run Job immediately on PL approval (targeted mode with PTH)
-            if patch.approved_by == "PL":
-                asyncio.create_task(
-                    trigger_cloud_run_job_immediate("metapm-loop1-worker", pth=pth_val)
-                )
+            # AP06: fire Cloud Run Job immediately on PL approval (targeted mode with PTH),
+            # queued once the approval below is committed
+            trigger_loop1 = patch.approved_by == "PL"
 
     if patch.approved_by and patch.status != 'approved':
         set_parts.append("approved_by = ?")
@@ -800,7 +830,8 @@ async def update_prompt(prompt_id: int, patch: PromptPatch):
         if current_status not in ('draft', 'prompt_ready'):
             raise HTTPException(status_code=400, detail="Content can only be edited when prompt is in draft status")
         set_parts.append("content_md = ?")
-        params.append(patch.content_md)
+        set_parts.append("content_md_z = ?")
+        params.extend(compression.split(patch.content_md))
         set_parts.append("content = ?")
         params.append(patch.content_md[:500] if patch.content_md else '')
 
@@ -817,6 +848,8 @@ async def update_prompt(prompt_id: int, patch: PromptPatch):
     execute_query(f"""
         UPDATE cc_prompts SET {', '.join(set_parts)} WHERE id = ?
     """, tuple(params), fetch="none")
+    if trigger_loop1:
+        trigger_cloud_run_job_immediate("metapm-loop1-worker", pth=pth_val)
 
     # MP12B: Write prompt history for status changes
     if patch.status and patch.status != current_status:
@@ -974,10 +1007,9 @@ async def get_jobs_status():
         pass  # non-fatal
 
     try:
-        token_resp = _requests.get(
+        token_resp = await http_clients.get_client(http_clients.GOOGLE_METADATA).get(
             "http://metadata.google.internal/computeMetadata/v1/instance/service-accounts/default/token",
             headers={"Metadata-Flavor": "Google"},
-            timeout=5
         )
         token = token_resp.json().get("access_token", "")
     except Exception as e:
@@ -989,11 +1021,10 @@ async def get_jobs_status():
         try:
             list_url = (f"https://us-central1-run.googleapis.com/apis/run.googleapis.com/v1/"
                         f"namespaces/{project}/executions")
-            resp = _requests.get(
+            resp = await http_clients.get_client(http_clients.GOOGLE_RUN).get(
                 list_url,
                 params={"labelSelector": f"run.googleapis.com/job={job_name}", "limit": "10"},
                 headers={"Authorization": f"Bearer {token}"},
-                timeout=10
             )
             if resp.status_code == 200:
                 items = resp.json().get("items", [])
@@ -1058,7 +1089,7 @@ async def launch_job(payload: dict):
     pth = payload.get("pth")
     if not pth:
         raise HTTPException(status_code=400, detail="pth required")
-    await trigger_cloud_run_job_immediate("metapm-loop1-worker", pth=pth)
-    return {"launched": True, "pth": pth}
+    job_id = trigger_cloud_run_job_immediate("metapm-loop1-worker", pth=pth)
+    return {"launched": job_id is not None, "pth": pth, "job_id": job_id}
 
 
@@ -3,8 +3,10 @@ MetaPM Quality API — MP23 REQ-048
 Sprint quality model endpoints for quality dashboard.
 """
 import logging
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
 from app.core.database import execute_query
+from app.services import quality_rollup
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -61,10 +63,8 @@ async def get_failure_schema():
     return schema
 
 
-@router.get("/api/quality/sprint/{pth}")
-async def get_sprint_quality(pth: str):
-    """Quality data for one sprint, including per-BV results."""
-    row = execute_query("""
+def _live_sprint_row(pth: str):
+    return execute_query("""
         SELECT TOP 1
             cp.pth,
             cp.sprint_id,
@@ -85,6 +85,21 @@ async def get_sprint_quality(pth: str):
         ORDER BY cp.created_at DESC
     """, (pth,), fetch="one")
 
+
+@router.get("/api/quality/sprint/{pth}")
+async def get_sprint_quality(pth: str):
+    """Quality data for one sprint, including per-BV results.
+
+    Header and pass rate come from uat_quality_rollup once it has been built,
+    otherwise (or for a PTH with no rollup row yet) from _live_sprint_row.
+    """
+    row = quality_rollup.sprint(pth) if quality_rollup.rollup_ready() else None
+    if row:
+        row["project_code"] = row.get("requirement_code")
+        row["sprint_failure_type"] = row.get("failure_type")
+    else:
+        row = _live_sprint_row(pth)
+
     if not row:
         raise HTTPException(404, f"No sprint found for PTH {pth}")
 
@@ -108,9 +123,12 @@ async def get_sprint_quality(pth: str):
             for b in bv_rows
         ]
 
-    total_bvs = len(bv_results) if bv_results else 0
-    passed_bvs = sum(1 for b in bv_results if b["status"] == "pass")
-    bv_pass_rate = round((passed_bvs / total_bvs) * 100, 1) if total_bvs > 0 else 0.0
+    if row.get("bv_pass_rate") is not None:
+        bv_pass_rate = float(row["bv_pass_rate"])
+    else:
+        total_bvs = len(bv_results) if bv_results else 0
+        passed_bvs = sum(1 for b in bv_results if b["status"] == "pass")
+        bv_pass_rate = round((passed_bvs / total_bvs) * 100, 1) if total_bvs > 0 else 0.0
 
     # Parse version from sprint_id (e.g. "MP23-QUALITY-MODEL-001" → look at cc_prompts content)
     sprint_id = row.get("sprint_id") or ""
@@ -131,10 +149,18 @@ async def get_sprint_quality(pth: str):
     }
 
 
-@router.get("/api/quality/portfolio")
-async def get_portfolio_quality():
-    """Sprint-level quality data for all sprints, newest first. Max 500."""
-    rows = execute_query("""
+def _live_portfolio_rows(project: Optional[str], date_from: Optional[str], date_to: Optional[str]):
+    filters, params = [], []
+    if project:
+        filters.append("AND rp.code = ?")
+        params.append(project)
+    if date_from:
+        filters.append("AND COALESCE(up.pl_submitted_at, cp.created_at) >= ?")
+        params.append(date_from)
+    if date_to:
+        filters.append("AND COALESCE(up.pl_submitted_at, cp.created_at) < DATEADD(day, 1, CAST(? AS DATE))")
+        params.append(date_to)
+    return execute_query(f"""
         SELECT TOP 500
             cp.pth,
             cp.sprint_id,
@@ -147,7 +173,7 @@ async def get_portfolio_quality():
             up.status AS uat_status,
             up.pl_submitted_at,
             up.attempt_number,
-            ur.failure_type AS sprint_failure_type,
+            ur.failure_type AS failure_type,
             (SELECT COUNT(*) FROM uat_bv_items bi WHERE bi.spec_id = up.id) AS total_bvs,
             (SELECT COUNT(*) FROM uat_bv_items bi WHERE bi.spec_id = up.id AND bi.status = 'pass') AS passed_bvs
         FROM cc_prompts cp
@@ -155,16 +181,37 @@ async def get_portfolio_quality():
         LEFT JOIN roadmap_projects rp ON rr.project_id = rp.id
         LEFT JOIN uat_pages up ON up.pth = cp.pth
         LEFT JOIN uat_results ur ON ur.handoff_id = up.handoff_id
-        WHERE cp.status IN ('complete', 'closed', 'executing', 'cc_complete')
-           OR up.pl_submitted_at IS NOT NULL
+        WHERE (cp.status IN ('complete', 'closed', 'executing', 'cc_complete')
+           OR up.pl_submitted_at IS NOT NULL)
+        {" ".join(filters)}
         ORDER BY COALESCE(up.pl_submitted_at, cp.created_at) DESC
-    """, fetch="all") or []
+    """, tuple(params), fetch="all") or []
+
+
+@router.get("/api/quality/portfolio")
+async def get_portfolio_quality(
+    project: Optional[str] = Query(None, description="Project code, e.g. MP"),
+    date_from: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    date_to: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
+):
+    """Sprint-level quality data for all sprints, newest first. Max 500.
+
+    Reads uat_quality_rollup (indexed on project_code / activity_at); falls
+    back to the live join until the rollup has been built.
+    """
+    if quality_rollup.rollup_ready():
+        rows = quality_rollup.portfolio(project=project, date_from=date_from, date_to=date_to)
+    else:
+        rows = _live_portfolio_rows(project, date_from, date_to)
 
     results = []
     for r in rows:
         total = r.get("total_bvs") or 0
         passed = r.get("passed_bvs") or 0
-        bv_pass_rate = round((passed / total) * 100, 1) if total > 0 else 0.0
+        if r.get("bv_pass_rate") is not None:
+            bv_pass_rate = float(r["bv_pass_rate"])
+        else:
+            bv_pass_rate = round((passed / total) * 100, 1) if total > 0 else 0.0
         results.append({
             "pth": r["pth"],
             "sprint_id": r.get("sprint_id") or "",
@@ -175,7 +222,9 @@ async def get_portfolio_quality():
             "five_q_applied": bool(r.get("five_q_applied")),
             "root_cause_method": r.get("root_cause_method"),
             "attempt_number": r.get("attempt_number"),
-            "failure_type": r.get("sprint_failure_type"),
+            "failure_type": r.get("failure_type"),
+            "total_bvs": total,
+            "passed_bvs": passed,
             "bv_pass_rate": bv_pass_rate,
             "overall_status": r.get("uat_status") or "pending",
             "submitted_at": str(r["pl_submitted_at"]) if r.get("pl_submitted_at") else None,
@@ -184,6 +233,16 @@ async def get_portfolio_quality():
     return results
 
 
+@router.post("/api/quality/rollup/rebuild")
+async def rebuild_quality_rollup():
+    """Repopulate uat_quality_rollup from the live tables."""
+    try:
+        return {"success": True, "rows": quality_rollup.rebuild_rollup()}
+    except Exception as exc:
+        logger.error(f"rebuild_quality_rollup failed: {exc}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(exc))
+
+
 @router.get("/api/quality/projects")
 async def get_quality_projects():
     """BUG-047: All projects for quality filter dropdown."""
@@ -196,7 +255,18 @@ async def get_quality_projects():
 
 @router.get("/api/quality/symptom-detector")
 async def get_symptom_chasing():
-    """Detect repeat bug patterns — features with 3+ bugs in 30 days."""
+    """Detect repeat bug patterns — features with 3+ bugs in 30 days.
+
+    Bugs are grouped by MinHash similarity of title + description within a
+    project (app/services/chain_matcher.py) rather than by a shared 40-char
+    title prefix. Falls back to the prefix grouping if the index can't load.
+    """
+    try:
+        from app.services.chain_matcher import symptom_clusters
+        return symptom_clusters(days=30, min_size=3)
+    except Exception as e:
+        logger.warning(f"symptom-detector matcher unavailable, using title prefix: {e}")
+
     rows = execute_query("""
         SELECT
             rp.code AS project_code,
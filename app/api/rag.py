@@ -3,155 +3,157 @@ Portfolio RAG proxy endpoints (MP-MS3 Phase 4) + MetaPM→RAG sync (PR-009).
 Proxies requests to the Portfolio RAG service.
 """
 
+import asyncio
 import json
 import logging
+import time
 import uuid
 from datetime import datetime, timezone
 from typing import Optional
-from fastapi import APIRouter, HTTPException, Query, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, Query, Response, UploadFile, File, Form
 import httpx
 
+from app.core import change_hooks, http_clients
 from app.core.config import settings
 from app.core.database import execute_query
+from app.services import bv_items, fulltext, rag_ingest, rag_outbox, rag_proxy, rag_sync, search_cache, search_index, typeahead, vector_index
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 RAG_BASE = settings.PORTFOLIO_RAG_URL.rstrip("/")
-TIMEOUT = 15.0
 SYNC_TIMEOUT = 300.0
 
 
 ETYMOLOGY_COLLECTIONS = {"etymology", "dcc", "wiktionary"}
 SQL_COLLECTIONS = {"portfolio", "metapm", "code", "jazz_theory"}
+# Served from the local vector index (hybrid with keyword scores) when enabled
+LOCAL_VECTOR_COLLECTIONS = {"metapm", "lessons"}
 
 
 @router.get("/rag/query")
 async def rag_query(
+    response: Response,
     q: str = Query(..., min_length=1),
     collection: Optional[str] = None,
     n: int = 5,
 ):
     """Route search by collection.
     etymology/dcc/wiktionary → Portfolio RAG /search/etymology (semantic)
-    portfolio/metapm/code/jazz_theory → MetaPM SQL /api/search/knowledge
+    portfolio/metapm/code/jazz_theory → MetaPM knowledge index (as /api/search/knowledge)
     No collection → Portfolio RAG /search/etymology (default etymology search)
+    metapm/lessons → local vector + keyword hybrid first, when the vector index is enabled
     """
+    if collection in LOCAL_VECTOR_COLLECTIONS and vector_index.enabled():
+        try:
+            results = await asyncio.to_thread(_hybrid_results, collection, q, 30)
+            if results is not None:
+                return {"query": q, "collection": collection, "source": "metapm_hybrid",
+                        "total": len(results), "results": results}
+        except Exception as e:
+            logger.warning(f"RAG query vector index error, using keyword path: {e}")
+
     if collection and collection in SQL_COLLECTIONS:
-        # Route to MetaPM SQL full-text search
+        # Route to the MetaPM knowledge index (BM25), or SQL full-text/LIKE
+        if not fulltext.use_fulltext_backend():
+            try:
+                results = await asyncio.to_thread(_knowledge_results, q, 30)
+                return {"query": q, "collection": collection, "source": "metapm_index",
+                        "total": len(results), "results": results}
+            except Exception as idx_err:
+                logger.warning(f"RAG query knowledge index unavailable, falling back to SQL: {idx_err}")
         try:
-            rows = execute_query(
-                """
-                SELECT TOP 20
-                  'requirement' AS source_type,
-                  r.code,
-                  r.title,
-                  r.description,
-                  p.code AS project_code,
-                  r.status
-                FROM roadmap_requirements r
-                JOIN roadmap_projects p ON r.project_id = p.id
-                WHERE r.title LIKE ? OR r.description LIKE ?
-                UNION ALL
-                SELECT TOP 10
-                  'compliance_doc' AS source_type,
-                  c.id AS code,
-                  c.id AS title,
-                  c.content_md AS description,
-                  c.project_code,
-                  c.doc_type AS status
-                FROM compliance_docs c
-                WHERE c.content_md LIKE ?
-                ORDER BY source_type
-                """,
-                (f"%{q}%", f"%{q}%", f"%{q}%"),
-                fetch="all",
-            )
-            results = [dict(r) for r in rows] if rows else []
+            results, _method = await asyncio.to_thread(_knowledge_sql, q, 30)
             return {"query": q, "collection": collection, "source": "metapm_sql", "total": len(results), "results": results}
         except Exception as e:
-            logger.error(f"RAG query SQL fallback error: {e}")
+            logger.error(f"RAG query knowledge index error: {e}")
             raise HTTPException(status_code=500, detail=f"SQL search failed: {e}")
     else:
         # Route to Portfolio RAG semantic search (etymology/dcc/wiktionary or default)
         effective_collection = collection if collection in ETYMOLOGY_COLLECTIONS else "etymology"
+        params = {"q": q, "collection": effective_collection, "n": n}
         try:
-            async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-                resp = await client.get(
-                    f"{RAG_BASE}/search/etymology",
-                    params={"q": q, "collection": effective_collection, "n": n},
-                )
-                resp.raise_for_status()
-                return resp.json()
-        except httpx.HTTPStatusError as e:
-            # Fallback to legacy /semantic if /search/etymology not yet deployed
-            try:
-                async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-                    resp2 = await client.get(
-                        f"{RAG_BASE}/semantic",
-                        params={"q": q, "collection": effective_collection, "n": n},
-                    )
-                    resp2.raise_for_status()
-                    return resp2.json()
-            except Exception as e2:
-                raise HTTPException(status_code=502, detail=f"RAG service error: {e2}")
+            data, cache_status = await rag_proxy.cached("/query", params, lambda: _semantic_search(params))
+            response.headers["X-Cache"] = cache_status
+            return data
         except Exception as e:
-            logger.error(f"RAG query proxy error: {e}")
-            raise HTTPException(status_code=502, detail=f"RAG service error: {e}")
+            _raise_proxy_error("RAG query", e)
 
 
-@router.get("/rag/documents")
-async def rag_documents(repo: Optional[str] = None, doc_type: Optional[str] = None):
-    """Proxy document listing to Portfolio RAG."""
-    try:
-        params = {}
-        if repo:
-            params["repo"] = repo
-        if doc_type:
-            params["doc_type"] = doc_type
-        async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-            resp = await client.get(f"{RAG_BASE}/documents", params=params)
+# /search/etymology 404s on Portfolio RAG builds that predate it; remember that
+# instead of paying for a failed call before every /semantic fallback.
+_ETYMOLOGY_MISSING_SECONDS = 600.0
+_etymology_missing_until = 0.0
+
+
+async def _semantic_search(params: dict):
+    global _etymology_missing_until
+    client = http_clients.get_client(http_clients.PORTFOLIO_RAG)
+    if time.monotonic() >= _etymology_missing_until:
+        resp = await client.get(f"{RAG_BASE}/search/etymology", params=params)
+        if resp.status_code not in (404, 405):
             resp.raise_for_status()
             return resp.json()
-    except httpx.HTTPStatusError as e:
+        _etymology_missing_until = time.monotonic() + _ETYMOLOGY_MISSING_SECONDS
+    # Fallback to legacy /semantic if /search/etymology not yet deployed
+    resp = await client.get(f"{RAG_BASE}/semantic", params=params)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _raise_proxy_error(what: str, e: Exception):
+    if isinstance(e, httpx.HTTPStatusError):
         raise HTTPException(status_code=e.response.status_code, detail=str(e))
+    if isinstance(e, rag_proxy.CircuitOpenError):
+        raise HTTPException(status_code=503, detail="RAG service unavailable (circuit open, nothing cached)")
+    logger.error(f"{what} proxy error: {e}")
+    raise HTTPException(status_code=502, detail=f"RAG service error: {e}")
+
+
+@router.get("/rag/documents")
+async def rag_documents(response: Response, repo: Optional[str] = None, doc_type: Optional[str] = None):
+    """Proxy document listing to Portfolio RAG (cached, see app/services/rag_proxy.py)."""
+    try:
+        data, cache_status = await rag_proxy.get_json("/documents", {"repo": repo or None, "doc_type": doc_type or None})
+        response.headers["X-Cache"] = cache_status
+        return data
     except Exception as e:
-        logger.error(f"RAG documents proxy error: {e}")
-        raise HTTPException(status_code=502, detail=f"RAG service error: {e}")
+        _raise_proxy_error("RAG documents", e)
 
 
 @router.get("/rag/latest/{doc_type}")
-async def rag_latest(doc_type: str, repo: Optional[str] = None):
-    """Proxy latest document query to Portfolio RAG."""
+async def rag_latest(doc_type: str, response: Response, repo: Optional[str] = None):
+    """Proxy latest document query to Portfolio RAG (cached)."""
     try:
-        params = {}
-        if repo:
-            params["repo"] = repo
-        async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-            resp = await client.get(f"{RAG_BASE}/latest/{doc_type}", params=params)
-            resp.raise_for_status()
-            return resp.json()
-    except httpx.HTTPStatusError as e:
-        raise HTTPException(status_code=e.response.status_code, detail=str(e))
+        data, cache_status = await rag_proxy.get_json(f"/latest/{doc_type}", {"repo": repo or None})
+        response.headers["X-Cache"] = cache_status
+        return data
     except Exception as e:
-        logger.error(f"RAG latest proxy error: {e}")
-        raise HTTPException(status_code=502, detail=f"RAG service error: {e}")
+        _raise_proxy_error("RAG latest", e)
 
 
 @router.get("/rag/checkpoints")
-async def rag_checkpoints():
-    """Proxy checkpoint listing to Portfolio RAG."""
+async def rag_checkpoints(response: Response):
+    """Proxy checkpoint listing to Portfolio RAG (cached)."""
     try:
-        async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-            resp = await client.get(f"{RAG_BASE}/checkpoints")
-            resp.raise_for_status()
-            return resp.json()
-    except httpx.HTTPStatusError as e:
-        raise HTTPException(status_code=e.response.status_code, detail=str(e))
+        data, cache_status = await rag_proxy.get_json("/checkpoints")
+        response.headers["X-Cache"] = cache_status
+        return data
     except Exception as e:
-        logger.error(f"RAG checkpoints proxy error: {e}")
-        raise HTTPException(status_code=502, detail=f"RAG service error: {e}")
+        _raise_proxy_error("RAG checkpoints", e)
+
+
+@router.get("/rag/cache")
+async def rag_cache_stats():
+    """Hit/stale/miss counters and circuit state for the Portfolio RAG read cache."""
+    return rag_proxy.stats()
+
+
+@router.delete("/rag/cache")
+async def rag_cache_clear():
+    rag_proxy.invalidate()
+    return {"cleared": True}
 
 
 def _write_governance_kv(key: str, value: dict) -> None:
@@ -176,17 +178,177 @@ def _write_governance_kv(key: str, value: dict) -> None:
         logger.warning(f"governance_kv write failed (non-fatal): {e}")
 
 
-@router.post("/rag/sync")
-async def sync_requirements_to_rag():
-    """Sync all MetaPM requirements into Portfolio RAG metapm collection.
+_REQ_SYNC_SQL = """
+    SELECT r.id, r.project_id, r.code, r.title, r.description,
+           r.type, r.priority, r.status, r.target_version,
+           r.sprint_id, r.handoff_id, r.uat_id, r.pth,
+           r.created_at, r.updated_at,
+           p.code as project_code, p.name as project_name
+    FROM roadmap_requirements r
+    JOIN roadmap_projects p ON r.project_id = p.id
+"""
+
+_UAT_SYNC_SQL = """
+    SELECT id, project, sprint_code, pth, version, status,
+           test_cases_json, general_notes, pl_submitted_at, spec_locked_at,
+           COALESCE(pl_submitted_at, spec_locked_at, created_at) AS changed_at
+    FROM uat_pages
+    WHERE spec_source = 'cc_spec' AND status != 'archived'
+"""
+
+# Ids of rows that currently produce a chunk, for the deleted-source anti-join
+_REQ_LIVE_IDS = ("SELECT CAST(r.id AS NVARCHAR(100)) FROM roadmap_requirements r "
+                 "JOIN roadmap_projects p ON r.project_id = p.id")
+_UAT_LIVE_IDS = ("SELECT CAST(id AS NVARCHAR(100)) FROM uat_pages "
+                 "WHERE spec_source = 'cc_spec' AND status != 'archived'")
+
+
+def _requirement_chunk(row: dict) -> dict:
+    """SYNC-2 chunk for one requirement row."""
+    code = row.get("code", "")
+    project_name = row.get("project_name", "")
+    title = row.get("title", "")
+    status = row.get("status", "")
+    priority = row.get("priority", "")
+    req_type = row.get("type", "")
+    pth = row.get("pth", "")
+    description = row.get("description", "")
+    created_at = str(row.get("created_at", ""))
+    updated_at = str(row.get("updated_at", ""))
+
+    text = (
+        f"REQUIREMENT: {code}\n"
+        f"PROJECT: {project_name}\n"
+        f"TITLE: {title}\n"
+        f"STATUS: {status}\n"
+        f"PRIORITY: {priority}\n"
+        f"TYPE: {req_type}\n"
+        f"PTH: {pth}\n"
+        f"DESCRIPTION: {description}\n"
+        f"CREATED: {created_at}\n"
+        f"UPDATED: {updated_at}"
+    )
+
+    metadata = {
+        "source": "MetaPM",
+        "code": code,
+        "project": project_name,
+        "status": status,
+        "priority": priority,
+        "pth": pth or "",
+        "version": "1.0",
+    }
+
+    req_id = row.get("id", code)
+    return {
+        "id": f"metapm::{req_id}",
+        "content": text,
+        "metadata": metadata,
+    }
+
+
+def _uat_chunk(row: dict, tc_json: list) -> dict:
+    """Chunk for one cc_spec UAT page (GROUP 4, MP-MEGA-005), given its current test cases."""
+    tc_lines = "\n".join(
+        f"  {tc.get('id','')} [{tc.get('status','pending').upper()}]: {tc.get('title','')} — {tc.get('notes','') or ''}"
+        for tc in tc_json
+    )
+    passed = sum(1 for t in tc_json if t.get("status") == "pass")
+    failed = sum(1 for t in tc_json if t.get("status") == "fail")
+    text = (
+        f"UAT: {row.get('pth','')} | {row.get('project','')} v{row.get('version','')}\n"
+        f"Sprint: {row.get('sprint_code','')}\n"
+        f"Status: {row.get('status','')}\n"
+        f"Results: {passed} passed, {failed} failed\n"
+        f"Test cases:\n{tc_lines}\n"
+        f"General notes: {row.get('general_notes','') or ''}\n"
+        f"URL: https://metapm.rentyourcio.com/uat/{row['id']}"
+    )
+    return {
+        "id": f"metapm::uat::{row['id']}",
+        "content": text,
+        "metadata": {
+            "source": "MetaPM-UAT",
+            "pth": row.get("pth") or "",
+            "project": row.get("project") or "",
+            "status": row.get("status") or "",
+            "version": row.get("version") or "",
+        },
+    }
+
+
+def _load_uat_chunks(ids: list) -> dict:
+    """Outbox loader: current chunk per qualifying UAT page id."""
+    rows = execute_query(
+        _UAT_SYNC_SQL + f" AND id IN ({', '.join('?' * len(ids))})",
+        tuple(ids), fetch="all",
+    ) or []
+    cases = bv_items.cases_many(rows)
+    by_id = {str(r["id"]).upper(): _uat_chunk(r, cases[str(r["id"])]) for r in rows}
+    # GUID text case varies by caller; answer in the caller's spelling
+    return {sid: by_id[sid.upper()] for sid in ids if sid.upper() in by_id}
+
+
+def _record_uat_sent(sent: dict, deleted: list) -> None:
+    """Keep rag_sync_state current so the next incremental /rag/sync skips these."""
+    rag_sync.record("metapm", [(chunk["id"], "uat", sid, chunk) for sid, chunk in sent.items()])
+    if deleted:
+        rag_sync.forget("metapm", [f"metapm::uat::{sid.upper()}" for sid in deleted])
+
+
+rag_outbox.register_source("uat", rag_outbox.Source(
+    collection="metapm",
+    load=_load_uat_chunks,
+    chunk_id=lambda spec_id: f"metapm::uat::{spec_id.upper()}",
+    on_sent=_record_uat_sent,
+))
+
+
+def _max_ts(rows: list, column: str, current=None):
+    for r in rows:
+        value = r.get(column)
+        if value is not None and (current is None or value > current):
+            current = value
+    return current
+
+
+def _sync_progress_writer(mode: str, sync_start: datetime):
+    """on_progress callback that mirrors batch progress into governance_kv (at most every 2s)."""
+    last = {"at": 0.0}
+
+    def _write(phase: str, done: int, total: int) -> None:
+        now = time.monotonic()
+        if done < total and now - last["at"] < 2.0:
+            return
+        last["at"] = now
+        _write_governance_kv("rag_sync_last_run", {
+            "status": "running", "mode": mode, "phase": phase,
+            "batches_done": done, "batches_total": total,
+            "timestamp": sync_start.isoformat(),
+        })
+    return _write
+
 
-    Fetches all requirements from MetaPM DB, builds chunks per SYNC-2 schema,
-    and POSTs to Portfolio RAG /ingest/custom with replace_collection=true.
+@router.post("/rag/sync")
+async def sync_requirements_to_rag(
+    full: bool = Query(False, description="Rebuild the whole metapm collection (replace_collection=true)"),
+):
+    """Sync MetaPM requirements and cc_spec UATs into the Portfolio RAG metapm collection.
+
+    Incremental by default: only requirements with updated_at (and UATs with
+    submit/lock/create time) at or past the stored watermark are chunked, and
+    of those only chunks whose content hash differs from rag_sync_state are
+    pushed. Chunks whose source row was deleted or archived are sent as
+    delete_ids. full=true (or no sync state yet) re-sends everything with
+    replace_collection=true on the first batch and re-records the state.
+    Chunks go through rag_ingest.IngestPipeline (concurrent, size-batched,
+    429-aware, retried); a failed run is checkpointed and the next call
+    resumes from the last acknowledged batch, including an interrupted full
+    rebuild.
     Called by Cloud Scheduler nightly or manually.
     Amendment E: adds [RAG_SYNC] progress logging + governance_kv status persistence.
     """
     sync_start = datetime.now(timezone.utc)
-    logger.info("[RAG_SYNC] Starting — fetching requirements from DB")
     api_key = settings.PORTFOLIO_RAG_API_KEY
     if not api_key:
         raise HTTPException(
@@ -194,292 +356,458 @@ async def sync_requirements_to_rag():
             detail="PORTFOLIO_RAG_API_KEY not configured"
         )
 
-    # Fetch all requirements from DB
+    collection = "metapm"
+    checkpoints = rag_ingest.GovernanceCheckpointStore()
+    req_job, uat_job = f"rag_sync:{collection}:requirement", f"rag_sync:{collection}:uat"
+    resuming_full = False
     try:
-        rows = execute_query("""
-            SELECT r.id, r.project_id, r.code, r.title, r.description,
-                   r.type, r.priority, r.status, r.target_version,
-                   r.sprint_id, r.handoff_id, r.uat_id, r.pth,
-                   r.created_at, r.updated_at,
-                   p.code as project_code, p.name as project_name
-            FROM roadmap_requirements r
-            JOIN roadmap_projects p ON r.project_id = p.id
-            ORDER BY p.code, r.code
-        """, fetch="all")
+        saved = checkpoints.load(req_job)
+        resuming_full = bool(saved and saved.get("replace"))
+        incremental = not full and not resuming_full and rag_sync.has_state(collection)
+    except Exception as e:
+        logger.warning(f"[RAG_SYNC] sync state unavailable, running full rebuild: {e}")
+        incremental = False
+    mode = "incremental" if incremental else "full"
+    marks = rag_sync.get_watermarks(collection) if incremental else {}
+    logger.info(f"[RAG_SYNC] Starting ({mode}) — fetching requirements from DB")
+
+    try:
+        if incremental and marks.get("requirement"):
+            rows = execute_query(_REQ_SYNC_SQL + " WHERE r.updated_at >= ? ORDER BY p.code, r.code",
+                                 (marks["requirement"],), fetch="all") or []
+        else:
+            rows = execute_query(_REQ_SYNC_SQL + " ORDER BY p.code, r.code", fetch="all") or []
     except Exception as e:
         logger.error(f"RAG sync DB query failed: {e}")
         raise HTTPException(status_code=500, detail=f"DB query failed: {e}")
 
-    if not rows:
-        return {"synced": 0, "collection": "metapm", "timestamp": datetime.now(timezone.utc).isoformat()}
-
-    # Build chunks per SYNC-2 schema
-    chunks = []
-    for row in rows:
-        code = row.get("code", "")
-        project_name = row.get("project_name", "")
-        title = row.get("title", "")
-        status = row.get("status", "")
-        priority = row.get("priority", "")
-        req_type = row.get("type", "")
-        pth = row.get("pth", "")
-        description = row.get("description", "")
-        created_at = str(row.get("created_at", ""))
-        updated_at = str(row.get("updated_at", ""))
-
-        text = (
-            f"REQUIREMENT: {code}\n"
-            f"PROJECT: {project_name}\n"
-            f"TITLE: {title}\n"
-            f"STATUS: {status}\n"
-            f"PRIORITY: {priority}\n"
-            f"TYPE: {req_type}\n"
-            f"PTH: {pth}\n"
-            f"DESCRIPTION: {description}\n"
-            f"CREATED: {created_at}\n"
-            f"UPDATED: {updated_at}"
-        )
+    try:
+        if incremental and marks.get("uat"):
+            uat_rows = execute_query(f"""
+                {_UAT_SYNC_SQL}
+                  AND (COALESCE(pl_submitted_at, spec_locked_at, created_at) >= ?
+                       OR NOT EXISTS (SELECT 1 FROM rag_sync_state s
+                                      WHERE s.collection = ? AND s.chunk_id = 'metapm::uat::' + CAST(uat_pages.id AS NVARCHAR(36))))
+                ORDER BY spec_locked_at DESC
+            """, (marks["uat"], collection), fetch="all") or []
+        else:
+            uat_rows = execute_query(_UAT_SYNC_SQL + " ORDER BY spec_locked_at DESC", fetch="all") or []
+    except Exception as e:
+        logger.warning(f"RAG sync UAT query failed (non-fatal): {e}")
+        uat_rows = []
 
-        metadata = {
-            "source": "MetaPM",
-            "code": code,
-            "project": project_name,
-            "status": status,
-            "priority": priority,
-            "pth": pth or "",
-            "version": "1.0",
-        }
+    req_chunks = [_requirement_chunk(r) for r in rows]
+    req_source = {c["id"]: r.get("id", r.get("code")) for c, r in zip(req_chunks, rows)}
+    uat_cases = bv_items.cases_many(uat_rows)
+    uat_chunks = [_uat_chunk(r, uat_cases[str(r["id"])]) for r in uat_rows]
+    uat_source = {c["id"]: r["id"] for c, r in zip(uat_chunks, uat_rows)}
+    unchanged = 0
+    deleted_ids = []
+    if incremental:
+        req_chunks, skipped = rag_sync.changed(collection, req_chunks)
+        unchanged += skipped
+        uat_chunks, skipped = rag_sync.changed(collection, uat_chunks)
+        unchanged += skipped
+        deleted_ids = (rag_sync.orphaned(collection, "requirement", _REQ_LIVE_IDS)
+                       + rag_sync.orphaned(collection, "uat", _UAT_LIVE_IDS))
+    elif not resuming_full:
+        # A resumed full run keeps the state recorded for its acknowledged batches
+        try:
+            rag_sync.reset(collection)
+        except Exception as e:
+            logger.warning(f"[RAG_SYNC] sync state reset failed (non-fatal): {e}")
 
-        req_id = row.get("id", code)
-        chunks.append({
-            "id": f"metapm::{req_id}",
-            "content": text,
-            "metadata": metadata,
-        })
+    def _record(source_type: str, sources: dict):
+        def _on_batch(batch):
+            try:
+                rag_sync.record(collection, [(c["id"], source_type, sources[c["id"]], c) for c in batch])
+            except Exception as e:
+                logger.warning(f"[RAG_SYNC] state record failed (chunks re-sent next run): {e}")
+        return _on_batch
 
-    # POST to Portfolio RAG /ingest/custom in batches of 25
-    import asyncio
-    batch_size = 25
-    total_ingested = 0
     headers = {"Content-Type": "application/json", "x-api-key": api_key}
-
+    progress = _sync_progress_writer(mode, sync_start)
+    ingest_stats = {}
+    uat_ok = True
+    client = http_clients.get_client(http_clients.PORTFOLIO_RAG)
+    pipeline = rag_ingest.IngestPipeline(
+        client, f"{RAG_BASE}/ingest/custom", headers=headers,
+        collection=collection, checkpoints=checkpoints, timeout=SYNC_TIMEOUT,
+    )
     try:
-        async with httpx.AsyncClient(timeout=SYNC_TIMEOUT) as client:
-            for i in range(0, len(chunks), batch_size):
-                batch = chunks[i : i + batch_size]
-                do_replace = i == 0  # only replace on first batch
-                payload = {
-                    "collection": "metapm",
-                    "replace_collection": do_replace,
-                    "chunks": batch,
-                }
-                resp = await client.post(
-                    f"{RAG_BASE}/ingest/custom",
-                    json=payload,
-                    headers=headers,
-                )
-                resp.raise_for_status()
-                result = resp.json()
-                total_ingested += result.get("chunks_ingested", len(batch))
-                logger.info(f"RAG sync batch {i // batch_size + 1}: {len(batch)} chunks (replace={do_replace})")
-                # Pause between batches to avoid rate limits
-                if i + batch_size < len(chunks):
-                    await asyncio.sleep(2)
-    except httpx.HTTPStatusError as e:
-        logger.error(f"RAG sync ingest failed at chunk {i}: {e.response.text}")
+        req_result = await pipeline.run(
+            req_chunks, replace_collection=not incremental, job=req_job,
+            on_batch=_record("requirement", req_source),
+            on_progress=lambda done, total: progress("requirements", done, total),
+        )
+    except rag_ingest.IngestError as e:
+        logger.error(f"RAG sync ingest failed after {e.done}/{e.total} batches: {e}")
+        _write_governance_kv("rag_sync_last_run", {
+            "status": "failed", "mode": mode, "phase": "requirements",
+            "batches_done": e.done, "batches_total": e.total, "resumable": True,
+            "error": str(e), "timestamp": sync_start.isoformat(),
+        })
         raise HTTPException(
-            status_code=e.response.status_code,
-            detail=f"RAG ingest failed at batch {i // batch_size + 1}: {e}"
+            status_code=502,
+            detail=f"RAG ingest failed after {e.done}/{e.total} batches (re-run resumes): {e}"
         )
-    except Exception as e:
-        logger.error(f"RAG sync error: {e}")
-        raise HTTPException(status_code=502, detail=f"RAG service error: {e}")
-
+    ingest_stats["requirements"] = req_result.as_dict()
+    total_ingested = req_result.chunks_ingested
     logger.info(f"RAG sync complete: {total_ingested} requirements synced to metapm collection")
     req_ingested = total_ingested
 
-    # GROUP 4 (MP-MEGA-005): Sync UAT records (cc_spec, not archived) to metapm collection
-    try:
-        uat_rows = execute_query("""
-            SELECT id, project, sprint_code, pth, version, status,
-                   test_cases_json, general_notes, pl_submitted_at, spec_locked_at
-            FROM uat_pages
-            WHERE spec_source = 'cc_spec' AND status != 'archived'
-            ORDER BY spec_locked_at DESC
-        """, fetch="all")
-    except Exception as e:
-        logger.warning(f"RAG sync UAT query failed (non-fatal): {e}")
-        uat_rows = []
-
-    if uat_rows:
-        uat_chunks = []
-        for row in uat_rows:
-            tc_json = json.loads(row.get("test_cases_json") or "[]") if row.get("test_cases_json") else []
-            tc_lines = "\n".join(
-                f"  {tc.get('id','')} [{tc.get('status','pending').upper()}]: {tc.get('title','')} — {tc.get('notes','') or ''}"
-                for tc in tc_json
-            )
-            passed = sum(1 for t in tc_json if t.get("status") == "pass")
-            failed = sum(1 for t in tc_json if t.get("status") == "fail")
-            text = (
-                f"UAT: {row.get('pth','')} | {row.get('project','')} v{row.get('version','')}\n"
-                f"Sprint: {row.get('sprint_code','')}\n"
-                f"Status: {row.get('status','')}\n"
-                f"Results: {passed} passed, {failed} failed\n"
-                f"Test cases:\n{tc_lines}\n"
-                f"General notes: {row.get('general_notes','') or ''}\n"
-                f"URL: https://metapm.rentyourcio.com/uat/{row['id']}"
+    if uat_chunks:
+        try:
+            uat_result = await pipeline.run(
+                uat_chunks, job=uat_job, on_batch=_record("uat", uat_source),
+                on_progress=lambda done, total: progress("uats", done, total),
             )
-            uat_chunks.append({
-                "id": f"metapm::uat::{row['id']}",
-                "content": text,
-                "metadata": {
-                    "source": "MetaPM-UAT",
-                    "pth": row.get("pth") or "",
-                    "project": row.get("project") or "",
-                    "status": row.get("status") or "",
-                    "version": row.get("version") or "",
-                },
-            })
+            ingest_stats["uats"] = uat_result.as_dict()
+            total_ingested += uat_result.chunks_ingested
+            logger.info(f"RAG sync UAT: {total_ingested - req_ingested} UAT records synced")
+        except rag_ingest.IngestError as e:
+            uat_ok = False
+            logger.warning(f"RAG sync UAT ingest failed after {e.done}/{e.total} batches (non-fatal): {e}")
 
+    deleted = 0
+    if deleted_ids:
         try:
-            async with httpx.AsyncClient(timeout=SYNC_TIMEOUT) as client:
-                for i in range(0, len(uat_chunks), batch_size):
-                    batch = uat_chunks[i: i + batch_size]
-                    payload = {
-                        "collection": "metapm",
-                        "replace_collection": False,
-                        "chunks": batch,
-                    }
-                    resp = await client.post(
-                        f"{RAG_BASE}/ingest/custom",
-                        json=payload,
-                        headers=headers,
-                    )
-                    resp.raise_for_status()
-                    result = resp.json()
-                    total_ingested += result.get("chunks_ingested", len(batch))
-                    if i + batch_size < len(uat_chunks):
-                        await asyncio.sleep(1)
-            logger.info(f"RAG sync UAT: {total_ingested - req_ingested} UAT records synced")
+            client = http_clients.get_client(http_clients.PORTFOLIO_RAG)
+            resp = await client.post(
+                f"{RAG_BASE}/ingest/custom",
+                json={"collection": collection, "replace_collection": False,
+                      "chunks": [], "delete_ids": deleted_ids},
+                headers=headers,
+                timeout=SYNC_TIMEOUT,
+            )
+            resp.raise_for_status()
+            rag_sync.forget(collection, deleted_ids)
+            deleted = len(deleted_ids)
         except Exception as e:
-            logger.warning(f"RAG sync UAT ingest failed (non-fatal): {e}")
+            logger.warning(f"RAG sync delete failed (retried next run): {e}")
+
+    # Advance watermarks only past what was actually pushed
+    new_marks = dict(marks)
+    new_marks["requirement"] = _max_ts(rows, "updated_at", marks.get("requirement"))
+    if uat_ok:
+        new_marks["uat"] = _max_ts(uat_rows, "changed_at", marks.get("uat"))
+    try:
+        rag_sync.set_watermarks(collection, new_marks)
+    except Exception as e:
+        logger.warning(f"[RAG_SYNC] watermark write failed (non-fatal): {e}")
 
     elapsed = (datetime.now(timezone.utc) - sync_start).total_seconds()
-    logger.info(f"[RAG_SYNC] Complete — synced={total_ingested} requirements={req_ingested} "
-                f"uats={total_ingested - req_ingested} elapsed={elapsed:.1f}s")
-    _write_governance_kv("rag_sync_last_run", {
-        "status": "success",
+    logger.info(f"[RAG_SYNC] Complete ({mode}) — synced={total_ingested} requirements={req_ingested} "
+                f"uats={total_ingested - req_ingested} unchanged={unchanged} deleted={deleted} "
+                f"elapsed={elapsed:.1f}s")
+    summary = {
+        "mode": mode,
         "synced": total_ingested,
         "synced_requirements": req_ingested,
         "synced_uats": total_ingested - req_ingested,
+        "unchanged": unchanged,
+        "deleted": deleted,
         "elapsed_seconds": round(elapsed, 1),
-        "timestamp": sync_start.isoformat(),
-    })
-    return {
-        "synced": total_ingested,
-        "synced_requirements": req_ingested,
-        "synced_uats": total_ingested - req_ingested,
-        "elapsed_seconds": round(elapsed, 1),
-        "collection": "metapm",
-        "timestamp": sync_start.isoformat(),
+        "ingest": ingest_stats,
     }
+    _write_governance_kv("rag_sync_last_run", {
+        "status": "success", **summary, "timestamp": sync_start.isoformat(),
+    })
+    rag_proxy.invalidate()
+    return {**summary, "collection": collection, "timestamp": sync_start.isoformat()}
 
 
-@router.get("/search/knowledge")
-async def search_knowledge(q: str = Query(..., min_length=1), limit: int = 20):
-    """Full-text search across MetaPM requirements and compliance docs.
-    Replaces Portfolio RAG for project knowledge queries. No RAG latency.
-    Falls back to LIKE-based search if SQL Server full-text index not enabled.
-    """
-    limit = min(max(limit, 1), 50)
+def _knowledge_results(q: str, limit: int) -> list:
+    """Requirements + compliance docs from the search index, best match first."""
+    hits = search_index.search(
+        q, sources=(search_index.REQUIREMENT, search_index.COMPLIANCE_DOC), limit=limit
+    )
     results = []
+    for score, doc in hits:
+        p = doc.payload
+        if doc.source == search_index.REQUIREMENT:
+            results.append({
+                "source_type": "requirement", "code": p["code"], "title": p["title"],
+                "description": p["description"], "project_code": p["project_code"],
+                "status": p["status"], "score": round(score, 3),
+            })
+        else:
+            results.append({
+                "source_type": "compliance_doc", "code": p["id"], "title": p["id"],
+                "description": p["content_md"], "project_code": p["project_code"],
+                "status": p["doc_type"], "score": round(score, 3),
+            })
+    return results
 
-    # Try CONTAINS() full-text search first; fall back to LIKE if FTS not enabled
-    try:
-        rows = execute_query(
-            """
-            SELECT TOP 20
-              'requirement' AS source_type,
-              r.code,
-              r.title,
-              r.description,
-              p.code AS project_code,
-              r.status
-            FROM roadmap_requirements r
-            JOIN roadmap_projects p ON r.project_id = p.id
-            WHERE CONTAINS((r.title, r.description), ?)
-            UNION ALL
-            SELECT TOP 10
-              'compliance_doc' AS source_type,
-              c.id AS code,
-              c.id AS title,
-              c.content_md AS description,
-              c.project_code,
-              c.doc_type AS status
-            FROM compliance_docs c
-            WHERE CONTAINS(c.content_md, ?)
-            ORDER BY source_type
-            """,
-            (q, q),
-            fetch="all",
+
+def _lesson_keyword_results(q: str, limit: int) -> list:
+    results = []
+    for score, doc in search_index.search(q, sources=(search_index.LESSON,), limit=limit):
+        p = doc.payload
+        results.append({
+            "source_type": "lesson", "code": p["id"], "title": p.get("source_sprint") or p["id"],
+            "description": p.get("lesson"), "project_code": p.get("project"),
+            "status": p.get("status"), "category": p.get("category"), "score": round(score, 3),
+        })
+    return results
+
+
+def _hybrid_results(collection: str, q: str, limit: int) -> Optional[list]:
+    """
+    Blend local cosine similarity with keyword scores for one collection.
+    score = α·cosine + (1-α)·keyword/max(keyword), α = VECTOR_HYBRID_ALPHA.
+    Keyword hits come from the BM25 index (metapm also keeps compliance docs,
+    which have no vectors). Returns None when the vector store isn't available.
+    """
+    vec_hits = vector_index.query(collection, q, k=limit * 2)
+    if vec_hits is None:
+        return None
+    if collection == "lessons":
+        keyword = [] if fulltext.use_fulltext_backend() else _lesson_keyword_results(q, limit * 2)
+    elif fulltext.use_fulltext_backend():
+        keyword, _method = _knowledge_sql(q, limit * 2)
+    else:
+        keyword = _knowledge_results(q, limit * 2)
+
+    alpha = settings.VECTOR_HYBRID_ALPHA
+    max_kw = max((float(r.get("score") or 0) for r in keyword), default=0.0) or 1.0
+    merged = {}
+    for r in keyword:
+        kw = float(r.get("score") or 0) / max_kw
+        merged[(r["source_type"], r["code"])] = {
+            **r, "keyword_score": round(kw, 3), "vector_score": 0.0,
+        }
+    for cos, _key, payload in vec_hits:
+        entry = merged.setdefault(
+            (payload["source_type"], payload["code"]), {**payload, "keyword_score": 0.0}
         )
-        results = [dict(r) for r in rows] if rows else []
-        search_method = "full_text"
-    except Exception as fts_err:
-        logger.warning(f"CONTAINS() failed (FTS not enabled?), falling back to LIKE: {fts_err}")
+        entry["vector_score"] = round(cos, 3)
+    for entry in merged.values():
+        entry["score"] = round(alpha * entry["vector_score"] + (1 - alpha) * entry["keyword_score"], 3)
+    return sorted(merged.values(), key=lambda r: r["score"], reverse=True)[:limit]
+
+
+def _knowledge_sql(q: str, limit: int):
+    """SQL path for knowledge search: CONTAINSTABLE ranking when full-text
+    indexes exist, else the per-word LIKE scan. Returns (results, method)."""
+    cond = fulltext.contains_query(q, mode="any")
+    if cond and fulltext.available("roadmap_requirements") and fulltext.available("compliance_docs"):
         try:
-            # Build per-word OR conditions for better recall on multi-word queries
-            words = [w.strip() for w in q.split() if len(w.strip()) >= 2]
-            if not words:
-                words = [q]
-            req_conditions = " OR ".join(
-                f"(r.title LIKE ? OR r.description LIKE ?)" for _ in words
-            )
-            doc_conditions = " OR ".join(f"c.content_md LIKE ?" for _ in words)
-            req_params = []
-            for w in words:
-                req_params.extend([f"%{w}%", f"%{w}%"])
-            doc_params = [f"%{w}%" for w in words]
             rows = execute_query(
                 f"""
-                SELECT TOP 20
-                  'requirement' AS source_type,
-                  r.code,
-                  r.title,
-                  r.description,
-                  p.code AS project_code,
-                  r.status
-                FROM roadmap_requirements r
-                JOIN roadmap_projects p ON r.project_id = p.id
-                WHERE {req_conditions}
-                UNION ALL
-                SELECT TOP 10
-                  'compliance_doc' AS source_type,
-                  c.id AS code,
-                  c.id AS title,
-                  c.content_md AS description,
-                  c.project_code,
-                  c.doc_type AS status
-                FROM compliance_docs c
-                WHERE {doc_conditions}
-                ORDER BY source_type
+                SELECT TOP (?) * FROM (
+                    SELECT
+                      'requirement' AS source_type,
+                      r.code,
+                      r.title,
+                      r.description,
+                      p.code AS project_code,
+                      r.status,
+                      ft.RANK AS score
+                    FROM {fulltext.containstable("roadmap_requirements", ("title", "description"))} ft
+                    JOIN roadmap_requirements r ON r.id = ft.[KEY]
+                    JOIN roadmap_projects p ON r.project_id = p.id
+                    UNION ALL
+                    SELECT
+                      'compliance_doc' AS source_type,
+                      c.id AS code,
+                      c.id AS title,
+                      c.content_md AS description,
+                      c.project_code,
+                      c.doc_type AS status,
+                      ft.RANK AS score
+                    FROM {fulltext.containstable("compliance_docs", ("content_md",))} ft
+                    JOIN compliance_docs c ON c.id = ft.[KEY]
+                ) hits
+                ORDER BY score DESC
                 """,
-                tuple(req_params + doc_params),
+                (limit, cond, cond),
                 fetch="all",
             )
-            results = [dict(r) for r in rows] if rows else []
-            search_method = "like"
-        except Exception as like_err:
-            logger.error(f"Knowledge search failed: {like_err}")
-            raise HTTPException(status_code=500, detail=f"Search failed: {like_err}")
+            return [dict(r) for r in rows] if rows else [], "full_text"
+        except Exception as fts_err:
+            logger.warning(f"CONTAINSTABLE failed, falling back to LIKE: {fts_err}")
+
+    # Build per-word OR conditions for better recall on multi-word queries
+    words = [w.strip() for w in q.split() if len(w.strip()) >= 2]
+    if not words:
+        words = [q]
+    req_conditions = " OR ".join(
+        f"(r.title LIKE ? OR r.description LIKE ?)" for _ in words
+    )
+    doc_conditions = " OR ".join(f"c.content_md LIKE ?" for _ in words)
+    req_params = []
+    for w in words:
+        req_params.extend([f"%{w}%", f"%{w}%"])
+    doc_params = [f"%{w}%" for w in words]
+    rows = execute_query(
+        f"""
+        SELECT TOP 20
+          'requirement' AS source_type,
+          r.code,
+          r.title,
+          r.description,
+          p.code AS project_code,
+          r.status
+        FROM roadmap_requirements r
+        JOIN roadmap_projects p ON r.project_id = p.id
+        WHERE {req_conditions}
+        UNION ALL
+        SELECT TOP 10
+          'compliance_doc' AS source_type,
+          c.id AS code,
+          c.id AS title,
+          c.content_md AS description,
+          c.project_code,
+          c.doc_type AS status
+        FROM compliance_docs c
+        WHERE {doc_conditions}
+        ORDER BY source_type
+        """,
+        tuple(req_params + doc_params),
+        fetch="all",
+    )
+    return [dict(r) for r in rows] if rows else [], "like"
+
+
+@router.get("/rag/outbox")
+async def rag_outbox_status():
+    """Pending and dead-lettered lesson/UAT ingests waiting on Portfolio RAG."""
+    try:
+        return rag_outbox.stats()
+    except Exception as e:
+        logger.error(f"RAG outbox stats error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
 
-    return {
-        "query": q,
-        "total": len(results),
-        "search_method": search_method,
-        "results": results[:limit],
-    }
+
+@router.post("/rag/outbox/retry")
+async def rag_outbox_retry(source_type: Optional[str] = None):
+    """Re-queue dead-lettered outbox rows (optionally one source_type)."""
+    try:
+        return {"requeued": rag_outbox.retry_dead(source_type)}
+    except Exception as e:
+        logger.error(f"RAG outbox retry error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/search/knowledge")
+async def search_knowledge(q: str = Query(..., min_length=1), limit: int = 20):
+    """Ranked search across MetaPM requirements and compliance docs.
+    Replaces Portfolio RAG for project knowledge queries. No RAG latency.
+    Served from the in-process BM25 index (app/services/search_index.py);
+    supports word*, "phrases" and project:/status:/type: filters. With
+    SEARCH_BACKEND=fulltext, or if the index cannot be built, uses SQL
+    CONTAINSTABLE and falls back to LIKE when full-text isn't available.
+    """
+    limit = min(max(limit, 1), 50)
+    cache_key = search_cache.key("knowledge", q, limit=limit)
+    cached = search_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    response = None
+    if not fulltext.use_fulltext_backend():
+        try:
+            results = await asyncio.to_thread(_knowledge_results, q, limit)
+            response = {"query": q, "total": len(results), "search_method": "bm25", "results": results}
+        except Exception as idx_err:
+            logger.warning(f"Knowledge index unavailable, falling back to SQL: {idx_err}")
+
+    if response is None:
+        try:
+            results, search_method = await asyncio.to_thread(_knowledge_sql, q, limit)
+        except Exception as sql_err:
+            logger.error(f"Knowledge search failed: {sql_err}")
+            raise HTTPException(status_code=500, detail=f"Search failed: {sql_err}")
+        response = {
+            "query": q,
+            "total": len(results),
+            "search_method": search_method,
+            "results": results[:limit],
+        }
+
+    search_cache.put(cache_key, response, _KNOWLEDGE_ENTITIES)
+    return response
+
+
+_KNOWLEDGE_ENTITIES = (change_hooks.REQUIREMENT, change_hooks.PROJECT, change_hooks.COMPLIANCE_DOC)
+
+
+@router.get("/search/index")
+async def search_index_status():
+    """Document and term counts for the in-process knowledge index."""
+    return search_index.stats()
+
+
+@router.post("/search/index/rebuild")
+async def rebuild_search_index():
+    """Rebuild the knowledge index from the database and swap it in."""
+    try:
+        await asyncio.to_thread(search_index.rebuild)
+        return {"success": True, **search_index.stats()}
+    except Exception as e:
+        logger.error(f"Search index rebuild failed: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/search/vectors")
+async def vector_index_status():
+    """Vector counts and embedder per collection for the local semantic index."""
+    return vector_index.stats()
+
+
+@router.post("/search/vectors/rebuild")
+async def rebuild_vector_index(collection: Optional[str] = None):
+    """Re-embed one collection (metapm, lessons) or all of them."""
+    if not vector_index.enabled():
+        raise HTTPException(status_code=409, detail="Local vector search is disabled (VECTOR_SEARCH or NumPy missing)")
+    if collection and collection not in vector_index.COLLECTIONS:
+        raise HTTPException(status_code=400, detail=f"Unknown collection: {collection}")
+    try:
+        for name in [collection] if collection else list(vector_index.COLLECTIONS):
+            await asyncio.to_thread(vector_index.build, name)
+        return {"success": True, **vector_index.stats()}
+    except Exception as e:
+        logger.error(f"Vector index rebuild failed: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/typeahead")
+async def typeahead_lookup(
+    q: str = Query(..., min_length=1, description="Code, PTH, sprint ID or title prefix"),
+    limit: int = Query(10, ge=1, le=50),
+    kinds: Optional[str] = Query(None, description="Comma-separated: requirement,pth,sprint,project,lesson"),
+):
+    """Autocomplete over the in-memory prefix index: exact code, then prefix, then title token."""
+    try:
+        kind_list = [k.strip() for k in kinds.split(",") if k.strip()] if kinds else None
+        started = time.perf_counter()
+        results = await asyncio.to_thread(typeahead.suggest, q, limit=limit, kinds=kind_list)
+        return {
+            "query": q,
+            "results": results,
+            "took_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+    except Exception as e:
+        logger.error(f"Typeahead failed: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/typeahead/index")
+async def typeahead_index_status():
+    """Entry counts for the typeahead index."""
+    return typeahead.stats()
+
+
+@router.post("/typeahead/index/rebuild")
+async def rebuild_typeahead_index():
+    """Reload the typeahead index from the database and swap it in."""
+    try:
+        await asyncio.to_thread(typeahead.rebuild)
+        return {"success": True, **typeahead.stats()}
+    except Exception as e:
+        logger.error(f"Typeahead rebuild failed: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
 
 
 ALLOWED_COLLECTIONS = {"portfolio", "etymology", "code", "jazz_theory", "metapm"}
@@ -537,20 +865,22 @@ async def tools_ingest(
         }
 
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                resp = await client.post(
-                    f"{RAG_BASE}/ingest/custom",
-                    json=payload,
-                    headers=headers,
-                )
-                resp.raise_for_status()
-                result = resp.json()
+            client = http_clients.get_client(http_clients.PORTFOLIO_RAG)
+            resp = await client.post(
+                f"{RAG_BASE}/ingest/custom",
+                json=payload,
+                headers=headers,
+                timeout=60.0,
+            )
+            resp.raise_for_status()
+            result = resp.json()
         except httpx.HTTPStatusError as e:
             raise HTTPException(status_code=e.response.status_code, detail=f"RAG ingest error: {e.response.text}")
         except Exception as e:
             logger.error(f"Tools ingest proxy error: {e}")
             raise HTTPException(status_code=502, detail=f"RAG service error: {e}")
 
+        rag_proxy.invalidate()
         chunks_ingested = result.get("ingested", result.get("count", 1))
         return {
             "status": "ingested",
@@ -563,20 +893,22 @@ async def tools_ingest(
     elif url:
         # Forward URL ingest request
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                resp = await client.post(
-                    f"{RAG_BASE}/ingest/url",
-                    json={"url": url, "collection": collection},
-                    headers={**headers, "Content-Type": "application/json"},
-                )
-                resp.raise_for_status()
-                result = resp.json()
+            client = http_clients.get_client(http_clients.PORTFOLIO_RAG)
+            resp = await client.post(
+                f"{RAG_BASE}/ingest/url",
+                json={"url": url, "collection": collection},
+                headers={**headers, "Content-Type": "application/json"},
+                timeout=60.0,
+            )
+            resp.raise_for_status()
+            result = resp.json()
         except httpx.HTTPStatusError as e:
             raise HTTPException(status_code=e.response.status_code, detail=f"RAG ingest error: {e.response.text}")
         except Exception as e:
             logger.error(f"Tools ingest URL proxy error: {e}")
             raise HTTPException(status_code=502, detail=f"RAG service error: {e}")
 
+        rag_proxy.invalidate()
         return {
             "status": "ingested",
             "source_id": url,
@@ -12,6 +12,7 @@ from pydantic import BaseModel
 from fastapi import APIRouter, HTTPException, Query, UploadFile, File, Form
 from fastapi.responses import PlainTextResponse
 
+from app.core import change_hooks
 from app.core.database import execute_query
 from app.schemas.roadmap import (
     ProjectCreate, ProjectUpdate, ProjectResponse, ProjectListResponse,
@@ -187,6 +188,7 @@ async def create_project(project: ProjectCreate):
             project.current_version, project.status.value, project.repo_url, project.deploy_url,
             project.category_id
         ), fetch="none")
+        change_hooks.notify_change(change_hooks.PROJECT, [project.id])
 
         return await get_project(project.id)
     except Exception as e:
@@ -239,6 +241,7 @@ async def update_project(project_id: str, update: ProjectUpdate):
         execute_query(f"""
             UPDATE roadmap_projects SET {", ".join(set_clauses)} WHERE id = ?
         """, tuple(params), fetch="none")
+        change_hooks.notify_change(change_hooks.PROJECT, [project_id])
 
         return await get_project(project_id)
     except HTTPException:
@@ -274,6 +277,7 @@ async def delete_project(project_id: str):
             )
 
         execute_query("DELETE FROM roadmap_projects WHERE id = ?", (project_id,), fetch="none")
+        change_hooks.notify_change(change_hooks.PROJECT, [project_id])
     except HTTPException:
         raise
     except Exception as e:
@@ -442,12 +446,17 @@ async def delete_sprint(sprint_id: str):
         if not sprint:
             raise HTTPException(status_code=404, detail="Sprint not found")
 
+        unassigned = execute_query(
+            "SELECT id FROM roadmap_requirements WHERE sprint_id = ?", (sprint_id,), fetch="all"
+        ) or []
         execute_query(
             "UPDATE roadmap_requirements SET sprint_id = NULL, updated_at = GETDATE() WHERE sprint_id = ?",
             (sprint_id,),
             fetch="none"
         )
         execute_query("DELETE FROM roadmap_sprints WHERE id = ?", (sprint_id,), fetch="none")
+        if unassigned:
+            change_hooks.notify_change(change_hooks.REQUIREMENT, [r["id"] for r in unassigned])
     except HTTPException:
         raise
     except Exception as e:
@@ -690,6 +699,7 @@ async def create_requirement(req: RequirementCreate):
             req.sprint_id, req.handoff_id, req.uat_id
         ), fetch="none")
 
+        change_hooks.notify_change(change_hooks.REQUIREMENT, [req.id])
         return await get_requirement(req.id)
     except Exception as e:
         logger.error(f"Error creating requirement: {e}")
@@ -754,6 +764,7 @@ async def update_requirement(requirement_id: str, update: RequirementUpdate):
             UPDATE roadmap_requirements SET {", ".join(set_clauses)} WHERE id = ?
         """, tuple(params), fetch="none")
 
+        change_hooks.notify_change(change_hooks.REQUIREMENT, [requirement_id])
         return await get_requirement(requirement_id)
     except HTTPException:
         raise
@@ -841,6 +852,7 @@ async def delete_requirement(requirement_id: str):
     """Delete a requirement."""
     try:
         execute_query("DELETE FROM roadmap_requirements WHERE id = ?", (requirement_id,), fetch="none")
+        change_hooks.notify_change(change_hooks.REQUIREMENT, [requirement_id])
     except Exception as e:
         logger.error(f"Error deleting requirement: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1167,6 +1179,7 @@ async def seed_roadmap_data():
                 INSERT INTO roadmap_requirements (id, project_id, code, title, type, priority, status, target_version)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """, r, fetch="none")
+        change_hooks.notify_change(change_hooks.REQUIREMENT, [r[0] for r in requirements])
 
         return {"message": "Seed data created", "projects": len(projects), "requirements": len(requirements)}
     except Exception as e:
@@ -1587,6 +1600,7 @@ async def auto_close_requirement(requirement_id: str):
             UPDATE roadmap_requirements SET status = 'closed', updated_at = GETDATE()
             WHERE id = ?
         """, (requirement_id,), fetch="none")
+        change_hooks.notify_change(change_hooks.REQUIREMENT, [requirement_id])
 
         return {"message": f"Requirement {requirement_id} auto-closed to closed", "previous_status": req['status']}
     except HTTPException:
@@ -1656,6 +1670,7 @@ async def assign_pth(requirement_id: str, body: PthAssignRequest = None):
             "UPDATE roadmap_requirements SET pth = ?, updated_at = GETDATE() WHERE id = ?",
             (pth_value, requirement_id), fetch="none"
         )
+        change_hooks.notify_change(change_hooks.REQUIREMENT, [requirement_id])
 
         # Insert into registry
         execute_query("""
@@ -1746,6 +1761,8 @@ async def transition_requirement_status(requirement_id: str, body: StatusTransit
         """, (body.changed_by, body.sprint_id, body.notes,
               requirement_id, current_status, new_status), fetch="none")
 
+        change_hooks.notify_change(change_hooks.REQUIREMENT, [requirement_id])
+
         # Get the history entry ID
         history_row = execute_query("""
             SELECT TOP 1 id FROM requirement_history
@@ -1803,7 +1820,10 @@ async def batch_transition_status(body: BatchStatusRequest):
 
             results.append({"id": req_id, "code": req['code'], "status": new_status, "previous": current_status})
 
-        return {"updated": len([r for r in results if 'status' in r]), "results": results}
+        updated_ids = [r["id"] for r in results if 'status' in r]
+        if updated_ids:
+            change_hooks.notify_change(change_hooks.REQUIREMENT, updated_ids)
+        return {"updated": len(updated_ids), "results": results}
     except Exception as e:
         logger.error(f"Error batch updating status: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1901,6 +1921,7 @@ async def update_requirement_state(req_id: str, body: StateTransition):
             (new_status, req_id), fetch="none"
         )
 
+        change_hooks.notify_change(change_hooks.REQUIREMENT, [req_id])
         checkpoint = hashlib.sha256(f"{req_id}:{new_status}".encode()).hexdigest()[:4].upper()
         return {"id": req_id, "status": new_status, "checkpoint": checkpoint}
     except HTTPException:
@@ -10,6 +10,7 @@ from typing import List, Optional
 from pydantic import BaseModel, Field
 from fastapi import APIRouter, Query
 
+from app.core import change_hooks
 from app.core.database import execute_query
 
 logger = logging.getLogger(__name__)
@@ -55,6 +56,7 @@ async def seed_requirements(
     skipped = 0
     updated = 0
     errors = []
+    changed_ids = []
 
     for item in items:
         try:
@@ -81,6 +83,7 @@ async def seed_requirements(
                     item.status, item.priority, item.type,
                     item.pth, item.code
                 ), fetch="none")
+                changed_ids.append(existing["id"])
                 updated += 1
                 continue
 
@@ -95,12 +98,15 @@ async def seed_requirements(
                 item.description, item.type, item.priority, item.status,
                 item.pth
             ), fetch="none")
+            changed_ids.append(req_id)
             created += 1
 
         except Exception as e:
             errors.append({"code": item.code, "reason": str(e)})
             logger.warning(f"Seed requirement {item.code} failed: {e}")
 
+    if changed_ids:
+        change_hooks.notify_change(change_hooks.REQUIREMENT, changed_ids)
     logger.info(f"Seed requirements: created={created} skipped={skipped} updated={updated} errors={len(errors)}")
     return {
         "created": created,
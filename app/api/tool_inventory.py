@@ -10,10 +10,10 @@ MP47 REQ-085: Self-documenting MCP tool inventory.
 import logging
 from typing import List, Optional
 
-import httpx
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 
+from app.core import http_clients
 from app.core.config import settings
 from app.core.database import execute_query
 
@@ -37,14 +37,13 @@ def _portfolio_rag_live_tool_names() -> Optional[List[str]]:
     """Best-effort live query of Portfolio RAG tools/list. Returns None on error."""
     url = "https://portfolio-rag-57478301787.us-central1.run.app/mcp/tools/list"
     try:
-        with httpx.Client(timeout=5.0) as client:
-            r = client.get(url)
-            if r.status_code != 200:
-                return None
-            data = r.json()
-            tools = data.get("tools") or data.get("result", {}).get("tools") or []
-            names = [t["name"] for t in tools if isinstance(t, dict) and t.get("name")]
-            return names or None
+        r = http_clients.get_sync_client(http_clients.PORTFOLIO_RAG).get(url, timeout=5.0)
+        if r.status_code != 200:
+            return None
+        data = r.json()
+        tools = data.get("tools") or data.get("result", {}).get("tools") or []
+        names = [t["name"] for t in tools if isinstance(t, dict) and t.get("name")]
+        return names or None
     except Exception as e:
         logger.info(f"Portfolio RAG live tools/list unreachable (falling back to curated): {e}")
         return None
@@ -2,6 +2,8 @@
 UAT Generation API — MP-UAT-GEN
 Endpoints for generating and serving UAT pages.
 """
+import asyncio
+import hashlib
 import json
 import logging
 import uuid as _uuid_mod
@@ -9,9 +11,12 @@ from datetime import datetime
 from typing import Optional, List
 from pydantic import BaseModel, Field
 from fastapi import APIRouter, HTTPException, Query, Request
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, Response, StreamingResponse
 
-from app.core.database import execute_query
+from app.core import change_hooks, compression, static_assets
+from app.core.cache import TTLCache
+from app.core.database import execute_query, get_db
+from app.services import bv_items, fulltext, search_cache, search_index, uat_templates, verification_service
 from app.services.uat_generator import generate_test_cases, render_uat_html
 from app.schemas.mcp import UATResultsUpdate, BulkArchiveRequest, BulkCloseRequest
 
@@ -160,22 +165,26 @@ async def generate_uat(body: UATGenerateRequest):
             linked_requirements=linked_requirements,
             feature_title=feature_title
         )
-        execute_query("""
-            UPDATE uat_pages
-            SET test_cases_json = ?, cai_review_json = ?, html_content = ?,
-                sprint_code = ?, pth = ?, version = ?, deploy_url = ?,
-                status = 'ready'
-            WHERE id = ?
-        """, (
-            json.dumps(test_cases),
-            json.dumps(body.cai_review) if body.cai_review else None,
-            html,
-            body.sprint_code,
-            body.pth,
-            version,
-            body.deploy_url,
-            uat_id
-        ), fetch="none")
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE uat_pages
+                SET test_cases_json = ?, cai_review_json = ?, html_content = ?, html_content_z = ?,
+                    html_norm_version = NULL, sprint_code = ?, pth = ?, version = ?, deploy_url = ?,
+                    status = 'ready'
+                WHERE id = ?
+            """, (
+                json.dumps(test_cases),
+                json.dumps(body.cai_review) if body.cai_review else None,
+                *compression.split(html),
+                body.sprint_code,
+                body.pth,
+                version,
+                body.deploy_url,
+                uat_id
+            ))
+            # New test cases start without results
+            bv_items.seed(cursor, uat_id, test_cases)
         logger.info(f"Updated UAT page {uat_id} for handoff {body.handoff_id}")
     else:
         # Create new — get the ID via OUTPUT
@@ -216,11 +225,12 @@ async def generate_uat(body: UATGenerateRequest):
             feature_title=feature_title
         )
         execute_query(
-            "UPDATE uat_pages SET html_content = ? WHERE id = ?",
-            (html, uat_id), fetch="none"
+            "UPDATE uat_pages SET html_content = ?, html_content_z = ?, html_norm_version = NULL WHERE id = ?",
+            (*compression.split(html), uat_id), fetch="none"
         )
         logger.info(f"Created UAT page {uat_id} for handoff {body.handoff_id}")
 
+    change_hooks.notify_change(change_hooks.UAT_PAGE, [uat_id])
     uat_url = f"https://metapm.rentyourcio.com/uat/{uat_id}"
     return UATGenerateResponse(
         uat_id=uat_id,
@@ -241,110 +251,23 @@ async def submit_uat_redirect(uat_id: str):
     return RedirectResponse(url=f"/uat/{uat_id}", status_code=302)
 
 
-@router.get("/uat/{uat_id}")
-async def serve_uat_page(request: Request, uat_id: str):
-    """Serve the UAT HTML page.
-
-    For cc_spec UATs: requires Google OAuth PL session (cprator@cbsware.com).
-    For legacy UATs: no auth required (existing behavior).
-
-    Lookup chain: uat_pages.id → uat_pages.handoff_id →
-    uat_results.id→handoff_id→uat_pages → render fallback from handoff data.
-    """
-    _validate_uuid(uat_id)
-    # 1. Primary: uat_pages by id
-    page = execute_query(
-        "SELECT id, project, html_content, status, pth, spec_source, spec_data, test_cases_json FROM uat_pages WHERE id = ?",
-        (uat_id,), fetch="one"
-    )
-
-    # Check for cc_spec auth BEFORE the legacy fallback chain
-    if page and page.get("spec_source") == "cc_spec":
-        from app.api.auth import is_pl_authenticated, get_session_email, render_login_required_page
-        if not is_pl_authenticated(request):
-            html = render_login_required_page(f"/uat/{uat_id}", uat_id)
-            return HTMLResponse(content=html, status_code=200)
-        # PL is authenticated — render interactive spec page
-        # Fetch full row including general_notes and pl_submitted_at
-        full_page = execute_query(
-            "SELECT id, project, spec_data, test_cases_json, general_notes, pl_submitted_at, status FROM uat_pages WHERE id = ?",
-            (uat_id,), fetch="one"
-        ) or page
-        from app.api.uat_spec import render_spec_uat_page
-        email = get_session_email(request) or ""
-        spec_data = json.loads(full_page.get("spec_data") or page.get("spec_data") or "{}") if (full_page.get("spec_data") or page.get("spec_data")) else {}
-        # BV-03 fix: inject project from uat_pages.project if spec_data lacks it
-        if not spec_data.get("project") and not spec_data.get("project_id"):
-            raw_proj = full_page.get("project") or page.get("project") or ""
-            if raw_proj:
-                spec_data["project"] = raw_proj
-        tc_json = json.loads(full_page.get("test_cases_json") or page.get("test_cases_json") or "[]") if (full_page.get("test_cases_json") or page.get("test_cases_json")) else []
-        # Strip to spec fields only (no result leakage for spec definition)
-        spec_tests = [
-            {"id": tc["id"], "title": tc["title"], "url": tc.get("url"),
-             "steps": tc.get("steps", []), "expected": tc.get("expected"),
-             "type": tc.get("type")}
-            for tc in tc_json
-            if not tc.get("id", "").startswith("_")
-        ]
-        general_notes = full_page.get("general_notes") or ""
-        is_submitted = bool(full_page.get("pl_submitted_at"))
-        html = render_spec_uat_page(
-            spec_id=uat_id,
-            spec_data=spec_data,
-            test_cases=spec_tests,
-            current_results=tc_json,
-            pl_email=email,
-            general_notes=general_notes,
-            is_submitted=is_submitted,
-            spec_status=full_page.get("status", "in_progress"),
-        )
-        return HTMLResponse(content=html)
-
-    # 2. Fallback: uat_pages by handoff_id
-    if not page:
-        page = execute_query(
-            "SELECT id, html_content, status, pth FROM uat_pages WHERE handoff_id = ?",
-            (uat_id,), fetch="one"
-        )
-
-    # 3. Fallback: uat_results.id → handoff_id → uat_pages
-    if not page:
-        uat_result = execute_query(
-            "SELECT handoff_id FROM uat_results WHERE id = ?",
-            (uat_id,), fetch="one"
-        )
-        if uat_result:
-            page = execute_query(
-                "SELECT id, html_content, status, pth FROM uat_pages WHERE handoff_id = ?",
-                (uat_result["handoff_id"],), fetch="one"
-            )
+# ── Legacy page serving ──────────────────────────────────────────────────────
+# Pages stored by older renderers get a set of regex/string rewrites before
+# they are served. That work is done once per page version: the rewritten
+# HTML is written back with html_norm_version, and rendered pages are kept in
+# an in-process LRU keyed on (page id, row_version). Bump the version when a
+# rewrite is added so stored pages are normalized again on their next view.
 
-    # 4. Last resort: render minimal page from handoff/uat_results data
-    if not page:
-        fallback = execute_query("""
-            SELECT u.id as result_id, u.status, u.total_tests, u.passed, u.failed,
-                   u.tested_by, u.tested_at, u.results_text,
-                   h.id as handoff_id, h.project, h.version
-            FROM uat_results u
-            JOIN mcp_handoffs h ON u.handoff_id = h.id
-            WHERE u.id = ? OR h.id = ?
-        """, (uat_id, uat_id), fetch="one")
-        if fallback:
-            return HTMLResponse(content=_render_fallback_uat(fallback))
-        raise HTTPException(404, "UAT page not found")
+UAT_HTML_NORM_VERSION = 1
 
-    # Mark as in_progress on first view
-    if page["status"] == "ready":
-        execute_query(
-            "UPDATE uat_pages SET status = 'in_progress' WHERE id = ?",
-            (page["id"],), fetch="none"
-        )
+_page_cache = TTLCache(maxsize=64, ttl=None)  # (page id, row_version) → (html, etag)
 
-    html = page["html_content"]
 
+def _normalize_stored_html(html: str, pth: Optional[str]) -> str:
+    """Apply the legacy-page rewrites. Idempotent: normalized HTML comes back unchanged."""
     # MP-UAT-DASHBOARD-FIX-001: Inject pre-populate script into existing pages
-    if 'loadSavedResults' not in html and '</script>' in html:
+    # (pages linking static/js/uat-structured.js already have it)
+    if 'loadSavedResults' not in html and 'uat-structured.' not in html and '</script>' in html:
         prepopulate_js = """
         // Pre-populate saved results on page load (injected by serve endpoint)
         (async function loadSavedResults() {
@@ -414,7 +337,7 @@ async def serve_uat_page(request: Request, uat_id: str):
 
     # MP-UAT-UI-001: Fix button labels — add PTH to Copy CC Link
     if 'Copy Results' in html or 'Copy CC Link' in html:
-        pth_col = page.get("pth") if "pth" in (page or {}) else None
+        pth_col = pth
         if not pth_col:
             # Try to extract PTH from page content
             pth_match = _re_serve.search(r'pth:\s*["\'](\w+)["\']', html)
@@ -427,7 +350,159 @@ async def serve_uat_page(request: Request, uat_id: str):
     if '>Submit to MetaPM<' in html:
         html = html.replace('>Submit to MetaPM<', '>Submit Final<')
 
-    return HTMLResponse(content=html)
+    return html
+
+
+def _resolve_uat_page(uat_id: str) -> Optional[dict]:
+    """
+    One round trip for the lookup chain uat_pages.id → uat_pages.handoff_id →
+    uat_results.id→handoff_id→uat_pages. Each branch is an index seek;
+    match_rank says which one hit. html_content is not fetched here.
+    """
+    return execute_query("""
+        SELECT TOP 1 p.id, p.project, p.status, p.pth, p.spec_source,
+               p.html_norm_version, p.row_version, m.match_rank
+        FROM (
+            SELECT 0 AS match_rank, id FROM uat_pages WHERE id = ?
+            UNION ALL
+            SELECT 1, id FROM uat_pages WHERE handoff_id = ?
+            UNION ALL
+            SELECT 2, up.id FROM uat_results r
+            JOIN uat_pages up ON up.handoff_id = r.handoff_id
+            WHERE r.id = ?
+        ) m
+        JOIN uat_pages p ON p.id = m.id
+        ORDER BY m.match_rank
+    """, (uat_id, uat_id, uat_id), fetch="one")
+
+
+def _rendered_page(page: dict) -> tuple:
+    """(html, etag) for a legacy page, from the LRU or by loading (and normalizing) it once."""
+    page_id = str(page["id"])
+    cache_key = (page_id, bytes(page["row_version"] or b""))
+    hit = _page_cache.get(cache_key)
+    if hit is not None:
+        return hit
+
+    row = execute_query(
+        "SELECT html_content, html_content_z, row_version FROM uat_pages WHERE id = ?",
+        (page_id,), fetch="one"
+    )
+    if not row:
+        raise HTTPException(404, "UAT page not found")
+    html = compression.read(row, "html_content") or ""
+    if (page.get("html_norm_version") or 0) < UAT_HTML_NORM_VERSION:
+        html = _normalize_stored_html(html, page.get("pth"))
+        # Guarded on row_version so a concurrent re-render is never overwritten
+        execute_query("""
+            UPDATE uat_pages SET html_content = ?, html_content_z = ?, html_norm_version = ?
+            WHERE id = ? AND row_version = ?
+        """, (*compression.split(html), UAT_HTML_NORM_VERSION, page_id, row["row_version"]), fetch="none")
+
+    # Not persisted: asset hashes change with every deploy that touches them
+    html = static_assets.refresh_urls(html)
+    etag = '"' + hashlib.sha1(html.encode("utf-8")).hexdigest() + '"'
+    _page_cache.set(cache_key, (html, etag))
+    return html, etag
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in [t.strip().removeprefix("W/") for t in header.split(",")]
+
+
+@router.get("/uat/{uat_id}")
+async def serve_uat_page(request: Request, uat_id: str):
+    """Serve the UAT HTML page.
+
+    For cc_spec UATs: requires Google OAuth PL session (cprator@cbsware.com).
+    For legacy UATs: no auth required (existing behavior).
+
+    Lookup chain: uat_pages.id → uat_pages.handoff_id →
+    uat_results.id→handoff_id→uat_pages → render fallback from handoff data.
+    Legacy pages are served from the normalized-page cache with an ETag.
+    """
+    _validate_uuid(uat_id)
+    page = _resolve_uat_page(uat_id)
+
+    # Check for cc_spec auth BEFORE the legacy fallback chain
+    if page and page["match_rank"] == 0 and page.get("spec_source") == "cc_spec":
+        from app.api.auth import is_pl_authenticated, get_session_email, render_login_required_page
+        if not is_pl_authenticated(request):
+            html = render_login_required_page(f"/uat/{uat_id}", uat_id)
+            return HTMLResponse(content=html, status_code=200)
+        # PL is authenticated — render interactive spec page
+        full_page = execute_query(
+            "SELECT id, project, spec_data, test_cases_json, general_notes_attachments, general_notes, "
+            "pl_submitted_at, status FROM uat_pages WHERE id = ?",
+            (uat_id,), fetch="one"
+        ) or page
+        from app.api.uat_spec import render_spec_uat_page
+        email = get_session_email(request) or ""
+        spec_data = json.loads(full_page["spec_data"]) if full_page.get("spec_data") else {}
+        # BV-03 fix: inject project from uat_pages.project if spec_data lacks it
+        if not spec_data.get("project") and not spec_data.get("project_id"):
+            raw_proj = full_page.get("project") or page.get("project") or ""
+            if raw_proj:
+                spec_data["project"] = raw_proj
+        tc_json = bv_items.cases(uat_id, full_page)
+        # Strip to spec fields only (no result leakage for spec definition)
+        spec_tests = [
+            {"id": tc["id"], "title": tc["title"], "url": tc.get("url"),
+             "steps": tc.get("steps", []), "expected": tc.get("expected"),
+             "type": tc.get("type")}
+            for tc in tc_json
+            if not tc.get("id", "").startswith("_")
+        ]
+        general_notes = full_page.get("general_notes") or ""
+        is_submitted = bool(full_page.get("pl_submitted_at"))
+        # Large specs are streamed as the template renders instead of built as one string
+        stream = len(spec_tests) > uat_templates.STREAM_THRESHOLD
+        html = render_spec_uat_page(
+            spec_id=uat_id,
+            spec_data=spec_data,
+            test_cases=spec_tests,
+            current_results=tc_json,
+            pl_email=email,
+            general_notes=general_notes,
+            is_submitted=is_submitted,
+            spec_status=full_page.get("status", "in_progress"),
+            stream=stream,
+        )
+        if stream:
+            return StreamingResponse(html, media_type="text/html; charset=utf-8")
+        return HTMLResponse(content=html)
+
+    # Last resort: render minimal page from handoff/uat_results data
+    if not page:
+        fallback = execute_query("""
+            SELECT u.id as result_id, u.status, u.total_tests, u.passed, u.failed,
+                   u.tested_by, u.tested_at, u.results_text,
+                   h.id as handoff_id, h.project, h.version
+            FROM uat_results u
+            JOIN mcp_handoffs h ON u.handoff_id = h.id
+            WHERE u.id = ? OR h.id = ?
+        """, (uat_id, uat_id), fetch="one")
+        if fallback:
+            return HTMLResponse(content=_render_fallback_uat(fallback))
+        raise HTTPException(404, "UAT page not found")
+
+    # Mark as in_progress on first view
+    if page["status"] == "ready":
+        execute_query(
+            "UPDATE uat_pages SET status = 'in_progress' WHERE id = ?",
+            (page["id"],), fetch="none"
+        )
+        change_hooks.notify_change(change_hooks.UAT_PAGE, [page["id"]])
+
+    html, etag = _rendered_page(page)
+    # no-cache: browsers revalidate every open, which is a 304 while the page is unchanged
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(content=html, headers=headers)
 
 
 @router.get("/api/uat/pages")
@@ -492,9 +567,11 @@ async def list_uat_pages(
         OFFSET ? ROWS FETCH NEXT ? ROWS ONLY
     """, (*params, offset, limit), fetch="all")
 
+    rows = rows or []
+    cases_by_id = bv_items.cases_many(rows)
     results = []
-    for row in (rows or []):
-        test_cases_raw = json.loads(row["test_cases_json"]) if row.get("test_cases_json") else []
+    for row in rows:
+        test_cases_raw = cases_by_id[str(row["id"])]
         pth = row.get("pth")
         proj = row["project"]
         ver = row.get("version") or "?"
@@ -621,12 +698,16 @@ a.back:hover{{text-decoration:underline}}
 
 class VerifyRequest(BaseModel):
     handoff_id: str
+    background: bool = False
 
 @router.post("/api/uat/verify")
 async def verify_handoff_endpoint(body: VerifyRequest):
-    """Verify endpoints claimed in a handoff's evidence."""
-    from app.services.verification_service import verify_handoff
-    result = await verify_handoff(body.handoff_id)
+    """Verify endpoints claimed in a handoff's evidence.
+    With background=true the check is queued and the job is returned for polling."""
+    if body.background:
+        job_id = verification_service.queue_verification(body.handoff_id)
+        return {"job_id": job_id, "status_url": f"/api/background-jobs/{job_id}"}
+    result = await verification_service.verify_handoff(body.handoff_id)
     if "error" in result:
         raise HTTPException(404, result["error"])
     return result
@@ -679,6 +760,7 @@ async def update_uat_status(uat_id: str, body: UATStatusUpdate):
         "UPDATE uat_pages SET status = ? WHERE id = ?",
         (body.status, uat_id), fetch="none"
     )
+    change_hooks.notify_change(change_hooks.UAT_PAGE, [uat_id])
     logger.info(f"UAT page {uat_id} status: {previous} -> {body.status}")
     return {"uat_id": uat_id, "status": body.status, "previous_status": previous}
 
@@ -687,26 +769,123 @@ async def update_uat_status(uat_id: str, body: UATStatusUpdate):
 
 @router.get("/api/search")
 async def universal_search(q: str = Query(..., min_length=1, max_length=100)):
-    """Search across requirements, UAT pages, handoffs, and lessons by PTH or keyword."""
+    """Search across requirements, UAT pages, handoffs, and lessons by PTH or keyword.
+
+    Ranked by the in-process BM25 index (exact PTH matches first). With
+    SEARCH_BACKEND=fulltext, or if the index is unavailable, _universal_search_sql
+    uses CONTAINSTABLE where full-text indexes exist and LIKE otherwise.
+    """
+    cache_key = search_cache.key("universal", q)
+    cached = search_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    results = None
+    if not fulltext.use_fulltext_backend():
+        try:
+            results = await asyncio.to_thread(_universal_search_index, q)
+        except Exception as e:
+            logger.warning(f"Search index unavailable, using SQL search: {e}")
+    if results is None:
+        results = await _universal_search_sql(q)
+    search_cache.put(cache_key, results, _UNIVERSAL_ENTITIES)
+    return results
+
+
+_UNIVERSAL_ENTITIES = (change_hooks.REQUIREMENT, change_hooks.PROJECT, change_hooks.UAT_PAGE,
+                       change_hooks.HANDOFF, change_hooks.LESSON)
+
+
+_UNIVERSAL_LIMITS = {"requirement": 50, "uat_page": 50, "handoff": 20, "lesson": 20}
+
+
+def _universal_search_index(q: str) -> dict:
     results = {"query": q, "requirements": [], "uat_pages": [], "handoffs": [], "lessons": []}
+    q_pth = q.strip().lower()
+    for source, limit in _UNIVERSAL_LIMITS.items():
+        hits = search_index.search(q, sources=(source,), limit=limit, prefix_last=True)
+        hits.sort(key=lambda sd: (sd[1].meta.get("pth") != q_pth, -sd[0]))
+        for _score, doc in hits:
+            p = doc.payload
+            if source == "requirement":
+                results["requirements"].append({
+                    "id": p["id"], "code": p["code"], "title": p["title"],
+                    "status": p["status"], "pth": p.get("pth"),
+                    "project_code": p.get("project_code"), "project_name": p.get("project_name")
+                })
+            elif source == "uat_page":
+                results["uat_pages"].append({
+                    "uat_id": p["id"], "project": p["project"], "version": p.get("version"),
+                    "status": p["status"], "pth": p.get("pth"),
+                    "title": p.get("handoff_title") or f"UAT: {p['project']} v{p.get('version') or '?'}",
+                    "uat_url": f"https://metapm.rentyourcio.com/uat/{p['id']}"
+                })
+            elif source == "handoff":
+                results["handoffs"].append({
+                    "id": p["id"], "project": p["project"],
+                    "title": p.get("title") or p.get("task"),
+                    "version": p.get("version"), "status": p["status"], "pth": p.get("pth")
+                })
+            else:
+                results["lessons"].append({
+                    "id": p["id"], "project": p["project"], "category": p["category"],
+                    "lesson": (p.get("lesson") or "")[:200], "source_sprint": p.get("source_sprint"),
+                    "status": p["status"]
+                })
+
+    results["total"] = sum(len(v) for k, v in results.items() if isinstance(v, list))
+    results["search_method"] = "bm25"
+    return results
+
+
+def _ft_or_like(table: str, columns: tuple, ft_sql: str, ft_params: tuple,
+                like_sql: str, like_params: tuple, q: str) -> list:
+    """Run ft_sql (CONTAINSTABLE, condition bound first) when table's full-text
+    index covers columns, else — or on error — the LIKE query."""
+    cond = fulltext.contains_query(q)
+    if cond and fulltext.available(table, columns):
+        try:
+            return execute_query(ft_sql, (cond,) + ft_params, fetch="all") or []
+        except Exception as e:
+            logger.warning(f"CONTAINSTABLE on {table} failed, using LIKE: {e}")
+    return execute_query(like_sql, like_params, fetch="all") or []
 
+
+def _search_requirements_sql(q: str) -> list:
     # Search requirements by pth or code/title
-    reqs = execute_query("""
+    out = []
+    reqs = _ft_or_like(
+        "roadmap_requirements", ("title",),
+        f"""
+        SELECT r.id, r.code, r.title, r.status, r.pth, r.project_id,
+               p.code as project_code, p.name as project_name
+        FROM roadmap_requirements r
+        LEFT JOIN roadmap_projects p ON r.project_id = p.id
+        LEFT JOIN {fulltext.containstable("roadmap_requirements", ("title",))} ft ON ft.[KEY] = r.id
+        WHERE r.pth = ? OR r.code LIKE ? OR ft.[KEY] IS NOT NULL
+        ORDER BY CASE WHEN r.pth = ? THEN 0 ELSE 1 END, ft.RANK DESC, r.updated_at DESC
+        """, (q, f"%{q}%", q),
+        """
         SELECT r.id, r.code, r.title, r.status, r.pth, r.project_id,
                p.code as project_code, p.name as project_name
         FROM roadmap_requirements r
         LEFT JOIN roadmap_projects p ON r.project_id = p.id
         WHERE r.pth = ? OR r.code LIKE ? OR r.title LIKE ?
         ORDER BY CASE WHEN r.pth = ? THEN 0 ELSE 1 END, r.updated_at DESC
-    """, (q, f"%{q}%", f"%{q}%", q), fetch="all") or []
+        """, (q, f"%{q}%", f"%{q}%", q), q,
+    )
     for r in reqs:
-        results["requirements"].append({
+        out.append({
             "id": r["id"], "code": r["code"], "title": r["title"],
             "status": r["status"], "pth": r.get("pth"),
             "project_code": r.get("project_code"), "project_name": r.get("project_name")
         })
+    return out
+
 
+def _search_uat_pages_sql(q: str) -> list:
     # Search UAT pages by pth or title/project
+    out = []
     pages = execute_query("""
         SELECT u.id, u.project, u.version, u.status, u.pth, u.created_at,
                h.title as handoff_title
@@ -716,43 +895,85 @@ async def universal_search(q: str = Query(..., min_length=1, max_length=100)):
         ORDER BY u.created_at DESC
     """, (q, f"%{q}%", f"%{q}%"), fetch="all") or []
     for p in pages:
-        results["uat_pages"].append({
+        out.append({
             "uat_id": str(p["id"]), "project": p["project"], "version": p.get("version"),
             "status": p["status"], "pth": p.get("pth"),
             "title": p.get("handoff_title") or f"UAT: {p['project']} v{p.get('version','?')}",
             "uat_url": f"https://metapm.rentyourcio.com/uat/{p['id']}"
         })
+    return out
 
+
+def _search_handoffs_sql(q: str) -> list:
     # Search handoffs by pth or title/project
-    handoffs = execute_query("""
+    out = []
+    handoffs = _ft_or_like(
+        "mcp_handoffs", ("title", "task"),
+        f"""
+        SELECT h.id, h.project, h.title, h.task, h.version, h.status, h.pth, h.created_at
+        FROM mcp_handoffs h
+        LEFT JOIN {fulltext.containstable("mcp_handoffs", ("title", "task"))} ft ON ft.[KEY] = h.id
+        WHERE h.pth = ? OR h.project LIKE ? OR ft.[KEY] IS NOT NULL
+        ORDER BY CASE WHEN h.pth = ? THEN 0 ELSE 1 END, ft.RANK DESC, h.created_at DESC
+        OFFSET 0 ROWS FETCH NEXT 20 ROWS ONLY
+        """, (q, f"%{q}%", q),
+        """
         SELECT id, project, title, task, version, status, pth, created_at
         FROM mcp_handoffs
         WHERE pth = ? OR title LIKE ? OR project LIKE ? OR task LIKE ?
         ORDER BY created_at DESC
         OFFSET 0 ROWS FETCH NEXT 20 ROWS ONLY
-    """, (q, f"%{q}%", f"%{q}%", f"%{q}%"), fetch="all") or []
+        """, (q, f"%{q}%", f"%{q}%", f"%{q}%"), q,
+    )
     for h in handoffs:
-        results["handoffs"].append({
+        out.append({
             "id": str(h["id"]), "project": h["project"],
             "title": h.get("title") or h.get("task"),
             "version": h.get("version"), "status": h["status"], "pth": h.get("pth")
         })
+    return out
+
 
+def _search_lessons_sql(q: str) -> list:
     # Search lessons by pth in notes/lesson text or source_sprint
-    lessons = execute_query("""
+    out = []
+    lessons = _ft_or_like(
+        "lessons_learned", ("lesson",),
+        f"""
+        SELECT l.id, l.project, l.category, l.lesson, l.source_sprint, l.status, l.target
+        FROM lessons_learned l
+        LEFT JOIN {fulltext.containstable("lessons_learned", ("lesson",))} ft ON ft.[KEY] = l.id
+        WHERE ft.[KEY] IS NOT NULL OR l.source_sprint LIKE ? OR l.id LIKE ?
+        ORDER BY ft.RANK DESC, l.created_at DESC
+        OFFSET 0 ROWS FETCH NEXT 20 ROWS ONLY
+        """, (f"%{q}%", f"%{q}%"),
+        """
         SELECT id, project, category, lesson, source_sprint, status, target
         FROM lessons_learned
         WHERE lesson LIKE ? OR source_sprint LIKE ? OR id LIKE ?
         ORDER BY created_at DESC
         OFFSET 0 ROWS FETCH NEXT 20 ROWS ONLY
-    """, (f"%{q}%", f"%{q}%", f"%{q}%"), fetch="all") or []
+        """, (f"%{q}%", f"%{q}%", f"%{q}%"), q,
+    )
     for ll in lessons:
-        results["lessons"].append({
+        out.append({
             "id": ll["id"], "project": ll["project"], "category": ll["category"],
             "lesson": ll["lesson"][:200], "source_sprint": ll.get("source_sprint"),
             "status": ll["status"]
         })
+    return out
+
 
+async def _universal_search_sql(q: str) -> dict:
+    """Run the four sub-searches concurrently (each on its own connection
+    in a worker thread), so a miss costs the slowest query rather than the sum."""
+    reqs, pages, handoffs, lessons = await asyncio.gather(
+        asyncio.to_thread(_search_requirements_sql, q),
+        asyncio.to_thread(_search_uat_pages_sql, q),
+        asyncio.to_thread(_search_handoffs_sql, q),
+        asyncio.to_thread(_search_lessons_sql, q),
+    )
+    results = {"query": q, "requirements": reqs, "uat_pages": pages, "handoffs": handoffs, "lessons": lessons}
     results["total"] = sum(len(v) for k, v in results.items() if isinstance(v, list))
     return results
 
@@ -770,7 +991,7 @@ async def get_uat_results(uat_id: str):
     if not page:
         raise HTTPException(404, f"UAT page {uat_id} not found")
 
-    test_cases = json.loads(page["test_cases_json"]) if page.get("test_cases_json") else []
+    test_cases = bv_items.cases(uat_id, page)
     return {
         "uat_id": uat_id,
         "status": page["status"],
@@ -783,7 +1004,7 @@ async def get_uat_results(uat_id: str):
 @router.patch("/api/uat/{uat_id}/results")
 async def update_uat_results(uat_id: str, body: UATResultsUpdate):
     """Update individual test case results from PL interaction.
-    Updates test_cases_json in uat_pages and re-renders HTML."""
+    Upserts the changed BVs into uat_bv_items and updates the page status."""
     _validate_uuid(uat_id)
     page = execute_query(
         "SELECT id, test_cases_json, handoff_id, project, pth, version FROM uat_pages WHERE id = ?",
@@ -792,8 +1013,7 @@ async def update_uat_results(uat_id: str, body: UATResultsUpdate):
     if not page:
         raise HTTPException(404, f"UAT page {uat_id} not found")
 
-    # Parse existing test cases
-    existing_cases = json.loads(page["test_cases_json"]) if page.get("test_cases_json") else []
+    existing_cases = bv_items.cases(uat_id, page)
 
     # Build lookup of updates
     updates_by_id = {tc.id: tc for tc in body.test_cases}
@@ -835,13 +1055,22 @@ async def update_uat_results(uat_id: str, body: UATResultsUpdate):
 
     submitted_at = "GETUTCDATE()" if new_status in ("passed", "failed", "submitted", "approved") else "NULL"
 
-    execute_query(f"""
-        UPDATE uat_pages
-        SET test_cases_json = ?,
-            status = ?,
-            submitted_at = {submitted_at}
-        WHERE id = ?
-    """, (json.dumps(existing_cases), new_status, uat_id), fetch="none")
+    titles = {c.get("id"): c.get("title", "") for c in existing_cases}
+    with get_db() as conn:
+        cursor = conn.cursor()
+        bv_items.apply(cursor, uat_id, [
+            {"id": tc.id, "title": titles.get(tc.id, ""), "status": tc.status,
+             "result": tc.result, "notes": tc.notes}
+            for tc in body.test_cases
+            if tc.id in titles
+        ])
+        cursor.execute(f"""
+            UPDATE uat_pages
+            SET status = ?,
+                submitted_at = {submitted_at}
+            WHERE id = ?
+        """, (new_status, uat_id))
+    change_hooks.notify_change(change_hooks.UAT_PAGE, [uat_id])
 
     # Count results
     pl_cases = [c for c in existing_cases if c.get("type", "pl_visual") == "pl_visual"]
@@ -864,6 +1093,22 @@ async def update_uat_results(uat_id: str, body: UATResultsUpdate):
     }
 
 
+# Distinct GUIDs from a JSON array of id strings; malformed ids simply never match
+_BULK_IDS_SQL = """
+            DECLARE @ids TABLE (id UNIQUEIDENTIFIER PRIMARY KEY);
+            INSERT INTO @ids
+            SELECT DISTINCT TRY_CAST(value AS UNIQUEIDENTIFIER) FROM OPENJSON(?)
+            WHERE TRY_CAST(value AS UNIQUEIDENTIFIER) IS NOT NULL;"""
+
+
+def _guid_key(value) -> str:
+    """Comparable form of an id as sent by the caller or returned by pyodbc."""
+    try:
+        return str(_uuid_mod.UUID(str(value))).upper()
+    except ValueError:
+        return str(value).upper()
+
+
 # ── POST /api/uat/bulk-archive — Archive old UAT records (MP-UAT-GEN-001 Part 5) ──
 
 @router.post("/api/uat/bulk-archive")
@@ -872,40 +1117,30 @@ async def bulk_archive_uats(body: BulkArchiveRequest):
     if not body.uat_ids:
         raise HTTPException(400, "uat_ids list cannot be empty")
 
-    archived_pages = 0
-    archived_results = 0
-    not_found = []
-    for uid in body.uat_ids:
-        found = False
-        # Archive in uat_pages if present
-        page = execute_query(
-            "SELECT id FROM uat_pages WHERE id = ?",
-            (uid,), fetch="one"
-        )
-        if page:
-            execute_query(
-                "UPDATE uat_pages SET status = 'archived' WHERE id = ?",
-                (uid,), fetch="none"
-            )
-            archived_pages += 1
-            found = True
-
-        # Archive in uat_results if present
-        result = execute_query(
-            "SELECT id FROM uat_results WHERE id = ?",
-            (uid,), fetch="one"
-        )
-        if result:
-            execute_query(
-                "UPDATE uat_results SET status = 'archived' WHERE id = ?",
-                (uid,), fetch="none"
-            )
-            archived_results += 1
-            found = True
-
-        if not found:
-            not_found.append(uid)
-
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SET NOCOUNT ON;
+            {_BULK_IDS_SQL}
+            DECLARE @hit TABLE (kind CHAR(1), id UNIQUEIDENTIFIER);
+            UPDATE p SET status = 'archived'
+            OUTPUT 'p', inserted.id INTO @hit
+            FROM uat_pages p JOIN @ids i ON i.id = p.id;
+            UPDATE r SET status = 'archived'
+            OUTPUT 'r', inserted.id INTO @hit
+            FROM uat_results r JOIN @ids i ON i.id = r.id;
+            SELECT kind, id FROM @hit;
+        """, (json.dumps(body.uat_ids),))
+        hits = cursor.fetchall()
+
+    archived_page_ids = [str(h[1]) for h in hits if h[0] == "p"]
+    archived_pages = len(archived_page_ids)
+    archived_results = len(hits) - archived_pages
+    found = {_guid_key(h[1]) for h in hits}
+    not_found = [uid for uid in body.uat_ids if _guid_key(uid) not in found]
+
+    if archived_page_ids:
+        change_hooks.notify_change(change_hooks.UAT_PAGE, archived_page_ids)
     total_archived = archived_pages + archived_results
     logger.info(f"Bulk archived {archived_pages} pages + {archived_results} results. Reason: {body.reason}")
     return {
@@ -929,23 +1164,24 @@ async def bulk_close_uat_specs(body: BulkCloseRequest):
         raise HTTPException(400, "spec_ids list cannot be empty")
 
     reason = body.reason or "bulk-close"
-    closed = []
-    not_found = []
-
-    for spec_id in body.spec_ids:
-        page = execute_query(
-            "SELECT id FROM uat_pages WHERE id = ?",
-            (spec_id,), fetch="one"
-        )
-        if page:
-            execute_query(
-                "UPDATE uat_pages SET status = 'archived', archive_reason = ? WHERE id = ?",
-                (reason[:200], spec_id), fetch="none"
-            )
-            closed.append(spec_id)
-        else:
-            not_found.append(spec_id)
-
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SET NOCOUNT ON;
+            {_BULK_IDS_SQL}
+            DECLARE @closed TABLE (id UNIQUEIDENTIFIER);
+            UPDATE p SET status = 'archived', archive_reason = ?
+            OUTPUT inserted.id INTO @closed
+            FROM uat_pages p JOIN @ids i ON i.id = p.id;
+            SELECT id FROM @closed;
+        """, (json.dumps(body.spec_ids), reason[:200]))
+        matched = {_guid_key(r[0]) for r in cursor.fetchall()}
+
+    closed = [sid for sid in body.spec_ids if _guid_key(sid) in matched]
+    not_found = [sid for sid in body.spec_ids if _guid_key(sid) not in matched]
+
+    if closed:
+        change_hooks.notify_change(change_hooks.UAT_PAGE, closed)
     logger.info(f"AP09 bulk-close: {len(closed)} specs archived, {len(not_found)} not found. Reason: {reason}")
     return {
         "closed": len(closed),
@@ -2,22 +2,21 @@
 MetaPM UAT Spec API — MP-UAT-SERVER-001
 Spec-first, authenticated server-side UAT system.
 """
-import asyncio
 import json
 import logging
-import os
 import uuid
 from datetime import datetime
 from typing import Any, List, Optional
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import HTMLResponse
 from pydantic import BaseModel, Field
-import httpx
 
+from app.core import change_hooks
 from app.core.config import settings
-from app.core.database import execute_query
+from app.core.database import execute_query, get_db
 from app.api.auth import is_pl_authenticated, render_login_required_page
 from app.api.prompts import trigger_cloud_run_job_immediate
+from app.services import bv_items, rag_outbox, uat_spec_batch
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -39,22 +38,6 @@ def _validate_uuid(value: str) -> str:
         raise HTTPException(status_code=400, detail=f"Invalid UUID: {value}")
 
 
-async def sync_uat_to_rag(spec_id: str):
-    """Fix 7 (MP08): Fire-and-forget — trigger Portfolio RAG re-ingestion after UAT submit."""
-    # MF01: rewired from /ingest/metapm (does not exist) to /api/rag/sync on MetaPM itself
-    rag_sync_url = "https://metapm.rentyourcio.com/api/rag/sync"
-    mcp_key = os.getenv("MCP_API_KEY")
-    if not mcp_key:
-        logger.warning("MCP_API_KEY not set — skipping UAT RAG sync")
-        return
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.post(rag_sync_url, headers={"X-API-Key": mcp_key})
-            logger.info(f"RAG sync after UAT {spec_id}: {resp.status_code}")
-    except Exception as e:
-        logger.warning(f"RAG sync failed (non-fatal): {e}")
-
-
 # ── Pydantic models ──────────────────────────────────────────────────────────
 
 class TestCaseSpec(BaseModel):
@@ -75,6 +58,10 @@ class UATSpecCreate(BaseModel):
     test_cases: List[TestCaseSpec] = Field(..., min_length=1)
 
 
+class UATSpecBatchCreate(BaseModel):
+    specs: List[UATSpecCreate] = Field(..., min_length=1, max_length=uat_spec_batch.MAX_SPECS)
+
+
 class UATSpecResponse(BaseModel):
     spec_id: str
     uat_url: str
@@ -150,7 +137,7 @@ async def create_uat_spec(body: UATSpecCreate):
     spec_data = body.model_dump()
 
     # Build minimal test_cases_json for compatibility with existing uat_pages queries
-    tc_json = json.dumps([
+    tc_list = [
         {
             "id": tc.id,
             "title": tc.title,
@@ -162,7 +149,8 @@ async def create_uat_spec(body: UATSpecCreate):
             "notes": ""
         }
         for tc in body.test_cases
-    ])
+    ]
+    tc_json = json.dumps(tc_list)
 
     # AP04 Fix 4: Check if spec already exists for this PTH (upsert by PTH)
     existing = execute_query(
@@ -196,20 +184,24 @@ async def create_uat_spec(body: UATSpecCreate):
             })
         # UPDATE existing unsubmitted spec — preserve ID, reset test cases
         try:
-            execute_query("""
-                UPDATE uat_pages SET
-                    project = ?, sprint_code = ?, version = ?,
-                    test_cases_json = ?, html_content = 'spec_created',
-                    status = 'ready', spec_data = ?
-                WHERE id = ?
-            """, (
-                body.project,
-                body.sprint,
-                body.version,
-                tc_json,
-                json.dumps(spec_data),
-                spec_id,
-            ), fetch="none")
+            with get_db() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    UPDATE uat_pages SET
+                        project = ?, sprint_code = ?, version = ?,
+                        test_cases_json = ?, html_content = 'spec_created', html_content_z = NULL,
+                        status = 'ready', spec_data = ?, general_notes_attachments = NULL
+                    WHERE id = ?
+                """, (
+                    body.project,
+                    body.sprint,
+                    body.version,
+                    tc_json,
+                    json.dumps(spec_data),
+                    spec_id,
+                ))
+                bv_items.seed(cursor, spec_id, tc_list)
+                rag_outbox.enqueue(cursor, "metapm", "uat", [spec_id])
             logger.info(f"Updated existing UAT spec {spec_id} for PTH {body.pth} ({len(body.test_cases)} tests)")
         except Exception as e:
             logger.error(f"UAT spec update failed: {e}")
@@ -219,30 +211,36 @@ async def create_uat_spec(body: UATSpecCreate):
         spec_id = str(uuid.uuid4()).upper()
         placeholder_handoff_id = spec_id  # reuse spec_id as placeholder
         try:
-            execute_query("""
-                INSERT INTO uat_pages
-                    (id, handoff_id, project, sprint_code, pth, version,
-                     test_cases_json, html_content, status,
-                     spec_source, spec_locked_at, spec_data)
-                VALUES (?, ?, ?, ?, ?, ?,
-                        ?, 'spec_created', 'ready',
-                        'cc_spec', ?, ?)
-            """, (
-                spec_id,
-                placeholder_handoff_id,
-                body.project,
-                body.sprint,
-                body.pth,
-                body.version,
-                tc_json,
-                now,
-                json.dumps(spec_data),
-            ), fetch="none")
+            with get_db() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    INSERT INTO uat_pages
+                        (id, handoff_id, project, sprint_code, pth, version,
+                         test_cases_json, html_content, status,
+                         spec_source, spec_locked_at, spec_data)
+                    VALUES (?, ?, ?, ?, ?, ?,
+                            ?, 'spec_created', 'ready',
+                            'cc_spec', ?, ?)
+                """, (
+                    spec_id,
+                    placeholder_handoff_id,
+                    body.project,
+                    body.sprint,
+                    body.pth,
+                    body.version,
+                    tc_json,
+                    now,
+                    json.dumps(spec_data),
+                ))
+                bv_items.seed(cursor, spec_id, tc_list)
+                rag_outbox.enqueue(cursor, "metapm", "uat", [spec_id])
             logger.info(f"Created new UAT spec {spec_id} for {body.project} {body.version} ({len(body.test_cases)} tests)")
         except Exception as e:
             logger.error(f"UAT spec insert failed: {e}")
             raise HTTPException(500, f"Failed to create UAT spec: {e}")
 
+    change_hooks.notify_change(change_hooks.UAT_PAGE, [spec_id])
+    rag_outbox.kick()
     uat_url = f"https://metapm.rentyourcio.com/uat/{spec_id}"
     logger.info(f"UAT spec upsert complete: {spec_id} PTH={body.pth}")
 
@@ -258,6 +256,7 @@ async def create_uat_spec(body: UATSpecCreate):
                     "UPDATE roadmap_requirements SET status = 'uat_ready', uat_url = ?, updated_at = GETUTCDATE() WHERE id = ?",
                     (uat_url, req_row["id"]), fetch="none"
                 )
+                change_hooks.notify_change(change_hooks.REQUIREMENT, [req_row["id"]])
                 logger.info(f"Auto-advanced {req_row['code']} to uat_ready on UAT spec creation for PTH {body.pth}")
         except Exception as e:
             logger.warning(f"Auto-advance to uat_ready failed (non-fatal): {e}")
@@ -270,6 +269,29 @@ async def create_uat_spec(body: UATSpecCreate):
     )
 
 
+# ── POST /api/uat/spec/batch ─────────────────────────────────────────────────
+
+@router.post("/api/uat/spec/batch", status_code=201)
+async def create_uat_specs(body: UATSpecBatchCreate):
+    """
+    Create or update many UAT specs in one call (upsert by PTH, same rules as
+    POST /api/uat/spec). All-or-nothing: 400 lists every invalid spec, 409
+    lists every spec with a prior PL submission, and nothing is written.
+    """
+    try:
+        return uat_spec_batch.ingest([spec.model_dump() for spec in body.specs])
+    except uat_spec_batch.BatchRejected as e:
+        conflict = any(err["error"] == "spec_has_prior_submission" for err in e.errors)
+        raise HTTPException(status_code=409 if conflict else 400, detail={
+            "error": "spec_has_prior_submission" if conflict else "invalid_batch",
+            "message": str(e),
+            "errors": e.errors,
+        })
+    except Exception as e:
+        logger.error(f"UAT spec batch failed: {e}")
+        raise HTTPException(500, f"Failed to write UAT spec batch: {e}")
+
+
 # ── GET /api/uat/spec/{spec_id} ──────────────────────────────────────────────
 
 @router.get("/api/uat/spec/{spec_id}")
@@ -333,7 +355,8 @@ async def submit_pl_results(spec_id: str, body: PLResultsSubmit, request: Reques
         )
 
     row = execute_query(
-        "SELECT id, test_cases_json, spec_source, status, pth, handoff_id FROM uat_pages WHERE id = ?",
+        "SELECT id, test_cases_json, general_notes_attachments, spec_source, status, pth, handoff_id "
+        "FROM uat_pages WHERE id = ?",
         (spec_id,), fetch="one"
     )
     if not row:
@@ -341,7 +364,7 @@ async def submit_pl_results(spec_id: str, body: PLResultsSubmit, request: Reques
     if row.get("spec_source") != "cc_spec":
         raise HTTPException(400, "This endpoint is only for cc_spec UATs")
 
-    existing_cases = json.loads(row["test_cases_json"]) if row.get("test_cases_json") else []
+    existing_cases = bv_items.cases(spec_id, row)
 
     # MP18 REQ-047 + MP20 BUG-039: Identify pl_visual BVs only (skip cc_machine)
     pl_visual_ids = set()
@@ -428,14 +451,6 @@ async def submit_pl_results(spec_id: str, body: PLResultsSubmit, request: Reques
             if update.failure_type:
                 case["failure_type"] = update.failure_type
 
-    # Store general notes attachments as sentinel entry (id starts with _)
-    if body.general_notes_attachments:
-        gn_idx = next((i for i, c in enumerate(existing_cases) if c.get("id") == "_general_notes"), None)
-        if gn_idx is not None:
-            existing_cases[gn_idx]["attachments"] = body.general_notes_attachments
-        else:
-            existing_cases.append({"id": "_general_notes", "attachments": body.general_notes_attachments})
-
     real_cases = [c for c in existing_cases if not c.get("id", "").startswith("_")]
     passed = sum(1 for c in real_cases if c.get("status") == "pass")
     failed = sum(1 for c in real_cases if c.get("status") == "fail")
@@ -489,15 +504,38 @@ async def submit_pl_results(spec_id: str, body: PLResultsSubmit, request: Reques
     gn_value = body.general_notes or body.overall_notes
     if isinstance(gn_value, list):
         gn_value = json.dumps(gn_value)
-    execute_query("""
-        UPDATE uat_pages
-        SET test_cases_json = ?,
-            status = ?,
-            pl_submitted_at = GETUTCDATE(),
-            general_notes = ?,
-            attempt_number = ?
-        WHERE id = ?
-    """, (json.dumps(existing_cases), new_status, gn_value, attempt_number, spec_id), fetch="none")
+    gn_attachments = json.dumps(body.general_notes_attachments) if body.general_notes_attachments else None
+    # MF01: BV results are upserted into uat_bv_items, one row per submitted BV
+    # (MP56: classification column holds former failure_type values)
+    title_lookup = {c["id"]: c.get("title", "") for c in real_cases}
+    bv_updates = [
+        {
+            "id": tc.id,
+            "title": title_lookup.get(tc.id, ""),
+            "status": tc.status or "pending",
+            "notes": tc.notes,
+            "classification": tc.classification,
+            "failure_type": tc.failure_type,
+            "attachments": tc.attachments,
+        }
+        for tc in body.test_cases
+    ]
+    with get_db() as conn:
+        cursor = conn.cursor()
+        bv_items.apply(cursor, spec_id, bv_updates)
+        cursor.execute("""
+            UPDATE uat_pages
+            SET status = ?,
+                pl_submitted_at = GETUTCDATE(),
+                general_notes = ?,
+                general_notes_attachments = COALESCE(?, general_notes_attachments),
+                attempt_number = ?
+            WHERE id = ?
+        """, (new_status, gn_value, gn_attachments, attempt_number, spec_id))
+        # Fix 7 (MP08): results reach Portfolio RAG via the outbox so CAI can query them
+        rag_outbox.enqueue(cursor, "metapm", "uat", [spec_id])
+    rag_outbox.kick()
+    change_hooks.notify_change(change_hooks.UAT_PAGE, [spec_id])
 
     # MP56: Sprint-level failure_type removed; BV-level classifications are now primary
     # (sprint_failure_type logic kept for conditional_pass validation but not persisted to uat_results)
@@ -559,51 +597,26 @@ async def submit_pl_results(spec_id: str, body: PLResultsSubmit, request: Reques
                     }
             elif req_row:
                 logger.info(f"Requirement {req_row['code']} at {req_row['status']}, not uat_ready — skipping auto-advance")
+            if requirement_advance_result:
+                change_hooks.notify_change(change_hooks.REQUIREMENT, [req_row["id"]])
         except Exception as e:
             logger.warning(f"REQ-045 auto-advance failed: {e}")
             requirement_advance_result = {"requirement_advance_error": str(e)}
     elif new_status == "in_progress":
         logger.info(f"UAT {spec_id} incomplete: {failed} fail, {total - passed - skipped} pending — no auto-advance")
 
-    # MF01: persist individual BV items to uat_bv_items table (MP56: classification column holds former failure_type values)
-    title_lookup = {c["id"]: c.get("title", "") for c in real_cases}
-    for tc in body.test_cases:
-        try:
-            bv_title = title_lookup.get(tc.id, "")
-            # MP56: Use failure_type value for classification column (merged in schema)
-            classification_value = tc.failure_type or tc.classification
-            execute_query("""
-                IF EXISTS (SELECT 1 FROM uat_bv_items WHERE spec_id=? AND bv_id=?)
-                    UPDATE uat_bv_items
-                    SET status=?, notes=?, classification=?, updated_at=GETUTCDATE()
-                    WHERE spec_id=? AND bv_id=?
-                ELSE
-                    INSERT INTO uat_bv_items (spec_id, bv_id, title, status, notes, classification)
-                    VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                spec_id, tc.id,                                                          # EXISTS check
-                tc.status or 'pending', tc.notes or '', classification_value,             # UPDATE SET
-                spec_id, tc.id,                                                          # UPDATE WHERE
-                spec_id, tc.id, bv_title,                                                # INSERT
-                tc.status or 'pending', tc.notes or '', classification_value,             # INSERT values
-            ), fetch="none")
-        except Exception as bv_err:
-            logger.warning(f"BV item upsert failed for {tc.id}: {bv_err}")
-
-    # Fix 7 (MP08): trigger RAG re-ingestion so CAI can query results immediately
-    asyncio.create_task(sync_uat_to_rag(spec_id))
 
     # AP07: trigger Loop 3 to auto-process UAT results (post review + email PL)
     spec_pth = row.get("pth") or "N/A"
     spec_handoff_id = str(row["handoff_id"]) if row.get("handoff_id") else "none"
-    asyncio.create_task(trigger_cloud_run_job_immediate(
+    trigger_cloud_run_job_immediate(
         "metapm-loop3-processor",
         args_override=[
             f"--spec-id={spec_id}",
             f"--handoff-id={spec_handoff_id}",
             f"--pth={spec_pth}",
         ]
-    ))
+    )
     logger.info(f"[AP07] Loop 3 triggered for spec {spec_id} PTH={spec_pth}")
 
     response = {
@@ -634,44 +647,27 @@ async def submit_cc_results(spec_id: str, body: CCResultsSubmit):
     if not row:
         raise HTTPException(404, f"UAT spec {spec_id} not found")
 
-    existing_cases = json.loads(row["test_cases_json"]) if row.get("test_cases_json") else []
-    updates_by_id = {tc.id: tc for tc in body.test_cases}
-    updated_count = 0
-
-    for case in existing_cases:
-        if case.get("id", "").startswith("_"):
-            continue
-        update = updates_by_id.get(case["id"])
-        if update and case.get("type") == "cc_machine":
-            case["cc_result"] = update.cc_result
-            case["cc_evidence"] = strip_surrogates(update.cc_evidence)
-            case["status"] = update.cc_result  # sync status with cc_result
-            updated_count += 1
-
-    execute_query("""
-        UPDATE uat_pages SET test_cases_json = ? WHERE id = ?
-    """, (json.dumps(existing_cases), spec_id), fetch="none")
-
-    # Also persist to uat_bv_items
-    for tc in body.test_cases:
-        try:
-            execute_query("""
-                IF EXISTS (SELECT 1 FROM uat_bv_items WHERE spec_id=? AND bv_id=?)
-                    UPDATE uat_bv_items
-                    SET status=?, cc_result=?, cc_evidence=?
-                    WHERE spec_id=? AND bv_id=?
-                ELSE
-                    INSERT INTO uat_bv_items (spec_id, bv_id, title, status, cc_result, cc_evidence)
-                    VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                spec_id, tc.id,
-                tc.cc_result, tc.cc_result, strip_surrogates(tc.cc_evidence),
-                spec_id, tc.id,
-                spec_id, tc.id, tc.id,
-                tc.cc_result, tc.cc_result, strip_surrogates(tc.cc_evidence),
-            ), fetch="none")
-        except Exception as e:
-            logger.warning(f"CC BV item upsert failed for {tc.id}: {e}")
+    machine_ids = {
+        c["id"] for c in bv_items.cases(spec_id, row)
+        if not c.get("id", "").startswith("_") and c.get("type") == "cc_machine"
+    }
+    machine_results = [tc for tc in body.test_cases if tc.id in machine_ids]
+    updated_count = len(machine_results)
+
+    # Only the spec's cc_machine BVs are written, and only cc_result/cc_evidence/
+    # status: PL-visual results, notes and classifications stay as the PL left
+    # them, and ids the spec never defined get no row.
+    with get_db() as conn:
+        bv_items.apply(conn.cursor(), spec_id, [
+            {
+                "id": tc.id,
+                "status": tc.cc_result,  # sync status with cc_result
+                "cc_result": tc.cc_result,
+                "cc_evidence": strip_surrogates(tc.cc_evidence),
+            }
+            for tc in machine_results
+        ])
+    change_hooks.notify_change(change_hooks.UAT_PAGE, [spec_id])
 
     logger.info(f"CC submitted {updated_count} machine BV results for spec {spec_id}")
     return {"updated": updated_count, "spec_id": spec_id}
@@ -706,6 +702,7 @@ async def override_uat_status(spec_id: str, body: UATOverride, request: Request)
         # Fallback: columns may not exist yet — update only status
         execute_query("UPDATE uat_pages SET status = ? WHERE id = ?",
                       (body.status, spec_id), fetch="none")
+    change_hooks.notify_change(change_hooks.UAT_PAGE, [spec_id])
     return {"spec_id": spec_id, "status": body.status, "override_note": body.override_note}
 
 
@@ -717,8 +714,8 @@ async def reopen_uat(spec_id: str, request: Request):
     MP-UAT-001: Reopen a submitted UAT for editing.
     MP47 BUG-087: Preserves prior pl-results so the form pre-populates on reload.
     Flips status back to 'ready' and clears pl_submitted_at (so the form is editable
-    again) but KEEPS test_cases_json and general_notes intact. The existing renderer
-    reads those fields to restore pass/fail radios, notes, classifications, and
+    again) but KEEPS the uat_bv_items results and general_notes intact. The renderer
+    reads those to restore pass/fail radios, notes, classifications, and
     failure types for each BV.
     Accepts PL Google OAuth session OR X-API-Key header.
     """
@@ -742,6 +739,7 @@ async def reopen_uat(spec_id: str, request: Request):
             pl_submitted_at = NULL
         WHERE id = ?
     """, (spec_id,), fetch="none")
+    change_hooks.notify_change(change_hooks.UAT_PAGE, [spec_id])
 
     logger.info(f"UAT spec {spec_id} reopened (BUG-087) — prior results preserved for pre-fill")
     return {"status": "reopened", "spec_id": spec_id, "results_preserved": True}
@@ -764,7 +762,7 @@ async def get_pl_results(spec_id: str):
     if not row:
         raise HTTPException(404, f"UAT spec {spec_id} not found")
 
-    cases = json.loads(row["test_cases_json"]) if row.get("test_cases_json") else []
+    cases = bv_items.cases(spec_id, row)
     pl_cases = [
         {
             "id": c.get("id"),
@@ -807,7 +805,7 @@ async def get_uat_results(spec_id: str):
         raise HTTPException(404, f"UAT spec {spec_id} not found")
 
     spec_data = json.loads(row["spec_json"]) if row.get("spec_json") else {}
-    cases = json.loads(row["test_cases_json"]) if row.get("test_cases_json") else []
+    cases = bv_items.cases(spec_id, row)
     real_cases = [c for c in cases if not c.get("id", "").startswith("_")]
 
     passed = sum(1 for c in real_cases if c.get("status") == "pass")
@@ -888,7 +886,7 @@ async def admin_backfill_uat_results(spec_id: str, body: AdminBackfillRequest, r
     if row.get("spec_source") != "cc_spec":
         raise HTTPException(400, "Admin backfill only allowed for cc_spec UATs")
 
-    existing_cases = json.loads(row["test_cases_json"]) if row.get("test_cases_json") else []
+    existing_cases = bv_items.cases(spec_id, row)
     updates_by_id = {tc.id: tc for tc in body.test_cases}
 
     for case in existing_cases:
@@ -919,33 +917,20 @@ async def admin_backfill_uat_results(spec_id: str, body: AdminBackfillRequest, r
     admin_gn = body.general_notes
     if isinstance(admin_gn, list):
         admin_gn = json.dumps(admin_gn)
-    execute_query("""
-        UPDATE uat_pages
-        SET test_cases_json = ?, status = ?, pl_submitted_at = GETUTCDATE(), general_notes = ?
-        WHERE id = ?
-    """, (json.dumps(existing_cases), new_status, admin_gn, spec_id), fetch="none")
-
-    # Persist individual BV items to uat_bv_items table
     title_lookup = {c["id"]: c.get("title", "") for c in real_cases}
-    for tc in body.test_cases:
-        try:
-            bv_title = title_lookup.get(tc.id, "")
-            execute_query("""
-                IF EXISTS (SELECT 1 FROM uat_bv_items WHERE spec_id=? AND bv_id=?)
-                    UPDATE uat_bv_items SET status=?, notes=?, updated_at=GETUTCDATE()
-                    WHERE spec_id=? AND bv_id=?
-                ELSE
-                    INSERT INTO uat_bv_items (spec_id, bv_id, title, status, notes)
-                    VALUES (?, ?, ?, ?, ?)
-            """, (
-                spec_id, tc.id,
-                tc.status or "pending", tc.notes or "",
-                spec_id, tc.id,
-                spec_id, tc.id, bv_title,
-                tc.status or "pending", tc.notes or "",
-            ), fetch="none")
-        except Exception as bv_err:
-            logger.warning(f"BV item upsert failed for {tc.id}: {bv_err}")
+    with get_db() as conn:
+        cursor = conn.cursor()
+        bv_items.apply(cursor, spec_id, [
+            {"id": tc.id, "title": title_lookup.get(tc.id, ""),
+             "status": tc.status or "pending", "notes": tc.notes or ""}
+            for tc in body.test_cases
+        ])
+        cursor.execute("""
+            UPDATE uat_pages
+            SET status = ?, pl_submitted_at = GETUTCDATE(), general_notes = ?
+            WHERE id = ?
+        """, (new_status, admin_gn, spec_id))
+    change_hooks.notify_change(change_hooks.UAT_PAGE, [spec_id])
 
     logger.info(f"[ADMIN-BACKFILL] spec={spec_id} PTH={row.get('pth')} reason='{body.backfill_reason}' "
                 f"status={new_status} {passed}P/{failed}F/{skipped}S")
@@ -965,48 +950,41 @@ async def admin_backfill_uat_results(spec_id: str, body: AdminBackfillRequest, r
 def render_spec_uat_page(spec_id: str, spec_data: dict, test_cases: list,
                           current_results: list, pl_email: str,
                           general_notes: str = "", is_submitted: bool = False,
-                          spec_status: str = "in_progress") -> str:
+                          spec_status: str = "in_progress", stream: bool = False):
     """Render the interactive UAT page for an authenticated PL session.
 
-    MP44 REQ-080: Refactored to orchestrate extracted modules.
-    Card rendering → uat_renderer, notes → uat_notes, page assembly → uat_payload.
+    MP44 REQ-080: cards, notes and page assembly are the uat/spec_page.html
+    template and its macros (see app/services/uat_templates.py).
+    With stream=True, returns an iterator of HTML chunks instead of a string.
     """
-    from html import escape as esc
-    from app.api.uat_renderer import render_bv_cards_section
-    from app.api.uat_notes import render_general_notes
-    from app.api.uat_payload import build_page_html, _PROJECT_NAMES
+    from app.api.uat_renderer import bv_cards_context
+    from app.api.uat_payload import _PROJECT_NAMES
+    from app.services import uat_templates
 
     _raw_project = spec_data.get("project") or spec_data.get("project_id") or "Unknown"
-    project = esc(_PROJECT_NAMES.get(_raw_project, _raw_project))
-    version = esc(spec_data.get("version", "?"))
-    sprint = esc(spec_data.get("sprint", ""))
-    pth = esc(spec_data.get("pth", ""))
-    reqs = ", ".join(spec_data.get("linked_requirements", []))
 
     # Separate sentinel entries (general notes attachments) from real test cases
     real_test_cases = [tc for tc in test_cases if not tc.get("id", "").startswith("_")]
     gn_sentinel = next((tc for tc in test_cases if tc.get("id") == "_general_notes"), None)
-    gn_stored_attachments = gn_sentinel.get("attachments", []) if gn_sentinel else []
-
-    # Build result lookup
-    result_by_id = {tc["id"]: tc for tc in current_results if not tc.get("id", "").startswith("_")}
-    submitted_cls = "submitted" if is_submitted else ""
-
-    # Render BV cards via uat_renderer
-    cards_html = render_bv_cards_section(real_test_cases, result_by_id,
-                                         submitted_cls, is_submitted)
 
-    # Render general notes via uat_notes
-    notes_html = render_general_notes(gn_stored_attachments, is_submitted)
-
-    # Pre-populate existing notes JSON for JS
-    general_notes_json = json.dumps(_parse_general_notes(general_notes))
-
-    # Assemble full page via uat_payload
-    return build_page_html(
-        project=project, version=version, sprint=sprint, pth=pth,
-        reqs=reqs, pl_email=pl_email, spec_id=spec_id,
-        cards_html=cards_html, notes_html=notes_html,
-        is_submitted=is_submitted, spec_status=spec_status,
-        general_notes_json=general_notes_json,
+    context = dict(
+        project=_PROJECT_NAMES.get(_raw_project, _raw_project),
+        version=spec_data.get("version", "?"),
+        sprint=spec_data.get("sprint", ""),
+        pth=spec_data.get("pth", ""),
+        reqs=", ".join(spec_data.get("linked_requirements", [])),
+        pl_email=pl_email,
+        spec_id=spec_id,
+        **bv_cards_context(
+            real_test_cases,
+            {tc["id"]: tc for tc in current_results if not tc.get("id", "").startswith("_")},
+        ),
+        submitted_cls="submitted" if is_submitted else "",
+        gn_attachments=gn_sentinel.get("attachments", []) if gn_sentinel else [],
+        general_notes_list=_parse_general_notes(general_notes),
+        is_submitted=is_submitted,
+        spec_status=spec_status,
     )
+    if stream:
+        return uat_templates.stream("uat/spec_page.html", **context)
+    return uat_templates.render("uat/spec_page.html", **context)
@@ -2,7 +2,6 @@
 MetaPM Verification Endpoints — MP18
 Permanent self-verification infrastructure for the portfolio lifecycle.
 """
-import json
 import logging
 import uuid
 from fastapi import APIRouter, HTTPException
@@ -10,6 +9,7 @@ from pydantic import BaseModel
 from typing import Optional
 
 from app.core.database import execute_query
+from app.services import bv_items
 from app.api.roadmap import ALLOWED_TRANSITIONS
 
 logger = logging.getLogger(__name__)
@@ -200,7 +200,7 @@ async def verify_uat_classification_gate(body: UATClassificationGateRequest):
     if not row:
         return {"check": "uat_classification_gate", "status": "fail", "reason": "spec not found"}
 
-    cases = json.loads(row["test_cases_json"]) if row.get("test_cases_json") else []
+    cases = bv_items.cases(body.spec_id, row)
     # MP20 BUG-039: match pl_visual explicitly (not just != cc_machine)
     pl_visual = [c for c in cases if not c.get("id", "").startswith("_") and c.get("type") == "pl_visual"]
 
@@ -0,0 +1,92 @@
+"""
+MetaPM In-Process Caches
+Small, thread-safe, size-bounded LRU cache with per-entry TTL and tag-based
+invalidation. Used for derived read models that are cheap to rebuild but
+expensive to compute on every request.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    LRU cache bounded by entry count. Each entry expires `ttl` seconds after
+    it was stored (ttl=None disables expiry). Entries can carry tags so a
+    write to one entity type drops only the entries derived from it.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: Optional[float] = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any, frozenset]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl is not None and now - stored_at > self.ttl
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING or self._expired(entry[0], now):
+                if entry is not _MISSING:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def get_entry(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        """Return (value, age_seconds) even if expired, or None if absent.
+        Lets callers serve stale data while they refresh."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            self._data.move_to_end(key)
+            return entry[1], now - entry[0]
+
+    def set(self, key: Hashable, value: Any, tags: Iterable[str] = ()) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic(), value, frozenset(tags))
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Drop every entry carrying any of `tags`. Returns entries removed."""
+        wanted: Set[str] = set(tags)
+        with self._lock:
+            doomed = [k for k, (_, _, t) in self._data.items() if t & wanted]
+            for k in doomed:
+                del self._data[k]
+            return len(doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,64 @@
+"""
+MetaPM Change Hooks
+In-process notification of entity writes so derived state (snapshots, caches,
+search indexes) can refresh incrementally instead of being recomputed on read.
+
+Write paths call notify_change(entity, keys) after their statements commit.
+Consumers register with subscribe(entity, callback). Callbacks run
+synchronously in the writer's thread; a failing callback is logged and never
+fails the write that triggered it.
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Entity names used by write paths. Keys are that table's primary key, except
+# the two bug join tables, whose keys are the affected bug requirement ids.
+REQUIREMENT = "requirement"
+BUG_CLASSIFICATION = "bug_classification"
+BUG_CHAIN_MEMBER = "bug_chain_member"
+HANDOFF = "handoff"
+UAT_PAGE = "uat_page"
+LESSON = "lesson"
+COMPLIANCE_DOC = "compliance_doc"
+PROMPT = "prompt"
+PROJECT = "project"
+
+ChangeCallback = Callable[[List[str]], None]
+
+_subscribers: Dict[str, List[ChangeCallback]] = {}
+_lock = threading.Lock()
+
+
+def subscribe(entity: str, callback: ChangeCallback) -> None:
+    """Register callback(keys) for writes to entity. Idempotent per callback."""
+    with _lock:
+        callbacks = _subscribers.setdefault(entity, [])
+        if callback not in callbacks:
+            callbacks.append(callback)
+
+
+def unsubscribe(entity: str, callback: ChangeCallback) -> None:
+    with _lock:
+        callbacks = _subscribers.get(entity, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+
+def notify_change(entity: str, keys: Optional[Iterable] = None) -> None:
+    """
+    Tell subscribers that rows of `entity` changed.
+    keys are the affected primary keys (stringified); an empty list means
+    "unknown / many rows" and subscribers should treat it as a full refresh.
+    """
+    key_list = [str(k) for k in (keys or []) if k is not None]
+    with _lock:
+        callbacks = list(_subscribers.get(entity, []))
+    for callback in callbacks:
+        try:
+            callback(key_list)
+        except Exception as e:
+            logger.warning(f"[change-hooks] {entity} subscriber {getattr(callback, '__name__', callback)} failed: {e}")
@@ -0,0 +1,54 @@
+"""
+MetaPM Compressed Text Columns
+Large HTML/markdown values are stored gzip-compressed in a VARBINARY
+`<column>_z` sibling instead of the NVARCHAR(MAX) column itself, which is
+left as '' (or NULL). The format is gzip over UTF-16LE — the same bytes SQL
+Server's COMPRESS() produces for an NVARCHAR — so the backfill can run in
+SQL and ad-hoc queries can read CAST(DECOMPRESS(x) AS NVARCHAR(MAX)).
+
+Values shorter than MIN_BYTES stay in the plain column: sentinels like
+'spec_created' and short prompts gain nothing from compression.
+cc_prompts.content is itself a 500-char preview and stays plain.
+
+Columns that SQL searches (full-text CONTAINSTABLE or LIKE) stay plain:
+mcp_handoffs.content, compliance_docs.content_md and code_files.content.
+"""
+
+import gzip
+from typing import Any, Dict, Optional, Tuple
+
+# table → compressed column (sibling is f"{column}_z")
+COLUMNS: Dict[str, str] = {
+    "uat_pages": "html_content",
+    "cc_prompts": "content_md",
+}
+
+MIN_BYTES = 2048
+
+
+def pack(text: Optional[str]) -> Optional[bytes]:
+    if text is None:
+        return None
+    return gzip.compress(text.encode("utf-16-le"), compresslevel=6, mtime=0)
+
+
+def unpack(blob: Optional[bytes]) -> Optional[str]:
+    if blob is None:
+        return None
+    return gzip.decompress(bytes(blob)).decode("utf-16-le")
+
+
+def split(text: Optional[str]) -> Tuple[Optional[str], Optional[bytes]]:
+    """(plain, compressed) values to write for `text`; exactly one carries it."""
+    if text is None or len(text) * 2 < MIN_BYTES:
+        return text, None
+    return "", pack(text)
+
+
+def read(row: Dict[str, Any], column: str) -> Optional[str]:
+    """Value of `column` from a row that selected both it and `<column>_z`."""
+    blob = row.get(f"{column}_z")
+    if blob is not None:
+        return unpack(blob)
+    return row.get(column)
+
@@ -43,6 +43,17 @@ class Settings(BaseSettings):
     PORTFOLIO_RAG_API_KEY: str = ""
     REINGEST_TOKEN: str = ""  # Shared with Portfolio RAG for auto-refresh on deploy
 
+    # Knowledge search: "memory" (in-process BM25 index) or "fulltext" (SQL Server CONTAINSTABLE)
+    SEARCH_BACKEND: str = "memory"
+
+    # Local vector search for the metapm/lessons RAG collections (needs NumPy)
+    VECTOR_SEARCH: bool = True
+    VECTOR_INDEX_DIR: str = "/tmp/metapm-vectors"
+    VECTOR_HYBRID_ALPHA: float = 0.6  # weight of cosine vs. normalized BM25 in hybrid scoring
+
+    # Compiled UAT template bytecode (app/services/uat_templates.py); empty disables
+    TEMPLATE_CACHE_DIR: str = "/tmp/metapm-templates"
+
     # Google OAuth (for PL-authenticated UAT pages)
     GOOGLE_CLIENT_ID: str = ""
     GOOGLE_CLIENT_SECRET: str = ""
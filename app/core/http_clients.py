@@ -0,0 +1,138 @@
+"""
+MetaPM Outbound HTTP Clients
+One pooled httpx client per upstream, shared by every request handler.
+
+Handlers used to open a fresh httpx.AsyncClient (or a blocking `requests`
+call) per request, paying DNS + TCP + TLS on every Portfolio RAG or
+Anthropic call. The registry keeps keep-alive pools per upstream so a slow
+or saturated upstream can't starve connections to the others, negotiates
+HTTP/2 where the `h2` package is installed, and is closed from the FastAPI
+lifespan on shutdown.
+
+Call sites keep passing absolute URLs; a per-call `timeout=` still
+overrides the upstream default (e.g. the long RAG sync).
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:  # HTTP/2 needs the optional h2 package (httpx[http2])
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+PORTFOLIO_RAG = "portfolio_rag"
+ANTHROPIC = "anthropic"
+OPENAI = "openai"
+GOOGLE_METADATA = "google_metadata"
+GOOGLE_RUN = "google_run"
+DEFAULT = "default"
+
+
+@dataclass(frozen=True)
+class Upstream:
+    timeout: float
+    connect_timeout: float = 5.0
+    max_connections: int = 20
+    max_keepalive: int = 10
+    keepalive_expiry: float = 30.0
+    http2: bool = True
+    follow_redirects: bool = False
+
+
+UPSTREAMS: Dict[str, Upstream] = {
+    PORTFOLIO_RAG: Upstream(timeout=15.0, max_connections=20, max_keepalive=10),
+    ANTHROPIC: Upstream(timeout=60.0, connect_timeout=10.0, max_connections=10, max_keepalive=5),
+    OPENAI: Upstream(timeout=60.0, connect_timeout=10.0, max_connections=10, max_keepalive=5),
+    # Metadata server is plain HTTP/1.1 on the local link
+    GOOGLE_METADATA: Upstream(timeout=5.0, connect_timeout=2.0, max_connections=5, max_keepalive=2,
+                              http2=False),
+    GOOGLE_RUN: Upstream(timeout=10.0, max_connections=5, max_keepalive=2),
+    # Anything else: MetaPM self-calls, PA webhook, verification of arbitrary URLs
+    DEFAULT: Upstream(timeout=30.0, max_connections=20, max_keepalive=10, http2=False),
+}
+
+_async_clients: Dict[str, httpx.AsyncClient] = {}
+_sync_clients: Dict[str, httpx.Client] = {}
+_lock = threading.Lock()
+
+
+def _client_kwargs(name: str) -> dict:
+    spec = UPSTREAMS.get(name)
+    if spec is None:
+        raise KeyError(f"Unknown HTTP upstream '{name}'")
+    return {
+        "timeout": httpx.Timeout(spec.timeout, connect=spec.connect_timeout),
+        "limits": httpx.Limits(
+            max_connections=spec.max_connections,
+            max_keepalive_connections=spec.max_keepalive,
+            keepalive_expiry=spec.keepalive_expiry,
+        ),
+        "http2": spec.http2 and HTTP2_AVAILABLE,
+        "follow_redirects": spec.follow_redirects,
+    }
+
+
+def get_client(name: str = DEFAULT) -> httpx.AsyncClient:
+    """Shared AsyncClient for an upstream. Do not close it or use it as a context manager."""
+    client = _async_clients.get(name)
+    if client is None or client.is_closed:
+        with _lock:
+            client = _async_clients.get(name)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(**_client_kwargs(name))
+                _async_clients[name] = client
+    return client
+
+
+def get_sync_client(name: str = DEFAULT) -> httpx.Client:
+    """Shared blocking Client for sync handlers and MCP tools (thread-safe)."""
+    client = _sync_clients.get(name)
+    if client is None or client.is_closed:
+        with _lock:
+            client = _sync_clients.get(name)
+            if client is None or client.is_closed:
+                client = httpx.Client(**_client_kwargs(name))
+                _sync_clients[name] = client
+    return client
+
+
+def startup(names: Optional[list] = None) -> None:
+    """Open the async pools up front so the first request doesn't pay for it."""
+    for name in names or UPSTREAMS:
+        get_client(name)
+    logger.info(f"HTTP clients ready: {', '.join(sorted(_async_clients))} (http2={HTTP2_AVAILABLE})")
+
+
+async def shutdown() -> None:
+    """Close every pooled connection. Safe to call more than once."""
+    with _lock:
+        async_clients = list(_async_clients.values())
+        sync_clients = list(_sync_clients.values())
+        _async_clients.clear()
+        _sync_clients.clear()
+    for client in async_clients:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"HTTP client close warning: {e}")
+    for client in sync_clients:
+        try:
+            client.close()
+        except Exception as e:
+            logger.warning(f"HTTP client close warning: {e}")
+
+
+def stats() -> dict:
+    return {
+        "http2": HTTP2_AVAILABLE,
+        "async": sorted(n for n, c in _async_clients.items() if not c.is_closed),
+        "sync": sorted(n for n, c in _sync_clients.items() if not c.is_closed),
+    }
@@ -4,6 +4,7 @@ Idempotent schema migrations run at startup.
 """
 
 import logging
+from app.core import compression
 from app.core.database import execute_query
 
 logger = logging.getLogger(__name__)
@@ -2188,4 +2189,343 @@ def run_migrations():
     except Exception as e:
         logger.warning(f"  Migration 64 warning: {e}")
 
+    # Migration 65: Materialized bug chain proposal snapshots (chain browse pages)
+    try:
+        tbl = execute_query("""
+            SELECT COUNT(*) as cnt FROM INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_NAME = 'chain_snapshot_seeded'
+        """, fetch="one")
+        if not tbl or tbl["cnt"] == 0:
+            logger.info("  Migration 65: Creating chain snapshot tables...")
+            execute_query("""
+                CREATE TABLE chain_snapshot_seeded (
+                    chain_label NVARCHAR(50) NOT NULL PRIMARY KEY,
+                    failure_class_hash NVARCHAR(200) NULL,
+                    expected_outcome NVARCHAR(500) NULL,
+                    missing_signal NVARCHAR(500) NULL,
+                    total_occurrences INT NOT NULL DEFAULT 0,
+                    member_requirement_codes NVARCHAR(MAX) NULL,
+                    first_occurrence_at DATETIME2 NULL,
+                    source NVARCHAR(20) NULL,
+                    refreshed_at DATETIME2 DEFAULT GETUTCDATE()
+                )
+            """, fetch="none")
+            execute_query("""
+                CREATE TABLE chain_snapshot_seeded_members (
+                    chain_label NVARCHAR(50) NOT NULL,
+                    member_code NVARCHAR(20) NOT NULL,
+                    CONSTRAINT PK_chain_snapshot_seeded_members PRIMARY KEY (chain_label, member_code)
+                )
+            """, fetch="none")
+            execute_query("CREATE INDEX ix_css_members_code ON chain_snapshot_seeded_members(member_code)", fetch="none")
+            execute_query("""
+                CREATE TABLE chain_snapshot_inductive (
+                    id INT IDENTITY PRIMARY KEY,
+                    chain_label NVARCHAR(50) NOT NULL,
+                    proposed_member_code NVARCHAR(20) NOT NULL,
+                    proposed_member_title NVARCHAR(500) NULL,
+                    match_rule NVARCHAR(500) NULL,
+                    recurrence_count INT NULL,
+                    diagnostic_present BIT NULL,
+                    refreshed_at DATETIME2 DEFAULT GETUTCDATE()
+                )
+            """, fetch="none")
+            execute_query("CREATE INDEX ix_csi_chain ON chain_snapshot_inductive(chain_label)", fetch="none")
+            execute_query("CREATE INDEX ix_csi_member ON chain_snapshot_inductive(proposed_member_code)", fetch="none")
+            execute_query("""
+                CREATE TABLE chain_snapshot_misclassified (
+                    id INT IDENTITY PRIMARY KEY,
+                    chain_label NVARCHAR(50) NOT NULL,
+                    member_requirement_code NVARCHAR(20) NOT NULL,
+                    bv_status NVARCHAR(20) NULL,
+                    bv_id NVARCHAR(50) NULL,
+                    bv_title NVARCHAR(500) NULL,
+                    failure_type NVARCHAR(100) NULL,
+                    misclassification_reason NVARCHAR(200) NULL,
+                    refreshed_at DATETIME2 DEFAULT GETUTCDATE()
+                )
+            """, fetch="none")
+            execute_query("CREATE INDEX ix_csm_chain ON chain_snapshot_misclassified(chain_label)", fetch="none")
+            execute_query("CREATE INDEX ix_csm_member ON chain_snapshot_misclassified(member_requirement_code)", fetch="none")
+            execute_query("""
+                CREATE TABLE chain_snapshot_unclassified (
+                    code NVARCHAR(20) NOT NULL PRIMARY KEY,
+                    title NVARCHAR(500) NULL,
+                    status NVARCHAR(50) NULL,
+                    reason_unclassified NVARCHAR(100) NULL,
+                    refreshed_at DATETIME2 DEFAULT GETUTCDATE()
+                )
+            """, fetch="none")
+            logger.info("  Migration 65: chain snapshot tables created.")
+            try:
+                from app.services.chain_snapshots import rebuild_snapshots
+                counts = rebuild_snapshots()
+                logger.info(f"  Migration 65: chain snapshots populated: {counts}")
+            except Exception as fill_err:
+                # Views may not exist yet on a fresh DB; POST /api/chains/snapshots/rebuild later.
+                logger.warning(f"  Migration 65: initial snapshot fill skipped: {fill_err}")
+        else:
+            logger.info("  Migration 65: chain snapshot tables already exist.")
+    except Exception as e:
+        logger.warning(f"  Migration 65 warning: {e}")
+
+    # Migration 66: Pre-aggregated UAT quality rollup (quality dashboard)
+    try:
+        tbl = execute_query("""
+            SELECT COUNT(*) as cnt FROM INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_NAME = 'uat_quality_rollup'
+        """, fetch="one")
+        if not tbl or tbl["cnt"] == 0:
+            logger.info("  Migration 66: Creating uat_quality_rollup table...")
+            execute_query("""
+                CREATE TABLE uat_quality_rollup (
+                    id INT IDENTITY PRIMARY KEY,
+                    prompt_id INT NOT NULL,
+                    pth NVARCHAR(20) NULL,
+                    sprint_id NVARCHAR(100) NULL,
+                    prompt_status NVARCHAR(30) NULL,
+                    five_q_applied BIT NULL,
+                    root_cause_method NVARCHAR(100) NULL,
+                    requirement_code NVARCHAR(20) NULL,
+                    project_code NVARCHAR(20) NULL,
+                    project_name NVARCHAR(200) NULL,
+                    sprint_title NVARCHAR(500) NULL,
+                    spec_id UNIQUEIDENTIFIER NULL,
+                    uat_status NVARCHAR(30) NULL,
+                    pl_submitted_at DATETIME2 NULL,
+                    attempt_number INT NULL,
+                    failure_type NVARCHAR(100) NULL,
+                    total_bvs INT NOT NULL DEFAULT 0,
+                    passed_bvs INT NOT NULL DEFAULT 0,
+                    failed_bvs INT NOT NULL DEFAULT 0,
+                    skipped_bvs INT NOT NULL DEFAULT 0,
+                    bv_pass_rate DECIMAL(5,1) NOT NULL DEFAULT 0,
+                    prompt_created_at DATETIME2 NULL,
+                    activity_at DATETIME2 NULL,
+                    refreshed_at DATETIME2 DEFAULT GETUTCDATE()
+                )
+            """, fetch="none")
+            execute_query("CREATE INDEX ix_uqr_pth ON uat_quality_rollup(pth)", fetch="none")
+            execute_query("CREATE INDEX ix_uqr_prompt ON uat_quality_rollup(prompt_id)", fetch="none")
+            execute_query("CREATE INDEX ix_uqr_activity ON uat_quality_rollup(activity_at DESC)", fetch="none")
+            execute_query("CREATE INDEX ix_uqr_project_activity ON uat_quality_rollup(project_code, activity_at DESC)", fetch="none")
+            logger.info("  Migration 66: uat_quality_rollup table created.")
+            try:
+                from app.services.quality_rollup import rebuild_rollup
+                rows = rebuild_rollup()
+                logger.info(f"  Migration 66: uat_quality_rollup populated: {rows} rows")
+            except Exception as fill_err:
+                logger.warning(f"  Migration 66: initial rollup fill skipped: {fill_err}")
+        else:
+            logger.info("  Migration 66: uat_quality_rollup table already exists.")
+    except Exception as e:
+        logger.warning(f"  Migration 66 warning: {e}")
+
+    # Migration 67: Full-text catalog + indexes for knowledge/handoff/transaction search
+    try:
+        from app.services.fulltext import ensure_fulltext
+        ft_status = ensure_fulltext()
+        logger.info(f"  Migration 67: full-text indexes: {ft_status}")
+    except Exception as e:
+        logger.warning(f"  Migration 67 warning (LIKE search stays in use): {e}")
+
+    # Migration 68: rag_sync_state — per-chunk content hashes for incremental RAG sync
+    try:
+        result = execute_query("""
+            SELECT COUNT(*) as cnt FROM INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_NAME = 'rag_sync_state'
+        """, fetch="one")
+        if result and result['cnt'] == 0:
+            logger.info("  Migration 68: Creating rag_sync_state table...")
+            execute_query("""
+                CREATE TABLE rag_sync_state (
+                    chunk_id NVARCHAR(200) NOT NULL PRIMARY KEY,
+                    collection NVARCHAR(50) NOT NULL,
+                    source_type NVARCHAR(20) NOT NULL,
+                    source_id NVARCHAR(100) NOT NULL,
+                    content_hash CHAR(64) NOT NULL,
+                    synced_at DATETIME2 NOT NULL DEFAULT GETUTCDATE()
+                )
+            """, fetch="none")
+            execute_query("CREATE INDEX ix_rss_collection_source ON rag_sync_state(collection, source_type, source_id)", fetch="none")
+            logger.info("  Migration 68: rag_sync_state table created.")
+        else:
+            logger.info("  Migration 68: rag_sync_state table already exists.")
+    except Exception as e:
+        logger.warning(f"  Migration 68 warning: {e}")
+
+    # Migration 69: rag_outbox — durable queue of Portfolio RAG ingests, drained by app/services/rag_outbox.py
+    try:
+        result = execute_query("""
+            SELECT COUNT(*) as cnt FROM INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_NAME = 'rag_outbox'
+        """, fetch="one")
+        if result and result['cnt'] == 0:
+            logger.info("  Migration 69: Creating rag_outbox table...")
+            execute_query("""
+                CREATE TABLE rag_outbox (
+                    id BIGINT IDENTITY(1,1) NOT NULL PRIMARY KEY,
+                    collection NVARCHAR(50) NOT NULL,
+                    source_type NVARCHAR(20) NOT NULL,
+                    source_id NVARCHAR(100) NOT NULL,
+                    status NVARCHAR(10) NOT NULL DEFAULT 'pending',
+                    attempts INT NOT NULL DEFAULT 0,
+                    next_attempt_at DATETIME2 NOT NULL DEFAULT GETUTCDATE(),
+                    locked_until DATETIME2 NULL,
+                    last_error NVARCHAR(1000) NULL,
+                    created_at DATETIME2 NOT NULL DEFAULT GETUTCDATE()
+                )
+            """, fetch="none")
+            execute_query("CREATE INDEX ix_rag_outbox_due ON rag_outbox(status, next_attempt_at)", fetch="none")
+            logger.info("  Migration 69: rag_outbox table created.")
+        else:
+            logger.info("  Migration 69: rag_outbox table already exists.")
+    except Exception as e:
+        logger.warning(f"  Migration 69 warning: {e}")
+
+    # Migration 70: uat_pages normalize-on-read — html_norm_version + row_version (cache key / write guard)
+    for col_name, col_def in [
+        ("html_norm_version", "INT NULL"),
+        ("row_version", "ROWVERSION"),
+    ]:
+        try:
+            result = execute_query("""
+                SELECT COUNT(*) as cnt
+                FROM INFORMATION_SCHEMA.COLUMNS
+                WHERE TABLE_NAME = 'uat_pages' AND COLUMN_NAME = ?
+            """, (col_name,), fetch="one")
+            if result and result['cnt'] == 0:
+                logger.info(f"  Migration 70: Adding {col_name} column to uat_pages...")
+                execute_query(f"ALTER TABLE uat_pages ADD {col_name} {col_def}", fetch="none")
+                logger.info(f"  Migration 70: {col_name} column added.")
+            else:
+                logger.info(f"  Migration 70: {col_name} already exists.")
+        except Exception as e:
+            logger.warning(f"  Migration 70 ({col_name}) warning: {e}")
+
+    # Migration 71: uat_bv_items as source of truth for BV results (app/services/bv_items.py)
+    for table, col_name, col_def in [
+        ("uat_bv_items", "failure_type", "NVARCHAR(50) NULL"),
+        ("uat_bv_items", "legacy_classification_note", "NVARCHAR(50) NULL"),
+        ("uat_bv_items", "attachments_json", "NVARCHAR(MAX) NULL"),
+        ("uat_bv_items", "result_text", "NVARCHAR(MAX) NULL"),
+        ("uat_pages", "general_notes_attachments", "NVARCHAR(MAX) NULL"),
+    ]:
+        try:
+            result = execute_query("""
+                SELECT COUNT(*) as cnt
+                FROM INFORMATION_SCHEMA.COLUMNS
+                WHERE TABLE_NAME = ? AND COLUMN_NAME = ?
+            """, (table, col_name), fetch="one")
+            if result and result['cnt'] == 0:
+                execute_query(f"ALTER TABLE {table} ADD [{col_name}] {col_def}", fetch="none")
+                logger.info(f"  Migration 71: Added {table}.{col_name}")
+            else:
+                logger.info(f"  Migration 71: {table}.{col_name} already exists.")
+        except Exception as e:
+            logger.warning(f"  Migration 71 ({table}.{col_name}) warning: {e}")
+    try:
+        # MERGE on (spec_id, bv_id) needs one row per BV: keep the newest duplicate
+        execute_query("""
+            IF NOT EXISTS (
+                SELECT 1 FROM sys.indexes
+                WHERE name = 'ux_uat_bv_items_spec_bv' AND object_id = OBJECT_ID('uat_bv_items')
+            )
+            BEGIN
+                WITH ranked AS (
+                    SELECT ROW_NUMBER() OVER (
+                        PARTITION BY spec_id, bv_id ORDER BY updated_at DESC
+                    ) AS rn
+                    FROM uat_bv_items
+                )
+                DELETE FROM ranked WHERE rn > 1;
+                CREATE UNIQUE INDEX ux_uat_bv_items_spec_bv ON uat_bv_items(spec_id, bv_id);
+            END
+        """, fetch="none")
+        logger.info("  Migration 71: ux_uat_bv_items_spec_bv ready.")
+    except Exception as e:
+        logger.warning(f"  Migration 71 (unique index) warning: {e}")
+
+    # Migration 72: gzip-compressed siblings for large text columns (app/core/compression.py)
+    for table, col_name in compression.COLUMNS.items():
+        z_col = f"{col_name}_z"
+        try:
+            result = execute_query("""
+                SELECT COUNT(*) as cnt
+                FROM INFORMATION_SCHEMA.COLUMNS
+                WHERE TABLE_NAME = ? AND COLUMN_NAME = ?
+            """, (table, z_col), fetch="one")
+            if result and result['cnt'] == 0:
+                execute_query(f"ALTER TABLE {table} ADD [{z_col}] VARBINARY(MAX) NULL", fetch="none")
+                logger.info(f"  Migration 72: Added {table}.{z_col}")
+            else:
+                logger.info(f"  Migration 72: {table}.{z_col} already exists.")
+        except Exception as e:
+            logger.warning(f"  Migration 72 ({table}.{z_col}) warning: {e}")
+            continue
+        try:
+            # Backfill in small batches so each transaction and its log stay short
+            moved = 0
+            while True:
+                batch = execute_query(f"""
+                    SET NOCOUNT ON;
+                    UPDATE TOP (200) {table}
+                    SET [{z_col}] = COMPRESS([{col_name}]), [{col_name}] = ''
+                    WHERE [{z_col}] IS NULL AND DATALENGTH([{col_name}]) >= ?;
+                    SELECT @@ROWCOUNT AS n;
+                """, (compression.MIN_BYTES,), fetch="one")
+                if not batch or not batch['n']:
+                    break
+                moved += batch['n']
+            if moved:
+                # Give back the LOB pages the plain text used to occupy
+                execute_query(f"ALTER INDEX ALL ON {table} REORGANIZE WITH (LOB_COMPACTION = ON)", fetch="none")
+                logger.info(f"  Migration 72: Compressed {moved} {table}.{col_name} values.")
+            else:
+                logger.info(f"  Migration 72: {table}.{col_name} already compressed.")
+        except Exception as e:
+            logger.warning(f"  Migration 72 ({table}.{col_name} backfill) warning: {e}")
+
+    # Migration 73: background_jobs — durable post-request work, run by app/services/job_queue.py
+    try:
+        result = execute_query("""
+            SELECT COUNT(*) as cnt FROM INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_NAME = 'background_jobs'
+        """, fetch="one")
+        if result and result['cnt'] == 0:
+            logger.info("  Migration 73: Creating background_jobs table...")
+            execute_query("""
+                CREATE TABLE background_jobs (
+                    id BIGINT IDENTITY(1,1) NOT NULL PRIMARY KEY,
+                    kind NVARCHAR(50) NOT NULL,
+                    payload NVARCHAR(MAX) NULL,
+                    priority INT NOT NULL DEFAULT 0,
+                    status NVARCHAR(10) NOT NULL DEFAULT 'pending',
+                    attempts INT NOT NULL DEFAULT 0,
+                    max_attempts INT NOT NULL DEFAULT 5,
+                    dedupe_key NVARCHAR(200) NULL,
+                    next_attempt_at DATETIME2 NOT NULL DEFAULT GETUTCDATE(),
+                    locked_until DATETIME2 NULL,
+                    last_error NVARCHAR(1000) NULL,
+                    result_json NVARCHAR(MAX) NULL,
+                    created_at DATETIME2 NOT NULL DEFAULT GETUTCDATE(),
+                    started_at DATETIME2 NULL,
+                    finished_at DATETIME2 NULL
+                )
+            """, fetch="none")
+            execute_query(
+                "CREATE INDEX ix_background_jobs_due ON background_jobs(status, priority DESC, next_attempt_at)",
+                fetch="none"
+            )
+            execute_query(
+                "CREATE INDEX ix_background_jobs_dedupe ON background_jobs(dedupe_key, status) "
+                "WHERE dedupe_key IS NOT NULL",
+                fetch="none"
+            )
+            logger.info("  Migration 73: background_jobs table created.")
+        else:
+            logger.info("  Migration 73: background_jobs table already exists.")
+    except Exception as e:
+        logger.warning(f"  Migration 73 warning: {e}")
+
     logger.info("Migrations complete.")
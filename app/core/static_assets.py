@@ -0,0 +1,75 @@
+"""
+MetaPM Static Assets — content-hashed URLs for shared CSS/JS.
+
+UAT pages link their shared stylesheet and script instead of inlining them.
+`asset_url("css/uat-spec.css")` returns /assets/css/uat-spec.<hash>.css, where
+<hash> is taken from the file's current content, so the response can be
+cached as immutable and a changed file gets a new URL.
+
+Stored pages outlive a deploy: a request for an old hash still gets the
+current file (revalidated, not immutable), and `refresh_urls` rewrites old
+hashes in stored HTML to the current ones when a page is served.
+"""
+
+import hashlib
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from fastapi import HTTPException
+from fastapi.responses import FileResponse
+
+STATIC_DIR = Path(__file__).resolve().parent.parent.parent / "static"
+URL_PREFIX = "/assets/"
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+_HASH_LEN = 12
+_HASHED_NAME = re.compile(r"^(?P<stem>.+)\.(?P<digest>[0-9a-f]{%d})(?P<ext>\.[A-Za-z0-9]+)$" % _HASH_LEN)
+_HASHED_URL = re.compile(r"/assets/(?P<path>[\w./-]+?)\.[0-9a-f]{%d}(?P<ext>\.[A-Za-z0-9]+)" % _HASH_LEN)
+
+
+def _resolve(rel_path: str) -> Optional[Path]:
+    path = (STATIC_DIR / rel_path).resolve()
+    if STATIC_DIR not in path.parents or not path.is_file():
+        return None
+    return path
+
+
+@lru_cache(maxsize=64)
+def digest(rel_path: str) -> str:
+    """Content hash of a file under /static. Files only change with a deploy."""
+    path = _resolve(rel_path)
+    if path is None:
+        raise FileNotFoundError(rel_path)
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:_HASH_LEN]
+
+
+def asset_url(rel_path: str) -> str:
+    """/assets URL for a file under /static, e.g. "css/uat-spec.css"."""
+    stem, dot, ext = rel_path.rpartition(".")
+    return f"{URL_PREFIX}{stem}.{digest(rel_path)}{dot}{ext}"
+
+
+def refresh_urls(html: str) -> str:
+    """Point every hashed asset URL in `html` at the current file content."""
+    def _current(m):
+        rel_path = f"{m.group('path')}{m.group('ext')}"
+        try:
+            return asset_url(rel_path)
+        except FileNotFoundError:
+            return m.group(0)
+    return _HASHED_URL.sub(_current, html)
+
+
+def serve(hashed_path: str) -> FileResponse:
+    """Response for GET /assets/{hashed_path}."""
+    m = _HASHED_NAME.match(hashed_path)
+    if not m:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    rel_path = f"{m.group('stem')}{m.group('ext')}"
+    path = _resolve(rel_path)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    current = m.group("digest") == digest(rel_path)
+    return FileResponse(str(path), headers={"Cache-Control": IMMUTABLE if current else "no-cache"})
@@ -6,6 +6,7 @@ FastAPI Application Entry Point
 import base64
 import os
 import uuid as _uuid
+from contextlib import asynccontextmanager
 from pathlib import Path
 from fastapi import FastAPI, Request, UploadFile, File
 from fastapi.staticfiles import StaticFiles
@@ -14,7 +15,8 @@ from fastapi.responses import RedirectResponse, JSONResponse, FileResponse, HTML
 from fastapi.exceptions import RequestValidationError
 from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 
-from app.api import tasks, projects, categories, methodology, capture, calendar, themes, backlog, mcp, roadmap, handoff_lifecycle, conductor, rag, lessons, uat_gen, governance, seed, auth, uat_spec, prompts, reviews, radar, challenge, intelligence, verify, quality, prompt_builder, templates_api, tool_inventory, code_status, erd, chains, classifier
+from app.api import tasks, projects, categories, methodology, capture, calendar, themes, backlog, mcp, roadmap, handoff_lifecycle, conductor, rag, lessons, uat_gen, governance, seed, auth, uat_spec, prompts, reviews, radar, challenge, intelligence, verify, quality, prompt_builder, templates_api, tool_inventory, code_status, erd, chains, classifier, background_jobs
+from app.core import http_clients, static_assets
 from app.core.config import settings
 from app.core.migrations import run_migrations
 from app.schemas.mcp import UATDirectSubmit, UATDirectSubmitResponse
@@ -24,12 +26,35 @@ import traceback
 
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pooled outbound HTTP clients (Portfolio RAG, Anthropic, OpenAI, Google APIs)
+    http_clients.startup()
+    # Compile UAT page templates once, before the first request
+    from app.services import uat_templates
+    uat_templates.warm()
+    # Drains rag_outbox (lesson/UAT ingests queued by request handlers)
+    from app.services import rag_outbox
+    rag_outbox.start()
+    # Runs background_jobs (verification, PA webhooks, Cloud Run triggers) queued by request handlers
+    from app.services import job_queue
+    job_queue.start()
+    try:
+        yield
+    finally:
+        await job_queue.stop()
+        await rag_outbox.stop()
+        await http_clients.shutdown()
+
+
 app = FastAPI(
     title="MetaPM",
     description="Cross-project task management system for Corey's 2026 projects",
     version=settings.VERSION,
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    lifespan=lifespan,
 )
 
 # Log startup to verify deployment
@@ -61,6 +86,28 @@ try:
 except Exception as e:
     logger.warning(f"Startup sweep warning (non-fatal): {e}")
 
+# Knowledge search index: streamed build on a background thread (not at import of the module)
+try:
+    if settings.SEARCH_BACKEND.lower() != "fulltext":
+        from app.services import search_index
+        search_index.warm_in_background()
+except Exception as e:
+    logger.warning(f"Search index warm-up warning (non-fatal): {e}")
+
+# Local vector index: load persisted vectors (or embed) on a background thread
+try:
+    from app.services import vector_index
+    vector_index.warm_in_background()
+except Exception as e:
+    logger.warning(f"Vector index warm-up warning (non-fatal): {e}")
+
+# Typeahead prefix index: small, but still built off the request path
+try:
+    from app.services import typeahead
+    typeahead.warm_in_background()
+except Exception as e:
+    logger.warning(f"Typeahead warm-up warning (non-fatal): {e}")
+
 # Redirect root to dashboard
 @app.get("/")
 async def root_redirect():
@@ -158,6 +205,7 @@ app.include_router(code_status.router, tags=["Code Files"])
 app.include_router(erd.router, tags=["ERD"])
 app.include_router(chains.router, tags=["Chains"])
 app.include_router(classifier.router, tags=["Classifier"])
+app.include_router(background_jobs.router, prefix="/api", tags=["Background Jobs"])
 
 
 # Define static_dir early for use in routes
@@ -515,6 +563,12 @@ async def favicon():
     raise HTTPException(status_code=404, detail="Favicon not found")
 
 
+@app.get("/assets/{asset_path:path}")
+async def hashed_asset(asset_path: str):
+    """Serve a content-hashed static asset (see app/core/static_assets.py)."""
+    return static_assets.serve(asset_path)
+
+
 @app.options("/api/uat/submit")
 async def api_uat_submit_preflight():
     """Handle browser preflight for UAT submit alias."""
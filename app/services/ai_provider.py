@@ -3,7 +3,7 @@ Provider-agnostic AI wrapper. Swap provider by changing config.
 Currently: Anthropic Claude. Future: OpenAI, Gemini, etc.
 """
 import os
-import httpx
+from app.core import http_clients
 from app.core.config import settings
 
 AI_PROVIDER = os.getenv("AI_PROVIDER", "anthropic")
@@ -19,21 +19,21 @@ async def call_ai(system_prompt: str, user_message: str) -> str:
 
 async def _call_anthropic(system_prompt: str, user_message: str) -> str:
     api_key = settings.ANTHROPIC_API_KEY
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        resp = await client.post(
-            "https://api.anthropic.com/v1/messages",
-            headers={
-                "x-api-key": api_key,
-                "anthropic-version": "2023-06-01",
-                "content-type": "application/json",
-            },
-            json={
-                "model": AI_MODEL,
-                "max_tokens": 4096,
-                "system": system_prompt,
-                "messages": [{"role": "user", "content": user_message}],
-            },
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        return data["content"][0]["text"]
+    client = http_clients.get_client(http_clients.ANTHROPIC)
+    resp = await client.post(
+        "https://api.anthropic.com/v1/messages",
+        headers={
+            "x-api-key": api_key,
+            "anthropic-version": "2023-06-01",
+            "content-type": "application/json",
+        },
+        json={
+            "model": AI_MODEL,
+            "max_tokens": 4096,
+            "system": system_prompt,
+            "messages": [{"role": "user", "content": user_message}],
+        },
+    )
+    resp.raise_for_status()
+    data = resp.json()
+    return data["content"][0]["text"]
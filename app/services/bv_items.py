@@ -0,0 +1,255 @@
+"""
+BV Items — uat_bv_items as the source of truth for per-BV UAT results.
+
+uat_pages.test_cases_json holds a spec's definition (ids, titles, steps,
+expected, type) as posted. Results live in one uat_bv_items row per
+(spec_id, bv_id), written by `apply()` as a single MERGE that touches only
+the BVs and columns named in the update, so a PL submit and a CC machine-
+result submit on the same spec no longer overwrite each other.
+
+`cases()` builds the old test_cases_json shape on demand — definition
+overlaid with row results — and caches it per spec until the next
+UAT_PAGE change. Column mapping (MP56): `classification` holds the failure
+type when there is one, else the PL label; `legacy_classification_note`
+holds the PL label whenever the PL has classified the BV. Rows written
+before that are overlaid only for status, notes and CC evidence, so older
+specs keep their classifications from the JSON. A row still at its seeded
+pending status or empty notes leaves the JSON value alone, so a legacy
+spec's results survive the rows seeded for it.
+"""
+
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.core import change_hooks
+from app.core.cache import TTLCache
+from app.core.database import execute_query
+
+logger = logging.getLogger(__name__)
+
+GENERAL_NOTES_ID = "_general_notes"
+
+_cache = TTLCache(maxsize=256, ttl=300)
+
+_IN_CHUNK = 1000
+
+_ROW_COLUMNS = (
+    "spec_id, bv_id, status, notes, classification, legacy_classification_note, "
+    "failure_type, cc_result, cc_evidence, attachments_json, result_text"
+)
+
+# NULL in the source keeps the stored value; '' clears the nullable columns.
+_MERGE = """
+    MERGE uat_bv_items WITH (HOLDLOCK) AS t
+    USING (
+        SELECT * FROM OPENJSON(?) WITH (
+            bv_id NVARCHAR(50) '$.bv_id',
+            title NVARCHAR(200) '$.title',
+            status NVARCHAR(20) '$.status',
+            notes NVARCHAR(MAX) '$.notes',
+            classification NVARCHAR(50) '$.classification',
+            legacy_classification_note NVARCHAR(50) '$.legacy_classification_note',
+            failure_type NVARCHAR(50) '$.failure_type',
+            cc_result NVARCHAR(20) '$.cc_result',
+            cc_evidence NVARCHAR(MAX) '$.cc_evidence',
+            attachments_json NVARCHAR(MAX) '$.attachments_json',
+            result_text NVARCHAR(MAX) '$.result_text'
+        )
+    ) AS s
+    ON t.spec_id = ? AND t.bv_id = s.bv_id
+    WHEN MATCHED THEN UPDATE SET
+        status = COALESCE(s.status, t.status),
+        notes = COALESCE(s.notes, t.notes),
+        classification = CASE WHEN s.classification IS NULL THEN t.classification
+                              ELSE NULLIF(s.classification, '') END,
+        legacy_classification_note = COALESCE(s.legacy_classification_note, t.legacy_classification_note),
+        failure_type = CASE WHEN s.failure_type IS NULL THEN t.failure_type
+                            ELSE NULLIF(s.failure_type, '') END,
+        cc_result = COALESCE(s.cc_result, t.cc_result),
+        cc_evidence = COALESCE(s.cc_evidence, t.cc_evidence),
+        attachments_json = COALESCE(s.attachments_json, t.attachments_json),
+        result_text = COALESCE(s.result_text, t.result_text),
+        updated_at = GETUTCDATE()
+    WHEN NOT MATCHED THEN INSERT (
+        spec_id, bv_id, title, status, notes, classification, legacy_classification_note,
+        failure_type, cc_result, cc_evidence, attachments_json, result_text
+    ) VALUES (
+        ?, s.bv_id, COALESCE(s.title, s.bv_id), COALESCE(s.status, 'pending'), COALESCE(s.notes, ''),
+        NULLIF(s.classification, ''), s.legacy_classification_note, NULLIF(s.failure_type, ''),
+        s.cc_result, s.cc_evidence, s.attachments_json, s.result_text
+    );
+"""
+
+_SEED = """
+    INSERT INTO uat_bv_items (spec_id, bv_id, title, status, notes)
+    SELECT ?, bv_id, title, 'pending', ''
+    FROM OPENJSON(?) WITH (bv_id NVARCHAR(50) '$.id', title NVARCHAR(200) '$.title')
+"""
+
+
+def _key(spec_id: str) -> str:
+    return str(spec_id).upper()
+
+
+def _definition(page: Dict[str, Any]) -> List[dict]:
+    try:
+        return json.loads(page.get("test_cases_json") or "[]")
+    except (json.JSONDecodeError, TypeError):
+        return []
+
+
+# What seed() writes. A row still holding these has no result of its own,
+# so it must not mask one recorded in test_cases_json before MP56.
+_SEEDED = {"status": "pending", "notes": ""}
+
+
+def _overlay(case: dict, row: Dict[str, Any]) -> None:
+    for column, field in (("status", "status"), ("notes", "notes"), ("cc_result", "cc_result"),
+                          ("cc_evidence", "cc_evidence"), ("result_text", "result")):
+        value = row.get(column)
+        if value is not None and value != _SEEDED.get(column):
+            case[field] = value
+    if row.get("attachments_json"):
+        case["attachments"] = json.loads(row["attachments_json"])
+    if row.get("legacy_classification_note") is not None:
+        case["classification"] = row["legacy_classification_note"]
+        case["failure_type"] = row.get("failure_type") or ""
+
+
+def merge_results(definition: List[dict], rows: Iterable[Dict[str, Any]],
+                  general_notes_attachments: Optional[str] = None) -> List[dict]:
+    """The test_cases_json view: each defined case with its row's results applied."""
+    by_id = {r["bv_id"]: r for r in rows}
+    cases = []
+    for case in definition:
+        case = dict(case)
+        row = by_id.get(case.get("id"))
+        if row:
+            _overlay(case, row)
+        cases.append(case)
+    if general_notes_attachments:
+        attachments = json.loads(general_notes_attachments)
+        sentinel = next((c for c in cases if c.get("id") == GENERAL_NOTES_ID), None)
+        if sentinel is None:
+            cases.append({"id": GENERAL_NOTES_ID, "attachments": attachments})
+        else:
+            sentinel["attachments"] = attachments
+    return cases
+
+
+def cases(spec_id: str, page: Dict[str, Any]) -> List[dict]:
+    """
+    Current test cases for a spec. `page` is its uat_pages row and must
+    carry test_cases_json (and general_notes_attachments, if selected).
+    """
+    key = _key(spec_id)
+    view = _cache.get(key)
+    if view is None:
+        rows = execute_query(
+            f"SELECT {_ROW_COLUMNS} FROM uat_bv_items WHERE spec_id = ?", (spec_id,)
+        ) or []
+        view = merge_results(_definition(page), rows, page.get("general_notes_attachments"))
+        _cache.set(key, view, tags=[key])
+    return [dict(c) for c in view]
+
+
+def cases_many(pages: List[Dict[str, Any]]) -> Dict[str, List[dict]]:
+    """cases() for a list of uat_pages rows (keyed by str(id)), one query per 1000 specs."""
+    ids = [str(p["id"]) for p in pages]
+    rows_by_spec: Dict[str, List[dict]] = {}
+    for i in range(0, len(ids), _IN_CHUNK):
+        chunk = ids[i:i + _IN_CHUNK]
+        rows = execute_query(
+            f"SELECT {_ROW_COLUMNS} FROM uat_bv_items WHERE spec_id IN ({', '.join('?' * len(chunk))})",
+            tuple(chunk),
+        ) or []
+        for r in rows:
+            rows_by_spec.setdefault(_key(r["spec_id"]), []).append(r)
+    return {
+        str(p["id"]): merge_results(_definition(p), rows_by_spec.get(_key(p["id"]), []),
+                                    p.get("general_notes_attachments"))
+        for p in pages
+    }
+
+
+def _source_row(update: Dict[str, Any]) -> Dict[str, Any]:
+    """uat_bv_items columns for one update given in test_cases_json field names."""
+    row: Dict[str, Any] = {"bv_id": update["id"]}
+    for field, column in (("status", "status"), ("notes", "notes"), ("cc_result", "cc_result"),
+                          ("cc_evidence", "cc_evidence"), ("result", "result_text")):
+        if update.get(field) is not None:
+            row[column] = update[field]
+    if update.get("title"):
+        row["title"] = update["title"][:200]
+    if update.get("attachments"):
+        row["attachments_json"] = json.dumps(update["attachments"])
+    if "classification" in update or "failure_type" in update:
+        label = update.get("classification") or ""
+        failure_type = update.get("failure_type") or ""
+        row["classification"] = failure_type or label
+        row["legacy_classification_note"] = label
+        row["failure_type"] = failure_type
+    return row
+
+
+def apply(cursor, spec_id: str, updates: List[Dict[str, Any]]) -> int:
+    """
+    Upsert results for the given BVs in one MERGE on the caller's cursor.
+    Each update is {"id": bv_id, ...fields}; only fields present are
+    written. Returns the number of BVs sent.
+    """
+    by_id = {u["id"]: _source_row(u) for u in updates if u.get("id")}
+    if not by_id:
+        return 0
+    cursor.execute(_MERGE, (json.dumps(list(by_id.values())), spec_id, spec_id))
+    return len(by_id)
+
+
+def _seed_rows(definition: List[dict]) -> List[dict]:
+    return [
+        {"id": tc["id"], "title": (tc.get("title") or "")[:200]}
+        for tc in definition
+        if tc.get("id") and not tc["id"].startswith("_")
+    ]
+
+
+def seed(cursor, spec_id: str, definition: List[dict]) -> None:
+    """Replace a spec's rows with one pending row per defined BV (spec create / re-spec)."""
+    cursor.execute("DELETE FROM uat_bv_items WHERE spec_id = ?", (spec_id,))
+    bvs = _seed_rows(definition)
+    if bvs:
+        cursor.execute(_SEED, (spec_id, json.dumps(bvs)))
+
+
+def seed_many(cursor, definitions: Dict[str, List[dict]]) -> None:
+    """seed() for many specs at once: one DELETE and one INSERT for the whole batch."""
+    if not definitions:
+        return
+    cursor.execute(
+        "DELETE FROM uat_bv_items WHERE spec_id IN (SELECT value FROM OPENJSON(?))",
+        (json.dumps(list(definitions)),),
+    )
+    rows = [{"spec_id": spec_id, **bv} for spec_id, definition in definitions.items()
+            for bv in _seed_rows(definition)]
+    if rows:
+        cursor.execute("""
+            INSERT INTO uat_bv_items (spec_id, bv_id, title, status, notes)
+            SELECT spec_id, bv_id, title, 'pending', ''
+            FROM OPENJSON(?) WITH (spec_id NVARCHAR(50) '$.spec_id', bv_id NVARCHAR(50) '$.id',
+                                   title NVARCHAR(200) '$.title')
+        """, (json.dumps(rows),))
+
+
+def invalidate(spec_ids: Iterable[str]) -> None:
+    _cache.invalidate_tags([_key(s) for s in spec_ids])
+
+
+def _on_uat_page_change(keys: List[str]) -> None:
+    if keys:
+        invalidate(keys)
+    else:
+        _cache.clear()
+
+
+change_hooks.subscribe(change_hooks.UAT_PAGE, _on_uat_page_change)
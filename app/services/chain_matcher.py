@@ -0,0 +1,405 @@
+"""
+Inductive Chain Matcher — in-process replacement for the MP53B inductive view rules.
+
+Bug titles and descriptions are tokenized once and kept in an inverted index
+(token → bug ids) alongside a MinHash signature per bug. Candidate members for a
+chain are drawn from the postings of the chain's `tokens` and
+`failure_class_hash` components, then scored on token coverage plus estimated
+Jaccard similarity to the chain's current members. Near-duplicate lookups use
+LSH banding over the signatures, so neither path scans every bug.
+
+The index loads lazily on first use and is kept current through the
+requirement change hook.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core import change_hooks
+from app.core.database import execute_query
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERM // BANDS
+_MERSENNE = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9_]+")
+STOPWORDS = frozenset("""
+    a an and are as at be but by can for from has have in into is it its not of on or
+    that the their then there this to was were when which will with without after before
+    does doesn don should would could still also only just now new bug fix fixed issue
+""".split())
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase word tokens, stopwords and 1-char tokens removed, crude plural folding."""
+    if not text:
+        return []
+    tokens = []
+    for tok in _TOKEN_RE.findall(text.lower()):
+        if tok in STOPWORDS or tok.isdigit():
+            continue
+        if len(tok) > 4 and tok.endswith("s") and not tok.endswith("ss"):
+            tok = tok[:-1]
+        tokens.append(tok)
+    return tokens
+
+
+def hash_tokens(failure_class_hash: Optional[str]) -> List[str]:
+    """Tokens from a `type:module:symptom` failure class hash."""
+    if not failure_class_hash:
+        return []
+    return tokenize(re.sub(r"[:/._-]", " ", failure_class_hash))
+
+
+def _permutations() -> List[Tuple[int, int]]:
+    perms = []
+    for i in range(NUM_PERM):
+        digest = hashlib.blake2b(f"metapm-minhash-{i}".encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], "big") % _MERSENNE or 1
+        b = int.from_bytes(digest[8:], "big") % _MERSENNE
+        perms.append((a, b))
+    return perms
+
+
+_PERMS = _permutations()
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "big")
+
+
+def minhash(tokens: Iterable[str]) -> Tuple[int, ...]:
+    """MinHash signature of a token set (NUM_PERM 32-bit values)."""
+    hashes = [_token_hash(t) for t in set(tokens)]
+    if not hashes:
+        return tuple([_MAX_HASH] * NUM_PERM)
+    return tuple(
+        min(((a * h + b) % _MERSENNE) & _MAX_HASH for h in hashes)
+        for a, b in _PERMS
+    )
+
+
+def signature_similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of the sets behind two signatures."""
+    if not sig_a or not sig_b:
+        return 0.0
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+@dataclass
+class BugDoc:
+    id: str
+    code: str
+    title: str
+    project_code: str = ""
+    created_at: Optional[datetime] = None
+    tokens: Set[str] = field(default_factory=set)
+    signature: Tuple[int, ...] = ()
+
+
+class ChainMatcher:
+    """Inverted token index + MinHash/LSH over bug requirements."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.docs: Dict[str, BugDoc] = {}
+        self.by_code: Dict[str, str] = {}
+        self.postings: Dict[str, Set[str]] = {}
+        self.buckets: Dict[Tuple[int, Tuple[int, ...]], Set[str]] = {}
+
+    # -- maintenance --------------------------------------------------------
+
+    def upsert(self, bug_id: str, code: str, title: str, description: str = "",
+               project_code: str = "", created_at: Optional[datetime] = None) -> None:
+        tokens = set(tokenize(title)) | set(tokenize(description))
+        doc = BugDoc(
+            id=bug_id, code=code, title=title or "", project_code=project_code or "",
+            created_at=created_at, tokens=tokens, signature=minhash(tokens),
+        )
+        with self._lock:
+            self.remove(bug_id)
+            self.docs[bug_id] = doc
+            if code:
+                self.by_code[code] = bug_id
+            for tok in tokens:
+                self.postings.setdefault(tok, set()).add(bug_id)
+            for key in self._band_keys(doc.signature):
+                self.buckets.setdefault(key, set()).add(bug_id)
+
+    def remove(self, bug_id: str) -> None:
+        with self._lock:
+            doc = self.docs.pop(bug_id, None)
+            if not doc:
+                return
+            if self.by_code.get(doc.code) == bug_id:
+                del self.by_code[doc.code]
+            for tok in doc.tokens:
+                ids = self.postings.get(tok)
+                if ids:
+                    ids.discard(bug_id)
+                    if not ids:
+                        del self.postings[tok]
+            for key in self._band_keys(doc.signature):
+                ids = self.buckets.get(key)
+                if ids:
+                    ids.discard(bug_id)
+                    if not ids:
+                        del self.buckets[key]
+
+    @staticmethod
+    def _band_keys(signature: Tuple[int, ...]):
+        for band in range(BANDS):
+            start = band * ROWS_PER_BAND
+            yield band, signature[start:start + ROWS_PER_BAND]
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    # -- queries ------------------------------------------------------------
+
+    def near_duplicates(self, code: str, threshold: float = 0.5, limit: int = 20) -> List[Dict[str, Any]]:
+        """Bugs whose estimated title+description Jaccard with `code` is ≥ threshold."""
+        with self._lock:
+            bug_id = self.by_code.get(code)
+            if not bug_id:
+                return []
+            doc = self.docs[bug_id]
+            candidates: Set[str] = set()
+            for key in self._band_keys(doc.signature):
+                candidates |= self.buckets.get(key, set())
+            candidates.discard(bug_id)
+            scored = []
+            for cid in candidates:
+                other = self.docs[cid]
+                sim = signature_similarity(doc.signature, other.signature)
+                if sim >= threshold:
+                    scored.append({
+                        "code": other.code,
+                        "title": other.title,
+                        "similarity": round(sim, 3),
+                        "shared_tokens": sorted(doc.tokens & other.tokens),
+                    })
+        scored.sort(key=lambda r: (-r["similarity"], r["code"]))
+        return scored[:limit]
+
+    def propose_members(self, chain: Dict[str, Any], member_codes: Iterable[str],
+                        min_score: float = 0.35, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Score non-member bugs against a chain. chain needs `tokens` (list) and
+        optionally `failure_class_hash`. Score = 0.6 × share of chain tokens the
+        bug contains + 0.4 × best MinHash similarity to an existing member.
+        """
+        chain_tokens: Set[str] = set()
+        for t in chain.get("tokens") or []:
+            chain_tokens.update(tokenize(t))
+        chain_tokens.update(hash_tokens(chain.get("failure_class_hash")))
+        members = set(member_codes)
+
+        with self._lock:
+            member_sigs = [
+                (c, self.docs[self.by_code[c]].signature) for c in sorted(members) if c in self.by_code
+            ]
+            candidate_ids: Set[str] = set()
+            for tok in chain_tokens:
+                candidate_ids |= self.postings.get(tok, set())
+            for _, sig in member_sigs:
+                for key in self._band_keys(sig):
+                    candidate_ids |= self.buckets.get(key, set())
+
+            proposals = []
+            for cid in candidate_ids:
+                doc = self.docs[cid]
+                if doc.code in members:
+                    continue
+                matched = chain_tokens & doc.tokens
+                coverage = len(matched) / len(chain_tokens) if chain_tokens else 0.0
+                best_sim, best_code = 0.0, None
+                for code, sig in member_sigs:
+                    sim = signature_similarity(doc.signature, sig)
+                    if sim > best_sim:
+                        best_sim, best_code = sim, code
+                score = 0.6 * coverage + 0.4 * best_sim
+                if score < min_score:
+                    continue
+                rule = []
+                if matched:
+                    rule.append("tokens: " + ", ".join(sorted(matched)))
+                if best_code:
+                    rule.append(f"similar to {best_code} ({best_sim:.2f})")
+                proposals.append({
+                    "proposed_member_code": doc.code,
+                    "proposed_member_title": doc.title,
+                    "score": round(score, 3),
+                    "token_coverage": round(coverage, 3),
+                    "member_similarity": round(best_sim, 3),
+                    "match_rule": "; ".join(rule),
+                    "recurrence_count": len(members),
+                })
+        proposals.sort(key=lambda p: (-p["score"], p["proposed_member_code"]))
+        return proposals[:limit]
+
+    def symptom_clusters(self, since: Optional[datetime] = None, threshold: float = 0.4,
+                         min_size: int = 3) -> List[Dict[str, Any]]:
+        """
+        Group recent bugs (per project) whose signatures collide in any LSH
+        band and clear `threshold`, using union-find. Returns clusters of at
+        least `min_size` bugs, largest first.
+        """
+        with self._lock:
+            ids = [
+                d.id for d in self.docs.values()
+                if since is None or (d.created_at and d.created_at.replace(tzinfo=None) >= since)
+            ]
+            id_set = set(ids)
+            parent = {i: i for i in ids}
+
+            def find(x):
+                while parent[x] != x:
+                    parent[x] = parent[parent[x]]
+                    x = parent[x]
+                return x
+
+            for bug_id in ids:
+                doc = self.docs[bug_id]
+                for key in self._band_keys(doc.signature):
+                    for other_id in self.buckets.get(key, ()):
+                        if other_id == bug_id or other_id not in id_set:
+                            continue
+                        other = self.docs[other_id]
+                        if other.project_code != doc.project_code:
+                            continue
+                        if signature_similarity(doc.signature, other.signature) >= threshold:
+                            ra, rb = find(bug_id), find(other_id)
+                            if ra != rb:
+                                parent[ra] = rb
+
+            groups: Dict[str, List[BugDoc]] = {}
+            for bug_id in ids:
+                groups.setdefault(find(bug_id), []).append(self.docs[bug_id])
+
+        clusters = []
+        for docs in groups.values():
+            if len(docs) < min_size:
+                continue
+            shared = set.intersection(*(d.tokens for d in docs))
+            docs.sort(key=lambda d: d.code)
+            clusters.append({
+                "project_code": docs[0].project_code,
+                "feature_prefix": " ".join(sorted(shared)[:6]) or docs[0].title[:40],
+                "bug_count": len(docs),
+                "codes": [d.code for d in docs],
+                "shared_tokens": sorted(shared),
+            })
+        clusters.sort(key=lambda c: (-c["bug_count"], c["project_code"]))
+        return clusters
+
+
+# ---------------------------------------------------------------------------
+# Process-wide index, loaded lazily from roadmap_requirements
+# ---------------------------------------------------------------------------
+
+_matcher: Optional[ChainMatcher] = None
+_load_lock = threading.Lock()
+
+_BUG_SELECT = """
+    SELECT r.id, r.code, r.title, r.description, r.created_at, p.code AS project_code
+    FROM roadmap_requirements r
+    LEFT JOIN roadmap_projects p ON r.project_id = p.id
+    WHERE r.type = 'bug'
+"""
+
+
+def _index_rows(matcher: ChainMatcher, rows: List[Dict[str, Any]]) -> None:
+    for r in rows:
+        matcher.upsert(
+            str(r["id"]), r.get("code") or "", r.get("title") or "",
+            r.get("description") or "", r.get("project_code") or "", r.get("created_at"),
+        )
+
+
+def get_matcher() -> ChainMatcher:
+    """Return the shared matcher, building it from the DB on first call."""
+    global _matcher
+    if _matcher is not None:
+        return _matcher
+    with _load_lock:
+        if _matcher is None:
+            matcher = ChainMatcher()
+            _index_rows(matcher, execute_query(_BUG_SELECT) or [])
+            logger.info(f"[chain-matcher] indexed {len(matcher)} bugs, {len(matcher.postings)} tokens")
+            _matcher = matcher
+    return _matcher
+
+
+def _on_requirement_change(requirement_ids: List[str]) -> None:
+    """Re-index changed bugs; drop ids that no longer exist or are no longer bugs."""
+    if _matcher is None:
+        return  # not built yet — the first get_matcher() call will see current rows
+    if not requirement_ids:
+        reset()
+        return
+    rows: List[Dict[str, Any]] = []
+    for i in range(0, len(requirement_ids), 500):
+        chunk = requirement_ids[i:i + 500]
+        rows.extend(execute_query(
+            _BUG_SELECT + f" AND r.id IN ({','.join(['?'] * len(chunk))})", tuple(chunk)
+        ) or [])
+    found = {str(r["id"]) for r in rows}
+    for rid in requirement_ids:
+        if rid not in found:
+            _matcher.remove(rid)
+    _index_rows(_matcher, rows)
+
+
+def reset() -> None:
+    """Drop the index; the next get_matcher() call rebuilds it."""
+    global _matcher
+    with _load_lock:
+        _matcher = None
+
+
+def load_chain(chain_id: str) -> Optional[Dict[str, Any]]:
+    """bug_chains row plus current member codes (from bug_chain_members)."""
+    chain = execute_query(
+        "SELECT id, pattern_label, tokens, failure_class_hash FROM bug_chains WHERE id = ?",
+        (chain_id,), fetch="one",
+    )
+    if not chain:
+        return None
+    try:
+        tokens = json.loads(chain["tokens"]) if chain.get("tokens") else []
+    except Exception:
+        tokens = []
+    members = execute_query(
+        """
+        SELECT r.code FROM bug_chain_members m
+        JOIN roadmap_requirements r ON r.id = m.bug_requirement_id
+        WHERE m.chain_id = ?
+        """,
+        (chain_id,),
+    ) or []
+    return {
+        "id": chain["id"],
+        "pattern_label": chain.get("pattern_label"),
+        "tokens": tokens if isinstance(tokens, list) else [],
+        "failure_class_hash": chain.get("failure_class_hash"),
+        "member_codes": [m["code"] for m in members],
+    }
+
+
+def symptom_clusters(days: int = 30, min_size: int = 3) -> List[Dict[str, Any]]:
+    since = datetime.utcnow() - timedelta(days=days)
+    return get_matcher().symptom_clusters(since=since, min_size=min_size)
+
+
+change_hooks.subscribe(change_hooks.REQUIREMENT, _on_requirement_change)
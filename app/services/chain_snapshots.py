@@ -0,0 +1,307 @@
+"""
+Bug Chain Snapshots — materialized copies of the MP53B chain proposal views.
+
+The /chains pages used to evaluate vw_bug_chain_proposals_seeded,
+vw_bug_chain_proposals_inductive, vw_bug_chain_misclassified and
+vw_bug_chain_unclassified on every page view. These tables hold the same rows,
+indexed on chain_label and member code, and are refreshed per bug whenever
+bug_chain_members, bug_classifications or a bug requirement changes, and
+the misclassified rows whenever a seeded member's UAT page or BVs change.
+"""
+
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from app.core import change_hooks
+from app.core.cache import TTLCache
+from app.core.database import execute_query, get_db
+
+logger = logging.getLogger(__name__)
+
+SEEDED = "chain_snapshot_seeded"
+SEEDED_MEMBERS = "chain_snapshot_seeded_members"
+INDUCTIVE = "chain_snapshot_inductive"
+MISCLASSIFIED = "chain_snapshot_misclassified"
+UNCLASSIFIED = "chain_snapshot_unclassified"
+
+# view name → snapshot table, for readers that fall back to the live view
+VIEW_FOR = {
+    SEEDED: "vw_bug_chain_proposals_seeded",
+    INDUCTIVE: "vw_bug_chain_proposals_inductive",
+    MISCLASSIFIED: "vw_bug_chain_misclassified",
+    UNCLASSIFIED: "vw_bug_chain_unclassified",
+}
+
+_IN_CHUNK = 500
+
+_nav_cache = TTLCache(maxsize=1, ttl=300)
+_ready: Optional[bool] = None
+
+
+def _placeholders(n: int) -> str:
+    return ",".join(["?"] * n)
+
+
+# Statements that copy view rows into snapshot tables. "{filter}" is replaced
+# with an optional member-code predicate for incremental refresh.
+_SEEDED_FILL = f"""
+    INSERT INTO {SEEDED} (chain_label, failure_class_hash, expected_outcome, missing_signal,
+                          total_occurrences, member_requirement_codes, first_occurrence_at, source)
+    SELECT chain_label, failure_class_hash, expected_outcome, missing_signal,
+           total_occurrences, member_requirement_codes, first_occurrence_at, source
+    FROM vw_bug_chain_proposals_seeded
+"""
+_SEEDED_MEMBERS_FILL = f"""
+    INSERT INTO {SEEDED_MEMBERS} (chain_label, member_code)
+    SELECT s.chain_label, m.code
+    FROM {SEEDED} s
+    CROSS APPLY OPENJSON(s.member_requirement_codes) WITH (code NVARCHAR(20) '$') m
+"""
+_INDUCTIVE_FILL = f"""
+    INSERT INTO {INDUCTIVE} (chain_label, proposed_member_code, proposed_member_title,
+                             match_rule, recurrence_count, diagnostic_present)
+    SELECT chain_label, proposed_member_code, proposed_member_title,
+           match_rule, recurrence_count, diagnostic_present
+    FROM vw_bug_chain_proposals_inductive
+    {{filter}}
+"""
+_MISCLASSIFIED_FILL = f"""
+    INSERT INTO {MISCLASSIFIED} (chain_label, member_requirement_code, bv_status, bv_id,
+                                 bv_title, failure_type, misclassification_reason)
+    SELECT chain_label, member_requirement_code, bv_status, bv_id,
+           bv_title, failure_type, misclassification_reason
+    FROM vw_bug_chain_misclassified
+    {{filter}}
+"""
+_UNCLASSIFIED_FILL = f"""
+    INSERT INTO {UNCLASSIFIED} (code, title, status, reason_unclassified)
+    SELECT code, title, status, reason_unclassified
+    FROM vw_bug_chain_unclassified
+    {{filter}}
+"""
+
+
+def snapshots_ready() -> bool:
+    """True once the snapshot tables exist and have been populated at least once."""
+    global _ready
+    if _ready:
+        return True
+    try:
+        row = execute_query(
+            "SELECT value_json FROM governance_kv WHERE key_name = 'chain_snapshots_built_at'",
+            fetch="one",
+        )
+        _ready = bool(row)
+    except Exception as exc:
+        logger.warning(f"[chain-snapshots] readiness check failed: {exc}")
+        _ready = False
+    return _ready
+
+
+def source(table: str) -> str:
+    """Snapshot table name if populated, else the live view it mirrors."""
+    return table if snapshots_ready() else VIEW_FOR[table]
+
+
+def rebuild_snapshots() -> Dict[str, int]:
+    """Repopulate every snapshot table from its view in one transaction."""
+    global _ready
+    with get_db() as conn:
+        cursor = conn.cursor()
+        for table in (SEEDED_MEMBERS, SEEDED, INDUCTIVE, MISCLASSIFIED, UNCLASSIFIED):
+            cursor.execute(f"DELETE FROM {table}")
+        cursor.execute(_SEEDED_FILL)
+        cursor.execute(_SEEDED_MEMBERS_FILL)
+        cursor.execute(_INDUCTIVE_FILL.format(filter=""))
+        cursor.execute(_MISCLASSIFIED_FILL.format(filter=""))
+        cursor.execute(_UNCLASSIFIED_FILL.format(filter=""))
+        _mark_built(cursor)
+        cursor.execute(f"""
+            SELECT
+                (SELECT COUNT(*) FROM {SEEDED}) AS seeded,
+                (SELECT COUNT(*) FROM {INDUCTIVE}) AS inductive,
+                (SELECT COUNT(*) FROM {MISCLASSIFIED}) AS misclassified,
+                (SELECT COUNT(*) FROM {UNCLASSIFIED}) AS unclassified
+        """)
+        cols = [c[0] for c in cursor.description]
+        counts = dict(zip(cols, cursor.fetchone()))
+    _ready = True
+    _nav_cache.clear()
+    logger.info(f"[chain-snapshots] rebuilt: {counts}")
+    return {k: int(v or 0) for k, v in counts.items()}
+
+
+def _mark_built(cursor) -> None:
+    cursor.execute("""
+        MERGE governance_kv AS t
+        USING (SELECT 'chain_snapshots_built_at' AS key_name) AS s ON t.key_name = s.key_name
+        WHEN MATCHED THEN UPDATE SET value_json = CONVERT(NVARCHAR(40), GETUTCDATE(), 126), updated_at = GETUTCDATE()
+        WHEN NOT MATCHED THEN INSERT (key_name, value_json) VALUES (s.key_name, CONVERT(NVARCHAR(40), GETUTCDATE(), 126));
+    """)
+
+
+def _seeded_members(cursor, codes: List[str]) -> bool:
+    """True if any of codes is a member of a seeded chain."""
+    for i in range(0, len(codes), _IN_CHUNK):
+        chunk = codes[i:i + _IN_CHUNK]
+        cursor.execute(
+            f"SELECT TOP 1 1 FROM {SEEDED_MEMBERS} WHERE member_code IN ({_placeholders(len(chunk))})",
+            tuple(chunk),
+        )
+        if cursor.fetchone():
+            return True
+    return False
+
+
+def _refresh_seeded(cursor) -> None:
+    cursor.execute(f"DELETE FROM {SEEDED_MEMBERS}")
+    cursor.execute(f"DELETE FROM {SEEDED}")
+    cursor.execute(_SEEDED_FILL)
+    cursor.execute(_SEEDED_MEMBERS_FILL)
+
+
+def refresh_for_codes(codes: List[str], seeded: bool = False) -> None:
+    """
+    Re-derive snapshot rows for specific bug codes. The per-member tables are
+    refreshed with DELETE + INSERT…SELECT filtered on the codes. Seeded chains
+    only change with their members' rows or with classifications, so they are
+    rebuilt when a code is a seeded member or when seeded=True.
+    """
+    if not snapshots_ready():
+        return
+    codes = [c for c in dict.fromkeys(codes) if c]
+    with get_db() as conn:
+        cursor = conn.cursor()
+        if seeded or _seeded_members(cursor, codes):
+            _refresh_seeded(cursor)
+        for i in range(0, len(codes), _IN_CHUNK):
+            chunk = codes[i:i + _IN_CHUNK]
+            ph = _placeholders(len(chunk))
+            params = tuple(chunk)
+            cursor.execute(f"DELETE FROM {INDUCTIVE} WHERE proposed_member_code IN ({ph})", params)
+            cursor.execute(_INDUCTIVE_FILL.format(filter=f"WHERE proposed_member_code IN ({ph})"), params)
+            cursor.execute(f"DELETE FROM {MISCLASSIFIED} WHERE member_requirement_code IN ({ph})", params)
+            cursor.execute(_MISCLASSIFIED_FILL.format(filter=f"WHERE member_requirement_code IN ({ph})"), params)
+            cursor.execute(f"DELETE FROM {UNCLASSIFIED} WHERE code IN ({ph})", params)
+            cursor.execute(_UNCLASSIFIED_FILL.format(filter=f"WHERE code IN ({ph})"), params)
+        _mark_built(cursor)
+    _nav_cache.clear()
+
+
+def _prune_deleted() -> None:
+    """Drop snapshot rows whose bug requirement no longer exists."""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        for table, col in ((INDUCTIVE, "proposed_member_code"),
+                           (MISCLASSIFIED, "member_requirement_code"),
+                           (UNCLASSIFIED, "code")):
+            cursor.execute(f"""
+                DELETE s FROM {table} s
+                WHERE NOT EXISTS (SELECT 1 FROM roadmap_requirements r WHERE r.code = s.{col})
+            """)
+    _nav_cache.clear()
+
+
+_SNAPSHOTTED_CODES = f"""
+    SELECT proposed_member_code AS code FROM {INDUCTIVE} WHERE proposed_member_code IN ({{ph}})
+    UNION SELECT member_requirement_code FROM {MISCLASSIFIED} WHERE member_requirement_code IN ({{ph}})
+    UNION SELECT code FROM {UNCLASSIFIED} WHERE code IN ({{ph}})
+"""
+
+
+def refresh_for_requirement_ids(requirement_ids: List[str], seeded: bool = False) -> None:
+    """
+    Change-hook entry point: resolve requirement ids to codes and refresh.
+    Bugs are refreshed; non-bugs only if they still have snapshot rows (a bug
+    whose type changed). Orphan rows are pruned only when an id is gone.
+    """
+    if not snapshots_ready():
+        return
+    if not requirement_ids:
+        rebuild_snapshots()
+        return
+    found = set()
+    codes: List[str] = []
+    others: List[str] = []
+    for i in range(0, len(requirement_ids), _IN_CHUNK):
+        chunk = requirement_ids[i:i + _IN_CHUNK]
+        rows = execute_query(
+            f"SELECT id, code, type FROM roadmap_requirements WHERE id IN ({_placeholders(len(chunk))})",
+            tuple(chunk),
+        ) or []
+        for r in rows:
+            found.add(str(r["id"]).upper())
+            if r.get("code"):
+                (codes if r.get("type") == "bug" else others).append(r["code"])
+    if any(str(rid).upper() not in found for rid in requirement_ids):
+        _prune_deleted()
+    for i in range(0, len(others), _IN_CHUNK):
+        chunk = others[i:i + _IN_CHUNK]
+        ph = _placeholders(len(chunk))
+        rows = execute_query(_SNAPSHOTTED_CODES.format(ph=ph), tuple(chunk) * 3) or []
+        codes.extend(r["code"] for r in rows)
+    if codes or seeded:
+        refresh_for_codes(codes, seeded=seeded)
+
+
+def _on_classification_change(requirement_ids: List[str]) -> None:
+    refresh_for_requirement_ids(requirement_ids, seeded=True)
+
+
+_SEEDED_SPEC = f"""
+    SELECT TOP 1 1
+    FROM uat_pages up
+    JOIN cc_prompts cp ON cp.pth = up.pth
+    JOIN roadmap_requirements r ON r.id = cp.requirement_id
+    JOIN {SEEDED_MEMBERS} sm ON sm.member_code = r.code
+    WHERE up.id IN (SELECT TRY_CAST(value AS UNIQUEIDENTIFIER) FROM OPENJSON(?))
+"""
+
+
+def refresh_misclassified(spec_ids: Optional[List[str]] = None) -> None:
+    """
+    UAT_PAGE hook (BV results and spec writes all fire it). Misclassified rows
+    come from seeded members' UAT BVs, so the table is rebuilt, and only when
+    a changed spec belongs to a seeded member. cc_prompts edits fire no hook;
+    relinking a prompt shows up on the next write to its UAT page, or on
+    POST /api/chains/snapshots/rebuild.
+    """
+    if not snapshots_ready():
+        return
+    with get_db() as conn:
+        cursor = conn.cursor()
+        if spec_ids:
+            cursor.execute(_SEEDED_SPEC, (json.dumps([str(s) for s in spec_ids]),))
+            if not cursor.fetchone():
+                return
+        cursor.execute(f"DELETE FROM {MISCLASSIFIED}")
+        cursor.execute(_MISCLASSIFIED_FILL.format(filter=""))
+    _nav_cache.clear()
+
+
+def nav_counts() -> Dict[str, Any]:
+    """Misclassified / unclassified badge counts, cached until the next refresh."""
+    cached = _nav_cache.get("nav")
+    if cached is not None:
+        return cached
+    row = execute_query(
+        f"""
+        SELECT
+            (SELECT COUNT(*) FROM {source(MISCLASSIFIED)}) AS misclassified_count,
+            (SELECT COUNT(*) FROM {source(UNCLASSIFIED)}) AS unclassified_count
+        """,
+        fetch="one",
+    ) or {}
+    counts = {
+        "misclassified_count": int(row.get("misclassified_count") or 0),
+        "unclassified_count": int(row.get("unclassified_count") or 0),
+    }
+    _nav_cache.set("nav", counts)
+    return counts
+
+
+change_hooks.subscribe(change_hooks.REQUIREMENT, refresh_for_requirement_ids)
+change_hooks.subscribe(change_hooks.BUG_CHAIN_MEMBER, refresh_for_requirement_ids)
+change_hooks.subscribe(change_hooks.BUG_CLASSIFICATION, _on_classification_change)
+change_hooks.subscribe(change_hooks.UAT_PAGE, refresh_misclassified)
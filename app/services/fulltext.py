@@ -0,0 +1,165 @@
+"""
+SQL Server Full-Text Search backend.
+
+For deployments where the in-process index (app/services/search_index.py) is
+too large to hold in memory, or as the SQL path when it is unavailable, text
+searches run through CONTAINSTABLE over full-text indexes instead of
+LIKE '%q%' scans. ensure_fulltext() (Migration 67) creates the catalog and
+indexes; available() detects at runtime whether a table's index exists and
+covers the requested columns, so every caller can fall back to its LIKE query.
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional, Sequence
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import execute_query, get_connection
+
+logger = logging.getLogger(__name__)
+
+CATALOG = "MetaPM_FTCatalog"
+
+# table → columns to full-text index
+TARGETS: Dict[str, List[str]] = {
+    "roadmap_requirements": ["title", "description"],
+    "compliance_docs": ["content_md"],
+    "mcp_handoffs": ["content", "title", "task"],
+    "lessons_learned": ["lesson"],
+    # vw_SearchableContent sources
+    "Transactions": ["PromptText", "ResponseText"],
+    "MediaFiles": ["TranscriptionText", "OCRText", "ImageDescription"],
+}
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_columns_cache = TTLCache(maxsize=32, ttl=600)
+
+
+def use_fulltext_backend() -> bool:
+    """True when settings.SEARCH_BACKEND selects SQL full-text over the in-process index."""
+    return settings.SEARCH_BACKEND.lower() == "fulltext"
+
+
+def contains_query(q: str, mode: str = "all") -> Optional[str]:
+    """
+    Build a CONTAINS search condition from free text. Each word becomes a
+    quoted prefix term ("word*") so partial words still match, roughly like
+    LIKE '%q%'. mode="all" ANDs the words, mode="any" ORs them. Returns None
+    when q has no searchable words (caller should use its LIKE path).
+    """
+    words = _WORD_RE.findall(q or "")
+    if not words:
+        return None
+    joiner = " AND " if mode == "all" else " OR "
+    return joiner.join(f'"{w}*"' for w in words)
+
+
+def indexed_columns(table: str) -> set:
+    """Lower-cased columns covered by an enabled full-text index on table (cached)."""
+    cached = _columns_cache.get(table)
+    if cached is not None:
+        return cached
+    try:
+        rows = execute_query("""
+            SELECT c.name
+            FROM sys.fulltext_indexes fi
+            JOIN sys.fulltext_index_columns fic ON fic.object_id = fi.object_id
+            JOIN sys.columns c ON c.object_id = fic.object_id AND c.column_id = fic.column_id
+            WHERE fi.object_id = OBJECT_ID(?) AND fi.is_enabled = 1
+        """, (table,), fetch="all") or []
+        cols = {r["name"].lower() for r in rows}
+    except Exception as exc:
+        logger.debug(f"[fulltext] detection failed for {table}: {exc}")
+        cols = set()
+    _columns_cache.set(table, cols)
+    return cols
+
+
+def available(table: str, columns: Optional[Sequence[str]] = None) -> bool:
+    """True if table has an enabled full-text index covering columns (default: TARGETS[table])."""
+    wanted = {c.lower() for c in (columns or TARGETS.get(table, []))}
+    have = indexed_columns(table)
+    return bool(have) and wanted <= have
+
+
+def containstable(table: str, columns: Sequence[str]) -> str:
+    """CONTAINSTABLE(...) source with one ? for the search condition; exposes [KEY] and RANK."""
+    return f"CONTAINSTABLE({table}, ({', '.join(columns)}), ?)"
+
+
+def _primary_key_index(cursor, table: str) -> Optional[str]:
+    cursor.execute(
+        "SELECT name FROM sys.indexes WHERE object_id = OBJECT_ID(?) AND is_primary_key = 1",
+        (table,),
+    )
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def ensure_fulltext() -> Dict[str, str]:
+    """
+    Create the catalog and full-text indexes in TARGETS, adding any missing
+    columns to existing indexes. Full-text DDL can't run inside a
+    transaction, so this uses its own autocommit connection. Returns a
+    per-table status; never raises for a single table.
+    """
+    status: Dict[str, str] = {}
+    conn = get_connection()
+    try:
+        conn.autocommit = True
+        cursor = conn.cursor()
+        cursor.execute("SELECT CAST(FULLTEXTSERVICEPROPERTY('IsFullTextInstalled') AS INT)")
+        installed = cursor.fetchone()
+        if not installed or not installed[0]:
+            return {"_service": "not installed"}
+
+        cursor.execute("SELECT COUNT(*) FROM sys.fulltext_catalogs WHERE name = ?", (CATALOG,))
+        if not cursor.fetchone()[0]:
+            cursor.execute(f"CREATE FULLTEXT CATALOG {CATALOG} AS DEFAULT")
+
+        for table, columns in TARGETS.items():
+            try:
+                cursor.execute("SELECT OBJECT_ID(?, 'U')", (table,))
+                if cursor.fetchone()[0] is None:
+                    status[table] = "no table"
+                    continue
+                cursor.execute("""
+                    SELECT c.name FROM sys.columns c
+                    WHERE c.object_id = OBJECT_ID(?)
+                """, (table,))
+                existing_cols = {r[0].lower() for r in cursor.fetchall()}
+                cols = [c for c in columns if c.lower() in existing_cols]
+
+                cursor.execute("SELECT COUNT(*) FROM sys.fulltext_indexes WHERE object_id = OBJECT_ID(?)", (table,))
+                if cursor.fetchone()[0]:
+                    cursor.execute("""
+                        SELECT c.name FROM sys.fulltext_index_columns fic
+                        JOIN sys.columns c ON c.object_id = fic.object_id AND c.column_id = fic.column_id
+                        WHERE fic.object_id = OBJECT_ID(?)
+                    """, (table,))
+                    indexed = {r[0].lower() for r in cursor.fetchall()}
+                    missing = [c for c in cols if c.lower() not in indexed]
+                    if missing:
+                        cursor.execute(f"ALTER FULLTEXT INDEX ON {table} ADD ({', '.join(missing)})")
+                        status[table] = f"added {', '.join(missing)}"
+                    else:
+                        status[table] = "exists"
+                    continue
+
+                key_index = _primary_key_index(cursor, table)
+                if not key_index or not cols:
+                    status[table] = "no key index" if not key_index else "no columns"
+                    continue
+                cursor.execute(
+                    f"CREATE FULLTEXT INDEX ON {table} ({', '.join(cols)}) "
+                    f"KEY INDEX [{key_index}] ON {CATALOG} WITH CHANGE_TRACKING AUTO"
+                )
+                status[table] = "created"
+            except Exception as exc:
+                status[table] = f"error: {exc}"
+                logger.warning(f"[fulltext] {table}: {exc}")
+    finally:
+        conn.close()
+    _columns_cache.clear()
+    return status
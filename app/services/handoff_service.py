@@ -8,7 +8,9 @@ import hashlib
 import logging
 from datetime import datetime
 from typing import Optional, List, Dict, Any
+from app.core import change_hooks
 from app.core.database import execute_query
+from app.services import fulltext
 
 logger = logging.getLogger(__name__)
 
@@ -170,6 +172,7 @@ def create_handoff(
     if result:
         handoff_id = str(result['id'])
         logger.info(f"Created handoff {handoff_id} for {final_project}/{final_task}")
+        change_hooks.notify_change(change_hooks.HANDOFF, [handoff_id])
         return {
             "id": handoff_id,
             "project": final_project,
@@ -210,15 +213,21 @@ def list_handoffs(
     status: Optional[str] = None,
     direction: Optional[str] = None,
     search: Optional[str] = None,
-    sort: str = 'created_at',
+    sort: Optional[str] = None,
     order: str = 'desc',
     page: int = 1,
     limit: int = 20
 ) -> Dict[str, Any]:
-    """List handoffs with filtering, sorting, and pagination."""
+    """List handoffs with filtering, sorting, and pagination.
+
+    search uses CONTAINSTABLE over (content, title, task) when the full-text
+    index exists, else LIKE. sort defaults to 'relevance' (full-text rank)
+    when searching with full-text, otherwise 'created_at'.
+    """
 
     conditions = []
     params = []
+    ft_cond = None
 
     if project:
         conditions.append("project = ?")
@@ -235,15 +244,27 @@ def list_handoffs(
         params.append(direction)
 
     if search:
-        conditions.append("(content LIKE ? OR title LIKE ? OR task LIKE ?)")
-        search_term = f"%{search}%"
-        params.extend([search_term, search_term, search_term])
+        ft_cond = fulltext.contains_query(search)
+        if ft_cond and fulltext.available("mcp_handoffs"):
+            conditions.append(
+                f"id IN (SELECT [KEY] FROM {fulltext.containstable('mcp_handoffs', ('content', 'title', 'task'))})"
+            )
+            params.append(ft_cond)
+        else:
+            ft_cond = None
+            conditions.append("(content LIKE ? OR title LIKE ? OR task LIKE ?)")
+            search_term = f"%{search}%"
+            params.extend([search_term, search_term, search_term])
 
     where_clause = " AND ".join(conditions) if conditions else "1=1"
 
     # Validate sort column
     valid_sorts = ['created_at', 'project', 'task', 'status', 'updated_at']
-    if sort not in valid_sorts:
+    if sort is None and ft_cond:
+        sort = 'relevance'
+    if sort == 'relevance' and not ft_cond:
+        sort = 'created_at'
+    if sort != 'relevance' and sort not in valid_sorts:
         sort = 'created_at'
 
     order = 'DESC' if order.lower() == 'desc' else 'ASC'
@@ -259,12 +280,22 @@ def list_handoffs(
     # Get paginated results
     offset = (page - 1) * limit
 
-    results = execute_query(f"""
-        SELECT * FROM mcp_handoffs
-        WHERE {where_clause}
-        ORDER BY {sort} {order}
-        OFFSET ? ROWS FETCH NEXT ? ROWS ONLY
-    """, tuple(params) + (offset, limit), fetch="all")
+    if sort == 'relevance':
+        results = execute_query(f"""
+            SELECT mcp_handoffs.* FROM mcp_handoffs
+            JOIN {fulltext.containstable('mcp_handoffs', ('content', 'title', 'task'))} ft
+              ON ft.[KEY] = mcp_handoffs.id
+            WHERE {where_clause}
+            ORDER BY ft.RANK DESC, created_at DESC
+            OFFSET ? ROWS FETCH NEXT ? ROWS ONLY
+        """, (ft_cond,) + tuple(params) + (offset, limit), fetch="all")
+    else:
+        results = execute_query(f"""
+            SELECT * FROM mcp_handoffs
+            WHERE {where_clause}
+            ORDER BY {sort} {order}
+            OFFSET ? ROWS FETCH NEXT ? ROWS ONLY
+        """, tuple(params) + (offset, limit), fetch="all")
 
     items = [_handoff_to_dict(r) for r in results] if results else []
 
@@ -379,6 +410,7 @@ def update_handoff(handoff_id: str, updates: Dict[str, Any]) -> Optional[Dict[st
         tuple(params),
         fetch="none"
     )
+    change_hooks.notify_change(change_hooks.HANDOFF, [handoff_id])
 
     return get_handoff(handoff_id)
 
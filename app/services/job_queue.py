@@ -0,0 +1,250 @@
+"""
+Background Jobs — durable, DB-backed queue for post-request side work.
+
+PA webhooks, Cloud Run Job triggers and handoff verification used to run
+as bare asyncio.create_task calls: nothing retried them and a restart lost
+them. Request handlers now insert a background_jobs row (optionally in
+their own transaction) and return; a pool of worker tasks started from the
+app lifespan claims due rows, highest priority first, and runs the handler
+registered for the row's kind.
+
+Delivery is at-least-once: leases, backoff and dead-lettering are the
+shared mechanics in app/services/lease_queue.py. A claimed row is invisible
+to other workers and instances for LEASE_SECONDS; if the worker dies, or
+the handler overruns, the row becomes claimable again, unless that was its
+last attempt. Handlers must be safe to run twice. A handler that raises is
+retried with exponential backoff; after max_attempts, or on
+PermanentJobError, the row is marked 'dead' and kept (with last_error)
+until retried from /api/background-jobs. Finished rows keep their result
+for KEEP_DONE_DAYS.
+
+RAG ingestion (UAT specs, lessons) already goes through rag_outbox, which
+batches by collection, so it is not duplicated here.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.database import execute_query
+from app.services import lease_queue
+
+logger = logging.getLogger(__name__)
+
+TABLE = "background_jobs"
+WORKERS = 4
+POLL_SECONDS = 10.0
+LEASE_SECONDS = 300
+DEFAULT_MAX_ATTEMPTS = 5
+MAX_BACKOFF_SECONDS = 3600
+KEEP_DONE_DAYS = 7
+PURGE_EVERY_SECONDS = 3600
+
+PRIORITY_HIGH = 10
+PRIORITY_NORMAL = 0
+PRIORITY_LOW = -10
+
+Handler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+HANDLERS: Dict[str, Handler] = {}
+
+QUEUE = lease_queue.LeaseTable(
+    TABLE, LEASE_SECONDS, base_delay=15, max_delay=MAX_BACKOFF_SECONDS,
+    max_attempts="max_attempts", statuses=("pending", "running"), finished_column="finished_at",
+)
+
+_last_purge: Optional[float] = None
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying cannot help; the job goes straight to 'dead'."""
+
+
+def register(kind: str, handler: Handler) -> None:
+    HANDLERS[kind] = handler
+
+
+_ENQUEUE = f"""
+    SET NOCOUNT ON;
+    DECLARE @id BIGINT = NULL;
+    IF ? IS NOT NULL
+        SELECT TOP 1 @id = id FROM {TABLE} WITH (UPDLOCK, HOLDLOCK)
+        WHERE dedupe_key = ? AND status IN ('pending', 'running');
+    IF @id IS NULL
+    BEGIN
+        INSERT INTO {TABLE} (kind, payload, priority, max_attempts, dedupe_key, next_attempt_at)
+        VALUES (?, ?, ?, ?, ?, DATEADD(second, ?, GETUTCDATE()));
+        SET @id = SCOPE_IDENTITY();
+    END
+    SELECT @id AS id;
+"""
+
+
+def enqueue(kind: str, payload: Dict[str, Any], priority: int = PRIORITY_NORMAL,
+            max_attempts: int = DEFAULT_MAX_ATTEMPTS, dedupe_key: Optional[str] = None,
+            delay_seconds: int = 0, cursor=None) -> int:
+    """
+    Queue a job and return its id. With dedupe_key, a pending or running job
+    with the same key is returned instead of adding another. Pass the
+    caller's cursor to enqueue in its transaction (then kick() after commit).
+    """
+    params = (dedupe_key, dedupe_key, kind, json.dumps(payload, default=str), priority,
+              max_attempts, dedupe_key, delay_seconds)
+    if cursor is not None:
+        cursor.execute(_ENQUEUE, params)
+        return int(cursor.fetchone()[0])
+    row = execute_query(_ENQUEUE, params, fetch="one")
+    kick()
+    return int(row["id"])
+
+
+def kick() -> None:
+    """Wake the workers now instead of at the next poll. Safe from any thread."""
+    _workers.kick()
+
+
+# ── Workers ──────────────────────────────────────────────────────────────────
+
+def _claim() -> Optional[Dict[str, Any]]:
+    return execute_query(f"""
+        WITH next AS (
+            SELECT TOP (1) * FROM {TABLE} WITH (ROWLOCK, READPAST, UPDLOCK)
+            WHERE {QUEUE.due()}
+            ORDER BY priority DESC, id
+        )
+        UPDATE next
+        SET status = 'running', {QUEUE.lease()},
+            started_at = COALESCE(started_at, GETUTCDATE())
+        OUTPUT inserted.id, inserted.kind, inserted.payload, inserted.attempts, inserted.max_attempts
+    """, fetch="one")
+
+
+def _ack(job_id: int, result: Any) -> None:
+    execute_query(f"""
+        UPDATE {TABLE}
+        SET status = 'done', locked_until = NULL, last_error = NULL,
+            result_json = ?, finished_at = GETUTCDATE()
+        WHERE id = ?
+    """, (json.dumps(result, default=str) if result is not None else None, job_id), fetch="none")
+
+
+def _fail(job: Dict[str, Any], error: str, permanent: bool = False) -> None:
+    QUEUE.fail([job], error, permanent)
+
+
+def _purge() -> int:
+    row = execute_query(f"""
+        SET NOCOUNT ON;
+        DELETE FROM {TABLE}
+        WHERE status = 'done' AND finished_at < DATEADD(day, -{KEEP_DONE_DAYS}, GETUTCDATE());
+        SELECT @@ROWCOUNT AS n;
+    """, fetch="one")
+    return row["n"] if row else 0
+
+
+async def run_once() -> bool:
+    """Claim and run one due job. Returns False when nothing was due."""
+    job = await asyncio.to_thread(_claim)
+    if not job:
+        return False
+    job_id, kind = job["id"], job["kind"]
+    handler = HANDLERS.get(kind)
+    if handler is None:
+        await asyncio.to_thread(_fail, job, f"no handler registered for '{kind}'")
+        return True
+    try:
+        payload = json.loads(job["payload"] or "{}")
+        # Past the lease another worker may claim the row, so stop waiting on it
+        result = await asyncio.wait_for(handler(payload), timeout=LEASE_SECONDS)
+    except asyncio.CancelledError:
+        raise  # shutdown: the lease expires and another worker picks it up
+    except PermanentJobError as e:
+        logger.warning(f"[jobs] {kind} #{job_id} failed permanently: {e}")
+        await asyncio.to_thread(_fail, job, str(e), True)
+    except Exception as e:
+        error = str(e) or type(e).__name__
+        logger.warning(f"[jobs] {kind} #{job_id} attempt {job['attempts']}/{job['max_attempts']} failed: {error}")
+        await asyncio.to_thread(_fail, job, error)
+    else:
+        await asyncio.to_thread(_ack, job_id, result)
+    return True
+
+
+def _housekeeping() -> None:
+    global _last_purge
+    reaped = QUEUE.reap()
+    if reaped:
+        logger.warning(f"[jobs] dead-lettered {reaped} jobs whose final attempt never finished")
+    if _last_purge is None or time.monotonic() - _last_purge > PURGE_EVERY_SECONDS:
+        _last_purge = time.monotonic()
+        purged = _purge()
+        if purged:
+            logger.info(f"[jobs] purged {purged} finished jobs")
+
+
+_workers = lease_queue.Workers("jobs", run_once, POLL_SECONDS, _housekeeping)
+
+
+def start(workers: int = WORKERS) -> None:
+    """Start the worker pool on the running loop (called from the app lifespan)."""
+    _workers.start(workers)
+
+
+async def stop() -> None:
+    await _workers.stop()
+
+
+# ── Status / admin ───────────────────────────────────────────────────────────
+
+def _job_dict(row: Dict[str, Any]) -> Dict[str, Any]:
+    out = dict(row)
+    for col in ("payload", "result_json"):
+        if out.get(col):
+            try:
+                out[col] = json.loads(out[col])
+            except (json.JSONDecodeError, TypeError):
+                pass
+    for col in ("next_attempt_at", "locked_until", "created_at", "started_at", "finished_at"):
+        if out.get(col) is not None:
+            out[col] = str(out[col])
+    return out
+
+
+def get(job_id: int) -> Optional[Dict[str, Any]]:
+    row = execute_query(f"""
+        SELECT id, kind, payload, priority, status, attempts, max_attempts, dedupe_key,
+               next_attempt_at, locked_until, last_error, result_json,
+               created_at, started_at, finished_at
+        FROM {TABLE} WHERE id = ?
+    """, (job_id,), fetch="one")
+    return _job_dict(row) if row else None
+
+
+def stats() -> Dict[str, Any]:
+    rows = execute_query(f"""
+        SELECT status, kind, COUNT(*) AS cnt, MIN(created_at) AS oldest
+        FROM {TABLE} GROUP BY status, kind
+    """, fetch="all") or []
+    dead = execute_query(f"""
+        SELECT TOP 20 id, kind, payload, attempts, last_error, created_at, finished_at
+        FROM {TABLE} WHERE status = 'dead' ORDER BY id DESC
+    """, fetch="all") or []
+    return {
+        "workers_running": _workers.running(),
+        "handlers": sorted(HANDLERS),
+        "queues": [
+            {"status": r["status"], "kind": r["kind"], "count": r["cnt"],
+             "oldest": str(r["oldest"]) if r.get("oldest") else None}
+            for r in rows
+        ],
+        "dead_letters": [_job_dict(r) for r in dead],
+    }
+
+
+def retry_dead(kind: Optional[str] = None) -> int:
+    """Put dead jobs back in the queue with a fresh attempt budget."""
+    requeued = QUEUE.retry_dead("kind", kind)
+    kick()
+    return requeued
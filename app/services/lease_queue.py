@@ -0,0 +1,174 @@
+"""
+Lease Queue — claim, lease, backoff and dead-letter mechanics shared by the
+DB-backed queues: rag_outbox (Portfolio RAG ingests) and job_queue
+(background_jobs).
+
+Both keep their work in a table with status, attempts, next_attempt_at,
+locked_until and last_error columns. A LeaseTable describes one:
+
+  - a claim picks up due rows, takes a lease on them (locked_until) and
+    counts an attempt; other workers and instances skip leased rows, and
+    a row whose lease runs out is due again, so a crashed worker loses
+    nothing;
+  - a row is never claimed once its attempts reach the cap; if the lease
+    on its final attempt runs out, reap() dead-letters it;
+  - a failed row waits retry_delay(attempts) before its next attempt and
+    is dead-lettered at the cap, or at once for a permanent failure;
+  - dead rows stay, with last_error, until retry_dead() requeues them.
+
+Workers runs a queue's drain loop on the app's event loop, woken by kick()
+or every poll interval.
+"""
+
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from app.core.database import execute_query
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LeaseTable:
+    table: str
+    lease_seconds: int
+    base_delay: int                     # first retry waits this long, doubling after each failure
+    max_delay: int
+    max_attempts: Union[int, str]       # a constant, or the column holding each row's cap
+    statuses: Tuple[str, ...] = ("pending",)   # statuses a row can be claimed (or leased) in
+    finished_column: Optional[str] = None      # stamped on dead-lettering, cleared on retry
+
+    @property
+    def _cap(self) -> str:
+        return str(self.max_attempts)
+
+    def due(self) -> str:
+        """WHERE condition for rows a claim may take."""
+        statuses = ", ".join(f"'{s}'" for s in self.statuses)
+        return (f"status IN ({statuses}) AND attempts < {self._cap} "
+                f"AND next_attempt_at <= GETUTCDATE() "
+                f"AND (locked_until IS NULL OR locked_until < GETUTCDATE())")
+
+    def lease(self) -> str:
+        """SET clause a claim applies to the rows it takes."""
+        return f"locked_until = DATEADD(second, {self.lease_seconds}, GETUTCDATE()), attempts = attempts + 1"
+
+    def retry_delay(self, attempts: int) -> int:
+        """Seconds to wait after the given number of failed attempts."""
+        if attempts < 1:
+            return 0
+        return min(self.base_delay * 2 ** min(attempts - 1, 30), self.max_delay)
+
+    def fail(self, rows: List[Dict[str, Any]], error: str, permanent: bool = False) -> None:
+        """
+        Release claimed rows after a failed attempt. Each row is a claim's
+        output (id, attempts, and max_attempts when the cap is a column).
+        """
+        if not rows:
+            return
+        outcomes = []
+        for r in rows:
+            cap = r["max_attempts"] if isinstance(self.max_attempts, str) else self.max_attempts
+            outcomes.append({"id": r["id"], "delay": self.retry_delay(r["attempts"]),
+                             "dead": int(permanent or r["attempts"] >= cap)})
+        finished = (f", {self.finished_column} = CASE WHEN f.dead = 1 THEN GETUTCDATE() END"
+                    if self.finished_column else "")
+        execute_query(f"""
+            UPDATE t
+            SET locked_until = NULL, last_error = ?,
+                status = CASE WHEN f.dead = 1 THEN 'dead' ELSE 'pending' END,
+                next_attempt_at = DATEADD(second, f.delay, GETUTCDATE()){finished}
+            FROM {self.table} t
+            JOIN OPENJSON(?) WITH (id BIGINT '$.id', delay INT '$.delay', dead BIT '$.dead') f
+              ON t.id = f.id
+        """, (error[:1000], json.dumps(outcomes)), fetch="none")
+
+    def reap(self) -> int:
+        """Dead-letter rows whose final attempt lost its lease (worker died or overran)."""
+        statuses = ", ".join(f"'{s}'" for s in self.statuses)
+        finished = f", {self.finished_column} = GETUTCDATE()" if self.finished_column else ""
+        row = execute_query(f"""
+            SET NOCOUNT ON;
+            UPDATE {self.table}
+            SET status = 'dead', locked_until = NULL,
+                last_error = COALESCE(last_error + ' | ', '') + 'lease expired on the final attempt'{finished}
+            WHERE status IN ({statuses}) AND attempts >= {self._cap} AND locked_until < GETUTCDATE();
+            SELECT @@ROWCOUNT AS n;
+        """, fetch="one")
+        return row["n"] if row else 0
+
+    def retry_dead(self, column: Optional[str] = None, value: Optional[str] = None) -> int:
+        """Put dead rows (optionally only those with column = value) back with a fresh attempt budget."""
+        finished = f", {self.finished_column} = NULL" if self.finished_column else ""
+        sql = (f"UPDATE {self.table} SET status = 'pending', attempts = 0, next_attempt_at = GETUTCDATE(), "
+               f"locked_until = NULL{finished} OUTPUT inserted.id WHERE status = 'dead'")
+        params: tuple = ()
+        if column and value:
+            sql += f" AND {column} = ?"
+            params = (value,)
+        rows = execute_query(sql, params, fetch="all") or []
+        return len(rows)
+
+
+class Workers:
+    """
+    Worker tasks for one queue. Each calls drain() until it returns False,
+    then sleeps until kick() or poll_seconds. The first worker also runs
+    housekeeping() (in a thread) once per round.
+    """
+
+    def __init__(self, name: str, drain: Callable[[], Awaitable[bool]], poll_seconds: float,
+                 housekeeping: Optional[Callable[[], None]] = None):
+        self.name = name
+        self.poll_seconds = poll_seconds
+        self._drain = drain
+        self._housekeeping = housekeeping
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List["asyncio.Task"] = []
+
+    def running(self) -> int:
+        return sum(1 for t in self._tasks if not t.done())
+
+    def kick(self) -> None:
+        """Wake the workers now instead of at the next poll. Safe from any thread."""
+        if self._wake is None or self._loop is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._wake.set)
+        except RuntimeError:
+            pass  # loop closed during shutdown
+
+    async def _run(self, first: bool) -> None:
+        while True:
+            try:
+                while await self._drain():
+                    pass
+                if first and self._housekeeping:
+                    await asyncio.to_thread(self._housekeeping)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[{self.name}] worker error: {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def start(self, count: int = 1) -> None:
+        """Start the workers on the running loop (called from the app lifespan)."""
+        if self.running():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._tasks = [self._loop.create_task(self._run(first=(i == 0))) for i in range(count)]
+
+    async def stop(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
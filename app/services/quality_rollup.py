@@ -0,0 +1,216 @@
+"""
+UAT Quality Rollup — pre-aggregated sprint quality rows for /api/quality/*.
+
+get_portfolio_quality used to join cc_prompts, requirements, projects,
+uat_pages and uat_results and run two correlated COUNT subqueries over
+uat_bv_items per row on every request. uat_quality_rollup holds one row per
+joined (prompt, UAT page) with BV counts and pass rate already computed, and
+is refreshed per PTH on every UAT_PAGE change notification, which each BV
+result write (PL, CC, direct submit, batch reseed) sends after it commits.
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core import change_hooks
+from app.core.database import execute_query, get_db
+
+logger = logging.getLogger(__name__)
+
+TABLE = "uat_quality_rollup"
+_BUILT_KEY = "uat_quality_rollup_built_at"
+
+_ready: Optional[bool] = None
+_last_sync = 0.0
+_SYNC_INTERVAL = 60  # seconds between prompt catch-up scans
+
+# Same join as the original portfolio/sprint queries; "{filter}" narrows it
+# to one PTH for incremental refresh.
+_FILL = f"""
+    INSERT INTO {TABLE} (
+        prompt_id, pth, sprint_id, prompt_status, five_q_applied, root_cause_method,
+        requirement_code, project_code, project_name, sprint_title,
+        spec_id, uat_status, pl_submitted_at, attempt_number, failure_type,
+        total_bvs, passed_bvs, failed_bvs, skipped_bvs, bv_pass_rate,
+        prompt_created_at, activity_at
+    )
+    SELECT
+        cp.id, cp.pth, cp.sprint_id, cp.status, cp.five_q_applied, cp.root_cause_method,
+        rr.code, rp.code, rp.name, rr.title,
+        up.id, up.status, up.pl_submitted_at, up.attempt_number, ur.failure_type,
+        ISNULL(bv.total_bvs, 0), ISNULL(bv.passed_bvs, 0),
+        ISNULL(bv.failed_bvs, 0), ISNULL(bv.skipped_bvs, 0),
+        CASE WHEN ISNULL(bv.total_bvs, 0) > 0
+             THEN ROUND(100.0 * bv.passed_bvs / bv.total_bvs, 1) ELSE 0 END,
+        cp.created_at, COALESCE(up.pl_submitted_at, cp.created_at)
+    FROM cc_prompts cp
+    LEFT JOIN roadmap_requirements rr ON cp.requirement_id = rr.id
+    LEFT JOIN roadmap_projects rp ON rr.project_id = rp.id
+    LEFT JOIN uat_pages up ON up.pth = cp.pth
+    LEFT JOIN uat_results ur ON ur.handoff_id = up.handoff_id
+    OUTER APPLY (
+        SELECT COUNT(*) AS total_bvs,
+               SUM(CASE WHEN bi.status = 'pass' THEN 1 ELSE 0 END) AS passed_bvs,
+               SUM(CASE WHEN bi.status = 'fail' THEN 1 ELSE 0 END) AS failed_bvs,
+               SUM(CASE WHEN bi.status = 'skip' THEN 1 ELSE 0 END) AS skipped_bvs
+        FROM uat_bv_items bi WHERE bi.spec_id = up.id
+    ) bv
+    {{filter}}
+"""
+
+
+def rollup_ready() -> bool:
+    """True once the rollup table exists and has been populated at least once."""
+    global _ready
+    if _ready:
+        return True
+    try:
+        row = execute_query(
+            "SELECT value_json FROM governance_kv WHERE key_name = ?",
+            (_BUILT_KEY,), fetch="one",
+        )
+        _ready = bool(row)
+    except Exception as exc:
+        logger.warning(f"[quality-rollup] readiness check failed: {exc}")
+        _ready = False
+    return _ready
+
+
+def rebuild_rollup() -> int:
+    """Repopulate the whole rollup in one transaction. Returns the row count."""
+    global _ready
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"DELETE FROM {TABLE}")
+        cursor.execute(_FILL.format(filter=""))
+        cursor.execute("""
+            MERGE governance_kv AS t
+            USING (SELECT ? AS key_name) AS s ON t.key_name = s.key_name
+            WHEN MATCHED THEN UPDATE SET value_json = CONVERT(NVARCHAR(40), GETUTCDATE(), 126), updated_at = GETUTCDATE()
+            WHEN NOT MATCHED THEN INSERT (key_name, value_json) VALUES (s.key_name, CONVERT(NVARCHAR(40), GETUTCDATE(), 126));
+        """, (_BUILT_KEY,))
+        cursor.execute(f"SELECT COUNT(*) FROM {TABLE}")
+        count = int(cursor.fetchone()[0] or 0)
+    _ready = True
+    logger.info(f"[quality-rollup] rebuilt: {count} rows")
+    return count
+
+
+def refresh_for_pth(pth: str) -> None:
+    """Re-derive the rollup rows for one PTH (DELETE + INSERT…SELECT, one transaction)."""
+    if not pth or not rollup_ready():
+        return
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"DELETE FROM {TABLE} WHERE pth = ?", (pth,))
+        cursor.execute(_FILL.format(filter="WHERE cp.pth = ?"), (pth,))
+
+
+def refresh_for_specs(spec_ids: List[str]) -> None:
+    """
+    Refresh the PTHs of UAT specs whose BV results or status changed. Never
+    raises — a stale rollup row is preferable to failing the write behind it.
+    """
+    try:
+        if not spec_ids or not rollup_ready():
+            return
+        rows = execute_query(
+            "SELECT DISTINCT pth FROM uat_pages WHERE id IN (SELECT value FROM OPENJSON(?)) AND pth IS NOT NULL",
+            (json.dumps(spec_ids),), fetch="all",
+        ) or []
+        for r in rows:
+            refresh_for_pth(r["pth"])
+    except Exception as exc:
+        logger.warning(f"[quality-rollup] refresh failed for {len(spec_ids)} spec(s): {exc}")
+
+
+def _rebuild_quietly() -> None:
+    try:
+        rebuild_rollup()
+    except Exception as exc:
+        logger.warning(f"[quality-rollup] rebuild failed: {exc}")
+
+
+def _on_uat_page_change(keys: List[str]) -> None:
+    if keys:
+        refresh_for_specs(keys)
+    elif rollup_ready():
+        # "Many rows": rebuild off the writer's thread rather than in its request
+        threading.Thread(target=_rebuild_quietly, name="quality-rollup-rebuild", daemon=True).start()
+
+
+def sync_prompts(force: bool = False) -> int:
+    """
+    Pick up cc_prompts rows created or re-statused since their rollup row was
+    written (prompt writes don't go through the BV submit paths). Throttled to
+    one anti-join scan per _SYNC_INTERVAL. Returns the number of PTHs refreshed.
+    """
+    global _last_sync
+    if not rollup_ready():
+        return 0
+    now = time.monotonic()
+    if not force and now - _last_sync < _SYNC_INTERVAL:
+        return 0
+    _last_sync = now
+    try:
+        rows = execute_query(f"""
+            SELECT DISTINCT cp.pth
+            FROM cc_prompts cp
+            LEFT JOIN {TABLE} q ON q.prompt_id = cp.id
+            WHERE cp.pth IS NOT NULL
+              AND (q.prompt_id IS NULL OR q.prompt_status <> cp.status)
+        """, fetch="all") or []
+        for r in rows:
+            refresh_for_pth(r["pth"])
+        return len(rows)
+    except Exception as exc:
+        logger.warning(f"[quality-rollup] prompt sync failed: {exc}")
+        return 0
+
+
+def portfolio(project: Optional[str] = None, date_from: Optional[str] = None,
+              date_to: Optional[str] = None, limit: int = 500) -> List[Dict[str, Any]]:
+    """Portfolio rows newest first, filtered on project code and activity date."""
+    sync_prompts()
+    where = [
+        "(prompt_status IN ('complete', 'closed', 'executing', 'cc_complete') "
+        "OR pl_submitted_at IS NOT NULL)"
+    ]
+    params: List[Any] = []
+    if project:
+        where.append("project_code = ?")
+        params.append(project)
+    if date_from:
+        where.append("activity_at >= ?")
+        params.append(date_from)
+    if date_to:
+        where.append("activity_at < DATEADD(day, 1, CAST(? AS DATE))")
+        params.append(date_to)
+    return execute_query(f"""
+        SELECT TOP {int(limit)}
+            pth, sprint_id, five_q_applied, root_cause_method, project_code, project_name,
+            sprint_title, spec_id, uat_status, pl_submitted_at, attempt_number,
+            failure_type, total_bvs, passed_bvs, failed_bvs, skipped_bvs, bv_pass_rate
+        FROM {TABLE}
+        WHERE {" AND ".join(where)}
+        ORDER BY activity_at DESC
+    """, tuple(params), fetch="all") or []
+
+
+def sprint(pth: str) -> Optional[Dict[str, Any]]:
+    """Latest rollup row for a PTH (by prompt creation), or None."""
+    return execute_query(f"""
+        SELECT TOP 1
+            pth, sprint_id, five_q_applied, root_cause_method, requirement_code,
+            sprint_title, spec_id, uat_status, pl_submitted_at, attempt_number,
+            failure_type, total_bvs, passed_bvs, bv_pass_rate
+        FROM {TABLE}
+        WHERE pth = ?
+        ORDER BY prompt_created_at DESC
+    """, (pth,), fetch="one")
+
+
+change_hooks.subscribe(change_hooks.UAT_PAGE, _on_uat_page_change)
@@ -0,0 +1,395 @@
+"""
+RAG Ingest Pipeline — concurrent, rate-adaptive pushes to Portfolio RAG /ingest/custom.
+
+The sync used to send fixed batches of 25 chunks one after another with a
+fixed sleep in between, and gave up on the first HTTP error. IngestPipeline:
+
+    - packs chunks into batches by serialized size (max_batch_bytes,
+      max_batch_chunks) instead of a fixed count, and splits a batch the
+      service rejects with 413
+    - sends up to `concurrency` batches at once; a replace_collection batch
+      always goes first, alone
+    - paces requests with a token bucket that halves its rate and pauses for
+      Retry-After on 429, and creeps back up on success
+    - retries 429 / 5xx / transport errors per batch with exponential backoff
+      and full jitter
+    - checkpoints acknowledged batch indices (keyed by a fingerprint of the
+      chunk set) so a failed run resumes from the last acknowledged batch
+      instead of starting over
+
+Progress is reported through an optional on_progress(done, total) callback;
+callers persist it (rag.py writes governance_kv as before).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+Chunk = Dict[str, Any]
+OnBatch = Callable[[List[Chunk]], None]
+OnProgress = Callable[[int, int], None]
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class IngestError(Exception):
+    """A batch failed after all retries. done/total say how far the run got."""
+
+    def __init__(self, message: str, done: int, total: int, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.done = done
+        self.total = total
+        self.status_code = status_code
+
+
+# ---------------------------------------------------------------------------
+# Rate limiting
+# ---------------------------------------------------------------------------
+
+class TokenBucket:
+    """
+    Async token bucket. rate tokens/sec refill up to capacity. throttle()
+    halves the rate (down to min_rate) and blocks all takers for the
+    server's Retry-After; each success adds back `recover` tokens/sec up to
+    max_rate (AIMD).
+    """
+
+    def __init__(self, rate: float, capacity: float, min_rate: float = 0.2,
+                 max_rate: Optional[float] = None, recover: float = 0.25,
+                 clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.max_rate = max_rate or rate
+        self.recover = recover
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def take(self) -> None:
+        while True:
+            async with self._lock:
+                now = self._clock()
+                wait = self._paused_until - now
+                if wait <= 0:
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            await asyncio.sleep(wait)
+
+    def throttle(self, retry_after: Optional[float] = None) -> None:
+        now = self._clock()
+        self._refill(now)
+        self.rate = max(self.min_rate, self.rate / 2)
+        self._tokens = 0.0
+        if retry_after:
+            self._paused_until = max(self._paused_until, now + retry_after)
+
+    def succeeded(self) -> None:
+        self.rate = min(self.max_rate, self.rate + self.recover)
+
+
+def retry_after_seconds(resp: httpx.Response) -> Optional[float]:
+    """Retry-After as seconds (delta-seconds form only; HTTP-dates are ignored)."""
+    value = resp.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Checkpoints
+# ---------------------------------------------------------------------------
+
+class MemoryCheckpointStore:
+    def __init__(self):
+        self.data: Dict[str, Dict[str, Any]] = {}
+
+    def load(self, job: str) -> Optional[Dict[str, Any]]:
+        return self.data.get(job)
+
+    def save(self, job: str, value: Dict[str, Any]) -> None:
+        self.data[job] = value
+
+    def clear(self, job: str) -> None:
+        self.data.pop(job, None)
+
+
+class GovernanceCheckpointStore:
+    """Checkpoints in governance_kv under rag_ingest_checkpoint::<job>."""
+
+    @staticmethod
+    def _key(job: str) -> str:
+        return f"rag_ingest_checkpoint::{job}"
+
+    def load(self, job: str) -> Optional[Dict[str, Any]]:
+        from app.core.database import execute_query
+        row = execute_query("SELECT value_json FROM governance_kv WHERE key_name = ?",
+                            (self._key(job),), fetch="one")
+        if not row or not row.get("value_json"):
+            return None
+        try:
+            return json.loads(row["value_json"])
+        except ValueError:
+            return None
+
+    def save(self, job: str, value: Dict[str, Any]) -> None:
+        from app.core.database import execute_query
+        value_json = json.dumps(value)
+        execute_query("""
+            MERGE governance_kv AS t
+            USING (SELECT ? AS key_name) AS s ON t.key_name = s.key_name
+            WHEN MATCHED THEN UPDATE SET value_json = ?, updated_at = GETUTCDATE()
+            WHEN NOT MATCHED THEN INSERT (key_name, value_json) VALUES (s.key_name, ?);
+        """, (self._key(job), value_json, value_json), fetch="none")
+
+    def clear(self, job: str) -> None:
+        from app.core.database import execute_query
+        execute_query("DELETE FROM governance_kv WHERE key_name = ?", (self._key(job),), fetch="none")
+
+
+# ---------------------------------------------------------------------------
+# Batching
+# ---------------------------------------------------------------------------
+
+def _chunk_size(chunk: Chunk) -> int:
+    return len(json.dumps(chunk, default=str).encode("utf-8"))
+
+
+def make_batches(chunks: List[Chunk], max_bytes: int, max_chunks: int) -> List[List[Chunk]]:
+    """Greedy in-order packing; a chunk larger than max_bytes gets a batch to itself."""
+    batches: List[List[Chunk]] = []
+    current: List[Chunk] = []
+    size = 0
+    for chunk in chunks:
+        n = _chunk_size(chunk)
+        if current and (size + n > max_bytes or len(current) >= max_chunks):
+            batches.append(current)
+            current, size = [], 0
+        current.append(chunk)
+        size += n
+    if current:
+        batches.append(current)
+    return batches
+
+
+def fingerprint(chunks: List[Chunk], replace: bool, layout: str = "") -> str:
+    """Identifies a run: same chunks, same replace flag, same batch layout."""
+    h = hashlib.sha256(f"{'replace' if replace else 'upsert'}|{layout}".encode("utf-8"))
+    for chunk in chunks:
+        h.update(json.dumps(chunk, sort_keys=True, default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Pipeline
+# ---------------------------------------------------------------------------
+
+@dataclass
+class IngestResult:
+    batches: int = 0
+    skipped_batches: int = 0     # already acknowledged by a previous (failed) run
+    chunks_ingested: int = 0
+    retries: int = 0
+    throttled: int = 0
+    resumed: bool = False
+    elapsed_seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches, "skipped_batches": self.skipped_batches,
+            "chunks_ingested": self.chunks_ingested, "retries": self.retries,
+            "throttled": self.throttled, "resumed": self.resumed,
+            "elapsed_seconds": round(self.elapsed_seconds, 2),
+        }
+
+
+class IngestPipeline:
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        collection: str = "metapm",
+        concurrency: int = 4,
+        max_batch_bytes: int = 256 * 1024,
+        max_batch_chunks: int = 100,
+        rate: float = 4.0,
+        max_attempts: int = 5,
+        base_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        checkpoints: Any = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        timeout: Optional[float] = None,
+    ):
+        self.client = client
+        self.url = url
+        self.headers = headers or {}
+        self.collection = collection
+        self.concurrency = max(1, concurrency)
+        self.max_batch_bytes = max_batch_bytes
+        self.max_batch_chunks = max_batch_chunks
+        self.bucket = TokenBucket(rate=rate, capacity=max(1.0, float(concurrency)))
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.checkpoints = checkpoints if checkpoints is not None else MemoryCheckpointStore()
+        self._sleep = sleep
+        # Per-request override; None keeps the (shared) client's default
+        self.timeout = timeout
+
+    async def _send(self, index: int, batch: List[Chunk], replace: bool, result: IngestResult) -> int:
+        payload = {"collection": self.collection, "replace_collection": replace, "chunks": batch}
+        last_error = ""
+        status: Optional[int] = None
+        for attempt in range(1, self.max_attempts + 1):
+            await self.bucket.take()
+            try:
+                if self.timeout is None:
+                    resp = await self.client.post(self.url, json=payload, headers=self.headers)
+                else:
+                    resp = await self.client.post(self.url, json=payload, headers=self.headers,
+                                                  timeout=self.timeout)
+            except httpx.TransportError as exc:
+                last_error, status = f"{type(exc).__name__}: {exc}", None
+            else:
+                if resp.status_code < 400:
+                    self.bucket.succeeded()
+                    try:
+                        return int(resp.json().get("chunks_ingested", len(batch)))
+                    except ValueError:
+                        return len(batch)
+                status = resp.status_code
+                last_error = f"HTTP {status}: {resp.text[:200]}"
+                if status == 413 and len(batch) > 1:
+                    # Too large for the service: halve the batch and future batch size
+                    self.max_batch_bytes = max(16 * 1024, self.max_batch_bytes // 2)
+                    mid = len(batch) // 2
+                    return (await self._send(index, batch[:mid], replace, result)
+                            + await self._send(index, batch[mid:], False, result))
+                if status not in RETRY_STATUSES:
+                    break
+                if status == 429:
+                    result.throttled += 1
+                    wait = retry_after_seconds(resp)
+                    self.bucket.throttle(wait)
+                    if wait is not None:
+                        result.retries += 1
+                        continue  # the bucket already waits out Retry-After
+            if attempt < self.max_attempts:
+                result.retries += 1
+                backoff = min(self.max_backoff, self.base_backoff * (2 ** (attempt - 1)))
+                await self._sleep(random.uniform(0, backoff))
+        raise IngestError(f"batch {index} failed: {last_error}", 0, 0, status_code=status)
+
+    async def run(
+        self,
+        chunks: List[Chunk],
+        replace_collection: bool = False,
+        job: Optional[str] = None,
+        on_batch: Optional[OnBatch] = None,
+        on_progress: Optional[OnProgress] = None,
+    ) -> IngestResult:
+        """
+        Push chunks. With job set, acknowledged batches are checkpointed and a
+        re-run over the same chunks skips them. Raises IngestError (after
+        in-flight batches finish) when a batch exhausts its retries.
+        """
+        started = time.monotonic()
+        result = IngestResult()
+        batches = make_batches(chunks, self.max_batch_bytes, self.max_batch_chunks)
+        result.batches = len(batches)
+        total = len(batches)
+        fp = fingerprint(chunks, replace_collection, f"{self.max_batch_bytes}/{self.max_batch_chunks}")
+        acked: Set[int] = set()
+        if job:
+            saved = self.checkpoints.load(job)
+            if saved and saved.get("fingerprint") == fp:
+                acked = set(saved.get("acked", []))
+                result.resumed = bool(acked)
+                result.skipped_batches = len(acked)
+        failure: Optional[IngestError] = None
+
+        def _ack(index: int, batch: List[Chunk], ingested: int) -> None:
+            acked.add(index)
+            result.chunks_ingested += ingested
+            if job:
+                try:
+                    self.checkpoints.save(job, {
+                        "fingerprint": fp, "acked": sorted(acked), "total": total,
+                        "replace": replace_collection,
+                    })
+                except Exception as exc:
+                    logger.warning(f"[rag-ingest] checkpoint save failed: {exc}")
+            if on_batch:
+                on_batch(batch)
+            if on_progress:
+                on_progress(len(acked), total)
+
+        pending = [i for i in range(total) if i not in acked]
+        # replace_collection wipes the collection, so batch 0 must land before any other
+        if replace_collection and pending and pending[0] == 0:
+            try:
+                _ack(0, batches[0], await self._send(0, batches[0], True, result))
+            except IngestError as exc:
+                failure = exc
+            pending = pending[1:]
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for i in pending:
+            queue.put_nowait(i)
+
+        async def _worker() -> None:
+            nonlocal failure
+            while failure is None:
+                try:
+                    i = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    ingested = await self._send(i, batches[i], False, result)
+                except IngestError as exc:
+                    if failure is None:
+                        failure = exc
+                    result.errors.append(str(exc))
+                    return
+                _ack(i, batches[i], ingested)
+
+        if failure is None and pending:
+            await asyncio.gather(*(_worker() for _ in range(min(self.concurrency, len(pending)))))
+
+        result.elapsed_seconds = time.monotonic() - started
+        if failure is not None:
+            raise IngestError(str(failure), len(acked), total, status_code=failure.status_code)
+        if job:
+            try:
+                self.checkpoints.clear(job)
+            except Exception as exc:
+                logger.warning(f"[rag-ingest] checkpoint clear failed: {exc}")
+        logger.info(
+            f"[rag-ingest] {self.collection}: {result.chunks_ingested} chunks in {total} batches "
+            f"({result.skipped_batches} resumed, {result.retries} retries, {result.throttled} throttled) "
+            f"in {result.elapsed_seconds:.1f}s"
+        )
+        return result
@@ -0,0 +1,191 @@
+"""
+RAG Outbox — durable, batched Portfolio RAG ingestion.
+
+Lesson and UAT writes used to call Portfolio RAG inline (best-effort, with a
+flag as the only trace of a failure). Now the request inserts a rag_outbox
+row in the same transaction as its own write, and a background dispatcher
+drains due rows in batches to /ingest/custom.
+
+Rows name a source (source_type + source_id), not a payload: the chunk is
+built from the current DB row at dispatch time, so repeated edits collapse
+into one send and a row that no longer qualifies becomes a delete.
+Claiming, leases, backoff and dead-lettering are the shared mechanics in
+app/services/lease_queue.py: failed sends back off exponentially; after
+MAX_ATTEMPTS a row is marked 'dead' and kept (with last_error) until
+retried from /api/rag/outbox.
+"""
+
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core import http_clients
+from app.core.config import settings
+from app.core.database import execute_query
+from app.services import lease_queue
+
+logger = logging.getLogger(__name__)
+
+TABLE = "rag_outbox"
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 8
+POLL_SECONDS = 15.0
+LEASE_SECONDS = 120      # claimed rows are invisible to other instances this long
+MAX_BACKOFF_SECONDS = 3600
+
+Chunk = Dict[str, Any]
+
+
+@dataclass
+class Source:
+    """How to turn outbox rows of one source_type into chunks."""
+    collection: str
+    load: Callable[[List[str]], Dict[str, Chunk]]   # source ids → {source_id: chunk} for live rows
+    chunk_id: Callable[[str], str]                  # chunk id to delete when the row is gone
+    on_sent: Optional[Callable[[Dict[str, Chunk], List[str]], None]] = None  # (sent, deleted source ids)
+
+
+SOURCES: Dict[str, Source] = {}
+
+QUEUE = lease_queue.LeaseTable(
+    TABLE, LEASE_SECONDS, base_delay=30, max_delay=MAX_BACKOFF_SECONDS, max_attempts=MAX_ATTEMPTS,
+)
+
+
+def register_source(source_type: str, source: Source) -> None:
+    SOURCES[source_type] = source
+
+
+def enqueue(cursor, collection: str, source_type: str, source_ids: List[str]) -> None:
+    """Queue sources for ingestion using the caller's cursor (same transaction), in one INSERT."""
+    if not source_ids:
+        return
+    cursor.execute(
+        f"INSERT INTO {TABLE} (collection, source_type, source_id) "
+        f"SELECT ?, ?, value FROM OPENJSON(?)",
+        (collection, source_type, json.dumps([str(sid) for sid in source_ids])),
+    )
+
+
+def kick() -> None:
+    """Wake the dispatcher now instead of at the next poll. Safe from any thread."""
+    _workers.kick()
+
+
+# ── Dispatch ─────────────────────────────────────────────────────────────────
+
+def _claim(limit: int) -> List[Dict[str, Any]]:
+    return execute_query(f"""
+        UPDATE TOP (?) {TABLE} WITH (ROWLOCK, READPAST)
+        SET {QUEUE.lease()}
+        OUTPUT inserted.id, inserted.collection, inserted.source_type, inserted.source_id, inserted.attempts
+        WHERE {QUEUE.due()}
+    """, (limit,), fetch="all") or []
+
+
+def _ack(row_ids: List[int]) -> None:
+    execute_query(f"DELETE FROM {TABLE} WHERE id IN ({', '.join(str(int(i)) for i in row_ids)})",
+                  fetch="none")
+
+
+async def _send(collection: str, chunks: List[Chunk], delete_ids: List[str]) -> None:
+    payload: Dict[str, Any] = {"collection": collection, "replace_collection": False, "chunks": chunks}
+    if delete_ids:
+        payload["delete_ids"] = delete_ids
+    headers = {"Content-Type": "application/json"}
+    if settings.PORTFOLIO_RAG_API_KEY:
+        headers["x-api-key"] = settings.PORTFOLIO_RAG_API_KEY
+    base = settings.PORTFOLIO_RAG_URL.rstrip("/")
+    resp = await http_clients.get_client(http_clients.PORTFOLIO_RAG).post(
+        f"{base}/ingest/custom", json=payload, headers=headers, timeout=60.0,
+    )
+    resp.raise_for_status()
+
+
+async def _dispatch_group(collection: str, source_type: str, rows: List[Dict[str, Any]]) -> None:
+    row_ids = [r["id"] for r in rows]
+    source = SOURCES.get(source_type)
+    if source is None:
+        await asyncio.to_thread(QUEUE.fail, rows, f"no source registered for '{source_type}'")
+        return
+    source_ids = list(dict.fromkeys(r["source_id"] for r in rows))
+    try:
+        live = await asyncio.to_thread(source.load, source_ids)
+        gone = [sid for sid in source_ids if sid not in live]
+        await _send(collection, list(live.values()), [source.chunk_id(sid) for sid in gone])
+    except Exception as e:
+        logger.warning(f"[rag-outbox] {source_type} batch of {len(source_ids)} failed: {e}")
+        await asyncio.to_thread(QUEUE.fail, rows, str(e))
+        return
+    await asyncio.to_thread(_ack, row_ids)
+    if source.on_sent:
+        try:
+            await asyncio.to_thread(source.on_sent, live, gone)
+        except Exception as e:
+            logger.warning(f"[rag-outbox] {source_type} post-send bookkeeping failed: {e}")
+
+
+async def drain_once(limit: int = BATCH_SIZE) -> int:
+    """Claim and send one batch of due rows. Returns the number of rows claimed."""
+    rows = await asyncio.to_thread(_claim, limit)
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for r in rows:
+        groups.setdefault((r["collection"], r["source_type"]), []).append(r)
+    for (collection, source_type), group in groups.items():
+        await _dispatch_group(collection, source_type, group)
+    return len(rows)
+
+
+async def _drain() -> bool:
+    return await drain_once() >= BATCH_SIZE
+
+
+def _housekeeping() -> None:
+    reaped = QUEUE.reap()
+    if reaped:
+        logger.warning(f"[rag-outbox] dead-lettered {reaped} rows whose final attempt never finished")
+
+
+_workers = lease_queue.Workers("rag-outbox", _drain, POLL_SECONDS, _housekeeping)
+
+
+def start() -> None:
+    """Start the dispatcher on the running loop (called from the app lifespan)."""
+    _workers.start()
+
+
+async def stop() -> None:
+    await _workers.stop()
+
+
+# ── Admin ────────────────────────────────────────────────────────────────────
+
+def stats() -> Dict[str, Any]:
+    rows = execute_query(f"""
+        SELECT status, source_type, COUNT(*) AS cnt, MIN(created_at) AS oldest
+        FROM {TABLE} GROUP BY status, source_type
+    """, fetch="all") or []
+    dead = execute_query(f"""
+        SELECT TOP 20 id, collection, source_type, source_id, attempts, last_error, created_at
+        FROM {TABLE} WHERE status = 'dead' ORDER BY id DESC
+    """, fetch="all") or []
+    return {
+        "dispatcher_running": _workers.running() > 0,
+        "queues": [
+            {"status": r["status"], "source_type": r["source_type"], "count": r["cnt"],
+             "oldest": str(r["oldest"]) if r.get("oldest") else None}
+            for r in rows
+        ],
+        "dead_letters": [
+            {**r, "created_at": str(r["created_at"]) if r.get("created_at") else None} for r in dead
+        ],
+    }
+
+
+def retry_dead(source_type: Optional[str] = None) -> int:
+    """Put dead-lettered rows back in the queue with a fresh attempt budget."""
+    requeued = QUEUE.retry_dead("source_type", source_type)
+    kick()
+    return requeued
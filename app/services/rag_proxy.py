@@ -0,0 +1,228 @@
+"""
+Portfolio RAG Read Proxy — cached, coalesced, circuit-broken GETs.
+
+/api/rag/query, /rag/documents, /rag/latest/{doc_type} and /rag/checkpoints
+used to call Portfolio RAG on every request. Agents repeat the same lookups
+constantly, so responses are cached here keyed on the normalized upstream
+request:
+
+- fresh (age <= ttl): served from memory
+- stale (age <= ttl + stale_ttl): served immediately, refreshed in the background
+- concurrent misses for the same key share one upstream call
+- after repeated upstream failures the breaker opens and any cached copy,
+  however old, is served until a probe succeeds
+
+Only 2xx JSON responses are cached; 4xx responses pass through uncached.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+import httpx
+
+from app.core import http_clients
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# path prefix → (ttl seconds, extra stale-while-revalidate seconds)
+POLICIES: Dict[str, Tuple[float, float]] = {
+    "query": (300.0, 3600.0),
+    "documents": (120.0, 900.0),
+    "latest": (60.0, 900.0),
+    "checkpoints": (60.0, 900.0),
+}
+
+FAILURE_THRESHOLD = 3
+OPEN_SECONDS = 30.0
+
+
+class CircuitOpenError(Exception):
+    """Upstream is marked down and there is no cached copy to serve."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker. Opens after `threshold` failures, lets one
+    probe through after `open_seconds` (half-open), closes on success.
+    """
+
+    def __init__(self, threshold: int = FAILURE_THRESHOLD, open_seconds: float = OPEN_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.threshold = threshold
+        self.open_seconds = open_seconds
+        self._clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self._clock() - self.opened_at >= self.open_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.failures >= self.threshold or self.opened_at is not None:
+            if self.opened_at is None:
+                logger.warning(f"[rag-proxy] circuit opened after {self.failures} failures")
+            self.opened_at = self._clock()
+
+
+_cache = TTLCache(maxsize=512, ttl=None)  # freshness is judged per policy from entry age
+_breaker = CircuitBreaker()
+_inflight: Dict[Hashable, "asyncio.Task"] = {}
+_stats = {"hits": 0, "stale": 0, "misses": 0, "coalesced": 0, "refreshes": 0,
+          "upstream_errors": 0, "stale_on_error": 0}
+
+
+def cache_key(path: str, params: Optional[Dict[str, Any]] = None) -> Tuple:
+    """Normalized request: dropped empty params, sorted, query text case/space-folded."""
+    norm = []
+    for k, v in sorted((params or {}).items()):
+        if v is None or v == "":
+            continue
+        if k == "q":
+            v = " ".join(str(v).lower().split())
+        norm.append((k, str(v)))
+    return (path, tuple(norm))
+
+
+def _policy(path: str) -> Tuple[float, float]:
+    head = path.strip("/").split("/", 1)[0]
+    return POLICIES.get(head, POLICIES["query"])
+
+
+def _is_upstream_failure(exc: Exception) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500 or exc.response.status_code == 429
+    return isinstance(exc, (httpx.TransportError, ValueError))
+
+
+async def _call(loader: Callable[[], Awaitable[Any]]) -> Any:
+    if not _breaker.allow():
+        raise CircuitOpenError("Portfolio RAG circuit open")
+    try:
+        value = await loader()
+    except Exception as exc:
+        if _is_upstream_failure(exc):
+            _stats["upstream_errors"] += 1
+            _breaker.record_failure()
+        else:
+            _breaker.record_success()  # a 4xx still means the service is up
+        raise
+    _breaker.record_success()
+    return value
+
+
+def _load(key: Hashable, loader: Callable[[], Awaitable[Any]]) -> "asyncio.Task":
+    """One in-flight upstream call per key; the result is cached on success."""
+    task = _inflight.get(key)
+    if task is not None:
+        _stats["coalesced"] += 1
+        return task
+
+    async def run():
+        try:
+            value = await _call(loader)
+            _cache.set(key, value)
+            return value
+        finally:
+            _inflight.pop(key, None)
+
+    task = asyncio.ensure_future(run())
+    _inflight[key] = task
+    return task
+
+
+def _refresh_in_background(key: Hashable, loader: Callable[[], Awaitable[Any]]) -> None:
+    if key in _inflight:
+        return
+    _stats["refreshes"] += 1
+    task = _load(key, loader)
+    # Retrieve the exception so a failed refresh isn't logged as "never retrieved"
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+async def cached(path: str, params: Optional[Dict[str, Any]],
+                 loader: Callable[[], Awaitable[Any]]) -> Tuple[Any, str]:
+    """
+    Return (value, cache_status) for an upstream read, where cache_status is
+    HIT, STALE or MISS. `loader` performs the upstream call.
+    """
+    key = cache_key(path, params)
+    ttl, stale_ttl = _policy(path)
+    entry = _cache.get_entry(key)
+
+    if entry is not None:
+        value, age = entry
+        if age <= ttl:
+            _stats["hits"] += 1
+            return value, "HIT"
+        if age <= ttl + stale_ttl or _breaker.state == "open":
+            _stats["stale"] += 1
+            if _breaker.state != "open":
+                _refresh_in_background(key, loader)
+            return value, "STALE"
+
+    _stats["misses"] += 1
+    try:
+        # shield: a client disconnect must not cancel the call other waiters share
+        return await asyncio.shield(_load(key, loader)), "MISS"
+    except Exception:
+        if entry is not None:
+            _stats["stale_on_error"] += 1
+            return entry[0], "STALE"
+        raise
+
+
+async def get_json(path: str, params: Optional[Dict[str, Any]] = None,
+                   base_url: Optional[str] = None) -> Tuple[Any, str]:
+    """Cached GET of a Portfolio RAG path (e.g. "/documents")."""
+    base = (base_url or settings.PORTFOLIO_RAG_URL).rstrip("/")
+    clean = {k: v for k, v in (params or {}).items() if v is not None}
+
+    async def loader():
+        resp = await http_clients.get_client(http_clients.PORTFOLIO_RAG).get(f"{base}{path}", params=clean)
+        resp.raise_for_status()
+        return resp.json()
+
+    return await cached(path, clean, loader)
+
+
+def invalidate() -> None:
+    """Drop every cached read, e.g. after content was ingested."""
+    _cache.clear()
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        **_stats,
+        "entries": len(_cache),
+        "maxsize": _cache.maxsize,
+        "in_flight": len(_inflight),
+        "circuit": _breaker.state,
+        "consecutive_failures": _breaker.failures,
+        "policies": {k: {"ttl_seconds": t, "stale_seconds": s} for k, (t, s) in POLICIES.items()},
+    }
@@ -0,0 +1,133 @@
+"""
+RAG Sync State — per-chunk content hashes for incremental Portfolio RAG sync.
+
+POST /api/rag/sync used to rebuild the whole metapm collection every run
+(replace_collection=true, every requirement and UAT chunk re-sent).
+rag_sync_state records, for each chunk id pushed to a collection, the source
+row it came from and a SHA-256 of what was sent. An incremental run selects
+rows past the stored watermark, drops chunks whose hash hasn't changed, and
+deletes chunks whose source row is gone (or no longer qualifies).
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.database import execute_query, get_db
+
+logger = logging.getLogger(__name__)
+
+TABLE = "rag_sync_state"
+_WATERMARK_KEY = "rag_sync_watermark::{collection}"
+_ROWS_PER_STATEMENT = 400  # 5 params per row, under the 2100-parameter limit
+
+
+def chunk_hash(chunk: Dict[str, Any]) -> str:
+    """Stable hash of a chunk's content and metadata."""
+    body = json.dumps({"content": chunk.get("content"), "metadata": chunk.get("metadata")},
+                      sort_keys=True, default=str)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+def has_state(collection: str) -> bool:
+    """True once a collection has been synced with state tracking at least once."""
+    row = execute_query(
+        f"SELECT TOP 1 1 AS present FROM {TABLE} WHERE collection = ?", (collection,), fetch="one"
+    )
+    return bool(row)
+
+
+def hashes(collection: str, chunk_ids: List[str]) -> Dict[str, str]:
+    """Stored hash per chunk id (ids never synced are absent)."""
+    found: Dict[str, str] = {}
+    for i in range(0, len(chunk_ids), 500):
+        part = chunk_ids[i:i + 500]
+        rows = execute_query(
+            f"SELECT chunk_id, content_hash FROM {TABLE} "
+            f"WHERE collection = ? AND chunk_id IN ({', '.join('?' * len(part))})",
+            (collection, *part), fetch="all",
+        ) or []
+        found.update({r["chunk_id"]: r["content_hash"] for r in rows})
+    return found
+
+
+def changed(collection: str, chunks: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+    """Split chunks into (those whose hash differs from the stored one, unchanged count)."""
+    stored = hashes(collection, [c["id"] for c in chunks])
+    out = [c for c in chunks if stored.get(c["id"]) != chunk_hash(c)]
+    return out, len(chunks) - len(out)
+
+
+def record(collection: str, entries: Iterable[Tuple[str, str, str, Dict[str, Any]]]) -> None:
+    """Upsert (chunk_id, source_type, source_id, chunk) rows after a successful push."""
+    rows = [(cid, collection, stype, str(sid), chunk_hash(chunk)) for cid, stype, sid, chunk in entries]
+    if not rows:
+        return
+    with get_db() as conn:
+        cursor = conn.cursor()
+        for i in range(0, len(rows), _ROWS_PER_STATEMENT):
+            part = rows[i:i + _ROWS_PER_STATEMENT]
+            cursor.execute(f"""
+                MERGE {TABLE} AS t
+                USING (VALUES {", ".join("(?, ?, ?, ?, ?)" for _ in part)})
+                    AS s (chunk_id, collection, source_type, source_id, content_hash)
+                ON t.chunk_id = s.chunk_id
+                WHEN MATCHED THEN UPDATE SET
+                    collection = s.collection, source_type = s.source_type, source_id = s.source_id,
+                    content_hash = s.content_hash, synced_at = GETUTCDATE()
+                WHEN NOT MATCHED THEN INSERT (chunk_id, collection, source_type, source_id, content_hash)
+                    VALUES (s.chunk_id, s.collection, s.source_type, s.source_id, s.content_hash);
+            """, tuple(v for row in part for v in row))
+
+
+def forget(collection: str, chunk_ids: List[str]) -> None:
+    for i in range(0, len(chunk_ids), 500):
+        part = chunk_ids[i:i + 500]
+        execute_query(
+            f"DELETE FROM {TABLE} WHERE collection = ? AND chunk_id IN ({', '.join('?' * len(part))})",
+            (collection, *part), fetch="none",
+        )
+
+
+def reset(collection: str) -> None:
+    """Clear a collection's state before a full rebuild re-records it."""
+    execute_query(f"DELETE FROM {TABLE} WHERE collection = ?", (collection,), fetch="none")
+
+
+def orphaned(collection: str, source_type: str, live_ids_sql: str) -> List[str]:
+    """
+    Chunk ids of source_type whose source row is no longer returned by
+    live_ids_sql (a SELECT of one NVARCHAR id column).
+    """
+    rows = execute_query(f"""
+        SELECT s.chunk_id FROM {TABLE} s
+        WHERE s.collection = ? AND s.source_type = ?
+          AND s.source_id NOT IN ({live_ids_sql})
+    """, (collection, source_type), fetch="all") or []
+    return [r["chunk_id"] for r in rows]
+
+
+def get_watermarks(collection: str) -> Dict[str, datetime]:
+    row = execute_query(
+        "SELECT value_json FROM governance_kv WHERE key_name = ?",
+        (_WATERMARK_KEY.format(collection=collection),), fetch="one",
+    )
+    if not row or not row.get("value_json"):
+        return {}
+    try:
+        return {k: datetime.fromisoformat(v) for k, v in json.loads(row["value_json"]).items() if v}
+    except (ValueError, TypeError) as exc:
+        logger.warning(f"[rag-sync] unreadable watermark for {collection}: {exc}")
+        return {}
+
+
+def set_watermarks(collection: str, marks: Dict[str, Optional[datetime]]) -> None:
+    value = json.dumps({k: v.isoformat() for k, v in marks.items() if v is not None})
+    execute_query("""
+        MERGE governance_kv AS t
+        USING (SELECT ? AS key_name) AS s ON t.key_name = s.key_name
+        WHEN MATCHED THEN UPDATE SET value_json = ?, updated_at = GETUTCDATE()
+        WHEN NOT MATCHED THEN INSERT (key_name, value_json) VALUES (s.key_name, ?);
+    """, (_WATERMARK_KEY.format(collection=collection), value, value), fetch="none")
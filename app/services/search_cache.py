@@ -0,0 +1,69 @@
+"""
+Search Result Cache — memoized /api/search and /api/search/knowledge responses.
+
+Agents and the PL repeat the same PTH and keyword searches constantly. Each
+response is cached under its normalized query and filters, tagged with the
+entity types it was built from; a change hook on any of those entities drops
+just the entries derived from it. The TTL is a backstop for writers that
+don't notify (jobs, ad-hoc SQL).
+"""
+
+import logging
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+from app.core import change_hooks
+from app.core.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+_cache = TTLCache(maxsize=1000, ttl=120)
+
+_ENTITIES = (
+    change_hooks.REQUIREMENT,
+    change_hooks.UAT_PAGE,
+    change_hooks.HANDOFF,
+    change_hooks.LESSON,
+    change_hooks.PROJECT,
+    change_hooks.COMPLIANCE_DOC,
+)
+
+
+def normalize(q: str) -> str:
+    return " ".join((q or "").lower().split())
+
+
+def key(endpoint: str, q: str, **filters: Any) -> Hashable:
+    return (endpoint, normalize(q), tuple(sorted((k, v) for k, v in filters.items() if v is not None)))
+
+
+def get(cache_key: Hashable) -> Optional[Any]:
+    return _cache.get(cache_key)
+
+
+def put(cache_key: Hashable, value: Any, entities: Iterable[str]) -> None:
+    _cache.set(cache_key, value, tags=entities)
+
+
+def invalidate(entities: Iterable[str]) -> int:
+    return _cache.invalidate_tags(entities)
+
+
+def clear() -> None:
+    _cache.clear()
+
+
+def stats() -> Dict[str, Any]:
+    return _cache.stats()
+
+
+def _subscriber(entity: str):
+    def _on_change(_keys):
+        # Any write can move a row into or out of a result set, so the keys
+        # don't narrow it down: drop every result built from this entity.
+        invalidate([entity])
+    _on_change.__name__ = f"search_cache_{entity}"
+    return _on_change
+
+
+for _entity in _ENTITIES:
+    change_hooks.subscribe(_entity, _subscriber(_entity))
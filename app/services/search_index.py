@@ -0,0 +1,560 @@
+"""
+Knowledge Search Index — in-process inverted index with BM25 ranking.
+
+/api/search/knowledge, the SQL collections of /api/rag/query and the universal
+/api/search used to run LIKE '%q%' over requirement titles/descriptions,
+compliance_docs.content_md, handoffs and lessons. None of that can use an
+index and the results came back in arbitrary order.
+
+This module keeps one inverted index over those sources (plus UAT pages for
+universal search), scored with BM25 across weighted fields. Queries support:
+
+    word            ranked term match
+    word*           prefix match (expanded over the sorted vocabulary)
+    "two words"     phrase match (token positions must be adjacent)
+    field:value     exact metadata filter — type, project, status, pth,
+                    category, doc_type
+
+The index is built from a streamed scan (fetchmany batches, one source at a
+time) in a background thread at startup, updated through change hooks for
+requirements, lessons and compliance docs, and caught up from updated_at /
+created_at watermarks for writers that don't notify (handoffs, UAT pages).
+"""
+
+import bisect
+import logging
+import math
+import re
+import threading
+import time
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from app.core import change_hooks
+from app.core.database import execute_query, get_db
+
+logger = logging.getLogger(__name__)
+
+K1 = 1.2
+B = 0.75
+FIELD_GAP = 1000  # position offset between fields so phrases never span two
+
+REQUIREMENT = "requirement"
+COMPLIANCE_DOC = "compliance_doc"
+HANDOFF = "handoff"
+LESSON = "lesson"
+UAT_PAGE = "uat_page"
+
+FILTER_FIELDS = ("type", "project", "status", "pth", "category", "doc_type")
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_QUERY_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase alphanumeric tokens. No stemming or stopwords — BM25 IDF handles noise."""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(text.lower())
+
+
+@dataclass
+class Doc:
+    source: str
+    key: str
+    payload: Dict[str, Any]
+    meta: Dict[str, str]
+    length: float = 0.0
+    terms: Set[str] = field(default_factory=set)
+
+
+@dataclass
+class ParsedQuery:
+    terms: List[str] = field(default_factory=list)
+    prefixes: List[str] = field(default_factory=list)
+    phrases: List[List[str]] = field(default_factory=list)
+    filters: Dict[str, str] = field(default_factory=dict)
+
+    def is_empty(self) -> bool:
+        return not (self.terms or self.prefixes or self.phrases)
+
+
+def parse_query(q: str, prefix_last: bool = False) -> ParsedQuery:
+    """
+    Split a query into terms, prefixes, phrases and field filters. An unquoted
+    word that tokenizes into several tokens ("MP-123") is treated as a phrase.
+    With prefix_last, the final bare word also matches as a prefix (typeahead).
+    """
+    parsed = ParsedQuery()
+    parts = list(_QUERY_RE.finditer(q or ""))
+    for i, m in enumerate(parts):
+        if m.group(1) is not None:
+            toks = tokenize(m.group(1))
+            if len(toks) > 1:
+                parsed.phrases.append(toks)
+            else:
+                parsed.terms.extend(toks)
+            continue
+        word = m.group(2)
+        name, sep, value = word.partition(":")
+        if sep and name.lower() in FILTER_FIELDS and value:
+            parsed.filters[name.lower()] = value.lower()
+            continue
+        if word.endswith("*") and len(word) > 1:
+            toks = tokenize(word[:-1])
+            if toks:
+                parsed.terms.extend(toks[:-1])
+                parsed.prefixes.append(toks[-1])
+            continue
+        toks = tokenize(word)
+        if len(toks) > 1:
+            parsed.phrases.append(toks)
+        elif toks:
+            if prefix_last and i == len(parts) - 1:
+                parsed.prefixes.append(toks[0])
+            else:
+                parsed.terms.append(toks[0])
+    return parsed
+
+
+class SearchIndex:
+    """Inverted index: term → {doc_no: (weighted tf, positions)} with BM25 scoring."""
+
+    def __init__(self):
+        self.docs: Dict[int, Doc] = {}
+        self.by_key: Dict[Tuple[str, str], int] = {}
+        self.postings: Dict[str, Dict[int, Tuple[float, array]]] = {}
+        self._vocab: Optional[List[str]] = None
+        self._next_no = 0
+        self._total_len = 0.0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    # -- maintenance ----------------------------------------------------------
+
+    def upsert(self, source: str, key: str, fields: Iterable[Tuple[Optional[str], float]],
+               payload: Dict[str, Any], meta: Dict[str, Any]) -> None:
+        """Index a document. fields is [(text, weight), …]; meta values are filterable."""
+        per_term: Dict[str, Tuple[float, List[int]]] = {}
+        length = 0.0
+        pos_base = 0
+        for text, weight in fields:
+            toks = tokenize(text)
+            for offset, tok in enumerate(toks):
+                wtf, positions = per_term.get(tok, (0.0, []))
+                positions.append(pos_base + offset)
+                per_term[tok] = (wtf + weight, positions)
+            length += weight * len(toks)
+            pos_base += len(toks) + FIELD_GAP
+
+        doc = Doc(
+            source=source, key=key, payload=payload,
+            meta={k: str(v).lower() for k, v in meta.items() if v not in (None, "")},
+            length=length, terms=set(per_term),
+        )
+        doc.meta["type"] = source
+        with self._lock:
+            self._remove_locked(source, key)
+            no = self._next_no
+            self._next_no += 1
+            self.docs[no] = doc
+            self.by_key[(source, key.lower())] = no
+            self._total_len += length
+            for tok, (wtf, positions) in per_term.items():
+                if tok not in self.postings:
+                    self._vocab = None
+                    self.postings[tok] = {}
+                self.postings[tok][no] = (wtf, array("i", positions))
+
+    def remove(self, source: str, key: str) -> None:
+        with self._lock:
+            self._remove_locked(source, key)
+
+    def _remove_locked(self, source: str, key: str) -> None:
+        no = self.by_key.pop((source, key.lower()), None)
+        if no is None:
+            return
+        doc = self.docs.pop(no)
+        self._total_len -= doc.length
+        for tok in doc.terms:
+            plist = self.postings.get(tok)
+            if plist is not None:
+                plist.pop(no, None)
+                if not plist:
+                    del self.postings[tok]
+                    self._vocab = None
+
+    def keys(self, source: str) -> Set[str]:
+        with self._lock:
+            return {self.docs[no].key for (s, _), no in self.by_key.items() if s == source}
+
+    # -- query ----------------------------------------------------------------
+
+    def _expand_prefix(self, prefix: str, max_terms: int = 50) -> List[str]:
+        if self._vocab is None:
+            self._vocab = sorted(self.postings)
+        i = bisect.bisect_left(self._vocab, prefix)
+        out = []
+        while i < len(self._vocab) and self._vocab[i].startswith(prefix) and len(out) < max_terms:
+            out.append(self._vocab[i])
+            i += 1
+        return out
+
+    def _phrase_docs(self, phrase: List[str]) -> Set[int]:
+        lists = [self.postings.get(t) for t in phrase]
+        if not all(lists):
+            return set()
+        candidates = set.intersection(*(set(p) for p in lists))
+        hits = set()
+        for no in candidates:
+            first = lists[0][no][1]
+            rest = [set(p[no][1]) for p in lists[1:]]
+            if any(all((start + j + 1) in rest[j] for j in range(len(rest))) for start in first):
+                hits.add(no)
+        return hits
+
+    def _bm25(self, term: str, scores: Dict[int, float], allowed: Optional[Set[int]], avgdl: float,
+              boost: float = 1.0) -> None:
+        plist = self.postings.get(term)
+        if not plist:
+            return
+        n = len(self.docs)
+        idf = math.log(1 + (n - len(plist) + 0.5) / (len(plist) + 0.5))
+        for no, (wtf, _) in plist.items():
+            if allowed is not None and no not in allowed:
+                continue
+            dl = self.docs[no].length
+            scores[no] = scores.get(no, 0.0) + boost * idf * (wtf * (K1 + 1)) / (
+                wtf + K1 * (1 - B + B * dl / avgdl)
+            )
+
+    def search(self, q: str, sources: Optional[Iterable[str]] = None, limit: int = 20,
+               filters: Optional[Dict[str, str]] = None,
+               prefix_last: bool = False) -> List[Tuple[float, Doc]]:
+        """
+        Ranked (score, Doc) pairs. Every phrase must match; bare terms and
+        prefixes are OR'ed and contribute BM25 score. Prefix expansions score
+        at half weight so exact terms rank first.
+        """
+        parsed = parse_query(q, prefix_last=prefix_last)
+        if filters:
+            parsed.filters.update({k: str(v).lower() for k, v in filters.items() if v})
+        if parsed.is_empty():
+            return []
+        source_set = set(sources) if sources else None
+
+        with self._lock:
+            if not self.docs:
+                return []
+            avgdl = max(self._total_len / len(self.docs), 1.0)
+
+            allowed: Optional[Set[int]] = None
+            for phrase in parsed.phrases:
+                hits = self._phrase_docs(phrase)
+                allowed = hits if allowed is None else allowed & hits
+
+            scores: Dict[int, float] = {}
+            for phrase in parsed.phrases:
+                for t in phrase:
+                    self._bm25(t, scores, allowed, avgdl)
+            for t in parsed.terms:
+                self._bm25(t, scores, allowed, avgdl)
+            for p in parsed.prefixes:
+                for t in self._expand_prefix(p):
+                    self._bm25(t, scores, allowed, avgdl, boost=1.0 if t == p else 0.5)
+
+            ranked = []
+            for no, score in scores.items():
+                doc = self.docs[no]
+                if source_set is not None and doc.source not in source_set:
+                    continue
+                if any(doc.meta.get(k) != v for k, v in parsed.filters.items()):
+                    continue
+                ranked.append((score, doc))
+        ranked.sort(key=lambda sd: (-sd[0], sd[1].source, sd[1].key))
+        return ranked[:limit]
+
+
+# ---------------------------------------------------------------------------
+# Sources — SQL, field weights and payload shape for each document type
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Source:
+    name: str
+    select: str           # base SELECT; must expose a `doc_key` column
+    key_column: str       # column for "WHERE … IN (…)" reloads
+    watermark: str        # expression for the change-feed high-water mark
+    where: str = ""       # extra predicate always applied
+
+    def sql(self, extra: str = "") -> str:
+        preds = [p for p in (self.where, extra) if p]
+        return self.select + (" WHERE " + " AND ".join(preds) if preds else "")
+
+
+SOURCES: Dict[str, Source] = {
+    REQUIREMENT: Source(
+        REQUIREMENT,
+        """SELECT CAST(r.id AS NVARCHAR(36)) AS doc_key, r.id, r.code, r.title, r.description,
+                  r.status, r.type, r.pth, r.project_id, p.code AS project_code, p.name AS project_name,
+                  r.updated_at AS wm
+           FROM roadmap_requirements r
+           LEFT JOIN roadmap_projects p ON r.project_id = p.id""",
+        "r.id", "r.updated_at",
+    ),
+    COMPLIANCE_DOC: Source(
+        COMPLIANCE_DOC,
+        """SELECT c.id AS doc_key, c.id, c.doc_type, c.project_code, c.content_md, c.updated_at AS wm
+           FROM compliance_docs c""",
+        "c.id", "c.updated_at",
+    ),
+    HANDOFF: Source(
+        HANDOFF,
+        """SELECT CAST(h.id AS NVARCHAR(36)) AS doc_key, h.id, h.project, h.title, h.task, h.version,
+                  h.status, h.pth, h.updated_at AS wm
+           FROM mcp_handoffs h""",
+        "h.id", "h.updated_at",
+    ),
+    LESSON: Source(
+        LESSON,
+        """SELECT l.id AS doc_key, l.id, l.project, l.category, l.lesson, l.source_sprint, l.status,
+                  l.target, l.created_at AS wm
+           FROM lessons_learned l""",
+        "l.id", "l.created_at",
+        where="(l.deleted IS NULL OR l.deleted = 0)",
+    ),
+    UAT_PAGE: Source(
+        UAT_PAGE,
+        """SELECT CAST(u.id AS NVARCHAR(36)) AS doc_key, u.id, u.project, u.version, u.status, u.pth,
+                  u.created_at, h.title AS handoff_title, u.created_at AS wm
+           FROM uat_pages u
+           LEFT JOIN mcp_handoffs h ON u.handoff_id = h.id""",
+        "u.id", "u.created_at",
+    ),
+}
+
+
+def _index_row(index: SearchIndex, source: str, r: Dict[str, Any]) -> None:
+    key = str(r["doc_key"])
+    if source == REQUIREMENT:
+        index.upsert(
+            source, key,
+            [(r.get("code"), 3.0), (r.get("pth"), 3.0), (r.get("title"), 2.0), (r.get("description"), 1.0)],
+            payload={
+                "id": r["id"], "code": r.get("code"), "title": r.get("title"),
+                "description": r.get("description"), "status": r.get("status"),
+                "pth": r.get("pth"), "project_id": r.get("project_id"),
+                "project_code": r.get("project_code"), "project_name": r.get("project_name"),
+            },
+            meta={"project": r.get("project_code"), "status": r.get("status"), "pth": r.get("pth")},
+        )
+    elif source == COMPLIANCE_DOC:
+        index.upsert(
+            source, key,
+            [(r.get("id"), 3.0), (r.get("content_md"), 1.0)],
+            payload={
+                "id": r["id"], "doc_type": r.get("doc_type"),
+                "project_code": r.get("project_code"), "content_md": r.get("content_md"),
+            },
+            meta={"project": r.get("project_code"), "doc_type": r.get("doc_type")},
+        )
+    elif source == HANDOFF:
+        index.upsert(
+            source, key,
+            [(r.get("pth"), 3.0), (r.get("title"), 2.0), (r.get("project"), 1.5), (r.get("task"), 1.0)],
+            payload={
+                "id": key, "project": r.get("project"), "title": r.get("title"), "task": r.get("task"),
+                "version": r.get("version"), "status": r.get("status"), "pth": r.get("pth"),
+            },
+            meta={"project": r.get("project"), "status": r.get("status"), "pth": r.get("pth")},
+        )
+    elif source == LESSON:
+        index.upsert(
+            source, key,
+            [(r.get("id"), 3.0), (r.get("source_sprint"), 2.0), (r.get("lesson"), 1.0)],
+            payload={
+                "id": r["id"], "project": r.get("project"), "category": r.get("category"),
+                "lesson": r.get("lesson"), "source_sprint": r.get("source_sprint"),
+                "status": r.get("status"), "target": r.get("target"),
+            },
+            meta={"project": r.get("project"), "status": r.get("status"), "category": r.get("category")},
+        )
+    elif source == UAT_PAGE:
+        index.upsert(
+            source, key,
+            [(r.get("pth"), 3.0), (r.get("handoff_title"), 2.0), (r.get("project"), 1.5)],
+            payload={
+                "id": key, "project": r.get("project"), "version": r.get("version"),
+                "status": r.get("status"), "pth": r.get("pth"), "handoff_title": r.get("handoff_title"),
+            },
+            meta={"project": r.get("project"), "status": r.get("status"), "pth": r.get("pth")},
+        )
+
+
+def _stream(sql: str, params: tuple = (), batch: int = 1000) -> Iterator[Dict[str, Any]]:
+    """Yield rows as dicts via fetchmany so large NVARCHAR(MAX) scans aren't materialized at once."""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        cols = [c[0] for c in cursor.description]
+        while True:
+            rows = cursor.fetchmany(batch)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(zip(cols, row))
+
+
+# ---------------------------------------------------------------------------
+# Process-wide index
+# ---------------------------------------------------------------------------
+
+CATCH_UP_INTERVAL = 30        # seconds between watermark scans
+FULL_REBUILD_INTERVAL = 6 * 3600
+
+_index: Optional[SearchIndex] = None
+_watermarks: Dict[str, Any] = {}
+_built_at = 0.0
+_last_catch_up = 0.0
+_build_lock = threading.Lock()
+_catch_up_lock = threading.Lock()
+
+
+def _build() -> Tuple[SearchIndex, Dict[str, Any]]:
+    started = time.monotonic()
+    index = SearchIndex()
+    watermarks: Dict[str, Any] = {}
+    for name, src in SOURCES.items():
+        try:
+            count = 0
+            for r in _stream(src.sql()):
+                _index_row(index, name, r)
+                wm = r.get("wm")
+                if wm is not None and (watermarks.get(name) is None or wm > watermarks[name]):
+                    watermarks[name] = wm
+                count += 1
+            logger.info(f"[search-index] {name}: {count} docs")
+        except Exception as exc:
+            logger.warning(f"[search-index] {name} skipped: {exc}")
+    logger.info(
+        f"[search-index] built {len(index)} docs, {len(index.postings)} terms "
+        f"in {time.monotonic() - started:.1f}s"
+    )
+    return index, watermarks
+
+
+def rebuild() -> SearchIndex:
+    """Build a fresh index and swap it in; readers keep the old one until then."""
+    global _index, _watermarks, _built_at
+    with _build_lock:
+        index, watermarks = _build()
+        _index, _watermarks, _built_at = index, watermarks, time.monotonic()
+    return index
+
+
+def get_index() -> SearchIndex:
+    """Shared index; builds synchronously if the startup build hasn't finished."""
+    if _index is None:
+        with _build_lock:
+            pass  # wait for an in-flight background build
+        if _index is None:
+            rebuild()
+    _maybe_refresh()
+    return _index
+
+
+def warm_in_background() -> None:
+    """Start the initial build on a daemon thread (called from app startup)."""
+    threading.Thread(target=rebuild, name="search-index-build", daemon=True).start()
+
+
+def _maybe_refresh() -> None:
+    now = time.monotonic()
+    if now - _built_at > FULL_REBUILD_INTERVAL and not _build_lock.locked():
+        warm_in_background()
+    elif now - _last_catch_up > CATCH_UP_INTERVAL:
+        catch_up()
+
+
+def catch_up() -> int:
+    """Re-index rows whose watermark column moved past the last seen value."""
+    global _last_catch_up
+    if _index is None or not _catch_up_lock.acquire(blocking=False):
+        return 0
+    try:
+        _last_catch_up = time.monotonic()
+        total = 0
+        for name, src in SOURCES.items():
+            since = _watermarks.get(name)
+            if since is None:
+                continue
+            try:
+                rows = execute_query(src.sql(f"{src.watermark} >= ?"), (since,), fetch="all") or []
+            except Exception as exc:
+                logger.warning(f"[search-index] catch-up {name} failed: {exc}")
+                continue
+            for r in rows:
+                _index_row(_index, name, r)
+                if r.get("wm") is not None and r["wm"] > _watermarks[name]:
+                    _watermarks[name] = r["wm"]
+            total += len(rows)
+        return total
+    finally:
+        _catch_up_lock.release()
+
+
+def refresh_keys(source: str, keys: List[str]) -> None:
+    """Re-read specific documents; keys missing from the source are dropped."""
+    if _index is None:
+        return
+    if not keys:
+        warm_in_background()
+        return
+    src = SOURCES[source]
+    keys = [str(k) for k in dict.fromkeys(keys)]
+    found: Set[str] = set()
+    for i in range(0, len(keys), 500):
+        chunk = keys[i:i + 500]
+        rows = execute_query(
+            src.sql(f"{src.key_column} IN ({','.join(['?'] * len(chunk))})"), tuple(chunk)
+        ) or []
+        for r in rows:
+            found.add(str(r["doc_key"]).lower())
+            _index_row(_index, source, r)
+    for k in keys:
+        if k.lower() not in found:
+            _index.remove(source, k)  # keys compare case-insensitively (GUIDs)
+
+
+def search(q: str, sources: Optional[Iterable[str]] = None, limit: int = 20,
+           filters: Optional[Dict[str, str]] = None, prefix_last: bool = False) -> List[Tuple[float, Doc]]:
+    return get_index().search(q, sources=sources, limit=limit, filters=filters, prefix_last=prefix_last)
+
+
+def stats() -> Dict[str, Any]:
+    if _index is None:
+        return {"ready": False}
+    counts: Dict[str, int] = {}
+    for doc in list(_index.docs.values()):
+        counts[doc.source] = counts.get(doc.source, 0) + 1
+    return {
+        "ready": True,
+        "docs": len(_index),
+        "terms": len(_index.postings),
+        "by_source": counts,
+        "age_seconds": int(time.monotonic() - _built_at),
+    }
+
+
+def _subscriber(source: str):
+    return lambda keys: refresh_keys(source, keys)
+
+
+change_hooks.subscribe(change_hooks.REQUIREMENT, _subscriber(REQUIREMENT))
+change_hooks.subscribe(change_hooks.LESSON, _subscriber(LESSON))
+change_hooks.subscribe(change_hooks.COMPLIANCE_DOC, _subscriber(COMPLIANCE_DOC))
+change_hooks.subscribe(change_hooks.HANDOFF, _subscriber(HANDOFF))
+change_hooks.subscribe(change_hooks.UAT_PAGE, _subscriber(UAT_PAGE))
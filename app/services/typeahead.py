@@ -0,0 +1,394 @@
+"""
+Typeahead Index — in-memory prefix lookup for codes, PTHs and titles.
+
+The dashboard's code/PTH lookups and /api/transactions/search/quick ran
+LIKE '%q%' against tables and views on every keystroke. This module keeps
+two sorted arrays searched with bisect:
+
+    keys    normalized identifiers — requirement codes, PTHs, sprint IDs,
+            project codes, lesson IDs
+    tokens  normalized title tokens (requirement titles, project and
+            sprint names) pointing back at the same entries
+
+Normalization lowercases and drops separators, so "mp-04", "MP04" and "mp04"
+all prefix-match MP-048. Results rank exact identifier matches first, then
+identifier prefixes, then title-token matches.
+
+Requirement, lesson and project writes arrive through change hooks; prompts,
+UAT pages and roadmap sprints (which don't notify) are picked up from an updated_at /
+created_at watermark at most once per _CATCH_UP_INTERVAL. Lookups never touch
+the database otherwise.
+"""
+
+import bisect
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core import change_hooks
+from app.core.database import execute_query
+from app.services.search_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+REQUIREMENT = "requirement"
+PTH = "pth"
+SPRINT = "sprint"
+PROJECT = "project"
+LESSON = "lesson"
+
+KINDS = (REQUIREMENT, PTH, SPRINT, PROJECT, LESSON)
+_KIND_ORDER = {k: i for i, k in enumerate(KINDS)}
+
+EXACT, PREFIX, TITLE = 0, 1, 2
+_MATCH_NAMES = {EXACT: "exact", PREFIX: "prefix", TITLE: "title"}
+
+_CATCH_UP_INTERVAL = 30  # seconds between prompt / UAT page watermark scans
+_MAX_SCAN = 2000  # upper bound on array entries walked per lookup
+
+_NORM_RE = re.compile(r"[^a-z0-9]+")
+
+EntryId = Tuple[str, str]
+
+
+def normalize(text: Optional[str]) -> str:
+    """Lowercase and strip everything but letters and digits."""
+    return _NORM_RE.sub("", (text or "").lower())
+
+
+@dataclass
+class Entry:
+    kind: str
+    id: str
+    key: str
+    label: str = ""
+    project: Optional[str] = None
+    tokens: Tuple[str, ...] = ()
+
+    def to_dict(self, match: int) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "id": self.id,
+            "key": self.key,
+            "label": self.label,
+            "project_code": self.project,
+            "match": _MATCH_NAMES[match],
+        }
+
+
+class TypeaheadIndex:
+    """Entries keyed by (kind, id); the sorted arrays are rebuilt lazily after writes."""
+
+    def __init__(self):
+        self._entries: Dict[EntryId, Entry] = {}
+        self._keys: List[Tuple[str, EntryId]] = []
+        self._tokens: List[Tuple[str, EntryId]] = []
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def put(self, entry: Entry) -> None:
+        with self._lock:
+            self._entries[(entry.kind, entry.id)] = entry
+            self._dirty = True
+
+    def drop(self, kind: str, entry_id: str) -> None:
+        with self._lock:
+            if self._entries.pop((kind, entry_id), None) is not None:
+                self._dirty = True
+
+    def _arrays(self) -> Tuple[List[Tuple[str, EntryId]], List[Tuple[str, EntryId]]]:
+        with self._lock:
+            if self._dirty:
+                keys, tokens = [], []
+                for eid, e in self._entries.items():
+                    norm = normalize(e.key)
+                    if norm:
+                        keys.append((norm, eid))
+                    for t in set(e.tokens):
+                        tokens.append((t, eid))
+                keys.sort()
+                tokens.sort()
+                self._keys, self._tokens = keys, tokens
+                self._dirty = False
+            return self._keys, self._tokens
+
+    @staticmethod
+    def _prefix_scan(array: List[Tuple[str, EntryId]], prefix: str) -> Iterable[Tuple[str, EntryId]]:
+        i = bisect.bisect_left(array, (prefix,))
+        end = min(len(array), i + _MAX_SCAN)
+        while i < end and array[i][0].startswith(prefix):
+            yield array[i]
+            i += 1
+
+    @staticmethod
+    def _exact_range(array: List[Tuple[str, EntryId]], token: str) -> List[Tuple[str, EntryId]]:
+        lo = bisect.bisect_left(array, (token,))
+        hi = bisect.bisect_left(array, (token + "\0",))
+        return array[lo:hi]
+
+    def suggest(self, q: str, limit: int = 10, kinds: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        norm = normalize(q)
+        words = tokenize(q)
+        if not norm:
+            return []
+        allowed = set(kinds) if kinds else None
+        keys, tokens = self._arrays()
+        best: Dict[EntryId, Tuple[int, int, int, str]] = {}
+
+        def offer(eid: EntryId, match: int, length: int) -> None:
+            if allowed is not None and eid[0] not in allowed:
+                return
+            rank = (match, _KIND_ORDER.get(eid[0], len(KINDS)), length, eid[1])
+            if eid not in best or rank < best[eid]:
+                best[eid] = rank
+
+        for key, eid in self._prefix_scan(keys, norm):
+            offer(eid, EXACT if key == norm else PREFIX, len(key))
+
+        # Title tokens: the last word is a prefix, earlier words must match whole tokens.
+        if words:
+            head, last = words[:-1], words[-1]
+            with self._lock:
+                if head:
+                    candidates: Optional[Set[EntryId]] = None
+                    for word in head:
+                        hits = {eid for _, eid in self._exact_range(tokens, word)}
+                        candidates = hits if candidates is None else candidates & hits
+                    matches: Iterable[EntryId] = [
+                        eid for eid in candidates or ()
+                        if eid in self._entries
+                        and any(t.startswith(last) for t in self._entries[eid].tokens)
+                    ]
+                else:
+                    matches = (eid for _, eid in self._prefix_scan(tokens, last))
+                for eid in matches:
+                    entry = self._entries.get(eid)
+                    if entry is not None and eid not in best:
+                        offer(eid, TITLE, len(entry.label))
+
+        ranked = sorted(best.items(), key=lambda kv: kv[1])[:limit]
+        with self._lock:
+            return [self._entries[eid].to_dict(rank[0]) for eid, rank in ranked if eid in self._entries]
+
+
+# ---------------------------------------------------------------------------
+# Loading
+# ---------------------------------------------------------------------------
+
+_REQUIREMENT_SQL = """
+    SELECT rr.id, rr.code, rr.title, rp.code AS project_code
+    FROM roadmap_requirements rr
+    LEFT JOIN roadmap_projects rp ON rr.project_id = rp.id
+"""
+
+_PROJECT_SQL = "SELECT id, code, name FROM roadmap_projects"
+
+_LESSON_SQL = """
+    SELECT id, project, LEFT(lesson, 120) AS lesson FROM lessons_learned
+    WHERE (deleted IS NULL OR deleted = 0)
+"""
+
+_SPRINT_SQL = "SELECT id, name, created_at FROM roadmap_sprints"
+
+_PROMPT_SQL = """
+    SELECT cp.pth, cp.sprint_id, rr.title, rp.code AS project_code, cp.updated_at
+    FROM cc_prompts cp
+    LEFT JOIN roadmap_requirements rr ON cp.requirement_id = rr.id
+    LEFT JOIN roadmap_projects rp ON rr.project_id = rp.id
+"""
+
+_UAT_PAGE_SQL = "SELECT pth, sprint_code, project, created_at FROM uat_pages"
+
+
+def _put_requirement(index: TypeaheadIndex, r: Dict[str, Any]) -> None:
+    if not r.get("code"):
+        return
+    index.put(Entry(REQUIREMENT, str(r["id"]), r["code"], r.get("title") or "",
+                    r.get("project_code"), tuple(tokenize(r.get("title")))))
+
+
+def _put_project(index: TypeaheadIndex, r: Dict[str, Any]) -> None:
+    index.put(Entry(PROJECT, str(r["id"]), r["code"], r.get("name") or "",
+                    r["code"], tuple(tokenize(r.get("name")))))
+
+
+def _put_lesson(index: TypeaheadIndex, r: Dict[str, Any]) -> None:
+    index.put(Entry(LESSON, str(r["id"]), str(r["id"]), r.get("lesson") or "", r.get("project")))
+
+
+def _put_sprint(index: TypeaheadIndex, sprint_id: str, name: Optional[str], project: Optional[str]) -> None:
+    if sprint_id:
+        index.put(Entry(SPRINT, sprint_id, sprint_id, name or "", project, tuple(tokenize(name))))
+
+
+def _put_roadmap_sprint(index: TypeaheadIndex, r: Dict[str, Any]) -> None:
+    _put_sprint(index, str(r["id"]), r.get("name"), None)
+
+
+def _put_prompt(index: TypeaheadIndex, r: Dict[str, Any]) -> None:
+    title = r.get("title") or ""
+    if r.get("pth"):
+        index.put(Entry(PTH, r["pth"], r["pth"], title or (r.get("sprint_id") or ""),
+                        r.get("project_code"), tuple(tokenize(title))))
+    if r.get("sprint_id") and (SPRINT, r["sprint_id"]) not in index._entries:
+        _put_sprint(index, r["sprint_id"], title, r.get("project_code"))
+
+
+def _put_uat_page(index: TypeaheadIndex, r: Dict[str, Any]) -> None:
+    # Prompts carry the better label; a UAT page only fills in PTHs no prompt has.
+    if r.get("pth") and (PTH, r["pth"]) not in index._entries:
+        index.put(Entry(PTH, r["pth"], r["pth"], r.get("sprint_code") or "", r.get("project")))
+
+
+_index: Optional[TypeaheadIndex] = None
+_watermarks: Dict[str, Any] = {}
+_last_catch_up = 0.0
+_build_lock = threading.Lock()
+_catch_up_lock = threading.Lock()
+
+
+def rebuild() -> TypeaheadIndex:
+    """Load every source into a fresh index and swap it in."""
+    global _index, _last_catch_up
+    with _build_lock:
+        started = time.monotonic()
+        index = TypeaheadIndex()
+        watermarks: Dict[str, Any] = {}
+        for r in execute_query(_PROJECT_SQL, fetch="all") or []:
+            _put_project(index, r)
+        for r in execute_query(_REQUIREMENT_SQL, fetch="all") or []:
+            _put_requirement(index, r)
+        for r in execute_query(_SPRINT_SQL, fetch="all") or []:
+            _put_roadmap_sprint(index, r)
+            if r.get("created_at") and (not watermarks.get("sprint") or r["created_at"] > watermarks["sprint"]):
+                watermarks["sprint"] = r["created_at"]
+        for r in execute_query(_LESSON_SQL, fetch="all") or []:
+            _put_lesson(index, r)
+        for r in execute_query(_PROMPT_SQL + " WHERE cp.pth IS NOT NULL OR cp.sprint_id IS NOT NULL",
+                               fetch="all") or []:
+            _put_prompt(index, r)
+            if r.get("updated_at") and (not watermarks.get("prompt") or r["updated_at"] > watermarks["prompt"]):
+                watermarks["prompt"] = r["updated_at"]
+        for r in execute_query(_UAT_PAGE_SQL + " WHERE pth IS NOT NULL", fetch="all") or []:
+            _put_uat_page(index, r)
+            if r.get("created_at") and (not watermarks.get("uat_page") or r["created_at"] > watermarks["uat_page"]):
+                watermarks["uat_page"] = r["created_at"]
+        index._arrays()
+        _watermarks.clear()
+        _watermarks.update(watermarks)
+        _index = index
+        _last_catch_up = time.monotonic()
+        logger.info(f"[typeahead] built {len(index)} entries in {time.monotonic() - started:.2f}s")
+        return index
+
+
+def get_index() -> TypeaheadIndex:
+    """Shared index. Until the first build lands, starts one and answers from an empty index."""
+    if _index is None:
+        warm_in_background()
+        return TypeaheadIndex()
+    return _index
+
+
+def warm_in_background() -> None:
+    """Rebuild on a daemon thread; lookups keep the current index until the new one is swapped in."""
+    if _build_lock.locked():
+        return  # a build is already in flight
+    threading.Thread(target=rebuild, name="typeahead-warm", daemon=True).start()
+
+
+def catch_up(force: bool = False) -> int:
+    """Pull prompts, UAT pages and sprints changed since the watermarks. Throttled; returns rows applied."""
+    global _last_catch_up
+    if _index is None:
+        return 0
+    now = time.monotonic()
+    if not force and now - _last_catch_up < _CATCH_UP_INTERVAL:
+        return 0
+    if not _catch_up_lock.acquire(blocking=False):
+        return 0
+    try:
+        _last_catch_up = now
+        applied = 0
+        for source, sql, column, stamp, put in (
+            ("prompt", _PROMPT_SQL, "cp.updated_at", "updated_at", _put_prompt),
+            ("uat_page", _UAT_PAGE_SQL, "created_at", "created_at", _put_uat_page),
+            ("sprint", _SPRINT_SQL, "created_at", "created_at", _put_roadmap_sprint),
+        ):
+            mark = _watermarks.get(source)
+            if mark is None:
+                continue
+            rows = execute_query(f"{sql} WHERE {column} >= ?", (mark,), fetch="all") or []
+            for r in rows:
+                put(_index, r)
+                if r.get(stamp) and r[stamp] > _watermarks[source]:
+                    _watermarks[source] = r[stamp]
+            applied += len(rows)
+        return applied
+    except Exception as exc:
+        logger.warning(f"[typeahead] catch-up failed: {exc}")
+        return 0
+    finally:
+        _catch_up_lock.release()
+
+
+_KEYED_SOURCES = {
+    REQUIREMENT: (_REQUIREMENT_SQL + " WHERE rr.id IN ({marks})", _put_requirement),
+    PROJECT: (_PROJECT_SQL + " WHERE id IN ({marks})", _put_project),
+    LESSON: (_LESSON_SQL + " AND id IN ({marks})", _put_lesson),  # deleted lessons read as gone
+}
+
+
+def refresh_keys(kind: str, keys: List[str]) -> None:
+    """Re-read the given rows of one hooked source; rows that no longer exist are dropped."""
+    if _index is None:
+        return
+    if not keys:
+        warm_in_background()
+        return
+    sql, put = _KEYED_SOURCES[kind]
+    for i in range(0, len(keys), 500):
+        chunk = keys[i:i + 500]
+        rows = execute_query(sql.format(marks=", ".join("?" * len(chunk))), tuple(chunk), fetch="all") or []
+        found = set()
+        for r in rows:
+            put(_index, r)
+            found.add(str(r["id"]).lower())
+        for key in chunk:
+            if key.lower() not in found:
+                _index.drop(kind, key)
+
+
+def suggest(q: str, limit: int = 10, kinds: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    index = get_index()
+    catch_up()
+    return index.suggest(q, limit=limit, kinds=kinds)
+
+
+def stats() -> Dict[str, Any]:
+    index = _index
+    if index is None:
+        return {"built": False}
+    counts: Dict[str, int] = {}
+    for kind, _ in list(index._entries):
+        counts[kind] = counts.get(kind, 0) + 1
+    return {"built": True, "entries": len(index), "by_kind": counts,
+            "watermarks": {k: str(v) for k, v in _watermarks.items()}}
+
+
+def _subscriber(kind: str):
+    def _on_change(keys: List[str]) -> None:
+        refresh_keys(kind, keys)
+    _on_change.__name__ = f"typeahead_{kind}"
+    return _on_change
+
+
+change_hooks.subscribe(change_hooks.REQUIREMENT, _subscriber(REQUIREMENT))
+change_hooks.subscribe(change_hooks.PROJECT, _subscriber(PROJECT))
+change_hooks.subscribe(change_hooks.LESSON, _subscriber(LESSON))
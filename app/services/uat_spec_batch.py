@@ -0,0 +1,262 @@
+"""
+UAT Spec Batch — post many UAT specs in one call.
+
+POST /api/uat/spec and the post_uat_spec MCP tool take one spec per call,
+each with its own upsert-by-PTH lookup, transaction, requirement lookup
+and RAG enqueue. Agents closing out multi-sprint runs post dozens of specs
+back to back. `ingest()` takes the whole list:
+
+  1. validates every spec in memory — nothing is written if any is bad;
+  2. resolves the latest cc_spec page per PTH and the cc_complete
+     requirement per PTH with one query each;
+  3. updates existing pages, inserts new ones, reseeds uat_bv_items and
+     queues the RAG sync in one transaction, each as a single statement
+     over an OPENJSON payload;
+  4. fires the UAT_PAGE change hook once, then auto-advances the linked
+     requirements (cc_complete → uat_ready) with one UPDATE and fires the
+     REQUIREMENT hook once for them.
+
+Per-spec semantics match the single-spec path: upsert by PTH, refuse to
+overwrite a spec with a recorded PL submission, and a missing cc_complete
+requirement is not an error.
+"""
+
+import json
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List
+
+from app.core import change_hooks
+from app.core.database import execute_query, get_db
+from app.services import bv_items, rag_outbox
+
+logger = logging.getLogger(__name__)
+
+MAX_SPECS = 100
+UAT_URL = "https://metapm.rentyourcio.com/uat/{}"
+
+EMPTY_TEST_CASES = "UAT spec must contain at least one test case (BA15)"
+
+# uat_pages column widths
+_LIMITS = {"project": 50, "sprint": 50, "version": 20, "pth": 20}
+
+
+class BatchRejected(Exception):
+    """The batch was not written. errors has one entry per offending spec (with its index)."""
+
+    def __init__(self, message: str, errors: List[Dict[str, Any]]):
+        super().__init__(message)
+        self.errors = errors
+
+
+def _test_cases(raw: List[dict], default_type: str) -> List[dict]:
+    return [
+        {
+            "id": tc.get("id", ""),
+            "title": tc.get("title", ""),
+            "url": tc.get("url"),
+            "steps": tc.get("steps") or [],
+            "expected": tc.get("expected"),
+            "type": tc.get("type") or default_type,
+            "status": "pending",
+            "notes": "",
+        }
+        for tc in raw
+    ]
+
+
+def _pth_key(pth: str) -> str:
+    # PTH comparisons in SQL Server are case-insensitive; match them the same way here
+    return pth.upper()
+
+
+def _validate(specs: List[dict]) -> List[Dict[str, Any]]:
+    errors: List[Dict[str, Any]] = []
+    seen: Dict[str, int] = {}
+    for i, spec in enumerate(specs):
+        def fail(error: str, **extra):
+            errors.append({"index": i, "pth": spec.get("pth"), "error": error, **extra})
+
+        for field, limit in _LIMITS.items():
+            value = spec.get(field)
+            if not isinstance(value, str) or not value.strip():
+                fail(f"{field} is required")
+            elif len(value) > limit:
+                fail(f"{field} longer than {limit} characters")
+        cases = spec.get("test_cases") or []
+        if not cases:
+            # REQ-002 (BA15): a zero-BV spec produces a zero-evidence pass
+            fail(EMPTY_TEST_CASES)
+        ids = [tc.get("id") for tc in cases]
+        if any(not bv_id for bv_id in ids):
+            fail("every test case needs an id")
+        dupes = sorted({bv_id for bv_id in ids if bv_id and ids.count(bv_id) > 1})
+        if dupes:
+            fail("duplicate test case ids", ids=dupes)
+        pth = spec.get("pth")
+        if isinstance(pth, str) and pth:
+            if _pth_key(pth) in seen:
+                fail("duplicate pth in batch", first_index=seen[_pth_key(pth)])
+            else:
+                seen[_pth_key(pth)] = i
+    return errors
+
+
+def _existing(pths: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Latest cc_spec page per PTH (the row the single-spec upsert would pick)."""
+    rows = execute_query("""
+        SELECT pth, id, pl_submitted_at FROM (
+            SELECT pth, id, pl_submitted_at,
+                   ROW_NUMBER() OVER (PARTITION BY pth ORDER BY created_at DESC) AS rn
+            FROM uat_pages
+            WHERE spec_source = 'cc_spec' AND pth IN (SELECT value FROM OPENJSON(?))
+        ) latest
+        WHERE rn = 1
+    """, (json.dumps(pths),), fetch="all") or []
+    return {_pth_key(r["pth"]): r for r in rows}
+
+
+def _ready_requirements(pths: List[str]) -> Dict[str, Dict[str, Any]]:
+    """One cc_complete requirement per PTH (MM14-REQ-001 auto-advance candidates)."""
+    rows = execute_query("""
+        SELECT id, code, pth FROM (
+            SELECT id, code, pth, ROW_NUMBER() OVER (PARTITION BY pth ORDER BY id) AS rn
+            FROM roadmap_requirements
+            WHERE status = 'cc_complete' AND pth IN (SELECT value FROM OPENJSON(?))
+        ) r
+        WHERE rn = 1
+    """, (json.dumps(pths),), fetch="all") or []
+    return {_pth_key(r["pth"]): r for r in rows}
+
+
+_PAGE_COLUMNS = """
+    id NVARCHAR(36) '$.id', project NVARCHAR(50) '$.project', sprint NVARCHAR(50) '$.sprint',
+    pth NVARCHAR(20) '$.pth', version NVARCHAR(20) '$.version',
+    tc_json NVARCHAR(MAX) '$.tc_json', spec_data NVARCHAR(MAX) '$.spec_data'
+"""
+
+_UPDATE = f"""
+    UPDATE p SET
+        project = s.project, sprint_code = s.sprint, version = s.version,
+        test_cases_json = s.tc_json, html_content = 'spec_created', html_content_z = NULL,
+        status = 'ready', spec_data = s.spec_data, general_notes_attachments = NULL
+    FROM uat_pages p
+    JOIN OPENJSON(?) WITH ({_PAGE_COLUMNS}) s ON p.id = TRY_CAST(s.id AS UNIQUEIDENTIFIER)
+"""
+
+_INSERT = f"""
+    INSERT INTO uat_pages
+        (id, handoff_id, project, sprint_code, pth, version,
+         test_cases_json, html_content, status,
+         spec_source, spec_locked_at, spec_data)
+    SELECT s.id, s.id, s.project, s.sprint, s.pth, s.version,
+           s.tc_json, 'spec_created', 'ready',
+           'cc_spec', ?, s.spec_data
+    FROM OPENJSON(?) WITH ({_PAGE_COLUMNS}) s
+"""
+
+
+def ingest(specs: List[dict], default_type: str = "browser") -> Dict[str, Any]:
+    """
+    Upsert a batch of UAT specs by PTH. Each spec is a dict with project,
+    sprint, version, pth and test_cases (plus optional linked_requirements);
+    test cases without a type get default_type. All-or-nothing: raises
+    BatchRejected when any spec fails validation or would overwrite a PL
+    submission. Returns one result per spec, in input order.
+    """
+    if not specs:
+        raise BatchRejected("specs must contain at least one UAT spec", [])
+    if len(specs) > MAX_SPECS:
+        raise BatchRejected(f"at most {MAX_SPECS} specs per batch (got {len(specs)})", [])
+    errors = _validate(specs)
+    if errors:
+        raise BatchRejected(f"{len(errors)} validation error(s); nothing was written", errors)
+
+    pths = [s["pth"] for s in specs]
+    existing = _existing(pths)
+    conflicts = [
+        {
+            "index": i, "pth": s["pth"], "error": "spec_has_prior_submission",
+            "spec_id": str(found["id"]),
+            "pl_submitted_at": str(found["pl_submitted_at"]),
+            "existing_uat_url": UAT_URL.format(found["id"]),
+        }
+        for i, s in enumerate(specs)
+        if (found := existing.get(_pth_key(s["pth"]))) and found.get("pl_submitted_at") is not None
+    ]
+    if conflicts:
+        # MP48 BUG-087 Phase C guard, see uat_spec.create_uat_spec
+        logger.warning(f"UAT spec batch blocked: {len(conflicts)} PTH(s) have prior PL submissions")
+        raise BatchRejected(
+            "Some specs already have a PL submission recorded. Archive them before re-posting; "
+            "nothing was written.", conflicts,
+        )
+
+    rows: List[Dict[str, Any]] = []
+    definitions: Dict[str, List[dict]] = {}
+    for s in specs:
+        found = existing.get(_pth_key(s["pth"]))
+        spec_id = str(found["id"]).upper() if found else str(uuid.uuid4()).upper()
+        tc_list = _test_cases(s["test_cases"], default_type)
+        definitions[spec_id] = tc_list
+        rows.append({
+            "id": spec_id, "project": s["project"], "sprint": s["sprint"],
+            "pth": s["pth"], "version": s["version"], "updated": bool(found),
+            "tc_json": json.dumps(tc_list), "spec_data": json.dumps(s, default=str),
+        })
+    updates = [r for r in rows if r["updated"]]
+    inserts = [r for r in rows if not r["updated"]]
+    spec_ids = [r["id"] for r in rows]
+
+    with get_db() as conn:
+        cursor = conn.cursor()
+        if updates:
+            cursor.execute(_UPDATE, (json.dumps(updates),))
+        if inserts:
+            cursor.execute(_INSERT, (datetime.utcnow(), json.dumps(inserts)))
+        bv_items.seed_many(cursor, definitions)
+        rag_outbox.enqueue(cursor, "metapm", "uat", spec_ids)
+    change_hooks.notify_change(change_hooks.UAT_PAGE, spec_ids)
+    rag_outbox.kick()
+    logger.info(f"UAT spec batch: {len(inserts)} created, {len(updates)} updated")
+
+    # MM14-REQ-001: auto-advance linked requirements cc_complete → uat_ready (non-fatal)
+    advanced: Dict[str, Dict[str, Any]] = {}
+    advance_error = None
+    try:
+        advanced = _ready_requirements(pths)
+        if advanced:
+            execute_query("""
+                UPDATE r SET status = 'uat_ready', uat_url = a.uat_url, updated_at = GETUTCDATE()
+                FROM roadmap_requirements r
+                JOIN OPENJSON(?) WITH (id NVARCHAR(36) '$.id', uat_url NVARCHAR(500) '$.uat_url') a
+                  ON r.id = a.id
+                WHERE r.status = 'cc_complete'
+            """, (json.dumps([
+                {"id": str(req["id"]), "uat_url": UAT_URL.format(r["id"])}
+                for r in rows if (req := advanced.get(_pth_key(r["pth"])))
+            ]),), fetch="none")
+            change_hooks.notify_change(change_hooks.REQUIREMENT, [str(req["id"]) for req in advanced.values()])
+            logger.info(f"UAT spec batch: auto-advanced {len(advanced)} requirement(s) to uat_ready")
+    except Exception as e:
+        advanced, advance_error = {}, str(e)
+        logger.warning(f"UAT spec batch: requirement auto-advance failed (non-fatal): {e}")
+
+    results = [
+        {
+            "index": i,
+            "spec_id": r["id"],
+            "uat_url": UAT_URL.format(r["id"]),
+            "pth": r["pth"],
+            "test_count": len(definitions[r["id"]]),
+            "action": "updated" if r["updated"] else "created",
+            "advanced_requirement": (advanced.get(_pth_key(r["pth"])) or {}).get("code"),
+            "status": "spec_created",
+        }
+        for i, r in enumerate(rows)
+    ]
+    out = {"created": len(inserts), "updated": len(updates), "specs": results}
+    if advance_error:
+        out["auto_advance_error"] = advance_error
+    return out
@@ -0,0 +1,73 @@
+"""
+UAT Templates — precompiled Jinja2 environment for every UAT page renderer.
+
+The spec page (uat_spec/uat_payload), structured page (uat_generator_v2) and
+legacy page (uat_generator) render from app/templates/uat/. Autoescape is on,
+so values go into templates raw; BV cards are _machine_cards.html /
+_pl_cards.html (included by _bv_section.html) and notes are macros in
+_notes.html. Templates are compiled once by `warm()` at startup, with
+bytecode cached in settings.TEMPLATE_CACHE_DIR (a directory of our own
+rather than Jinja's default spot in the shared temp dir) so a new worker
+skips the parse.
+
+`stream()` yields the page in chunks via Template.generate() for specs
+large enough that building one string is wasteful.
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from jinja2 import BytecodeCache, Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+from app.core.config import settings
+from app.core.static_assets import asset_url
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
+
+# Specs with more BVs than this are streamed instead of rendered into one string
+STREAM_THRESHOLD = 200
+
+
+def _bytecode_cache() -> Optional[BytecodeCache]:
+    if not settings.TEMPLATE_CACHE_DIR:
+        return None
+    try:
+        Path(settings.TEMPLATE_CACHE_DIR).mkdir(mode=0o700, parents=True, exist_ok=True)
+    except OSError as exc:
+        logger.warning(f"UAT template bytecode cache disabled: {exc}")
+        return None
+    return FileSystemBytecodeCache(settings.TEMPLATE_CACHE_DIR)
+
+
+env = Environment(
+    loader=FileSystemLoader(str(TEMPLATES_DIR)),
+    autoescape=select_autoescape(["html"]),
+    bytecode_cache=_bytecode_cache(),
+    auto_reload=False,
+)
+env.globals["asset_url"] = asset_url
+
+
+def render(name: str, **context: Any) -> str:
+    return env.get_template(name).render(**context)
+
+
+def stream(name: str, **context: Any) -> Iterator[str]:
+    return env.get_template(name).generate(**context)
+
+
+def macro(name: str, macro_name: str):
+    """A macro from a template, callable from Python (returns Markup)."""
+    return getattr(env.get_template(name).module, macro_name)
+
+
+def warm() -> int:
+    """Compile every UAT template up front. Returns the number loaded."""
+    names = env.list_templates(filter_func=lambda n: n.startswith("uat/"))
+    for name in names:
+        env.get_template(name)
+    logger.info(f"UAT templates compiled: {len(names)}")
+    return len(names)
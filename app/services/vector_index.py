@@ -0,0 +1,505 @@
+"""
+Local Vector Index — in-process semantic search for the metapm and lessons collections.
+
+/api/rag/query used to send every semantic lookup to Portfolio RAG. This
+module keeps a dense-vector store per collection in NumPy, so requirement and
+lesson queries can be answered with cosine top-k locally and blended with the
+BM25 keyword index (see rag._hybrid_results).
+
+Vectors come from a pluggable embedder (set_embedder). The default,
+HashedTfidfEmbedder, needs no model download: unigram and bigram tokens are
+hashed into 65,536 buckets, weighted by sublinear TF × IDF (document
+frequencies kept per collection), and mapped to DIM dimensions with a fixed
+sparse random projection.
+
+Each store is persisted under settings.VECTOR_INDEX_DIR as a raw float32
+matrix (opened with np.memmap, copy-on-write) plus a JSON sidecar of keys,
+payloads and the source watermark, so a restart reloads instead of
+re-embedding. Requirement and lesson writes upsert through change hooks;
+rows written by other paths are caught up from the watermark.
+
+NumPy is optional: without it enabled() is False and callers keep their
+keyword-only path.
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # local vector search is disabled without NumPy
+    np = None
+
+from app.core import change_hooks
+from app.core.config import settings
+from app.core.database import execute_query
+from app.services import search_index
+from app.services.search_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+METAPM = "metapm"
+LESSONS = "lessons"
+
+DIM = 256
+_BUCKETS = 1 << 16
+_NNZ = 3          # nonzeros per bucket in the sparse random projection
+_SEED = 20260219  # fixed so vectors stay comparable across processes and restarts
+CATCH_UP_INTERVAL = 30
+SAVE_DELAY = 10   # seconds to batch upserts before rewriting the vector file
+
+
+# ---------------------------------------------------------------------------
+# Embedders
+# ---------------------------------------------------------------------------
+
+_projections: Dict[int, Tuple[Any, Any]] = {}
+
+
+def _get_projection(dim: int):
+    """(bucket → dims, bucket → signs) for the sparse random projection, built once per dim."""
+    proj = _projections.get(dim)
+    if proj is None:
+        rng = np.random.default_rng(_SEED)
+        idx = rng.integers(0, dim, size=(_BUCKETS, _NNZ), dtype=np.int32)
+        signs = rng.choice(np.array([-1.0, 1.0], dtype=np.float32), size=(_BUCKETS, _NNZ))
+        proj = _projections[dim] = (idx, signs / np.float32(math.sqrt(_NNZ)))
+    return proj
+
+
+def _buckets(text: Optional[str]) -> List[int]:
+    tokens = tokenize(text)
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    # crc32, not hash(): bucket ids must not change with PYTHONHASHSEED
+    return [zlib.crc32(g.encode("utf-8")) % _BUCKETS for g in grams]
+
+
+class HashedTfidfEmbedder:
+    """Hashed TF-IDF features reduced to `dim` dimensions by random projection."""
+
+    name = "hashed-tfidf-rp"
+
+    def __init__(self, dim: int = DIM):
+        self.dim = dim
+        self.df = np.zeros(_BUCKETS, dtype=np.int32)
+        self.n_docs = 0
+
+    def fit(self, texts: Iterable[str]) -> None:
+        self.df[:] = 0
+        self.n_docs = 0
+        for text in texts:
+            self.observe(text)
+
+    def observe(self, text: str) -> None:
+        """Count one more document (incremental upserts keep IDF roughly current)."""
+        b = _buckets(text)
+        if b:
+            self.df[np.unique(np.asarray(b, dtype=np.int64))] += 1
+        self.n_docs += 1
+
+    def embed(self, texts: List[str]):
+        idx, signs = _get_projection(self.dim)
+        idf = np.log((self.n_docs + 1) / (self.df.astype(np.float32) + 1)) + 1.0
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            b = _buckets(text)
+            if not b:
+                continue
+            buckets, tf = np.unique(np.asarray(b, dtype=np.int64), return_counts=True)
+            w = (1.0 + np.log(tf)).astype(np.float32) * idf[buckets]
+            np.add.at(out[row], idx[buckets].ravel(), (signs[buckets] * w[:, None]).ravel())
+            norm = np.linalg.norm(out[row])
+            if norm:
+                out[row] /= norm
+        return out
+
+    def save_state(self, path: str) -> None:
+        np.save(path, np.append(self.df, np.int32(self.n_docs)))
+
+    def load_state(self, path: str) -> bool:
+        if not os.path.exists(path):
+            return False
+        data = np.load(path)
+        if data.shape[0] != _BUCKETS + 1:
+            return False
+        self.df, self.n_docs = data[:-1].astype(np.int32), int(data[-1])
+        return True
+
+
+EmbedderFactory = Callable[[], Any]
+_embedder_factory: EmbedderFactory = HashedTfidfEmbedder
+
+
+def set_embedder(factory: EmbedderFactory) -> None:
+    """
+    Swap in another local embedding model. factory() must return an object
+    with name, dim and embed(texts) → float32 array of unit rows; fit(texts),
+    observe(text), save_state(path) and load_state(path) are optional.
+    Existing stores are dropped and rebuilt on next use.
+    """
+    global _embedder_factory
+    _embedder_factory = factory
+    with _lock:
+        _stores.clear()
+
+
+def _call(obj: Any, method: str, *args) -> Any:
+    fn = getattr(obj, method, None)
+    return fn(*args) if fn else None
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+class VectorStore:
+    """Dense rows keyed by document key; freed slots are zeroed and reused."""
+
+    def __init__(self, collection: str, embedder: Any):
+        self.collection = collection
+        self.embedder = embedder
+        self.matrix = np.zeros((0, embedder.dim), dtype=np.float32)
+        self.keys: List[Optional[str]] = []
+        self.slots: Dict[str, int] = {}
+        self.payloads: Dict[str, Dict[str, Any]] = {}
+        self.watermark: Optional[datetime] = None
+        self.lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def _ensure_capacity(self, rows: int) -> None:
+        if rows <= self.matrix.shape[0]:
+            return
+        grown = np.zeros((max(rows, self.matrix.shape[0] * 2, 64), self.embedder.dim), dtype=np.float32)
+        grown[:len(self.keys)] = self.matrix[:len(self.keys)]
+        self.matrix = grown
+
+    def upsert(self, items: List[Tuple[str, str, Dict[str, Any]]], observe: bool = True) -> None:
+        """items: (key, text, payload). Re-embeds and overwrites existing keys."""
+        if not items:
+            return
+        if observe:
+            for _, text, _ in items:
+                _call(self.embedder, "observe", text)
+        vectors = self.embedder.embed([text for _, text, _ in items])
+        with self.lock:
+            if isinstance(self.matrix, np.memmap):
+                self.matrix = np.array(self.matrix)
+            free = [i for i, k in enumerate(self.keys) if k is None]
+            for (key, _, payload), vec in zip(items, vectors):
+                k = key.lower()
+                slot = self.slots.get(k)
+                if slot is None:
+                    if free:
+                        slot = free.pop()
+                        self.keys[slot] = k
+                    else:
+                        slot = len(self.keys)
+                        self._ensure_capacity(slot + 1)
+                        self.keys.append(k)
+                    self.slots[k] = slot
+                self.matrix[slot] = vec
+                self.payloads[k] = payload
+
+    def remove(self, keys: Iterable[str]) -> None:
+        with self.lock:
+            for key in keys:
+                slot = self.slots.pop(key.lower(), None)
+                if slot is None:
+                    continue
+                if isinstance(self.matrix, np.memmap):
+                    self.matrix = np.array(self.matrix)
+                self.matrix[slot] = 0.0
+                self.keys[slot] = None
+                self.payloads.pop(key.lower(), None)
+
+    def search(self, q: str, k: int = 10) -> List[Tuple[float, str, Dict[str, Any]]]:
+        qvec = self.embedder.embed([q])[0]
+        if not qvec.any():
+            return []
+        with self.lock:
+            n = len(self.keys)
+            if not n:
+                return []
+            scores = np.asarray(self.matrix[:n] @ qvec)
+            k = min(k, n)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [
+                (float(scores[i]), self.keys[i], self.payloads[self.keys[i]])
+                for i in top if self.keys[i] is not None and scores[i] > 0
+            ]
+
+    # -- persistence -----------------------------------------------------
+
+    def _paths(self, directory: str) -> Tuple[str, str, str]:
+        base = os.path.join(directory, self.collection)
+        return f"{base}.f32", f"{base}.meta.json", f"{base}.state.npy"
+
+    def save(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        vec_path, meta_path, state_path = self._paths(directory)
+        with self.lock:
+            n = len(self.keys)
+            meta = {
+                "embedder": self.embedder.name, "dim": self.embedder.dim, "rows": n,
+                "keys": self.keys, "payloads": self.payloads,
+                "watermark": self.watermark.isoformat() if self.watermark else None,
+            }
+            if n:
+                out = np.memmap(vec_path + ".tmp", dtype=np.float32, mode="w+", shape=(n, self.embedder.dim))
+                out[:] = self.matrix[:n]
+                out.flush()
+                del out
+            else:
+                open(vec_path + ".tmp", "wb").close()
+            _call(self.embedder, "save_state", state_path)
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f, default=str)
+        os.replace(vec_path + ".tmp", vec_path)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    @classmethod
+    def load(cls, collection: str, embedder: Any, directory: str) -> Optional["VectorStore"]:
+        store = cls(collection, embedder)
+        vec_path, meta_path, state_path = store._paths(directory)
+        if not (os.path.exists(vec_path) and os.path.exists(meta_path)):
+            return None
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("embedder") != embedder.name or meta.get("dim") != embedder.dim:
+            return None
+        if hasattr(embedder, "load_state") and not embedder.load_state(state_path):
+            return None
+        n = int(meta["rows"])
+        if n:
+            store.matrix = np.memmap(vec_path, dtype=np.float32, mode="c", shape=(n, embedder.dim))
+        store.keys = meta["keys"]
+        store.slots = {k: i for i, k in enumerate(store.keys) if k is not None}
+        store.payloads = meta["payloads"]
+        store.watermark = datetime.fromisoformat(meta["watermark"]) if meta.get("watermark") else None
+        return store
+
+
+# ---------------------------------------------------------------------------
+# Collections
+# ---------------------------------------------------------------------------
+
+def _requirement_doc(r: Dict[str, Any]) -> Tuple[str, str, Dict[str, Any]]:
+    text = " ".join(filter(None, [r.get("code"), r.get("title"), r.get("description")]))
+    return str(r["doc_key"]), text, {
+        "source_type": "requirement", "code": r.get("code"), "title": r.get("title"),
+        "description": (r.get("description") or "")[:1000], "project_code": r.get("project_code"),
+        "status": r.get("status"),
+    }
+
+
+def _lesson_doc(r: Dict[str, Any]) -> Tuple[str, str, Dict[str, Any]]:
+    text = " ".join(filter(None, [r.get("source_sprint"), r.get("lesson")]))
+    return str(r["doc_key"]), text, {
+        "source_type": "lesson", "code": r.get("id"), "title": r.get("source_sprint") or r.get("id"),
+        "description": (r.get("lesson") or "")[:1000], "project_code": r.get("project"),
+        "status": r.get("status"), "category": r.get("category"),
+    }
+
+
+# collection → (search_index source supplying the SQL, row → (key, text, payload))
+COLLECTIONS = {
+    METAPM: (search_index.REQUIREMENT, _requirement_doc),
+    LESSONS: (search_index.LESSON, _lesson_doc),
+}
+
+_stores: Dict[str, VectorStore] = {}
+_last_catch_up: Dict[str, float] = {}
+_save_timers: Dict[str, threading.Timer] = {}
+_lock = threading.Lock()
+_build_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    return np is not None and settings.VECTOR_SEARCH
+
+
+def _max_wm(current: Optional[datetime], value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime) and (current is None or value > current):
+        return value
+    return current
+
+
+def build(collection: str) -> VectorStore:
+    """Embed every row of a collection, persist it, and swap it in."""
+    source_name, to_doc = COLLECTIONS[collection]
+    src = search_index.SOURCES[source_name]
+    with _build_lock:
+        started = time.monotonic()
+        docs, watermark = [], None
+        for r in search_index._stream(src.sql()):
+            docs.append(to_doc(r))
+            watermark = _max_wm(watermark, r.get("wm"))
+        embedder = _embedder_factory()
+        _call(embedder, "fit", [text for _, text, _ in docs])
+        store = VectorStore(collection, embedder)
+        store.upsert(docs, observe=False)
+        store.watermark = watermark
+        try:
+            store.save(settings.VECTOR_INDEX_DIR)
+        except OSError as exc:
+            logger.warning(f"[vector-index] could not persist {collection}: {exc}")
+        with _lock:
+            _stores[collection] = store
+            _last_catch_up[collection] = time.monotonic()
+        logger.info(f"[vector-index] {collection}: embedded {len(store)} docs in {time.monotonic() - started:.1f}s")
+        return store
+
+
+def _load(collection: str) -> Optional[VectorStore]:
+    try:
+        store = VectorStore.load(collection, _embedder_factory(), settings.VECTOR_INDEX_DIR)
+    except Exception as exc:
+        logger.warning(f"[vector-index] could not load {collection} from disk: {exc}")
+        return None
+    if store is not None:
+        with _lock:
+            _stores[collection] = store
+        logger.info(f"[vector-index] {collection}: loaded {len(store)} vectors from disk")
+        catch_up(collection, force=True)
+    return store
+
+
+def get_store(collection: str) -> Optional[VectorStore]:
+    """Store for collection: in memory, else from disk, else built now. None when disabled."""
+    if not enabled() or collection not in COLLECTIONS:
+        return None
+    store = _stores.get(collection)
+    if store is None:
+        with _build_lock:
+            pass  # wait for an in-flight background load/build
+        store = _stores.get(collection) or _load(collection) or build(collection)
+    catch_up(collection)
+    return store
+
+
+def warm_in_background() -> None:
+    """Load (or build) every collection on a daemon thread."""
+    if not enabled():
+        return
+
+    def _warm():
+        for collection in COLLECTIONS:
+            try:
+                if _load(collection) is None:
+                    build(collection)
+            except Exception as exc:
+                logger.warning(f"[vector-index] warm-up {collection} failed: {exc}")
+
+    threading.Thread(target=_warm, name="vector-index-warm", daemon=True).start()
+
+
+def _schedule_save(collection: str) -> None:
+    def _save():
+        store = _stores.get(collection)
+        if store is not None:
+            try:
+                store.save(settings.VECTOR_INDEX_DIR)
+            except OSError as exc:
+                logger.warning(f"[vector-index] could not persist {collection}: {exc}")
+
+    with _lock:
+        timer = _save_timers.get(collection)
+        if timer is not None and timer.is_alive():
+            return
+        timer = threading.Timer(SAVE_DELAY, _save)
+        timer.daemon = True
+        _save_timers[collection] = timer
+        timer.start()
+
+
+def catch_up(collection: str, force: bool = False) -> int:
+    """Embed rows whose watermark moved past the store's. Throttled per collection."""
+    store = _stores.get(collection)
+    now = time.monotonic()
+    if store is None or store.watermark is None:
+        return 0
+    if not force and now - _last_catch_up.get(collection, 0.0) < CATCH_UP_INTERVAL:
+        return 0
+    _last_catch_up[collection] = now
+    source_name, to_doc = COLLECTIONS[collection]
+    src = search_index.SOURCES[source_name]
+    try:
+        rows = execute_query(src.sql(f"{src.watermark} >= ?"), (store.watermark,), fetch="all") or []
+    except Exception as exc:
+        logger.warning(f"[vector-index] catch-up {collection} failed: {exc}")
+        return 0
+    if rows:
+        store.upsert([to_doc(r) for r in rows])
+        for r in rows:
+            store.watermark = _max_wm(store.watermark, r.get("wm"))
+        _schedule_save(collection)
+    return len(rows)
+
+
+def refresh_keys(collection: str, keys: List[str]) -> None:
+    """Re-embed specific rows; keys that no longer exist (or are filtered out) are removed."""
+    store = _stores.get(collection)
+    if store is None:
+        return
+    if not keys:
+        threading.Thread(target=build, args=(collection,), daemon=True).start()
+        return
+    source_name, to_doc = COLLECTIONS[collection]
+    src = search_index.SOURCES[source_name]
+    keys = list(dict.fromkeys(str(k) for k in keys))
+    found = set()
+    for i in range(0, len(keys), 500):
+        chunk = keys[i:i + 500]
+        rows = execute_query(
+            src.sql(f"{src.key_column} IN ({','.join(['?'] * len(chunk))})"), tuple(chunk), fetch="all"
+        ) or []
+        store.upsert([to_doc(r) for r in rows])
+        found.update(str(r["doc_key"]).lower() for r in rows)
+    store.remove([k for k in keys if k.lower() not in found])
+    _schedule_save(collection)
+
+
+def query(collection: str, q: str, k: int = 10) -> Optional[List[Tuple[float, str, Dict[str, Any]]]]:
+    """Cosine top-k as (score, key, payload), or None when local vectors aren't available."""
+    store = get_store(collection)
+    if store is None:
+        return None
+    return store.search(q, k)
+
+
+def stats() -> Dict[str, Any]:
+    if not enabled():
+        return {"enabled": False, "numpy": np is not None}
+    return {
+        "enabled": True,
+        "dir": settings.VECTOR_INDEX_DIR,
+        "collections": {
+            name: {
+                "docs": len(store), "embedder": store.embedder.name, "dim": store.embedder.dim,
+                "watermark": store.watermark.isoformat() if store.watermark else None,
+            }
+            for name, store in list(_stores.items())
+        },
+    }
+
+
+def _subscriber(collection: str):
+    def _on_change(keys: List[str]) -> None:
+        if enabled():
+            refresh_keys(collection, keys)
+    _on_change.__name__ = f"vector_index_{collection}"
+    return _on_change
+
+
+change_hooks.subscribe(change_hooks.REQUIREMENT, _subscriber(METAPM))
+change_hooks.subscribe(change_hooks.LESSON, _subscriber(LESSONS))
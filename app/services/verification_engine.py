@@ -0,0 +1,122 @@
+"""
+Verification Engine — concurrent endpoint probes for handoff verification
+(MP-VERIFY-001).
+
+verify_handoff used to GET each claimed endpoint one after another with a
+10s timeout, so a handoff with 20 endpoints could take minutes.
+
+ProbeEngine:
+    - probes a handoff's endpoints concurrently, bounded by a global limit
+      and a per-host limit so one slow service can't take every slot
+    - probes each distinct URL once per call and remembers results for
+      cache_ttl seconds, so re-verifying a handoff doesn't re-hit them all
+    - retries transport errors and 429/502/503/504 with exponential backoff
+      and full jitter
+
+This module only probes. Queuing a verification for later is not its job:
+those run as 'verify_handoff' jobs on the durable queue in
+app/services/job_queue.py (see verification_service).
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core import http_clients
+from app.core.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 502, 503, 504}
+
+Sleep = Callable[[float], Awaitable[None]]
+
+
+@dataclass
+class ProbeResult:
+    url: str
+    status: Optional[int] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    elapsed_ms: int = 0
+    cached: bool = False
+
+
+class ProbeEngine:
+    """GETs URLs concurrently under global and per-host limits. `client=None` uses the shared pool."""
+
+    def __init__(self, client: Optional[httpx.AsyncClient] = None, global_limit: int = 16,
+                 per_host_limit: int = 4, timeout: float = 10.0, retries: int = 2,
+                 backoff: float = 0.5, cache_ttl: float = 60.0, sleep: Sleep = asyncio.sleep):
+        self._client = client
+        self.global_limit = global_limit
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._sleep = sleep
+        self._cache = TTLCache(maxsize=1024, ttl=cache_ttl)
+        self._global: Optional[asyncio.Semaphore] = None
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client or http_clients.get_client(http_clients.DEFAULT)
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        sem = self._hosts.get(host)
+        if sem is None:
+            sem = self._hosts[host] = asyncio.Semaphore(self.per_host_limit)
+        return sem
+
+    async def _get(self, url: str) -> ProbeResult:
+        result = ProbeResult(url)
+        started = time.monotonic()
+        for attempt in range(self.retries + 1):
+            result.attempts = attempt + 1
+            try:
+                # Host slot first: a request queued behind a busy host must not hold a global one
+                async with self._host_limit(url), self._global:
+                    resp = await self.client.get(url, timeout=self.timeout, follow_redirects=True)
+                result.status, result.error = resp.status_code, None
+                if resp.status_code not in RETRY_STATUSES:
+                    break
+            except httpx.TransportError as e:
+                result.status, result.error = None, str(e) or type(e).__name__
+            except Exception as e:  # bad URL etc. — retrying won't help
+                result.status, result.error = None, str(e) or type(e).__name__
+                break
+            if attempt < self.retries:
+                await self._sleep(random.uniform(0, self.backoff * 2 ** attempt))
+        result.elapsed_ms = int((time.monotonic() - started) * 1000)
+        return result
+
+    async def probe(self, url: str) -> ProbeResult:
+        hit = self._cache.get(url)
+        if hit is not None:
+            return ProbeResult(url, hit.status, hit.error, 0, 0, cached=True)
+        if self._global is None:
+            self._global = asyncio.Semaphore(self.global_limit)
+        result = await self._get(url)
+        if result.status is not None:  # failures are re-probed next time
+            self._cache.set(url, result)
+        return result
+
+    async def probe_many(self, urls: Iterable[str]) -> Dict[str, ProbeResult]:
+        """Probe each distinct URL once, concurrently. Returns {url: result}."""
+        unique = list(dict.fromkeys(u for u in urls if u))
+        results = await asyncio.gather(*(self.probe(u) for u in unique))
+        return dict(zip(unique, results))
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+
+engine = ProbeEngine()
@@ -2,14 +2,14 @@
 Handoff Verification Service — MP-VERIFY-001
 Independently verifies endpoints CC claims to have built.
 """
+import asyncio
 import json
 import re
 import logging
 from datetime import datetime
 
-import httpx
-
 from app.core.database import execute_query
+from app.services import job_queue, verification_engine
 
 logger = logging.getLogger(__name__)
 
@@ -25,57 +25,26 @@ async def verify_handoff(handoff_id: str) -> dict:
     Verify endpoints claimed in a handoff's evidence_json.
     Returns verification results with per-endpoint match status.
     """
-    handoff = execute_query(
+    handoff = await asyncio.to_thread(
+        execute_query,
         "SELECT id, evidence_json, verification_status FROM mcp_handoffs WHERE id = ?",
-        (handoff_id,), fetch="one"
+        (handoff_id,), "one"
     )
     if not handoff:
         return {"error": f"Handoff {handoff_id} not found"}
 
     evidence_json = handoff.get("evidence_json")
     if not evidence_json:
-        _save_verification(handoff_id, "unconfirmed", [], "no evidence provided")
+        await asyncio.to_thread(_save_verification, handoff_id, "unconfirmed", [], "no evidence provided")
         return {"handoff_id": handoff_id, "verification_status": "unconfirmed", "reason": "no evidence provided", "results": []}
 
     try:
         requirements = json.loads(evidence_json)
     except (json.JSONDecodeError, TypeError):
-        _save_verification(handoff_id, "unconfirmed", [], "invalid evidence JSON")
+        await asyncio.to_thread(_save_verification, handoff_id, "unconfirmed", [], "invalid evidence JSON")
         return {"handoff_id": handoff_id, "verification_status": "unconfirmed", "reason": "invalid evidence JSON", "results": []}
 
-    results = []
-
-    async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
-        for req in requirements:
-            if req.get("status") != "complete":
-                continue
-            evidence = req.get("evidence", {})
-            if not evidence:
-                continue
-            endpoint = extract_url_from_curl(evidence.get("curl_command", ""))
-            if not endpoint:
-                continue
-            try:
-                resp = await client.get(endpoint)
-                actual = resp.status_code
-                claimed = evidence.get("http_status", 200)
-                results.append({
-                    "requirement_code": req.get("code"),
-                    "endpoint": endpoint,
-                    "cc_claimed_status": claimed,
-                    "actual_status": actual,
-                    "match": actual == claimed
-                })
-            except Exception as e:
-                results.append({
-                    "requirement_code": req.get("code"),
-                    "endpoint": endpoint,
-                    "cc_claimed_status": evidence.get("http_status"),
-                    "actual_status": None,
-                    "match": False,
-                    "error": str(e)
-                })
-
+    results = await check_evidence(requirements)
     if not results:
         status = "skipped"
     elif all(r["match"] for r in results):
@@ -85,11 +54,63 @@ async def verify_handoff(handoff_id: str) -> dict:
     else:
         status = "mismatch"
 
-    _save_verification(handoff_id, status, results)
+    await asyncio.to_thread(_save_verification, handoff_id, status, results)
 
     return {"handoff_id": handoff_id, "verification_status": status, "results": results}
 
 
+async def check_evidence(requirements: list, probes: verification_engine.ProbeEngine = None) -> list:
+    """Probe the endpoints claimed by completed requirements, all at once. One result per claim."""
+    probes = probes or verification_engine.engine
+    claims = []
+    for req in requirements:
+        if req.get("status") != "complete":
+            continue
+        evidence = req.get("evidence", {})
+        if not evidence:
+            continue
+        endpoint = extract_url_from_curl(evidence.get("curl_command", ""))
+        if endpoint:
+            claims.append((req, evidence, endpoint))
+
+    probed = await probes.probe_many(endpoint for _, _, endpoint in claims)
+    results = []
+    for req, evidence, endpoint in claims:
+        probe = probed[endpoint]
+        if probe.status is not None:
+            claimed = evidence.get("http_status", 200)
+            results.append({
+                "requirement_code": req.get("code"),
+                "endpoint": endpoint,
+                "cc_claimed_status": claimed,
+                "actual_status": probe.status,
+                "match": probe.status == claimed
+            })
+        else:
+            results.append({
+                "requirement_code": req.get("code"),
+                "endpoint": endpoint,
+                "cc_claimed_status": evidence.get("http_status"),
+                "actual_status": None,
+                "match": False,
+                "error": probe.error
+            })
+    return results
+
+
+def queue_verification(handoff_id: str) -> int:
+    """Queue verify_handoff as a background job; returns the job id (an already-queued one if any)."""
+    return job_queue.enqueue("verify_handoff", {"handoff_id": handoff_id},
+                             dedupe_key=f"verify_handoff:{handoff_id}")
+
+
+async def _run_verification_job(payload: dict) -> dict:
+    result = await verify_handoff(payload["handoff_id"])
+    if "error" in result:
+        raise job_queue.PermanentJobError(result["error"])
+    return {"verification_status": result["verification_status"], "results": len(result["results"])}
+
+
 def _save_verification(handoff_id: str, status: str, results: list, reason: str = None):
     """Save verification results to DB and update handoff."""
     results_data = results if not reason else [{"reason": reason}]
@@ -104,3 +125,6 @@ def _save_verification(handoff_id: str, status: str, results: list, reason: str
         """, (status, handoff_id), fetch="none")
     except Exception as e:
         logger.error(f"Failed to save verification for {handoff_id}: {e}")
+
+
+job_queue.register("verify_handoff", _run_verification_job)
@@ -33,26 +33,52 @@ function SchemaFlag({ note }) {
 const STORAGE_KEY = "metapm-bug-classifier-v2";
 
 // === API-backed persistence (replaces localStorage) ===
+const SUMMARY_PAGE = 200;
+
+// One keyset page of bug summaries (list-view fields + counts). The first
+// page also carries classifications and chains; nested context is hydrated
+// per bug via loadBugDetail().
+async function loadSummaryPage(cursor) {
+  let url = `/api/classifier/bootstrap?mode=summary&limit=${SUMMARY_PAGE}`;
+  if (cursor) url += `&cursor=${encodeURIComponent(cursor)}`;
+  const res = await fetch(url);
+  if (!res.ok) throw new Error(`Bootstrap failed: ${res.status}`);
+  const data = await res.json();
+  return {
+    bugs: data.bugs || [],
+    classifications: data.classifications,
+    chains: data.chains,
+    nextCursor: data.next_cursor || null,
+  };
+}
+
 async function loadFromAPI() {
   try {
-    const res = await fetch("/api/classifier/bootstrap");
-    if (!res.ok) throw new Error(`Bootstrap failed: ${res.status}`);
-    const data = await res.json();
-    return {
-      bugs: data.bugs || [],
-      classifications: data.classifications || [],
-      chains: data.chains || [],
-    };
+    const page = await loadSummaryPage(null);
+    return { ...page, classifications: page.classifications || [], chains: page.chains || [] };
   } catch (e) {
     console.error("[API] Bootstrap failed, using seed fallback", e);
     return {
       bugs: window.BUGS || [],
       classifications: window.CLASSIFICATIONS || [],
       chains: window.BUG_CHAINS || [],
+      nextCursor: null,
     };
   }
 }
 
+async function loadBugDetail(codes) {
+  try {
+    const res = await fetch(`/api/classifier/bugs?codes=${codes.map(encodeURIComponent).join(",")}`);
+    if (!res.ok) throw new Error(`GET /api/classifier/bugs failed: ${res.status}`);
+    const data = await res.json();
+    return data.bugs || [];
+  } catch (e) {
+    console.error("[API] Bug detail load failed", e);
+    return [];
+  }
+}
+
 async function persistBugUpdate(code, classifications, bug_chain_ids) {
   try {
     const res = await fetch(`/api/bugs/${code}`, {
@@ -163,26 +189,44 @@ function App() {
   const [classifications, setClassifications] = useState([]);
   const [chains, setChains] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  const applyFirstPage = (data) => {
+    setBugs(data.bugs);
+    setClassifications(data.classifications);
+    setChains(data.chains);
+    setNextCursor(data.nextCursor);
+    setLoading(false);
+  };
 
-  // Load data from API on mount
+  // Load the first page from the API on mount; later pages load on demand
   useEffect(() => {
-    loadFromAPI().then(data => {
-      setBugs(data.bugs);
-      setClassifications(data.classifications);
-      setChains(data.chains);
-      setLoading(false);
-    });
+    loadFromAPI().then(applyFirstPage);
   }, []);
 
   const resetAll = () => {
     if (!confirm("Reload data from server?")) return;
     setLoading(true);
-    loadFromAPI().then(data => {
-      setBugs(data.bugs);
-      setClassifications(data.classifications);
-      setChains(data.chains);
-      setLoading(false);
-    });
+    loadFromAPI().then(applyFirstPage);
+  };
+
+  const loadMore = useCallback(() => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    loadSummaryPage(nextCursor)
+      .then(page => {
+        setBugs(bs => bs.concat(page.bugs));
+        setNextCursor(page.nextCursor);
+      })
+      .catch(e => console.error("[API] Loading more bugs failed", e))
+      .finally(() => setLoadingMore(false));
+  }, [nextCursor, loadingMore]);
+
+  // Fetch the next page as the queue is scrolled near its end
+  const onQueueScroll = (e) => {
+    const el = e.currentTarget;
+    if (el.scrollHeight - el.scrollTop - el.clientHeight < 300) loadMore();
   };
 
   const [query, setQuery] = useState("");
@@ -210,6 +254,29 @@ function App() {
 
   const sel = bugs.find(b => b.code === selectedCode) || filtered[0];
 
+  // Hydrate nested context (UAT walks, sprints, reviews, history) on first open,
+  // prefetching the neighbours reachable with j/k.
+  useEffect(() => {
+    if (!sel || sel.hydrated !== false) return;
+    const i = filtered.findIndex(b => b.code === sel.code);
+    const codes = [sel, filtered[i - 1], filtered[i + 1]]
+      .filter(b => b && b.hydrated === false)
+      .map(b => b.code);
+    loadBugDetail(codes).then(details => {
+      if (!details.length) return;
+      const byCode = Object.fromEntries(details.map(d => [d.code, d]));
+      setBugs(bs => bs.map(b => byCode[b.code]
+        ? { ...b, ...byCode[b.code], classifications: b.classifications, bug_chain_ids: b.bug_chain_ids, hydrated: true }
+        : b));
+    });
+  }, [sel?.code, sel?.hydrated]);
+
+  // Stepping onto the last loaded bugs (j or a click) fetches the next page
+  useEffect(() => {
+    const i = filtered.findIndex(b => b.code === sel?.code);
+    if (i >= 0 && i >= filtered.length - 2) loadMore();
+  }, [sel?.code]);
+
   // Update bug helper - updates local state and syncs to API
   const updateBug = (code, patch) => {
     setBugs(bs => bs.map(b => b.code === code ? { ...b, ...patch, updated_at: new Date().toISOString() } : b));
@@ -295,7 +362,7 @@ function App() {
           </button>
           <span style={{width: 1, height: 20, background:'var(--rule)'}}></span>
           <span className="mono" style={{fontSize: 11, color:'var(--ink-3)'}}>
-            {filtered.length}/{bugs.length} bugs
+            {filtered.length}/{bugs.length}{nextCursor ? "+" : ""} bugs
           </span>
           <span style={{width: 1, height: 20, background:'var(--rule)'}}></span>
           <span title={loading ? "loading..." : "connected to MetaPM"}
@@ -350,7 +417,7 @@ function App() {
               </select>
             </div>
           </div>
-          <div className="scroll" style={S.queueList}>
+          <div className="scroll" style={S.queueList} onScroll={onQueueScroll}>
             {filtered.map(b => {
               const isSel = b.code === sel?.code;
               const ch = b.bug_chain_id && chains.find(c => c.id === b.bug_chain_id);
@@ -385,6 +452,13 @@ function App() {
                 </div>
               );
             })}
+            {nextCursor && (
+              <div style={{padding:'10px', textAlign:'center'}}>
+                <button className="btn sm" onClick={loadMore} disabled={loadingMore}>
+                  {loadingMore ? "loading…" : "load more"}
+                </button>
+              </div>
+            )}
           </div>
         </div>
 
@@ -424,10 +498,10 @@ function App() {
           <div className="tabs">
             {[
               ["description", "Description", null],
-              ["uat", "UAT history", sel?.uat_walks?.length || 0],
-              ["sprints", "Sprints", sel?.sprints?.length || 0],
-              ["reviews", "Reviews", sel?.reviews?.length || 0],
-              ["state", "State", sel?.history?.length || 0],
+              ["uat", "UAT history", sel?.uat_walks?.length ?? sel?.counts?.uat_walks ?? 0],
+              ["sprints", "Sprints", sel?.sprints?.length ?? sel?.counts?.sprints ?? 0],
+              ["reviews", "Reviews", sel?.reviews?.length ?? sel?.counts?.reviews ?? 0],
+              ["state", "State", sel?.history?.length ?? sel?.counts?.history ?? 0],
               ["chain", "Chain", null],
             ].map(([id, label, count]) => (
               <div key={id} className={`tab ${tab===id?'active':''}`} onClick={()=>setTab(id)}>
@@ -0,0 +1,518 @@
+// UAT spec page (app/api/uat_payload.py). Per-page values come from the
+// SPEC_ID and UAT_PAGE globals the page defines before loading this file.
+
+// REQ-071: Light/dark theme toggle
+(function() {
+  var saved = localStorage.getItem('metapm-theme') || 'dark';
+  document.documentElement.setAttribute('data-theme', saved);
+  var btn = document.getElementById('theme-toggle');
+  if (btn) {
+    btn.textContent = saved === 'dark' ? '☀️' : '🌙';
+    btn.addEventListener('click', function() {
+      var current = document.documentElement.getAttribute('data-theme') || 'dark';
+      var next = current === 'dark' ? 'light' : 'dark';
+      document.documentElement.setAttribute('data-theme', next);
+      btn.textContent = next === 'dark' ? '☀️' : '🌙';
+      localStorage.setItem('metapm-theme', next);
+    });
+  }
+})();
+
+
+// MP24 REQ-057: Multi-note management
+let noteCounter = 0;
+function addNote() {
+  noteCounter++;
+  const ts = new Date().toISOString().replace('T', ' ').substring(0, 19) + 'Z';
+  const container = document.getElementById('notes-list');
+  const entry = document.createElement('div');
+  entry.className = 'note-entry';
+  entry.style.cssText = 'background:#0d1117;border:1px solid #334155;border-radius:6px;padding:10px;margin-bottom:8px;position:relative';
+  entry.innerHTML = `<div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:6px">` +
+    `<span style="color:#8b949e;font-size:0.78rem">${ts}</span>` +
+    `<div style="display:flex;gap:6px;align-items:center">` +
+    `<select class="note-classification" style="padding:3px 6px;background:#161b22;color:#e2e8f0;border:1px solid #334155;border-radius:4px;font-size:0.78rem">` +
+    `<option value="">No classification</option>` +
+    `<option value="new_requirement">New requirement</option>` +
+    `<option value="bug">Bug</option>` +
+    `<option value="finding">Finding</option>` +
+    `<option value="no_action">No-action</option>` +
+    `<option value="out_of_scope">Out of scope</option>` +
+    `</select>` +
+    `<button onclick="this.closest('.note-entry').remove()" style="background:none;border:none;color:#f87171;cursor:pointer;font-size:1rem;padding:0 4px">&times;</button>` +
+    `</div></div>` +
+    `<div class="note-failure-type-row" style="display:none;margin-bottom:6px">` +
+    `<label style="font-size:0.75rem;color:#8b949e;margin-bottom:4px;display:block">Failure Type</label>` +
+    `<select class="note-failure-type" style="width:100%;padding:7px 10px;background:#0d1117;border:1px solid #334155;border-radius:6px;color:#e2e8f0;font-size:0.85rem">` +
+    `<option value="">-- Select --</option>` +
+    `<option value="wrong_spec">Wrong spec</option>` +
+    `<option value="regression">Regression</option>` +
+    `<option value="environment">Environment</option>` +
+    `<option value="unclear_bv">Unclear BV</option>` +
+    `<option value="machine_test_sent_to_pl">Machine test sent to PL</option>` +
+    `<option value="no_5q_applied">No 5Q applied</option>` +
+    `<option value="incomplete_spec">Incomplete spec</option>` +
+    `<option value="missing_acceptance_criteria">Missing acceptance criteria</option>` +
+    `<option value="incomplete_handoff">Incomplete handoff</option>` +
+    `<option value="ui_rendering_bug">UI rendering bug</option>` +
+    `<option value="data_mapping_bug">Data mapping bug</option>` +
+    `<option value="filter_query_bug">Filter/query bug</option>` +
+    `<option value="gate_validation_bug">Gate/validation bug</option>` +
+    `<option value="navigation_routing_bug">Navigation/routing bug</option>` +
+    `<option value="api_contract_bug">API contract bug</option>` +
+    `<option value="state_management_bug">State management bug</option>` +
+    `<option value="performance_bug">Performance bug</option>` +
+    `<option value="other">Other</option>` +
+    `</select>` +
+    `</div>` +
+    `<textarea class="note-text" placeholder="Enter note..." style="width:100%;min-height:50px;padding:6px;background:#161b22;color:#e2e8f0;border:1px solid #334155;border-radius:4px;resize:vertical;font-size:0.82rem"></textarea>`;
+  container.appendChild(entry);
+
+  // BUG-075: Wire classification → failure type cascade for General Notes
+  const classSelect = entry.querySelector('.note-classification');
+  const ftRow = entry.querySelector('.note-failure-type-row');
+  classSelect.addEventListener('change', function() {
+    if (this.value === 'bug') {
+      ftRow.style.display = 'block';
+    } else {
+      ftRow.style.display = 'none';
+      ftRow.querySelector('select').value = '';
+    }
+    if (window.PortfolioDebug) {
+      window.PortfolioDebug.log('GeneralNotes', 'classification changed', {
+        value: classSelect.value,
+        failureTypeVisible: classSelect.value === 'bug'
+      });
+    }
+  });
+}
+
+function gatherNotes() {
+  const entries = [];
+  document.querySelectorAll('.note-entry').forEach(entry => {
+    const text = entry.querySelector('.note-text')?.value || '';
+    const classification = entry.querySelector('.note-classification')?.value || null;
+    const failureType = entry.querySelector('.note-failure-type')?.value || null;
+    const tsSpan = entry.querySelector('span');
+    const timestamp = tsSpan ? tsSpan.textContent.trim() : null;
+    if (text.trim()) {
+      const note = { timestamp, text: text.trim(), classification: classification || null };
+      if (classification === 'bug' && failureType) {
+        note.failure_type = failureType;
+      }
+      entries.push(note);
+    }
+  });
+  return entries;
+}
+
+// Pre-populate existing notes on page load
+(function loadExistingNotes() {
+  const existingNotes = UAT_PAGE.general_notes;
+  existingNotes.forEach(n => {
+    addNote();
+    const entries = document.querySelectorAll('.note-entry');
+    const last = entries[entries.length - 1];
+    if (n.text) last.querySelector('.note-text').value = n.text;
+    if (n.classification) {
+      last.querySelector('.note-classification').value = n.classification;
+      if (n.classification === 'bug') {
+        const ftRow = last.querySelector('.note-failure-type-row');
+        if (ftRow) ftRow.style.display = 'block';
+      }
+    }
+    if (n.failure_type) {
+      const ftSelect = last.querySelector('.note-failure-type');
+      if (ftSelect) ftSelect.value = n.failure_type;
+    }
+    if (n.timestamp) last.querySelector('span').textContent = n.timestamp;
+  });
+})();
+
+function updateCounts() {
+  const cards = document.querySelectorAll('.test-card:not([data-type="cc_machine"])');
+  const machineCards = document.querySelectorAll('.test-card[data-type="cc_machine"]');
+  let pass=0,fail=0,skip=0,pend=0;
+  cards.forEach(card => {
+    const id = card.dataset.id;
+    const checked = card.querySelector(`input[name="${id}"]:checked`);
+    const val = checked ? checked.value : 'pending';
+    card.querySelectorAll('.radio-label').forEach(l => l.className = l.className.replace(/\bchecked-\w+/g,''));
+    if (checked) checked.closest('.radio-label')?.classList.add(`checked-${val}`);
+    card.className = card.className.replace(/\bresult-\w+/g,'') + ` result-${val}`;
+    if (val==='pass') pass++; else if(val==='fail') fail++; else if(val==='skip') skip++; else pend++;
+  });
+  machineCards.forEach(card => { pass++; });
+  document.getElementById('cnt-total').textContent = cards.length + machineCards.length;
+  document.getElementById('cnt-pass').textContent = pass;
+  document.getElementById('cnt-fail').textContent = fail;
+  document.getElementById('cnt-skip').textContent = skip;
+  document.getElementById('cnt-pend').textContent = pend;
+}
+
+// MP30: Data-driven failure schema — 2-level cascade
+let FAILURE_SCHEMA = {};
+
+async function loadFailureSchema() {
+  try {
+    const resp = await fetch('/api/config/failure-schema');
+    FAILURE_SCHEMA = await resp.json();
+    document.querySelectorAll('.failure-type-select').forEach(sel => {
+      const savedVal = sel.dataset.savedValue || '';
+      sel.innerHTML = '<option value="">\u2014 Select failure type \u2014</option>';
+      Object.entries(FAILURE_SCHEMA).forEach(([catCode, cat]) => {
+        const group = document.createElement('optgroup');
+        group.label = cat.label;
+        cat.types.forEach(t => {
+          const opt = new Option(t.text, t.value);
+          if (t.value === savedVal) opt.selected = true;
+          group.appendChild(opt);
+        });
+        sel.appendChild(group);
+      });
+    });
+    const container = document.getElementById('cheat-sheet-types');
+    if (container) {
+      let html = '<h4>Failure Types</h4>';
+      Object.entries(FAILURE_SCHEMA).forEach(([code, cat]) => {
+        html += '<div style="margin-bottom:10px">' +
+          '<div style="font-size:11px;text-transform:uppercase;color:var(--muted);font-weight:600;margin:8px 0 4px">' + cat.label + '</div>' +
+          '<ul style="margin:0;padding-left:16px;font-size:12px;line-height:1.6">';
+        cat.types.forEach(t => {
+          const shortName = t.text.split(' \u2014 ')[0] || t.text;
+          html += '<li><strong>' + shortName + ':</strong> ' + t.help + '</li>';
+        });
+        html += '</ul></div>';
+      });
+      container.innerHTML = html;
+    }
+  } catch(e) {
+    console.error('Failed to load failure schema:', e);
+  }
+}
+
+// MP31 REQ-070: Load classifications from DB
+async function loadClassifications() {
+  try {
+    const resp = await fetch('/api/config/uat-classifications');
+    const classifications = await resp.json();
+    if (!Array.isArray(classifications)) {
+      console.error('uat-classifications: expected array, got', classifications);
+      return;
+    }
+    document.querySelectorAll('.classification-select').forEach(sel => {
+      const savedVal = sel.value || sel.dataset.savedValue || '';
+      sel.innerHTML = '<option value="">\u2014 Select classification \u2014</option>';
+      classifications.forEach(c => {
+        const opt = new Option(c.display_label, c.display_label);
+        if (c.display_label === savedVal) opt.selected = true;
+        sel.appendChild(opt);
+      });
+    });
+    const cheatContainer = document.getElementById('cheat-sheet-types');
+    if (cheatContainer) {
+      const classHtml = `
+        <h4 style="color:var(--info);border-bottom:1px solid var(--line);
+                   padding-bottom:4px;margin:16px 0 8px;font-size:13px">
+          Classifications
+        </h4>
+        <ul style="margin:0;padding-left:16px;font-size:12px;line-height:1.7">
+        ${classifications.map(c =>
+          `<li><strong>${c.display_label}:</strong> ${c.help_text}</li>`
+        ).join('')}
+        </ul>`;
+      cheatContainer.insertAdjacentHTML('beforeend', classHtml);
+    }
+  } catch(e) {
+    console.error('Failed to load classifications:', e);
+  }
+}
+
+function updateCascade(card) {
+  const id = card.dataset.id;
+  const status = card.querySelector(`input[name="${id}"]:checked`)?.value || 'pending';
+  const cascade = card.querySelector('.cascade-classification');
+  const classSelect = card.querySelector('.classification-select');
+  const ftRow = card.querySelector('.failure-type-section');
+  if (!cascade) return;
+  if (status === 'pass') {
+    cascade.style.display = 'none';
+    if (classSelect) classSelect.value = 'No-action';
+  } else {
+    cascade.style.display = 'block';
+  }
+  const classification = classSelect?.value || '';
+  if (ftRow) {
+    ftRow.style.display = (classification === 'Bug') ? 'block' : 'none';
+  }
+}
+
+// Wire radio buttons + classification selects for cascade
+document.querySelectorAll('.test-card:not([data-type="cc_machine"])').forEach(card => {
+  card.querySelectorAll('input[type="radio"]').forEach(r => {
+    r.addEventListener('change', () => {
+      updateCounts();
+      updateCascade(card);
+    });
+  });
+  const classSelect = card.querySelector('.classification-select');
+  if (classSelect) {
+    classSelect.addEventListener('change', () => updateCascade(card));
+  }
+  // BA41: notes textarea focus instrumentation
+  const notesInput = card.querySelector('.notes-input');
+  if (notesInput) {
+    notesInput.addEventListener('focus', () => {
+      if (window.PortfolioDebug) {
+        window.PortfolioDebug.log('BVCard', 'notes focused', {bvId: card.dataset.id});
+      }
+    });
+  }
+});
+
+updateCounts();
+loadFailureSchema();
+loadClassifications();
+
+// ── Attachment support (MP07) ──
+const attachmentsMap = {};
+let generalNotesAttachments = [];
+
+function blobToBase64(blob) {
+  return new Promise(resolve => {
+    const reader = new FileReader();
+    reader.onload = () => resolve(reader.result.split(',')[1]);
+    reader.readAsDataURL(blob);
+  });
+}
+
+function showThumbInEl(el, mime, b64) {
+  if (el) el.innerHTML = `<img src="data:${mime};base64,${b64}">`;
+}
+
+document.querySelectorAll('.paste-zone').forEach(zone => {
+  zone.addEventListener('paste', async e => {
+    e.preventDefault();
+    const items = Array.from(e.clipboardData.items);
+    const imgItem = items.find(i => i.type.startsWith('image/'));
+    if (!imgItem) return;
+    const b64 = await blobToBase64(imgItem.getAsFile());
+    const att = [{type:'image', mime: imgItem.type, data: b64, filename:'screenshot.png'}];
+    const id = zone.dataset.id;
+    if (id) {
+      attachmentsMap[id] = att;
+      showThumbInEl(document.getElementById(`athumb-${id}`), imgItem.type, b64);
+    } else {
+      generalNotesAttachments = att;
+      showThumbInEl(document.getElementById('gn-attach-thumb'), imgItem.type, b64);
+    }
+    zone.classList.add('has-image');
+    zone.innerHTML = '✅ Screenshot captured <button class="remove-attach" onclick="removeAttach(this)" title="Remove screenshot" style="background:#7f1d1d;color:#fca5a5;border:none;border-radius:4px;padding:1px 6px;cursor:pointer;margin-left:8px;font-size:12px">✕</button>';
+  });
+});
+
+function removeAttach(btn) {
+  const zone = btn.closest('.paste-zone');
+  if (!zone) return;
+  const id = zone.dataset.id;
+  if (id) {
+    delete attachmentsMap[id];
+    const thumb = document.getElementById(`athumb-${id}`);
+    if (thumb) thumb.innerHTML = '';
+  } else {
+    generalNotesAttachments = [];
+    const thumb = document.getElementById('gn-attach-thumb');
+    if (thumb) thumb.innerHTML = '';
+  }
+  zone.classList.remove('has-image');
+  zone.innerHTML = '📷 Paste screenshot here (Ctrl+V)';
+}
+
+document.querySelectorAll('.attach-input').forEach(input => {
+  input.addEventListener('change', async e => {
+    const file = e.target.files[0];
+    if (!file) return;
+    const b64 = await blobToBase64(file);
+    const type = file.type.startsWith('image/') ? 'image' : 'file';
+    const att = [{type, mime: file.type, data: b64, filename: file.name}];
+    const id = input.dataset.id;
+    attachmentsMap[id] = att;
+    const nameEl = document.getElementById(`aname-${id}`);
+    nameEl.innerHTML = `${file.name} (${Math.round(file.size/1024)}KB) <button class="remove-attach" onclick="removeFileAttach(this, '${id}')" title="Remove file" style="background:#7f1d1d;color:#fca5a5;border:none;border-radius:4px;padding:1px 6px;cursor:pointer;margin-left:6px;font-size:12px">✕</button>`;
+    if (type === 'image') showThumbInEl(document.getElementById(`athumb-${id}`), file.type, b64);
+  });
+});
+
+function removeFileAttach(btn, id) {
+  delete attachmentsMap[id];
+  const nameEl = document.getElementById(`aname-${id}`);
+  if (nameEl) nameEl.textContent = '';
+  const thumb = document.getElementById(`athumb-${id}`);
+  if (thumb) thumb.innerHTML = '';
+  const input = document.querySelector(`.attach-input[data-id="${id}"]`);
+  if (input) input.value = '';
+}
+
+const gnInput = document.getElementById('gn-attach-input');
+if (gnInput) {
+  gnInput.addEventListener('change', async e => {
+    const file = e.target.files[0];
+    if (!file) return;
+    const b64 = await blobToBase64(file);
+    const type = file.type.startsWith('image/') ? 'image' : 'file';
+    generalNotesAttachments = [{type, mime: file.type, data: b64, filename: file.name}];
+    document.getElementById('gn-attach-name').textContent = `${file.name} (${Math.round(file.size/1024)}KB)`;
+    if (type === 'image') showThumbInEl(document.getElementById('gn-attach-thumb'), file.type, b64);
+  });
+}
+
+async function reopenUAT(specId) {
+  const confirmed = confirm('Reopen this UAT for editing? Current results will be cleared.');
+  if (!confirmed) return;
+  const btn = document.querySelector('.btn-resubmit');
+  if (btn) { btn.disabled = true; btn.textContent = '⏳ Reopening...'; }
+  try {
+    const r = await fetch(`/api/uat/${specId}/reopen`, {
+      method: 'POST',
+      headers: {'Content-Type': 'application/json'}
+    });
+    if (r.ok) {
+      window.location.reload();
+    } else {
+      const data = await r.json();
+      alert(`Reopen failed: ${data.detail || JSON.stringify(data)}`);
+      if (btn) { btn.disabled = false; btn.textContent = '↩ Reopen & Edit Results'; }
+    }
+  } catch(e) {
+    alert(`Reopen error: ${e.message}`);
+    if (btn) { btn.disabled = false; btn.textContent = '↩ Reopen & Edit Results'; }
+  }
+}
+
+async function markAsPassed() {
+  const btn = document.querySelector('.btn-mark-passed');
+  if (btn) { btn.disabled = true; btn.textContent = '⏳ Overriding...'; }
+  try {
+    const resp = await fetch(`/api/uat/${SPEC_ID}/override`, {
+      method: 'PATCH',
+      headers: {'Content-Type': 'application/json'},
+      body: JSON.stringify({ status: 'passed', override_note: 'PL override: conditional_pass → passed' })
+    });
+    const data = await resp.json();
+    if (resp.ok) {
+      const div = document.getElementById('submit-result');
+      div.style.display = 'block';
+      div.className = 'ok';
+      div.innerHTML = `Status overridden to <strong>passed</strong>. <a href="/uat/${SPEC_ID}">View UAT record &rarr;</a>`;
+      if (btn) btn.style.display = 'none';
+    } else {
+      if (btn) { btn.disabled = false; btn.textContent = '✅ Mark as Passed'; }
+      alert(`Override failed: ${data.detail || JSON.stringify(data)}`);
+    }
+  } catch(e) {
+    if (btn) { btn.disabled = false; btn.textContent = '✅ Mark as Passed'; }
+    alert(`Override error: ${e.message}`);
+  }
+}
+
+async function submitAcknowledge() {
+  if (!confirm('All items were machine-verified. Acknowledge and close?')) return;
+  try {
+    const resp = await fetch(`/api/uat/${SPEC_ID}/pl-results`, {
+      method: 'PATCH',
+      headers: {'Content-Type': 'application/json'},
+      body: JSON.stringify({ test_cases: [], general_notes: [{timestamp: new Date().toISOString(), text: 'All BVs machine-verified. PL acknowledged.', classification: null}] })
+    });
+    if (resp.ok) {
+      const div = document.getElementById('submit-result');
+      div.style.display = 'block';
+      div.className = 'ok';
+      div.innerHTML = 'Acknowledged. <a href="/uat/' + SPEC_ID + '">View UAT record &rarr;</a>';
+    } else {
+      const data = await resp.json();
+      alert('Acknowledge failed: ' + (data.detail || JSON.stringify(data)));
+    }
+  } catch(e) { alert('Error: ' + e.message); }
+}
+
+async function submitResults() {
+  const confirmed = confirm(
+    'Submit UAT results?\n\nThis will record your test results. ' +
+    'You can reopen and edit results after submission.'
+  );
+  if (!confirmed) return;
+
+  const cards = document.querySelectorAll('.test-card:not([data-type="cc_machine"])');
+  const test_cases = [];
+  let missingClassification = [];
+  let hasFails = false;
+  cards.forEach(card => {
+    if (card.dataset.type === 'cc_machine') return;
+    const id = card.dataset.id;
+    const checked = card.querySelector(`input[name="${id}"]:checked`);
+    const status = checked ? checked.value : 'pending';
+    const notes = card.querySelector('.notes-input')?.value || '';
+    const attachments = attachmentsMap[id] || [];
+    const classSelect = card.querySelector('.classification-select');
+    const classification = classSelect ? classSelect.value : '';
+    if (!classification && status !== 'pass') missingClassification.push(id);
+    const ftSelect = card.querySelector('.failure-type-select');
+    const failure_type = (ftSelect && classification === 'Bug') ? ftSelect.value : null;
+    if (status === 'fail') hasFails = true;
+    test_cases.push({ id, status, notes, attachments, classification, failure_type });
+  });
+  if (missingClassification.length > 0) {
+    alert('Classification required for all BVs: ' + missingClassification.join(', '));
+    return;
+  }
+  const general_notes = gatherNotes();
+
+  let sprintFailureType = null;
+  const hasSkips = test_cases.some(tc => tc.status === 'skip');
+  const allPassOrSkip = test_cases.every(tc => tc.status === 'pass' || tc.status === 'skip');
+  if (!hasFails && hasSkips && allPassOrSkip) {
+    sprintFailureType = prompt('This UAT will be a conditional pass.\nPlease select a failure type:\n\n' +
+      '1. wrong_spec\n2. regression\n3. environment\n4. unclear_bv\n' +
+      '5. incomplete_spec\n6. other\n\nType the failure type:');
+    if (!sprintFailureType) {
+      alert('Conditional pass requires a failure type.');
+      return;
+    }
+  }
+
+  const btn = document.getElementById('submit-btn');
+  btn.disabled = true;
+  btn.textContent = '⏳ Submitting...';
+
+  const payload = { test_cases, general_notes, general_notes_attachments: generalNotesAttachments, submitted_by: UAT_PAGE.pl_email };
+  if (sprintFailureType) payload.failure_type = sprintFailureType;
+
+  try {
+    const resp = await fetch(`/api/uat/${SPEC_ID}/pl-results`, {
+      method: 'PATCH',
+      headers: {'Content-Type': 'application/json'},
+      body: JSON.stringify(payload)
+    });
+    const data = await resp.json();
+    const div = document.getElementById('submit-result');
+    div.style.display = 'block';
+    if (resp.ok) {
+      window.location.replace('/uat/' + SPEC_ID);
+      return;
+    } else {
+      btn.disabled = false;
+      btn.textContent = '📤 Submit Results';
+      div.className = 'err';
+      const detail = data.detail;
+      const msg = (typeof detail === 'object' && detail.message) ? detail.message : (typeof detail === 'string' ? detail : JSON.stringify(detail));
+      div.textContent = `Error: ${msg}`;
+    }
+  } catch(e) {
+    btn.disabled = false;
+    btn.textContent = '📤 Submit Results';
+    const div = document.getElementById('submit-result');
+    div.style.display = 'block';
+    div.className = 'err';
+    div.textContent = `Submit failed: ${e.message}`;
+  }
+}
@@ -0,0 +1,400 @@
+// Structured UAT page (app/services/uat_generator_v2.py). Per-page values come
+// from the UAT_CONFIG global the page defines before loading this file.
+
+const results = {};
+        document.getElementById('test-date').textContent = new Date().toLocaleDateString();
+
+        function setResult(btn, result) {
+            const item = btn.closest('.test-item');
+            const id = item.dataset.test;
+            item.querySelectorAll('.btn').forEach(b => b.classList.remove('selected'));
+            btn.classList.add('selected');
+            item.classList.remove('passed', 'failed', 'skipped');
+            if (result === 'pass') item.classList.add('passed');
+            else if (result === 'fail') item.classList.add('failed');
+            else item.classList.add('skipped');
+            results[id] = result;
+            // MP30: Show/hide 2-level cascade (Classification → Failure type)
+            updateCascade(item, result);
+            updateCounts();
+        }
+
+        function updateCounts() {
+            const total = document.querySelectorAll('.test-item').length;
+            const p = Object.values(results).filter(r => r === 'pass').length;
+            const f = Object.values(results).filter(r => r === 'fail').length;
+            const s = Object.values(results).filter(r => r === 'skip').length;
+            const pending = total - p - f - s;
+            document.getElementById('pass-count').textContent = p;
+            document.getElementById('fail-count').textContent = f;
+            document.getElementById('skip-count').textContent = s;
+            document.getElementById('pending-count').textContent = pending;
+
+            const overall = document.getElementById('overall-result');
+            const label = document.getElementById('overall-label');
+            if (pending === 0) {
+                if (f > 0) {
+                    overall.className = 'overall-result is-fail';
+                    overall.innerHTML = '<h4 style="color:#f87171;">NEEDS FIXES</h4><p>' + f + ' test(s) failed.</p>';
+                    label.textContent = 'FAILED';
+                    label.style.color = '#f87171';
+                } else {
+                    overall.className = 'overall-result is-pass';
+                    overall.innerHTML = '<h4 style="color:#4ade80;">ALL PASSED</h4><p>All ' + p + ' tests passed!</p>';
+                    label.textContent = 'PASSED';
+                    label.style.color = '#4ade80';
+                }
+            } else {
+                overall.className = 'overall-result is-pending';
+                overall.innerHTML = '<h4>Overall: PENDING</h4><p>' + pending + ' test(s) remaining.</p>';
+                label.textContent = 'PENDING';
+                label.style.color = '';
+            }
+        }
+
+        function gatherTestCases() {
+            const cases = [];
+            document.querySelectorAll('.test-item').forEach(item => {
+                if (item.dataset.type === 'cc_machine') return;
+                const id = item.dataset.test;
+                const notes = item.querySelector('.notes-input')?.value || '';
+                const ftSelect = item.querySelector('.failure-type-select');
+                const classSelect = item.querySelector('.classification-select');
+                const classification = classSelect ? classSelect.value : '';
+                const failure_type = (ftSelect && classification === 'Bug') ? ftSelect.value : '';
+                cases.push({
+                    id: id,
+                    status: results[id] || 'pending',
+                    result: results[id] ? (results[id] === 'pass' ? 'Confirmed' : results[id] === 'fail' ? 'Failed' : 'Skipped') : null,
+                    notes: notes,
+                    classification: classification || null,
+                    failure_type: failure_type || null
+                });
+            });
+            return cases;
+        }
+
+        function buildResultsText() {
+            const total = document.querySelectorAll('.test-item').length;
+            const p = Object.values(results).filter(r => r === 'pass').length;
+            const f = Object.values(results).filter(r => r === 'fail').length;
+            const s = Object.values(results).filter(r => r === 'skip').length;
+            const sep = '='.repeat(60);
+
+            let out = '[' + UAT_CONFIG.project + '] ';
+            out += (f > 0 ? '\U0001f534' : '\U0001f7e2') + ' v' + UAT_CONFIG.version;
+            out += ' \u2014 UAT: ' + UAT_CONFIG.feature + '\n' + sep + '\n';
+            out += 'Date: ' + new Date().toLocaleString() + '\n';
+            out += 'Version: ' + UAT_CONFIG.version + '\n';
+            out += 'Summary: ' + p + ' passed, ' + f + ' failed, ' + s + ' skipped\n' + sep + '\n\n';
+
+            document.querySelectorAll('.test-item').forEach(item => {
+                const id = item.dataset.test;
+                const title = item.querySelector('.test-title')?.textContent || '';
+                const notes = item.querySelector('.notes-input')?.value || '';
+                const status = results[id] || 'pending';
+                const icons = { pass: '\u2713 PASS', fail: '\u2717 FAIL', skip: '? PENDING', pending: '? PENDING' };
+                out += '  [' + id + '] ' + (icons[status] || status) + ': ' + title + '\n';
+                if (notes.trim()) out += '         \U0001f4dd ' + notes + '\n';
+                out += '\n';
+            });
+
+            const notes = gatherNotes();
+            if (notes.length) {
+                out += 'General Notes\n' + '-'.repeat(50) + '\n';
+                notes.forEach(n => { out += '[' + (n.classification || '') + '] ' + n.text + '\n'; });
+            }
+
+            out += '\nOVERALL: ' + (f > 0 ? 'PENDING' : (Object.keys(results).length === total ? 'APPROVED' : 'PENDING')) + '\n';
+            return out;
+        }
+
+        function copyResults() {
+            const text = buildResultsText();
+            if (navigator.clipboard && navigator.clipboard.writeText) {
+                navigator.clipboard.writeText(text).then(() => alert('Copied!'));
+            } else {
+                const ta = document.createElement('textarea');
+                ta.value = text; document.body.appendChild(ta);
+                ta.select(); document.execCommand('copy');
+                document.body.removeChild(ta); alert('Copied!');
+            }
+        }
+
+        async function saveResults() {
+            const cases = gatherTestCases();
+            const pending = cases.filter(c => c.status === 'pending').length;
+            const failed = cases.filter(c => c.status === 'fail').length;
+            let overall = 'pending';
+            if (pending === 0) overall = failed > 0 ? 'failed' : 'passed';
+
+            try {
+                const res = await fetch(
+                    'https://metapm.rentyourcio.com/api/uat/' + UAT_CONFIG.uat_page_id + '/results',
+                    {
+                        method: 'PATCH',
+                        headers: { 'Content-Type': 'application/json' },
+                        body: JSON.stringify({ test_cases: cases, overall_status: overall })
+                    }
+                );
+                if (res.ok) {
+                    alert('Progress saved!');
+                } else {
+                    const d = await res.json();
+                    alert('Save failed: ' + (d.detail || res.status));
+                }
+            } catch(err) {
+                alert('Network error: ' + err.message);
+            }
+        }
+
+        async function submitResults() {
+            const btn = document.getElementById('submit-btn');
+            const cases = gatherTestCases();
+            const total = cases.length;
+            const p = cases.filter(c => c.status === 'pass').length;
+            const f = cases.filter(c => c.status === 'fail').length;
+            const s = cases.filter(c => c.status === 'skip').length;
+            const pending = total - p - f - s;
+
+            if (pending > 0) {
+                if (!confirm(pending + ' test(s) still pending. Submit anyway?')) return;
+            }
+
+            btn.disabled = true;
+            btn.textContent = 'Submitting...';
+
+            try {
+                // Save results first — auto-approve when all pass
+                const allPassFinal = (f === 0 && pending === 0 && p === total);
+                const saveRes = await fetch(
+                    'https://metapm.rentyourcio.com/api/uat/' + UAT_CONFIG.uat_page_id + '/results',
+                    {
+                        method: 'PATCH',
+                        headers: { 'Content-Type': 'application/json' },
+                        body: JSON.stringify({
+                            test_cases: cases,
+                            overall_status: allPassFinal ? 'approved' : (f > 0 ? 'failed' : (pending > 0 ? 'pending' : 'passed'))
+                        })
+                    }
+                );
+
+                // Then submit to UAT results
+                const submitRes = await fetch(
+                    'https://metapm.rentyourcio.com/api/uat/submit',
+                    {
+                        method: 'POST',
+                        headers: { 'Content-Type': 'application/json' },
+                        body: JSON.stringify({
+                            project: UAT_CONFIG.project,
+                            version: UAT_CONFIG.version,
+                            feature: UAT_CONFIG.feature,
+                            status: f > 0 ? 'failed' : 'passed',
+                            total_tests: total,
+                            passed: p, failed: f, skipped: s,
+                            results_text: buildResultsText(),
+                            results: cases.map(c => ({
+                                id: c.id, title: c.id, status: c.status, note: c.notes
+                            })),
+                            tested_by: 'PL',
+                            pth: UAT_CONFIG.pth
+                        })
+                    }
+                );
+
+                if (submitRes.ok) {
+                    const data = await submitRes.json();
+                    const allPass = (f === 0 && pending === 0 && p === total);
+                    btn.textContent = allPass ? 'UAT approved — all tests passed' : 'Submitted!';
+                    btn.style.background = '#166534';
+                    if (data.handoff_url) {
+                        const link = document.createElement('a');
+                        link.href = data.handoff_url; link.target = '_blank';
+                        link.textContent = 'View in MetaPM';
+                        link.style.cssText = 'display:block;text-align:center;margin-top:12px;color:#60a5fa;font-weight:600';
+                        btn.parentElement.appendChild(link);
+                    }
+                } else {
+                    const d = await submitRes.json();
+                    btn.textContent = 'Error: ' + (d.detail || submitRes.status);
+                    btn.style.background = '#991b1b';
+                    btn.disabled = false;
+                }
+            } catch(err) {
+                btn.textContent = 'Network error';
+                btn.style.background = '#991b1b';
+                btn.disabled = false;
+            }
+        }
+
+        // MP24 REQ-057: Multi-note management
+        let noteCounter = 0;
+        function addNote() {
+            noteCounter++;
+            const ts = new Date().toISOString().replace('T', ' ').substring(0, 19) + 'Z';
+            const container = document.getElementById('notes-list');
+            const entry = document.createElement('div');
+            entry.className = 'note-entry';
+            entry.dataset.noteId = noteCounter;
+            entry.style.cssText = 'background:#1e1e32;border:1px solid #334155;border-radius:6px;padding:12px;margin-bottom:8px;position:relative';
+            entry.innerHTML = `<div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:6px">` +
+                `<span style="color:#8b949e;font-size:0.8rem">${ts}</span>` +
+                `<div style="display:flex;gap:8px;align-items:center">` +
+                `<select class="note-classification" style="padding:4px 6px;background:#0d1117;color:#e2e8f0;border:1px solid #334155;border-radius:4px;font-size:0.8rem">` +
+                `<option value="">No classification</option>` +
+                `<option value="new_requirement">New requirement</option>` +
+                `<option value="bug">Bug</option>` +
+                `<option value="finding">Finding</option>` +
+                `<option value="no_action">No-action</option>` +
+                `<option value="out_of_scope">Out of scope</option>` +
+                `</select>` +
+                `<button onclick="this.closest('.note-entry').remove()" style="background:none;border:none;color:#f87171;cursor:pointer;font-size:1.1rem;padding:0 4px">&times;</button>` +
+                `</div></div>` +
+                `<textarea class="note-text" placeholder="Enter note..." style="width:100%;min-height:60px;padding:8px;background:#0d1117;color:#e2e8f0;border:1px solid #334155;border-radius:4px;resize:vertical;font-size:0.85rem"></textarea>`;
+            container.appendChild(entry);
+        }
+
+        function gatherNotes() {
+            const entries = [];
+            document.querySelectorAll('.note-entry').forEach(entry => {
+                const text = entry.querySelector('.note-text')?.value || '';
+                const classification = entry.querySelector('.note-classification')?.value || null;
+                const tsSpan = entry.querySelector('span');
+                const timestamp = tsSpan ? tsSpan.textContent.trim() : null;
+                if (text.trim()) {
+                    entries.push({ timestamp, text: text.trim(), classification: classification || null });
+                }
+            });
+            return entries;
+        }
+
+        // Screenshot paste handler
+        document.addEventListener('paste', function(e) {
+            const zone = e.target.closest('[data-paste-target]');
+            if (!zone) return;
+            const files = e.clipboardData?.files;
+            if (!files || !files.length) return;
+            const file = files[0];
+            if (!file.type.startsWith('image/')) return;
+            e.preventDefault();
+            const reader = new FileReader();
+            reader.onload = function(ev) {
+                const img = new Image();
+                img.onload = function() {
+                    const maxW = 800;
+                    let w = img.width, h = img.height;
+                    if (w > maxW) { h = Math.round(h * maxW / w); w = maxW; }
+                    const canvas = document.createElement('canvas');
+                    canvas.width = w; canvas.height = h;
+                    canvas.getContext('2d').drawImage(img, 0, 0, w, h);
+                    zone.innerHTML = '';
+                    zone.classList.add('has-image');
+                    const thumb = document.createElement('img');
+                    thumb.src = canvas.toDataURL('image/png');
+                    thumb.className = 'media-thumb';
+                    zone.appendChild(thumb);
+                };
+                img.src = ev.target.result;
+            };
+            reader.readAsDataURL(file);
+        });
+
+        // Pre-populate saved results on page load (MP-UAT-DASHBOARD-FIX-001)
+        (async function loadSavedResults() {
+            try {
+                const res = await fetch(
+                    'https://metapm.rentyourcio.com/api/uat/' + UAT_CONFIG.uat_page_id + '/results'
+                );
+                if (!res.ok) return;
+                const data = await res.json();
+                (data.test_cases || []).forEach(tc => {
+                    if (!tc.status || tc.status === 'pending') return;
+                    const item = document.querySelector('.test-item[data-test="' + tc.id + '"]');
+                    if (!item) return;
+                    // Find and click the matching button
+                    const btnClass = tc.status === 'pass' ? 'btn-pass' : tc.status === 'fail' ? 'btn-fail' : 'btn-skip';
+                    const btn = item.querySelector('.' + btnClass);
+                    if (btn) setResult(btn, tc.status);
+                    // Restore notes
+                    if (tc.notes) {
+                        const textarea = item.querySelector('.notes-input');
+                        if (textarea) textarea.value = tc.notes;
+                    }
+                });
+            } catch(e) {
+                console.log('Could not load saved results:', e);
+            }
+        })();
+
+        // MP27: Data-driven failure schema — cascading dropdowns + cheat sheet
+        let FAILURE_SCHEMA = {};
+
+        async function loadFailureSchema() {
+            try {
+                const resp = await fetch('/api/config/failure-schema');
+                FAILURE_SCHEMA = await resp.json();
+
+                // Populate all failure-type-select dropdowns using optgroups
+                document.querySelectorAll('.failure-type-select').forEach(sel => {
+                    sel.innerHTML = '<option value="">\u2014 Select failure type \u2014</option>';
+                    Object.entries(FAILURE_SCHEMA).forEach(([catCode, cat]) => {
+                        const group = document.createElement('optgroup');
+                        group.label = cat.label;
+                        cat.types.forEach(t => {
+                            group.appendChild(new Option(t.text, t.value));
+                        });
+                        sel.appendChild(group);
+                    });
+                });
+
+                // Build cheat sheet content from DB help_text
+                const container = document.getElementById('cheat-sheet-types');
+                if (container) {
+                    let html = '<h4>Failure Types</h4>';
+                    Object.entries(FAILURE_SCHEMA).forEach(([code, cat]) => {
+                        html += '<div class="group">' +
+                          '<div class="group-title">' + cat.label + '</div>' +
+                          '<ul>';
+                        cat.types.forEach(t => {
+                            const shortName = t.text.split(' \u2014 ')[0] || t.text;
+                            html += '<li><strong>' + shortName + ':</strong> ' + t.help + '</li>';
+                        });
+                        html += '</ul></div>';
+                    });
+                    container.innerHTML = html;
+                }
+            } catch(e) {
+                console.error('Failed to load failure schema:', e);
+            }
+        }
+
+        function updateCascade(item, status) {
+            const cascade     = item.querySelector('.cascade-classification');
+            const classSelect = item.querySelector('.classification-select');
+            const ftRow       = item.querySelector('.failure-type-row');
+
+            if (!cascade) return;
+
+            if (status === 'pass') {
+                cascade.style.display = 'none';
+                if (classSelect) classSelect.value = 'No-action';
+            } else {
+                cascade.style.display = 'block';
+            }
+
+            const classification = classSelect?.value || '';
+            if (ftRow) {
+                ftRow.style.display = (classification === 'Bug') ? 'block' : 'none';
+            }
+        }
+
+        // Wire classification select change events for cascade
+        document.querySelectorAll('.test-item').forEach(item => {
+            const classSelect = item.querySelector('.classification-select');
+            if (classSelect) {
+                classSelect.addEventListener('change', () => updateCascade(item, results[item.dataset.test] || 'pending'));
+            }
+        });
+
+        // Load schema on page init
+        loadFailureSchema();
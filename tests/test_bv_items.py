@@ -0,0 +1,133 @@
+"""
+Per-BV results view (app/services/bv_items.py): test_cases_json definitions
+overlaid with uat_bv_items rows.
+
+Specs created before MP56 recorded their results in test_cases_json, and
+their uat_bv_items rows were seeded as pending with empty notes. Those rows
+must not mask the recorded results. CC machine-result submissions may write
+only the spec's cc_machine rows.
+"""
+
+import asyncio
+import json
+from contextlib import contextmanager
+
+import pytest
+
+from app.api import mcp_tools, uat_spec
+from app.core import change_hooks
+from app.services import bv_items
+
+SPEC_ID = "0F1E2D3C-0000-0000-0000-000000000001"
+
+LEGACY_CASES = [
+    {"id": "BV-01", "title": "Saves", "type": "pl_visual", "status": "pass", "notes": "",
+     "classification": "", "failure_type": ""},
+    {"id": "BV-02", "title": "Exports CSV", "type": "pl_visual", "status": "fail",
+     "notes": "button missing", "classification": "Bug", "failure_type": "regression"},
+    {"id": "BV-03", "title": "Health", "type": "cc_machine", "status": "pass", "notes": "",
+     "cc_result": "pass", "cc_evidence": "HTTP 200"},
+]
+
+
+def _seeded(bv_id):
+    """A row as seed() writes it, nothing recorded since."""
+    return {"spec_id": SPEC_ID, "bv_id": bv_id, "status": "pending", "notes": "",
+            "classification": None, "legacy_classification_note": None, "failure_type": None,
+            "cc_result": None, "cc_evidence": None, "attachments_json": None, "result_text": None}
+
+
+@pytest.fixture
+def rows():
+    return [_seeded(tc["id"]) for tc in LEGACY_CASES]
+
+
+def test_seeded_rows_keep_legacy_json_results(rows):
+    merged = bv_items.merge_results(LEGACY_CASES, rows)
+    assert merged == LEGACY_CASES
+
+
+def test_recorded_results_override_the_json(rows):
+    rows[0].update(status="fail", notes="reverts on reload",
+                   classification="regression", legacy_classification_note="Bug", failure_type="regression")
+    rows[2].update(cc_result="fail", cc_evidence="HTTP 500")
+    by_id = {c["id"]: c for c in bv_items.merge_results(LEGACY_CASES, rows)}
+
+    assert by_id["BV-01"]["status"] == "fail"
+    assert by_id["BV-01"]["notes"] == "reverts on reload"
+    assert (by_id["BV-01"]["classification"], by_id["BV-01"]["failure_type"]) == ("Bug", "regression")
+    assert by_id["BV-02"] == LEGACY_CASES[1]
+    assert (by_id["BV-03"]["cc_result"], by_id["BV-03"]["cc_evidence"]) == ("fail", "HTTP 500")
+
+
+def test_cases_for_a_legacy_spec(monkeypatch, rows):
+    monkeypatch.setattr(bv_items, "execute_query", lambda sql, params=None, fetch="all": rows)
+    bv_items.invalidate([SPEC_ID])
+    page = {"id": SPEC_ID, "test_cases_json": json.dumps(LEGACY_CASES)}
+
+    view = bv_items.cases(SPEC_ID, page)
+
+    assert [(c["id"], c["status"]) for c in view] == [("BV-01", "pass"), ("BV-02", "fail"), ("BV-03", "pass")]
+    assert view[1]["notes"] == "button missing"
+    bv_items.invalidate([SPEC_ID])
+
+
+# ── CC machine-result submissions ───────────────────────────────────────────
+
+@pytest.fixture
+def cc_submit(monkeypatch, rows):
+    """uat_pages/uat_bv_items fakes for the two CC submit paths; yields the MERGE payloads sent."""
+    merged = []
+    page = {"id": SPEC_ID, "test_cases_json": json.dumps(LEGACY_CASES)}
+
+    @contextmanager
+    def get_db():
+        class _Cursor:
+            def execute(self, sql, params=()):
+                assert "MERGE uat_bv_items" in sql
+                merged.append(json.loads(params[0]))
+
+        class _Conn:
+            def cursor(self):
+                return _Cursor()
+
+        yield _Conn()
+
+    page_query = lambda sql, params=None, fetch="all": page
+    for module in (uat_spec, mcp_tools):
+        monkeypatch.setattr(module, "execute_query", page_query)
+        monkeypatch.setattr(module, "get_db", get_db)
+    monkeypatch.setattr(bv_items, "execute_query", lambda sql, params=None, fetch="all": rows)
+    monkeypatch.setattr(change_hooks, "notify_change", lambda entity, keys=None: None)
+    bv_items.invalidate([SPEC_ID])
+    yield merged
+    bv_items.invalidate([SPEC_ID])
+
+
+_SUBMISSION = [
+    {"id": "BV-03", "cc_result": "fail", "cc_evidence": "HTTP 500"},   # cc_machine
+    {"id": "BV-01", "cc_result": "fail", "cc_evidence": "not mine"},   # pl_visual
+    {"id": "BV-99", "cc_result": "pass", "cc_evidence": "undefined"},  # not in the spec
+]
+
+
+def test_cc_results_endpoint_writes_only_machine_bvs(cc_submit):
+    body = uat_spec.CCResultsSubmit(test_cases=_SUBMISSION)
+    out = asyncio.run(uat_spec.submit_cc_results(SPEC_ID, body))
+
+    assert out["updated"] == 1
+    assert cc_submit == [[{"bv_id": "BV-03", "status": "fail", "cc_result": "fail", "cc_evidence": "HTTP 500"}]]
+
+
+def test_cc_results_tool_writes_only_machine_bvs(cc_submit):
+    out = mcp_tools._tool_submit_cc_results({"spec_id": SPEC_ID, "test_cases": _SUBMISSION})
+
+    assert out["updated"] == 1
+    assert [[r["bv_id"] for r in payload] for payload in cc_submit] == [["BV-03"]]
+
+
+def test_cc_results_naming_no_machine_bv_write_nothing(cc_submit):
+    out = mcp_tools._tool_submit_cc_results({"spec_id": SPEC_ID, "test_cases": _SUBMISSION[1:]})
+
+    assert out["updated"] == 0
+    assert cc_submit == []
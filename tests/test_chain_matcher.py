@@ -0,0 +1,96 @@
+"""
+Bug near-duplicate index (app/services/chain_matcher.py) kept current
+through the requirement change hook.
+
+roadmap_requirements is an in-memory list behind a fake execute_query, so
+the MCP write path and the matcher's incremental reload run as in
+production without SQL Server.
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.api import classifier, mcp_tools
+from app.core import change_hooks
+from app.services import chain_matcher
+
+
+class _FakeRequirements:
+    """Just enough of roadmap_requirements for post_requirement and the matcher."""
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+
+    def mcp_query(self, sql, params=None, fetch="all"):
+        sql = " ".join(sql.split())
+        if sql.startswith("SELECT id FROM roadmap_projects"):
+            return {"id": "proj-mp"}
+        if "MAX(" in sql:
+            return {"maxNum": len(self.rows)}
+        if sql.startswith("SELECT id FROM roadmap_requirements WHERE project_id = ? AND code = ?"):
+            return next(({"id": r["id"]} for r in self.rows if r["code"] == params[1]), None)
+        if sql.startswith("INSERT INTO roadmap_requirements"):
+            req_id, project_id, code, title, description, req_type = params[:6]
+            self.rows.append({
+                "id": req_id, "code": code, "title": title, "description": description,
+                "type": req_type, "created_at": datetime.utcnow(), "project_code": "MP",
+            })
+            return None
+        raise AssertionError(f"unexpected query: {sql}")
+
+    def matcher_query(self, sql, params=None, fetch="all"):
+        bugs = [r for r in self.rows if r["type"] == "bug"]
+        if params:
+            bugs = [r for r in bugs if r["id"] in params]
+        return bugs
+
+
+@pytest.fixture
+def requirements(monkeypatch):
+    db = _FakeRequirements([
+        {"id": "r-1", "code": "BUG-001", "type": "bug", "project_code": "MP",
+         "title": "UAT classification dropdown renders empty on page load",
+         "description": "classification options missing from dropdown", "created_at": datetime.utcnow()},
+        {"id": "r-2", "code": "BUG-002", "type": "bug", "project_code": "MP",
+         "title": "CSV export button missing from dashboard",
+         "description": "export csv download gone", "created_at": datetime.utcnow()},
+    ])
+    monkeypatch.setattr(mcp_tools, "execute_query", db.mcp_query)
+    monkeypatch.setattr(chain_matcher, "execute_query", db.matcher_query)
+    # Only the matcher listens; other subscribers would reach for the real DB
+    monkeypatch.setattr(change_hooks, "_subscribers",
+                        {change_hooks.REQUIREMENT: [chain_matcher._on_requirement_change]})
+    chain_matcher.reset()
+    yield db
+    chain_matcher.reset()
+
+
+def _similar(code):
+    return asyncio.run(classifier.get_similar_bugs(code, threshold=0.3, limit=20))["similar"]
+
+
+def test_bug_created_through_mcp_shows_up_in_similar(requirements):
+    chain_matcher.get_matcher()  # index built before the write, as in a running app
+
+    created = mcp_tools._tool_post_requirement({
+        "project_code": "MP", "type": "bug",
+        "title": "UAT classification dropdown renders empty after page load",
+        "description": "dropdown has no classification options",
+    })
+
+    assert created["code"] == "BUG-003"
+    assert created["code"] in chain_matcher.get_matcher().by_code
+    assert [r["code"] for r in _similar(created["code"])] == ["BUG-001"]
+    assert created["code"] in [r["code"] for r in _similar("BUG-001")]
+
+
+def test_non_bug_requirements_stay_out_of_the_index(requirements):
+    chain_matcher.get_matcher()
+    created = mcp_tools._tool_post_requirement({
+        "project_code": "MP", "type": "feature",
+        "title": "UAT classification dropdown renders empty after page load",
+    })
+    assert created["code"].startswith("REQ-")
+    assert created["code"] not in chain_matcher.get_matcher().by_code
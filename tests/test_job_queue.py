@@ -0,0 +1,240 @@
+"""
+Durable background job queue (app/services/job_queue.py) and the shared
+lease/backoff mechanics it runs on (app/services/lease_queue.py).
+
+background_jobs is an in-memory table behind a fake execute_query with its
+own clock, so claiming, backoff, dedupe and dead-lettering run through the
+real queue code without SQL Server. The fake applies each statement's
+semantics; the ordering and attempt-cap guards it relies on are asserted
+against the claim's SQL.
+"""
+
+import asyncio
+import json
+import re
+
+import pytest
+
+from app.services import job_queue, lease_queue, rag_outbox
+
+
+class _FakeJobs:
+    def __init__(self):
+        self.rows = {}
+        self.now = 0.0
+        self.next_id = 1
+
+    def _due(self, r):
+        return (r["status"] in ("pending", "running") and r["attempts"] < r["max_attempts"]
+                and r["next_attempt_at"] <= self.now
+                and (r["locked_until"] is None or r["locked_until"] < self.now))
+
+    def query(self, sql, params=None, fetch="all"):
+        sql = " ".join(sql.split())
+        if "DECLARE @id" in sql:
+            dedupe_key, _, kind, payload, priority, max_attempts, _, delay = params
+            for r in self.rows.values():
+                if dedupe_key is not None and r["dedupe_key"] == dedupe_key \
+                        and r["status"] in ("pending", "running"):
+                    return {"id": r["id"]}
+            job_id, self.next_id = self.next_id, self.next_id + 1
+            self.rows[job_id] = {
+                "id": job_id, "kind": kind, "payload": payload, "priority": priority,
+                "max_attempts": max_attempts, "dedupe_key": dedupe_key, "status": "pending",
+                "attempts": 0, "next_attempt_at": self.now + delay, "locked_until": None,
+                "last_error": None, "result_json": None, "finished_at": None,
+            }
+            return {"id": job_id}
+        if sql.startswith("WITH next AS"):
+            assert "ORDER BY priority DESC, id" in sql
+            assert "attempts < max_attempts" in sql
+            due = sorted((r for r in self.rows.values() if self._due(r)), key=lambda r: (-r["priority"], r["id"]))
+            if not due:
+                return None
+            r = due[0]
+            r.update(status="running", attempts=r["attempts"] + 1,
+                     locked_until=self.now + job_queue.LEASE_SECONDS)
+            return {k: r[k] for k in ("id", "kind", "payload", "attempts", "max_attempts")}
+        if "SET status = 'done'" in sql:
+            result_json, job_id = params
+            self.rows[job_id].update(status="done", locked_until=None, last_error=None,
+                                     result_json=result_json, finished_at=self.now)
+            return None
+        if "JOIN OPENJSON" in sql:
+            error, outcomes = params
+            for f in json.loads(outcomes):
+                r = self.rows[f["id"]]
+                r.update(locked_until=None, last_error=error, next_attempt_at=self.now + f["delay"],
+                         status="dead" if f["dead"] else "pending",
+                         finished_at=self.now if f["dead"] else None)
+            return None
+        if "lease expired on the final attempt" in sql:
+            reaped = [r for r in self.rows.values()
+                      if r["status"] in ("pending", "running") and r["attempts"] >= r["max_attempts"]
+                      and r["locked_until"] is not None and r["locked_until"] < self.now]
+            for r in reaped:
+                r.update(status="dead", locked_until=None, finished_at=self.now,
+                         last_error="lease expired on the final attempt")
+            return {"n": len(reaped)}
+        if "SET status = 'pending', attempts = 0" in sql:
+            kind = params[0] if params else None
+            assert kind is None or re.search(r"AND kind = \?$", sql)
+            requeued = [r for r in self.rows.values() if r["status"] == "dead" and kind in (None, r["kind"])]
+            for r in requeued:
+                r.update(status="pending", attempts=0, next_attempt_at=self.now,
+                         locked_until=None, finished_at=None)
+            return [{"id": r["id"]} for r in requeued]
+        raise AssertionError(f"unexpected query: {sql}")
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    db = _FakeJobs()
+    monkeypatch.setattr(job_queue, "execute_query", db.query)
+    monkeypatch.setattr(lease_queue, "execute_query", db.query)
+    monkeypatch.setattr(job_queue, "HANDLERS", {})
+    return db
+
+
+def _run_once():
+    return asyncio.run(job_queue.run_once())
+
+
+def _handler(calls, fail=None):
+    async def handler(payload):
+        calls.append(payload["n"])
+        if fail is not None:
+            raise fail
+        return {"ok": payload["n"]}
+    return handler
+
+
+def test_claims_highest_priority_first_then_oldest(jobs):
+    calls = []
+    job_queue.register("work", _handler(calls))
+    job_queue.enqueue("work", {"n": "low"}, priority=job_queue.PRIORITY_LOW)
+    job_queue.enqueue("work", {"n": "normal-1"})
+    job_queue.enqueue("work", {"n": "high"}, priority=job_queue.PRIORITY_HIGH)
+    job_queue.enqueue("work", {"n": "normal-2"})
+
+    while _run_once():
+        pass
+
+    assert calls == ["high", "normal-1", "normal-2", "low"]
+    assert {r["status"] for r in jobs.rows.values()} == {"done"}
+
+
+def test_retry_delay_doubles_up_to_the_cap():
+    assert [job_queue.QUEUE.retry_delay(n) for n in range(1, 10)] == \
+        [15, 30, 60, 120, 240, 480, 960, 1920, 3600]
+    assert job_queue.QUEUE.retry_delay(500) == job_queue.MAX_BACKOFF_SECONDS
+
+
+def test_failed_job_waits_out_its_backoff(jobs):
+    calls = []
+    job_queue.register("work", _handler(calls, fail=RuntimeError("upstream 503")))
+    job_id = job_queue.enqueue("work", {"n": 1})
+
+    assert _run_once()
+    row = jobs.rows[job_id]
+    assert (row["status"], row["attempts"], row["last_error"]) == ("pending", 1, "upstream 503")
+    assert row["next_attempt_at"] == 15
+
+    jobs.now = 14
+    assert not _run_once()
+    jobs.now = 15
+    assert _run_once()
+    assert calls == [1, 1]
+    assert jobs.rows[job_id]["next_attempt_at"] == 15 + 30
+
+
+def test_dedupe_key_collapses_repeats_while_active(jobs):
+    calls = []
+    job_queue.register("work", _handler(calls))
+    first = job_queue.enqueue("work", {"n": 1}, dedupe_key="work:1")
+    assert job_queue.enqueue("work", {"n": 1}, dedupe_key="work:1") == first
+    other = job_queue.enqueue("work", {"n": 2}, dedupe_key="work:2")
+    assert other != first
+
+    while _run_once():
+        pass
+    assert sorted(calls) == [1, 2]
+    # Once done, the same key queues a new job
+    assert job_queue.enqueue("work", {"n": 1}, dedupe_key="work:1") not in (first, other)
+
+
+def test_dead_lettered_after_max_attempts(jobs):
+    calls = []
+    job_queue.register("work", _handler(calls, fail=RuntimeError("boom")))
+    job_id = job_queue.enqueue("work", {"n": 1}, max_attempts=3)
+
+    for _ in range(3):
+        assert _run_once()
+        jobs.now += job_queue.MAX_BACKOFF_SECONDS
+    assert not _run_once()
+
+    row = jobs.rows[job_id]
+    assert (row["status"], row["attempts"], row["last_error"]) == ("dead", 3, "boom")
+    assert row["finished_at"] is not None
+    assert calls == [1, 1, 1]
+
+
+def test_permanent_error_dead_letters_at_once(jobs):
+    calls = []
+    job_queue.register("work", _handler(calls, fail=job_queue.PermanentJobError("handoff not found")))
+    job_id = job_queue.enqueue("work", {"n": 1})
+
+    assert _run_once()
+    jobs.now += job_queue.MAX_BACKOFF_SECONDS
+    assert not _run_once()
+    assert (jobs.rows[job_id]["status"], jobs.rows[job_id]["attempts"]) == ("dead", 1)
+
+
+def test_lost_final_attempt_is_reaped_not_reclaimed(jobs):
+    job_id = job_queue.enqueue("work", {"n": 1}, max_attempts=1)
+    assert job_queue._claim()["id"] == job_id   # the worker dies holding the lease
+
+    jobs.now += job_queue.LEASE_SECONDS + 1
+    assert job_queue._claim() is None
+    assert job_queue.QUEUE.reap() == 1
+    assert jobs.rows[job_id]["status"] == "dead"
+    assert "lease expired" in jobs.rows[job_id]["last_error"]
+
+
+def test_retry_dead_requeues_with_a_fresh_budget(jobs):
+    calls = []
+    job_queue.register("work", _handler(calls, fail=job_queue.PermanentJobError("down")))
+    job_queue.register("other", _handler(calls, fail=job_queue.PermanentJobError("down")))
+    work = job_queue.enqueue("work", {"n": "work"})
+    other = job_queue.enqueue("other", {"n": "other"})
+    while _run_once():
+        pass
+    assert {jobs.rows[work]["status"], jobs.rows[other]["status"]} == {"dead"}
+
+    job_queue.register("work", _handler(calls))
+    assert job_queue.retry_dead("work") == 1
+    assert (jobs.rows[work]["status"], jobs.rows[work]["attempts"]) == ("pending", 0)
+    assert jobs.rows[other]["status"] == "dead"
+
+    while _run_once():
+        pass
+    assert jobs.rows[work]["status"] == "done"
+    assert json.loads(jobs.rows[work]["result_json"]) == {"ok": "work"}
+
+
+def test_rag_outbox_rows_share_the_backoff_and_constant_cap(monkeypatch):
+    sent = []
+    monkeypatch.setattr(lease_queue, "execute_query", lambda sql, params=None, fetch="all": sent.append(params))
+    rows = [{"id": 1, "attempts": 1}, {"id": 2, "attempts": rag_outbox.MAX_ATTEMPTS - 1},
+            {"id": 3, "attempts": rag_outbox.MAX_ATTEMPTS}]
+
+    rag_outbox.QUEUE.fail(rows, "HTTP 502")
+
+    (error, outcomes), = sent
+    assert error == "HTTP 502"
+    assert json.loads(outcomes) == [
+        {"id": 1, "delay": 30, "dead": 0},
+        {"id": 2, "delay": 1920, "dead": 0},
+        {"id": 3, "delay": rag_outbox.MAX_BACKOFF_SECONDS, "dead": 1},
+    ]
+    assert f"attempts < {rag_outbox.MAX_ATTEMPTS}" in rag_outbox.QUEUE.due()
@@ -0,0 +1,51 @@
+"""
+Knowledge routes of /api/rag/query and /api/search/knowledge
+(app/api/rag.py): the in-process index is tried first and SQL serves the
+request when it fails, off the event loop in both cases.
+"""
+
+import asyncio
+import threading
+
+import pytest
+from fastapi import Response
+
+from app.api import rag
+from app.services import fulltext, search_cache
+
+SQL_ROW = {"source_type": "requirement", "code": "MP-001", "title": "Cache", "score": 1.0}
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    seen = []
+    loop_thread = threading.get_ident()
+
+    def index_down(q, limit):
+        seen.append(("index", threading.get_ident() != loop_thread))
+        raise RuntimeError("index build failed")
+
+    def sql(q, limit):
+        seen.append(("sql", threading.get_ident() != loop_thread))
+        return [SQL_ROW], "like"
+
+    monkeypatch.setattr(rag, "_knowledge_results", index_down)
+    monkeypatch.setattr(rag, "_knowledge_sql", sql)
+    monkeypatch.setattr(fulltext, "use_fulltext_backend", lambda: False)
+    monkeypatch.setattr(search_cache, "get", lambda key: None)
+    monkeypatch.setattr(search_cache, "put", lambda key, value, entities: None)
+    return seen
+
+
+def test_rag_query_falls_back_to_sql_when_the_index_fails(calls):
+    out = asyncio.run(rag.rag_query(Response(), q="cache", collection="portfolio", n=5))
+
+    assert (out["source"], out["results"]) == ("metapm_sql", [SQL_ROW])
+    assert calls == [("index", True), ("sql", True)]
+
+
+def test_knowledge_search_falls_back_to_sql_when_the_index_fails(calls):
+    out = asyncio.run(rag.search_knowledge(q="cache", limit=20))
+
+    assert (out["search_method"], out["results"]) == ("like", [SQL_ROW])
+    assert calls == [("index", True), ("sql", True)]
@@ -0,0 +1,70 @@
+"""
+uat_quality_rollup refresh (app/services/quality_rollup.py).
+
+The rollup follows UAT_PAGE change notifications, so every BV write path
+refreshes it by notifying. execute_query and get_db are fakes that record
+the PTH lookup and the per-PTH DELETE + INSERT…SELECT.
+"""
+
+import json
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+from app.core import change_hooks
+from app.services import quality_rollup
+
+PAGES = {"spec-1": "AB01", "spec-2": "AB01", "spec-3": "AB02", "spec-4": None}
+
+
+@pytest.fixture
+def db(monkeypatch):
+    fake = {"lookups": [], "refreshed": [], "rebuilt": threading.Event()}
+
+    def execute_query(sql, params=None, fetch="all"):
+        assert "FROM uat_pages" in sql
+        ids = json.loads(params[0])
+        fake["lookups"].append(ids)
+        return [{"pth": p} for p in dict.fromkeys(PAGES.get(i) for i in ids) if p]
+
+    @contextmanager
+    def get_db():
+        class _Cursor:
+            def execute(self, sql, params=()):
+                if sql.startswith("DELETE FROM") and params:
+                    fake["refreshed"].append(params[0])
+
+        class _Conn:
+            def cursor(self):
+                return _Cursor()
+
+        yield _Conn()
+
+    monkeypatch.setattr(quality_rollup, "execute_query", execute_query)
+    monkeypatch.setattr(quality_rollup, "get_db", get_db)
+    monkeypatch.setattr(quality_rollup, "_ready", True)
+    monkeypatch.setattr(quality_rollup, "rebuild_rollup", lambda: fake["rebuilt"].set())
+    return fake
+
+
+def test_uat_page_notify_refreshes_each_pth_once(db):
+    change_hooks.notify_change(change_hooks.UAT_PAGE, ["spec-1", "spec-2", "spec-3", "spec-4"])
+
+    assert db["lookups"] == [["spec-1", "spec-2", "spec-3", "spec-4"]]
+    assert db["refreshed"] == ["AB01", "AB02"]
+
+
+def test_full_refresh_rebuilds_in_the_background(db):
+    change_hooks.notify_change(change_hooks.UAT_PAGE, [])
+
+    assert db["rebuilt"].wait(5)
+    assert db["lookups"] == [] and db["refreshed"] == []
+
+
+def test_refresh_failure_does_not_reach_the_writer(db, monkeypatch):
+    def down(*args, **kwargs):
+        raise RuntimeError("deadlock victim")
+    monkeypatch.setattr(quality_rollup, "execute_query", down)
+
+    quality_rollup.refresh_for_specs(["spec-1"])
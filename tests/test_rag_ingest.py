@@ -0,0 +1,199 @@
+"""
+RAG ingest pipeline (app/services/rag_ingest.py) against a local stub of
+Portfolio RAG /ingest/custom.
+
+The stub runs on 127.0.0.1 in a background thread and can be scripted to
+answer 429 (with Retry-After), 500, 413 or a hard failure for chosen
+requests, so retries, throttling, batch splitting and checkpoint resume are
+exercised over real HTTP without touching the deployed service.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from app.services.rag_ingest import (
+    IngestError,
+    IngestPipeline,
+    MemoryCheckpointStore,
+    make_batches,
+)
+
+
+class _StubIngest:
+    """Records every accepted batch; `script` maps request number → (status, headers)."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.script = {}
+        self.fail_ids = set()       # chunk ids that always get a 400
+        self.max_body = None        # bodies larger than this get a 413
+        self.accepted = []          # [{"replace": bool, "ids": [...]}]
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("content-length", 0)))
+                payload = json.loads(body)
+                with stub.lock:
+                    stub.requests += 1
+                    n = stub.requests
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    time.sleep(stub.delay)
+                    ids = [c["id"] for c in payload["chunks"]]
+                    status, headers = stub.script.get(n, (200, {}))
+                    if status == 200 and stub.max_body and len(body) > stub.max_body:
+                        status = 413
+                    if status == 200 and stub.fail_ids.intersection(ids):
+                        status = 400
+                    if status == 200:
+                        with stub.lock:
+                            stub.accepted.append({"replace": payload["replace_collection"], "ids": ids})
+                        out = json.dumps({"chunks_ingested": len(ids)}).encode()
+                    else:
+                        out = json.dumps({"detail": f"stub {status}"}).encode()
+                    self.send_response(status)
+                    for k, v in headers.items():
+                        self.send_header(k, v)
+                    self.send_header("content-type", "application/json")
+                    self.send_header("content-length", str(len(out)))
+                    self.end_headers()
+                    self.wfile.write(out)
+                finally:
+                    with stub.lock:
+                        stub.in_flight -= 1
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/ingest/custom"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def accepted_ids(self):
+        return [i for batch in self.accepted for i in batch["ids"]]
+
+
+async def _no_sleep(_seconds):
+    return None
+
+
+def _chunks(n, size=200):
+    return [{"id": f"metapm::{i}", "content": "x" * size, "metadata": {"code": f"R-{i}"}} for i in range(n)]
+
+
+def _run(stub, chunks, **kwargs):
+    run_kwargs = {k: kwargs.pop(k) for k in ("replace_collection", "job", "on_batch") if k in kwargs}
+    kwargs.setdefault("sleep", _no_sleep)
+    kwargs.setdefault("rate", 1000.0)
+
+    async def go():
+        async with httpx.AsyncClient(timeout=10) as client:
+            pipeline = IngestPipeline(client, stub.url, **kwargs)
+            return await pipeline.run(chunks, **run_kwargs)
+
+    return asyncio.run(go())
+
+
+def test_batches_are_packed_by_payload_bytes():
+    chunks = _chunks(10, size=1000)
+    batches = make_batches(chunks, max_bytes=3500, max_chunks=100)
+    assert [len(b) for b in batches] == [3, 3, 3, 1]
+    assert [c["id"] for b in batches for c in b] == [c["id"] for c in chunks]
+    # max_chunks still caps a batch of tiny chunks
+    assert [len(b) for b in make_batches(_chunks(5, size=1), 10**6, 2)] == [2, 2, 1]
+
+
+def test_every_chunk_delivered_once_and_replace_batch_goes_first_alone():
+    chunks = _chunks(40, size=500)
+    with _StubIngest(delay=0.02) as stub:
+        result = _run(stub, chunks, replace_collection=True, concurrency=4, max_batch_bytes=3000)
+
+    assert sorted(stub.accepted_ids()) == sorted(c["id"] for c in chunks)
+    assert len(stub.accepted_ids()) == len(chunks)
+    assert stub.accepted[0]["replace"] is True
+    assert all(b["replace"] is False for b in stub.accepted[1:])
+    assert result.chunks_ingested == 40
+    assert result.batches == len(stub.accepted)
+    assert 1 < stub.max_in_flight <= 4
+
+
+def test_429_retry_after_and_5xx_are_retried():
+    chunks = _chunks(6)
+    with _StubIngest() as stub:
+        stub.script = {1: (429, {"Retry-After": "0.05"}), 2: (500, {}), 3: (503, {})}
+        started = time.monotonic()
+        result = _run(stub, chunks, concurrency=1, max_batch_chunks=2)
+        elapsed = time.monotonic() - started
+
+    assert sorted(stub.accepted_ids()) == sorted(c["id"] for c in chunks)
+    assert result.throttled == 1
+    assert result.retries >= 3
+    assert elapsed >= 0.05  # Retry-After was honoured
+
+
+def test_413_splits_the_batch():
+    chunks = _chunks(8, size=400)
+    with _StubIngest() as stub:
+        stub.max_body = 1500
+        result = _run(stub, chunks, concurrency=1, max_batch_bytes=10_000)
+
+    assert sorted(stub.accepted_ids()) == sorted(c["id"] for c in chunks)
+    assert result.chunks_ingested == 8
+    assert all(len(b["ids"]) <= 3 for b in stub.accepted)
+
+
+def test_failed_run_resumes_from_last_acknowledged_batch():
+    chunks = _chunks(10)
+    store = MemoryCheckpointStore()
+    with _StubIngest() as stub:
+        stub.fail_ids = {"metapm::6"}
+        with pytest.raises(IngestError) as excinfo:
+            _run(stub, chunks, replace_collection=True, job="sync", checkpoints=store,
+                 concurrency=1, max_batch_chunks=2)
+        assert excinfo.value.done == 3 and excinfo.value.total == 5
+        first_run = stub.accepted_ids()
+        assert first_run == [f"metapm::{i}" for i in range(6)]
+        assert store.load("sync")["acked"] == [0, 1, 2]
+
+        stub.fail_ids = set()
+        stub.accepted.clear()
+        recorded = []
+        result = _run(stub, chunks, replace_collection=True, job="sync", checkpoints=store,
+                      concurrency=1, max_batch_chunks=2, on_batch=lambda b: recorded.extend(c["id"] for c in b))
+
+    # Only the unacknowledged batches were sent, and the collection was not replaced again
+    assert stub.accepted_ids() == [f"metapm::{i}" for i in range(6, 10)]
+    assert all(b["replace"] is False for b in stub.accepted)
+    assert recorded == [f"metapm::{i}" for i in range(6, 10)]
+    assert result.resumed and result.skipped_batches == 3
+    assert store.load("sync") is None  # cleared on success
+
+
+def test_changed_chunks_start_a_fresh_run():
+    store = MemoryCheckpointStore()
+    store.save("sync", {"fingerprint": "stale", "acked": [0, 1], "total": 3})
+    chunks = _chunks(6)
+    with _StubIngest() as stub:
+        result = _run(stub, chunks, job="sync", checkpoints=store, max_batch_chunks=2)
+    assert not result.resumed
+    assert sorted(stub.accepted_ids()) == sorted(c["id"] for c in chunks)
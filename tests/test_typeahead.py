@@ -0,0 +1,87 @@
+"""
+Typeahead index (app/services/typeahead.py).
+
+execute_query is replaced by a fake over in-memory lessons_learned rows
+that honours the soft-delete filter only when the SQL asks for it, so a
+query that forgets the filter leaks deleted lessons into suggestions.
+"""
+
+import threading
+import time
+
+import pytest
+
+from app.services import typeahead
+
+
+class _FakeSource:
+    def __init__(self):
+        self.lessons = {"L-1": {"id": "L-1", "project": "MP", "lesson": "cache the ranker", "deleted": 0},
+                        "L-2": {"id": "L-2", "project": "MP", "lesson": "cache the headers", "deleted": 0}}
+        self.release = threading.Event()
+        self.release.set()
+
+    def query(self, sql, params=None, fetch="all"):
+        if "lessons_learned" not in sql:
+            return []
+        self.release.wait(5)
+        rows = list(self.lessons.values())
+        if "(deleted IS NULL OR deleted = 0)" in sql:
+            rows = [r for r in rows if not r["deleted"]]
+        if params:
+            rows = [r for r in rows if r["id"] in params]
+        return rows
+
+
+@pytest.fixture
+def source(monkeypatch):
+    fake = _FakeSource()
+    monkeypatch.setattr(typeahead, "execute_query", fake.query)
+    monkeypatch.setattr(typeahead, "_index", None)
+    return fake
+
+
+def _swapped(old, timeout=5.0):
+    """Wait for the background build to replace the given index."""
+    deadline = time.monotonic() + timeout
+    while typeahead._index is old and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return typeahead._index
+
+
+def _lesson_ids(index):
+    return sorted(r["id"] for r in index.suggest("l", kinds=[typeahead.LESSON]))
+
+
+def test_rebuild_skips_deleted_lessons(source):
+    source.lessons["L-2"]["deleted"] = 1
+    assert _lesson_ids(typeahead.rebuild()) == ["L-1"]
+
+
+def test_deleting_a_lesson_drops_it_on_the_keyed_refresh(source):
+    typeahead.rebuild()
+    source.lessons["L-2"]["deleted"] = 1
+
+    typeahead.refresh_keys(typeahead.LESSON, ["L-2"])
+
+    assert _lesson_ids(typeahead.get_index()) == ["L-1"]
+
+
+def test_full_refresh_keeps_serving_the_old_index(source):
+    old = typeahead.rebuild()
+    source.release.clear()      # hold the background build in its first lessons query
+
+    typeahead.refresh_keys(typeahead.LESSON, [])
+
+    assert typeahead.get_index() is old
+    source.release.set()
+    assert _swapped(old) is not old
+
+
+def test_cold_lookup_does_not_wait_for_the_build(source):
+    source.release.clear()
+
+    assert typeahead.suggest("l") == []
+
+    source.release.set()
+    assert _lesson_ids(_swapped(None)) == ["L-1", "L-2"]
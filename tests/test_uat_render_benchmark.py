@@ -0,0 +1,109 @@
+"""
+UAT page render benchmarks (pytest-benchmark).
+
+Renders spec pages of 10, 100 and 1000 BVs through the Jinja2 templates in
+app/templates/uat/, plain and streamed, plus the structured page. Peak
+memory of one render is recorded in extra_info next to the timings, so both
+can be tracked across runs:
+
+    pytest tests/test_uat_render_benchmark.py --benchmark-autosave
+    pytest tests/test_uat_render_benchmark.py --benchmark-compare
+"""
+
+import tracemalloc
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from app.api.uat_spec import render_spec_uat_page
+from app.services.uat_generator_v2 import render_structured_uat_html
+
+SIZES = [10, 100, 1000]
+
+
+def _spec(n: int) -> dict:
+    """A spec with n BVs: every fifth one cc_machine, the rest pl_visual with mixed results."""
+    test_cases, results = [], []
+    for i in range(n):
+        tc = {
+            "id": f"BV-{i:04d}",
+            "title": f"Check <widget> {i} renders & saves",
+            "url": f"https://metapm.example/app?tab={i}&view=full" if i % 2 else "",
+            "steps": ["Open the page", "Click 'Save'", "Reload"],
+            "expected": "Value persists after <reload>",
+            "type": "cc_machine" if i % 5 == 4 else "pl_visual",
+        }
+        test_cases.append(tc)
+        status = ("pass", "fail", "skip", "pending")[i % 4]
+        results.append({
+            **tc,
+            "status": status,
+            "notes": f"note {i} with <markup> & 'quotes'" if status != "pass" else "",
+            "classification": "Bug" if status == "fail" else "",
+            "failure_type": "wrong_spec" if status == "fail" else "",
+            "cc_result": "pass",
+            "cc_evidence": "HTTP 200 in 120ms" if tc["type"] == "cc_machine" else "",
+        })
+    return {
+        "spec_id": "00000000-0000-0000-0000-000000000001",
+        "spec_data": {"project": "proj-mp", "version": "2.99.0", "sprint": "MP-BENCH",
+                      "pth": "BN01", "linked_requirements": ["REQ-001", "REQ-002"]},
+        "test_cases": test_cases,
+        "current_results": results,
+        "pl_email": "pl@example.com",
+        "general_notes": '[{"text": "general <note>", "classification": "finding"}]',
+    }
+
+
+def _structured(n: int) -> dict:
+    return {
+        "project": "MetaPM",
+        "version": "2.99.0",
+        "feature": "MP-BENCH: render benchmark",
+        "pth": "BN01",
+        "cc_summary": "Benchmark run",
+        "test_cases": [
+            {"id": f"BV-{i:04d}", "title": f"Check widget {i}", "expected": "Persists",
+             "instructions": ["Open", "Save", "Reload"]}
+            for i in range(n)
+        ],
+        "handoff_id": "00000000-0000-0000-0000-000000000002",
+        "uat_result_id": "00000000-0000-0000-0000-000000000003",
+    }
+
+
+def _record_peak_memory(benchmark, fn) -> None:
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    benchmark.extra_info["peak_kib"] = peak // 1024
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_spec_page_render(benchmark, n):
+    spec = _spec(n)
+    html = benchmark(render_spec_uat_page, **spec)
+    _record_peak_memory(benchmark, lambda: render_spec_uat_page(**spec))
+    benchmark.extra_info["kib"] = len(html.encode()) // 1024
+    assert html.count('class="test-card') == n
+    assert "<widget>" not in html  # autoescaped
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_spec_page_stream(benchmark, n):
+    spec = _spec(n)
+    html = benchmark(lambda: "".join(render_spec_uat_page(**spec, stream=True)))
+    _record_peak_memory(benchmark, lambda: [len(c) for c in render_spec_uat_page(**spec, stream=True)])
+    assert html == render_spec_uat_page(**spec)
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_structured_page_render(benchmark, n):
+    args = _structured(n)
+    html = benchmark(render_structured_uat_html, **args)
+    _record_peak_memory(benchmark, lambda: render_structured_uat_html(**args))
+    assert html.count('class="test-item"') == n
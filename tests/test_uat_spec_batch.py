@@ -0,0 +1,166 @@
+"""
+Batch UAT spec ingestion (app/services/uat_spec_batch.py and
+POST /api/uat/spec/batch).
+
+execute_query and get_db are replaced by fakes: lookups answer from
+per-test rows, and every write is recorded, so validation, the prior-
+submission guard, the update/insert split and the change-hook calls are
+checked without SQL Server.
+"""
+
+import asyncio
+import json
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.api import uat_spec
+from app.core import change_hooks
+from app.services import uat_spec_batch
+
+EXISTING_ID = "11111111-2222-3333-4444-555555555555"
+
+
+def _spec(pth, *bv_ids, **extra):
+    return {
+        "project": "proj-mp", "sprint": "MP-BATCH", "version": "2.99.0", "pth": pth,
+        "test_cases": [{"id": bv, "title": f"Check {bv}"} for bv in bv_ids or ("BV-01",)],
+        **extra,
+    }
+
+
+class _FakeDB:
+    def __init__(self):
+        self.existing = []      # uat_pages rows: pth, id, pl_submitted_at
+        self.ready = []         # cc_complete requirements: id, code, pth
+        self.queries = []
+        self.writes = []        # (sql, params) run on the get_db cursor
+        self.notified = []
+
+    def execute_query(self, sql, params=None, fetch="all"):
+        sql = " ".join(sql.split())
+        self.queries.append((sql, params))
+        if sql.startswith("UPDATE r SET status = 'uat_ready'"):
+            return None
+        pths = {p.upper() for p in json.loads(params[0])}
+        if "FROM uat_pages" in sql:
+            return [r for r in self.existing if r["pth"].upper() in pths]
+        if "FROM roadmap_requirements WHERE status = 'cc_complete'" in sql:
+            return [r for r in self.ready if r["pth"].upper() in pths]
+        raise AssertionError(f"unexpected query: {sql}")
+
+    @contextmanager
+    def get_db(self):
+        db = self
+
+        class _Cursor:
+            def execute(self, sql, params=()):
+                db.writes.append((" ".join(sql.split()), params))
+
+        class _Conn:
+            def cursor(self):
+                return _Cursor()
+
+        yield _Conn()
+
+    def written(self, prefix):
+        return [params for sql, params in self.writes if sql.startswith(prefix)]
+
+
+@pytest.fixture
+def db(monkeypatch):
+    fake = _FakeDB()
+    monkeypatch.setattr(uat_spec_batch, "execute_query", fake.execute_query)
+    monkeypatch.setattr(uat_spec_batch, "get_db", fake.get_db)
+    monkeypatch.setattr(change_hooks, "notify_change", lambda entity, keys=None: fake.notified.append((entity, keys)))
+    return fake
+
+
+def test_invalid_specs_are_all_reported_and_nothing_is_written(db):
+    specs = [
+        _spec("AB01"),
+        _spec("", "BV-01"),
+        {**_spec("AB03"), "test_cases": []},
+        _spec("AB04", "BV-01", "BV-01"),
+        {**_spec("AB05"), "version": "9" * 21},
+    ]
+    with pytest.raises(uat_spec_batch.BatchRejected) as exc:
+        uat_spec_batch.ingest(specs)
+
+    errors = {(e["index"], e["error"]) for e in exc.value.errors}
+    assert errors == {
+        (1, "pth is required"),
+        (2, uat_spec_batch.EMPTY_TEST_CASES),
+        (3, "duplicate test case ids"),
+        (4, "version longer than 20 characters"),
+    }
+    assert db.queries == [] and db.writes == [] and db.notified == []
+
+
+def test_duplicate_pth_in_batch_is_rejected_case_insensitively(db):
+    with pytest.raises(uat_spec_batch.BatchRejected) as exc:
+        uat_spec_batch.ingest([_spec("AB01"), _spec("AB02"), _spec("ab01")])
+
+    assert exc.value.errors == [
+        {"index": 2, "pth": "ab01", "error": "duplicate pth in batch", "first_index": 0},
+    ]
+    assert db.writes == []
+
+
+def test_prior_pl_submission_is_a_409_and_nothing_is_written(db):
+    db.existing = [{"pth": "AB02", "id": EXISTING_ID, "pl_submitted_at": datetime(2026, 10, 1)}]
+    body = uat_spec.UATSpecBatchCreate(specs=[_spec("AB01"), _spec("AB02")])
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(uat_spec.create_uat_specs(body))
+
+    assert exc.value.status_code == 409
+    assert exc.value.detail["error"] == "spec_has_prior_submission"
+    (conflict,) = exc.value.detail["errors"]
+    assert (conflict["index"], conflict["pth"], conflict["spec_id"]) == (1, "AB02", EXISTING_ID)
+    assert db.writes == [] and db.notified == []
+
+
+def test_validation_errors_are_a_400(db):
+    body = uat_spec.UATSpecBatchCreate(specs=[_spec("AB01"), _spec("AB01")])
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(uat_spec.create_uat_specs(body))
+    assert exc.value.status_code == 400
+    assert exc.value.detail["error"] == "invalid_batch"
+
+
+def test_existing_pths_update_new_ones_insert(db):
+    db.existing = [{"pth": "AB01", "id": EXISTING_ID.lower(), "pl_submitted_at": None}]
+    db.ready = [{"id": "req-2", "code": "REQ-002", "pth": "AB02"}]
+
+    out = uat_spec_batch.ingest([_spec("ab01", "BV-01", "BV-02"), _spec("AB02", "BV-01")])
+
+    assert (out["created"], out["updated"]) == (1, 1)
+    updated, created = out["specs"]
+    assert (updated["action"], updated["spec_id"], updated["test_count"]) == ("updated", EXISTING_ID.upper(), 2)
+    assert (created["action"], created["advanced_requirement"]) == ("created", "REQ-002")
+    assert created["spec_id"] != EXISTING_ID.upper()
+
+    (update_params,) = db.written("UPDATE p SET")
+    assert [r["id"] for r in json.loads(update_params[0])] == [EXISTING_ID.upper()]
+    (insert_params,) = db.written("INSERT INTO uat_pages")
+    assert [r["pth"] for r in json.loads(insert_params[1])] == ["AB02"]
+    (seed_params,) = db.written("INSERT INTO uat_bv_items")
+    assert sorted((r["spec_id"], r["id"]) for r in json.loads(seed_params[0])) == sorted([
+        (EXISTING_ID.upper(), "BV-01"), (EXISTING_ID.upper(), "BV-02"), (created["spec_id"], "BV-01"),
+    ])
+
+    advance = [p for sql, p in db.queries if sql.startswith("UPDATE r SET status = 'uat_ready'")]
+    assert [a["id"] for a in json.loads(advance[0][0])] == ["req-2"]
+    assert db.notified == [
+        (change_hooks.UAT_PAGE, [EXISTING_ID.upper(), created["spec_id"]]),
+        (change_hooks.REQUIREMENT, ["req-2"]),
+    ]
+
+
+def test_no_cc_complete_requirement_means_no_requirement_notify(db):
+    out = uat_spec_batch.ingest([_spec("AB01")])
+    assert out["specs"][0]["advanced_requirement"] is None
+    assert [entity for entity, _ in db.notified] == [change_hooks.UAT_PAGE]
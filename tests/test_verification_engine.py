@@ -0,0 +1,167 @@
+"""
+Handoff verification engine (app/services/verification_engine.py) against a
+local stub HTTP server.
+
+The stub runs on 127.0.0.1 in a background thread. Paths pick the answer:
+/status/<code>, /slow (sleeps), and /flaky/<n> (503 for the first n hits,
+then 200). It counts requests per path and the peak number in flight, so
+concurrency limits, URL dedup, caching and retries are checked over real
+HTTP.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from app.services.verification_engine import ProbeEngine
+from app.services.verification_service import check_evidence
+
+
+class _StubServer:
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.hits = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with stub.lock:
+                    stub.hits[self.path] += 1
+                    n = stub.hits[self.path]
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    status = 200
+                    parts = self.path.split("?")[0].strip("/").split("/")
+                    if parts[0] == "status":
+                        status = int(parts[1])
+                    elif parts[0] == "slow":
+                        time.sleep(stub.delay)
+                    elif parts[0] == "flaky":
+                        status = 503 if n <= int(parts[1]) else 200
+                    out = json.dumps({"path": self.path}).encode()
+                    self.send_response(status)
+                    self.send_header("content-type", "application/json")
+                    self.send_header("content-length", str(len(out)))
+                    self.end_headers()
+                    self.wfile.write(out)
+                finally:
+                    with stub.lock:
+                        stub.in_flight -= 1
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+async def _no_sleep(_seconds):
+    return None
+
+
+def _probe(urls, rounds=1, **kwargs):
+    kwargs.setdefault("sleep", _no_sleep)
+
+    async def go():
+        async with httpx.AsyncClient(timeout=5) as client:
+            engine = ProbeEngine(client, **kwargs)
+            return [await engine.probe_many(urls) for _ in range(rounds)]
+
+    return asyncio.run(go())
+
+
+def test_probes_run_concurrently_up_to_the_per_host_limit():
+    with _StubServer(delay=0.1) as stub:
+        urls = [f"{stub.base}/slow?i={i}" for i in range(12)]
+        started = time.monotonic()
+        [results] = _probe(urls, global_limit=10, per_host_limit=4)
+        elapsed = time.monotonic() - started
+
+    assert all(r.status == 200 for r in results.values())
+    assert stub.max_in_flight == 4
+    assert elapsed < 12 * 0.1  # far less than one-after-another
+
+
+def test_global_limit_caps_in_flight_probes():
+    with _StubServer(delay=0.05) as stub:
+        urls = [f"{stub.base}/slow?i={i}" for i in range(9)]
+        _probe(urls, global_limit=3, per_host_limit=10)
+    assert stub.max_in_flight == 3
+
+
+def test_identical_urls_are_probed_once_and_cached():
+    with _StubServer() as stub:
+        url = f"{stub.base}/status/201"
+        first, second = _probe([url, url, url], rounds=2, cache_ttl=60)
+        assert stub.hits["/status/201"] == 1
+        assert list(first) == [url]
+        assert first[url].status == 201 and not first[url].cached
+        assert second[url].status == 201 and second[url].cached
+
+        _probe([url], rounds=2, cache_ttl=0)
+        assert stub.hits["/status/201"] == 3  # expired immediately, probed each round
+
+
+def test_transient_errors_are_retried():
+    with _StubServer() as stub:
+        flaky = f"{stub.base}/flaky/2"
+        not_found = f"{stub.base}/status/404"
+        [results] = _probe([flaky, not_found], retries=2)
+
+    assert results[flaky].status == 200 and results[flaky].attempts == 3
+    # A 404 is an answer, not a transient error
+    assert results[not_found].status == 404 and results[not_found].attempts == 1
+
+
+def test_unreachable_endpoint_reports_error_after_retries():
+    with _StubServer() as stub:
+        dead = stub.base.rsplit(":", 1)[0] + ":9/"  # discard port, nothing listening
+    [results] = _probe([dead], retries=1)
+    assert results[dead].status is None
+    assert results[dead].error
+    assert results[dead].attempts == 2
+
+
+def test_check_evidence_matches_claimed_statuses():
+    with _StubServer() as stub:
+        ok = f"{stub.base}/status/200"
+        requirements = [
+            {"code": "REQ-1", "status": "complete",
+             "evidence": {"curl_command": f"curl -s {ok} | jq .", "http_status": 200}},
+            {"code": "REQ-2", "status": "complete",
+             "evidence": {"curl_command": f"curl {ok}", "http_status": 201}},
+            {"code": "REQ-3", "status": "complete",
+             "evidence": {"curl_command": f"curl {stub.base}/status/404"}},
+            {"code": "REQ-4", "status": "in_progress",
+             "evidence": {"curl_command": f"curl {ok}"}},
+            {"code": "REQ-5", "status": "complete", "evidence": {"curl_command": "no url here"}},
+        ]
+
+        async def go():
+            async with httpx.AsyncClient(timeout=5) as client:
+                return await check_evidence(requirements, ProbeEngine(client, sleep=_no_sleep))
+
+        results = asyncio.run(go())
+
+    assert [(r["requirement_code"], r["actual_status"], r["match"]) for r in results] == [
+        ("REQ-1", 200, True), ("REQ-2", 200, False), ("REQ-3", 404, False),
+    ]
+    assert stub.hits["/status/200"] == 1  # REQ-1 and REQ-2 share one probe
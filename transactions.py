@@ -3,6 +3,7 @@ MetaPM Transactions API
 History, search, and analytics for AI conversations
 """
 
+import logging
 from typing import Optional
 from datetime import datetime
 from uuid import UUID
@@ -14,6 +15,9 @@ from app.models.transaction import (
     CostSummary, UsagePattern
 )
 from app.core.database import execute_query, execute_procedure
+from app.services import fulltext
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -224,6 +228,26 @@ async def get_conversation_full(conversation_guid: UUID):
 # SEARCH
 # ============================================
 
+def _ft_rank_source(q: str):
+    """
+    Ranked full-text matches for vw_SearchableContent as a derived table
+    (ContentType, ContentID, RANK) plus its params, or None when the
+    Transactions/MediaFiles full-text indexes are missing and the caller
+    should use its LIKE query.
+    """
+    cond = fulltext.contains_query(q)
+    if not cond or not (fulltext.available("Transactions") and fulltext.available("MediaFiles")):
+        return None
+    sql = f"""(
+            SELECT 'TRANSACTION' AS ContentType, [KEY] AS ContentID, RANK
+            FROM {fulltext.containstable("Transactions", fulltext.TARGETS["Transactions"])}
+            UNION ALL
+            SELECT 'MEDIA', [KEY], RANK
+            FROM {fulltext.containstable("MediaFiles", fulltext.TARGETS["MediaFiles"])}
+        )"""
+    return sql, (cond, cond)
+
+
 @router.post("/search", response_model=SearchResponse)
 async def search_content(request: SearchRequest):
     """
@@ -252,16 +276,44 @@ async def search_content(request: SearchRequest):
         ORDER BY CreatedAt DESC
     """
     
-    params = (
-        request.max_results,
-        request.query, request.query,
+    filter_params = (
         request.project_code, request.project_code,
         request.content_type, request.content_type,
         request.start_date, request.start_date,
         request.end_date, request.end_date
     )
-    
-    rows = execute_query(query, params, fetch="all") or []
+    params = (request.max_results, request.query, request.query) + filter_params
+
+    rows = None
+    ft = _ft_rank_source(request.query)
+    if ft:
+        ft_sql, ft_params = ft
+        try:
+            rows = execute_query(f"""
+                SELECT TOP (?)
+                    s.ContentType as contentType,
+                    s.ContentID as contentId,
+                    s.ContentGUID as contentGuid,
+                    s.Context as context,
+                    LEFT(s.PrimaryText, 500) as primaryText,
+                    LEFT(s.SecondaryText, 500) as secondaryText,
+                    s.CreatedAt as createdAt,
+                    s.ProjectCode as projectCode
+                FROM vw_SearchableContent s
+                JOIN {ft_sql} ft
+                  ON ft.ContentType = s.ContentType AND ft.ContentID = s.ContentID
+                WHERE
+                    (? IS NULL OR s.ProjectCode = ?)
+                    AND (? IS NULL OR s.ContentType = ?)
+                    AND (? IS NULL OR s.CreatedAt >= ?)
+                    AND (? IS NULL OR s.CreatedAt <= ?)
+                ORDER BY ft.RANK DESC, s.CreatedAt DESC
+            """, (request.max_results,) + ft_params + filter_params, fetch="all") or []
+        except Exception as e:
+            logger.warning(f"CONTAINSTABLE on vw_SearchableContent failed, using LIKE: {e}")
+            rows = None
+    if rows is None:
+        rows = execute_query(query, params, fetch="all") or []
     
     results = [SearchResult(**row) for row in rows]
     
@@ -290,8 +342,29 @@ async def quick_search(
         ORDER BY CreatedAt DESC
     """
     
-    rows = execute_query(query, (limit, q), fetch="all") or []
-    
+    rows = None
+    ft = _ft_rank_source(q)
+    if ft:
+        ft_sql, ft_params = ft
+        try:
+            rows = execute_query(f"""
+                SELECT TOP (?)
+                    s.ContentType as contentType,
+                    s.ContentID as contentId,
+                    s.Context as context,
+                    LEFT(s.PrimaryText, 200) as primaryText,
+                    s.CreatedAt as createdAt
+                FROM vw_SearchableContent s
+                JOIN {ft_sql} ft
+                  ON ft.ContentType = s.ContentType AND ft.ContentID = s.ContentID
+                ORDER BY ft.RANK DESC, s.CreatedAt DESC
+            """, (limit,) + ft_params, fetch="all") or []
+        except Exception as e:
+            logger.warning(f"CONTAINSTABLE on vw_SearchableContent failed, using LIKE: {e}")
+            rows = None
+    if rows is None:
+        rows = execute_query(query, (limit, q), fetch="all") or []
+
     return {"results": rows, "query": q}
 
 
@@ -8,11 +8,11 @@ import uuid
 from typing import Optional
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
 from google.cloud import storage
-import httpx
 
 from app.models.transaction import (
     VoiceCaptureRequest, VoiceCaptureResponse, TaskSummaryBrief
 )
+from app.core import http_clients
 from app.core.config import settings
 from app.core.database import execute_query, execute_procedure
 
@@ -60,38 +60,38 @@ async def transcribe_audio(gcs_path: str) -> dict:
     audio_content = blob.download_as_bytes()
     
     # Call OpenAI Whisper API
-    async with httpx.AsyncClient() as http_client:
-        response = await http_client.post(
-            "https://api.openai.com/v1/audio/transcriptions",
-            headers={
-                "Authorization": f"Bearer {settings.OPENAI_API_KEY}"
-            },
-            files={
-                "file": (gcs_path.split('/')[-1], audio_content, "audio/webm")
-            },
-            data={
-                "model": "whisper-1",
-                "response_format": "verbose_json"  # Includes confidence
-            },
-            timeout=60.0
+    http_client = http_clients.get_client(http_clients.OPENAI)
+    response = await http_client.post(
+        "https://api.openai.com/v1/audio/transcriptions",
+        headers={
+            "Authorization": f"Bearer {settings.OPENAI_API_KEY}"
+        },
+        files={
+            "file": (gcs_path.split('/')[-1], audio_content, "audio/webm")
+        },
+        data={
+            "model": "whisper-1",
+            "response_format": "verbose_json"  # Includes confidence
+        },
+        timeout=60.0
+    )
+    
+    if response.status_code != 200:
+        raise HTTPException(
+            status_code=502,
+            detail=f"Whisper API error: {response.text}"
         )
-        
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=502,
-                detail=f"Whisper API error: {response.text}"
-            )
-        
-        result = response.json()
-        
-        return {
-            "text": result.get("text", ""),
-            "language": result.get("language", "en"),
-            "duration": result.get("duration", 0),
-            # Whisper doesn't return confidence per-se, but we can estimate
-            # based on whether it detected the language correctly
-            "confidence": 0.95 if result.get("language") else 0.80
-        }
+    
+    result = response.json()
+    
+    return {
+        "text": result.get("text", ""),
+        "language": result.get("language", "en"),
+        "duration": result.get("duration", 0),
+        # Whisper doesn't return confidence per-se, but we can estimate
+        # based on whether it detected the language correctly
+        "confidence": 0.95 if result.get("language") else 0.80
+    }
 
 
 async def understand_with_claude(
@@ -146,62 +146,62 @@ Respond with JSON only:
     if project_context:
         user_prompt += f"\n\nContext: Currently working on project {project_context}"
     
-    async with httpx.AsyncClient() as http_client:
-        start_time = time.time()
-        
-        response = await http_client.post(
-            "https://api.anthropic.com/v1/messages",
-            headers={
-                "x-api-key": settings.ANTHROPIC_API_KEY,
-                "anthropic-version": "2023-06-01",
-                "content-type": "application/json"
-            },
-            json={
-                "model": "claude-sonnet-4-20250514",
-                "max_tokens": 1024,
-                "system": system_prompt,
-                "messages": [
-                    {"role": "user", "content": user_prompt}
-                ]
-            },
-            timeout=30.0
+    http_client = http_clients.get_client(http_clients.ANTHROPIC)
+    start_time = time.time()
+    
+    response = await http_client.post(
+        "https://api.anthropic.com/v1/messages",
+        headers={
+            "x-api-key": settings.ANTHROPIC_API_KEY,
+            "anthropic-version": "2023-06-01",
+            "content-type": "application/json"
+        },
+        json={
+            "model": "claude-sonnet-4-20250514",
+            "max_tokens": 1024,
+            "system": system_prompt,
+            "messages": [
+                {"role": "user", "content": user_prompt}
+            ]
+        },
+        timeout=30.0
+    )
+    
+    processing_time = int((time.time() - start_time) * 1000)
+    
+    if response.status_code != 200:
+        raise HTTPException(
+            status_code=502,
+            detail=f"Claude API error: {response.text}"
         )
+    
+    result = response.json()
+    content = result["content"][0]["text"]
+    
+    # Parse JSON from response
+    import json
+    try:
+        # Handle case where Claude wraps in markdown
+        if "```json" in content:
+            content = content.split("```json")[1].split("```")[0]
+        elif "```" in content:
+            content = content.split("```")[1].split("```")[0]
         
-        processing_time = int((time.time() - start_time) * 1000)
-        
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=502,
-                detail=f"Claude API error: {response.text}"
-            )
-        
-        result = response.json()
-        content = result["content"][0]["text"]
-        
-        # Parse JSON from response
-        import json
-        try:
-            # Handle case where Claude wraps in markdown
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0]
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0]
-            
-            parsed = json.loads(content.strip())
-        except json.JSONDecodeError:
-            parsed = {
-                "intent": "UNCLEAR",
-                "response": content,
-                "project_code": None,
-                "categories": []
-            }
-        
-        # Add token counts for cost tracking
-        parsed["prompt_tokens"] = result.get("usage", {}).get("input_tokens", 0)
-        parsed["response_tokens"] = result.get("usage", {}).get("output_tokens", 0)
-        parsed["processing_time_ms"] = processing_time
-        
-        return parsed
+        parsed = json.loads(content.strip())
+    except json.JSONDecodeError:
+        parsed = {
+            "intent": "UNCLEAR",
+            "response": content,
+            "project_code": None,
+            "categories": []
+        }
+    
+    # Add token counts for cost tracking
+    parsed["prompt_tokens"] = result.get("usage", {}).get("input_tokens", 0)
+    parsed["response_tokens"] = result.get("usage", {}).get("output_tokens", 0)
+    parsed["processing_time_ms"] = processing_time
+    
+    return parsed
 
 
 @router.post("/voice", response_model=VoiceCaptureResponse)